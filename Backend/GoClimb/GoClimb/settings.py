@@ -49,6 +49,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     # APIs
     "rest_framework",
     # Your App
@@ -59,16 +60,26 @@ X_FRAME_OPTIONS = "SAMEORIGIN"  # allows you to use modals insated of popups
 SILENCED_SYSTEM_CHECKS = ["security.W019"]  # ignores redundant warning messages
 
 MIDDLEWARE = [
+    "MyApp.middleware.RequestMetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
     "django.contrib.auth.middleware.AuthenticationMiddleware",
+    "MyApp.middleware.GoClimbUserMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
 ]
 
+# Bearer token required to scrape /metrics (404 when empty, unless DEBUG)
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+# Request instrumentation (Server-Timing, metrics log, /metrics); on by
+# default only where /metrics can be scraped
+REQUEST_METRICS_ENABLED = (
+    os.getenv("REQUEST_METRICS_ENABLED", "true" if METRICS_TOKEN or DEBUG else "false").lower() == "true"
+)
+
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
 ROOT_URLCONF = "GoClimb.urls"
@@ -107,6 +118,25 @@ DATABASES = {
     "default": dj_database_url.config(default=os.getenv("DATABASE_URL")),
 }
 
+# "responses" backs MyApp.Utils.response_cache; set RESPONSE_CACHE_BACKEND=file
+# to share it between worker processes on one host.
+_RESPONSE_CACHE = {
+    "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    "LOCATION": "goclimb-responses",
+}
+if os.getenv("RESPONSE_CACHE_BACKEND") == "file":
+    _RESPONSE_CACHE = {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": os.getenv("RESPONSE_CACHE_DIR", "/tmp/goclimb-response-cache"),
+    }
+_RESPONSE_CACHE["OPTIONS"] = {"MAX_ENTRIES": 5000}
+
+CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "responses": _RESPONSE_CACHE,
+}
+RESPONSE_CACHE_TIMEOUT = int(os.getenv("RESPONSE_CACHE_TIMEOUT", "300"))
+
 # Add PostgreSQL-specific options only for non-CI environments
 if os.getenv("CI") != "true":
     DATABASES["default"]["OPTIONS"] = {"options": "-c search_path=go_climb,public"}
@@ -5,8 +5,11 @@ from rest_framework import status
 
 from MyApp.Serializer.serializers import ClimbLogSerializer
 from MyApp.Firebase.helpers import authenticate_app_check_token
+from MyApp.Firebase.authentication import get_request_user
 from MyApp.Controller import climblog_controller
-from MyApp.Exceptions.exceptions import InvalidUIDError
+from MyApp.Utils.pagination import paginate_queryset, parse_page_params
+from MyApp.Utils.bulk_import import enumerate_records, import_format, read_records
+from MyApp.Exceptions.exceptions import InvalidUIDError, InvalidCursorError
 from django.core.exceptions import ObjectDoesNotExist
 
 @api_view(["POST"])
@@ -29,21 +32,43 @@ def get_user_climb_logs_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cursor, page_size, page_errors = parse_page_params(data)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
         climb_logs = climblog_controller.get_user_climb_logs(user_id)
 
-        serializer = ClimbLogSerializer(climb_logs, many=True)
+        page, next_cursor = paginate_queryset(climb_logs, cursor, page_size)
+        serializer = ClimbLogSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Climb logs fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except InvalidUIDError as e:
         return Response(
             {
@@ -176,6 +201,152 @@ def create_climb_log_view(request: Request) -> Response:
         )
 
 
+@api_view(["POST"])
+def bulk_create_climb_logs_view(request: Request) -> Response:
+    """
+    Boundary: Handle HTTP request to import many climb logs at once.
+
+    INPUT: one of
+        Content-Type: application/x-ndjson, one climb log object per line
+        Content-Type: text/csv, header row then one climb log per line
+        Content-Type: application/json, {"user_id": str, "logs": [climb log objects]}
+    with ?user_id=... (or a bearer token) naming the user for streamed bodies.
+    Each climb log: {"route_id", "date_climbed", "notes", "title", "status", "attempt"}
+    OUTPUT: {
+        "success": bool,
+        "message": str,
+        "data": {"created": int, "failed": int, "log_ids": [str],
+                 "errors": [{"row": int, "errors": dict}]},
+        "errors": dict  # Only if success is False
+    }
+    """
+    auth_result = authenticate_app_check_token(request)
+    if not auth_result.get("success"):
+        return Response(auth_result, status=status.HTTP_401_UNAUTHORIZED)
+
+    fmt = import_format(request.content_type)
+    if fmt is None and not request.content_type.startswith("application/json"):
+        return Response(
+            {
+                "success": False,
+                "message": "Unsupported content type.",
+                "errors": {"content_type": "Use application/x-ndjson, text/csv or application/json."},
+            },
+            status=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        )
+
+    data = {}
+    if fmt is None:
+        data = request.data if isinstance(request.data, dict) else {}
+
+    # Default to the user behind the bearer token (see GoClimbUserMiddleware)
+    user = get_request_user(request)
+    user_id = data.get("user_id") or request.query_params.get("user_id", "").strip() or (user.pk if user else "")
+
+    if not user_id:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"user_id": "This field is required."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    if user is not None and user.pk != user_id:
+        return Response(
+            {
+                "success": False,
+                "message": "Forbidden.",
+                "errors": {"user_id": "Does not match the authenticated user."},
+            },
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
+    if fmt is None:
+        logs = data.get("logs")
+        if not isinstance(logs, list) or not logs:
+            return Response(
+                {
+                    "success": False,
+                    "message": "Invalid input.",
+                    "errors": {"logs": "Must be a non-empty list."},
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        records = enumerate_records(logs)
+    else:
+        if request.stream is None:
+            return Response(
+                {
+                    "success": False,
+                    "message": "Invalid input.",
+                    "errors": {"body": "Request body is empty."},
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        records = read_records(request.stream, fmt)
+
+    try:
+        result = climblog_controller.bulk_create_climb_logs(user_id, records)
+
+        if not result["created"]:
+            return Response(
+                {
+                    "success": False,
+                    "message": "No climb logs were imported.",
+                    "errors": {"rows": result["errors"]},
+                },
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(
+            {
+                "success": True,
+                "message": f"Imported {result['created']} climb logs.",
+                "data": result,
+            },
+            status=status.HTTP_201_CREATED,
+        )
+
+    except ObjectDoesNotExist:
+        return Response(
+            {
+                "success": False,
+                "message": "User not found.",
+                "errors": {"user_id": "Invalid user ID."},
+            },
+            status=status.HTTP_404_NOT_FOUND,
+        )
+    except UnicodeDecodeError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"body": "Request body must be UTF-8."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except ValueError as ve:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"body": str(ve)},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except Exception as e:
+        return Response(
+            {
+                "success": False,
+                "message": "An error occurred while importing climb logs.",
+                "errors": {"exception": str(e)},
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @api_view(["DELETE"])
 def delete_climb_log_view(request: Request) -> Response:
     """
@@ -6,11 +6,15 @@ from rest_framework import status
 
 from MyApp.Serializer.serializers import CragSerializer
 from MyApp.Firebase.helpers import authenticate_app_check_token
+from MyApp.Utils.response_cache import cached_response
 from MyApp.Controller import crag_controller
+from MyApp.Utils.pagination import paginate_queryset, parse_page_params
+from MyApp.Exceptions.exceptions import InvalidCursorError
 from django.core.exceptions import ObjectDoesNotExist
 
 
 @api_view(["GET"])
+@cached_response("crag", "user")
 def get_crag_info_view(request: Request) -> Response:
 
     auth_result = authenticate_app_check_token(request)
@@ -64,6 +68,25 @@ def get_crag_info_view(request: Request) -> Response:
         )
 
 
+def _parse_window_params(request: Request, default_days: int):
+    """Read the optional ``days`` / ``half_life`` query params of the ranking views."""
+    days_param = request.query_params.get("days", "").strip()
+    half_life_param = request.query_params.get("half_life", "").strip()
+
+    errors = {}
+    days, half_life = default_days, None
+    try:
+        days = int(days_param) if days_param else default_days
+    except ValueError:
+        errors["days"] = "Must be an integer."
+    try:
+        half_life = float(half_life_param) if half_life_param else None
+    except ValueError:
+        errors["half_life"] = "Must be a number."
+
+    return days, half_life, errors
+
+
 @api_view(["GET"])
 def get_crag_monthly_ranking_view(request: Request) -> Response:
 
@@ -85,14 +108,26 @@ def get_crag_monthly_ranking_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    days, half_life, window_errors = _parse_window_params(request, default_days=30)
+    if window_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": window_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
-        crag_list = crag_controller.get_monthly_ranking(count)
+        crag_list = crag_controller.get_monthly_ranking(count, days, half_life)
 
-        serialized_data = []
-        for idx, crag in enumerate(crag_list, 1):
-            crag_data = CragSerializer(crag).data
-            serialized_data.append({"crag": crag_data, "ranking": idx})
+        crags_data = CragSerializer(crag_list, many=True).data
+        serialized_data = [
+            {"crag": crag_data, "ranking": idx}
+            for idx, crag_data in enumerate(crags_data, 1)
+        ]
 
         return Response(
             {
@@ -124,6 +159,7 @@ def get_crag_monthly_ranking_view(request: Request) -> Response:
 
 
 @api_view(["GET"])
+@cached_response("crag", "route", "climb_log", "user")
 def get_trending_crags_view(request: Request) -> Response:
 
     auth_result = authenticate_app_check_token(request)
@@ -144,15 +180,25 @@ def get_trending_crags_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    days, half_life, window_errors = _parse_window_params(request, default_days=7)
+    if window_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": window_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
-        trending_list = crag_controller.get_trending_crags(count)
+        trending_list = crag_controller.get_trending_crags(count, days, half_life)
 
-        serialized_data = []
-        for item in trending_list:
-            crag_obj = item["crag"]
-            crag_data = CragSerializer(crag_obj).data
+        crags_data = CragSerializer([item["crag"] for item in trending_list], many=True).data
 
+        serialized_data = []
+        for item, crag_data in zip(trending_list, crags_data):
             serialized_data.append(
                 {
                     "crag": crag_data,
@@ -203,6 +249,7 @@ def get_random_crag_view(request: Request) -> Response:
 
     count = data.get("count", 10)
     blacklist = data.get("blacklist", [])
+    cursor = data.get("cursor") or None
 
     try:
         count = int(count)
@@ -226,9 +273,19 @@ def get_random_crag_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    if cursor is not None and not isinstance(cursor, str):
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Must be a string."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
-        crag_list = crag_controller.get_random_crag(count, blacklist)
+        crag_list, next_cursor = crag_controller.get_random_crag(count, blacklist, cursor)
 
         serializer = CragSerializer(crag_list, many=True)
 
@@ -237,6 +294,7 @@ def get_random_crag_view(request: Request) -> Response:
                 "success": True,
                 "message": "Crags fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
@@ -262,6 +320,7 @@ def get_random_crag_view(request: Request) -> Response:
 
 
 @api_view(["GET"])
+@cached_response("crag")
 def get_all_crag_ids_view(request: Request) -> Response:
     """
     Boundary: Handle HTTP request to get all crag IDs with location details.
@@ -406,19 +465,41 @@ def get_crags_by_user_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cursor, page_size, page_errors = parse_page_params(request.query_params)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
         crags = crag_controller.get_crags_by_user_id(user_id)
-        serializer = CragSerializer(crags, many=True)
+        page, next_cursor = paginate_queryset(crags, cursor, page_size)
+        serializer = CragSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Crags fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except ValueError as ve:
         return Response(
             {
@@ -605,4 +686,117 @@ def search_crags_view(request: Request) -> Response:
                 "errors": {"exception": str(e)},
             },
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
-        )
\ No newline at end of file
+        )
+
+def _parse_number_params(request: Request, names, cast):
+    """Optional numeric query params; missing ones are None."""
+    values, errors = {}, {}
+    for name in names:
+        raw = request.query_params.get(name, "").strip()
+        try:
+            values[name] = cast(raw) if raw else None
+        except ValueError:
+            errors[name] = "Must be an integer." if cast is int else "Must be a number."
+    return values, errors
+
+
+@api_view(["GET"])
+@cached_response("crag")
+def get_nearby_crags_view(request: Request) -> Response:
+    """
+    Boundary: Handle HTTP request to find crags near a point or in a map viewport.
+
+    Query Parameters:
+        lat, lon: number - Centre point (required unless a bounding box is given)
+        radius_km: number (optional, default: 10, max: 500) - Search radius
+        min_lat, min_lon, max_lat, max_lon: number (optional) - Bounding box;
+            all four together. min_lon > max_lon crosses the antimeridian.
+        limit: number (optional, default: 100, max: 1000) - Crags to return
+        zoom: number (optional, 0-22) - Map zoom; adds tile clusters
+
+    OUTPUT: {
+        "success": bool,
+        "message": str,
+        "data": {
+            "total": int,
+            "crags": [
+                {"crag_id": str, "name": str, "location_lat": float,
+                 "location_lon": float, "distance_km": float}
+            ],
+            "clusters": [
+                {"tile": "z/x/y", "count": int, "location_lat": float,
+                 "location_lon": float, "crag_id"?: str, "name"?: str}
+            ]  # only with zoom
+        },
+        "errors": dict
+    }
+    """
+    auth_result = authenticate_app_check_token(request)
+    if not auth_result.get("success"):
+        return Response(auth_result, status=status.HTTP_401_UNAUTHORIZED)
+
+    bbox_names = ("min_lat", "min_lon", "max_lat", "max_lon")
+    numbers, errors = _parse_number_params(request, ("lat", "lon", "radius_km", *bbox_names), float)
+    integers, int_errors = _parse_number_params(request, ("limit", "zoom"), int)
+    errors.update(int_errors)
+
+    bbox = None
+    given = [name for name in bbox_names if numbers.get(name) is not None]
+    if given and len(given) < len(bbox_names):
+        for name in bbox_names:
+            if name not in given and name not in errors:
+                errors[name] = "Required with the other bounding box fields."
+    elif given:
+        bbox = tuple(numbers[name] for name in bbox_names)
+
+    if errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        data = crag_controller.get_nearby_crags(
+            lat=numbers["lat"],
+            lon=numbers["lon"],
+            radius_km=numbers["radius_km"],
+            bbox=bbox,
+            limit=(
+                crag_controller.NEARBY_DEFAULT_LIMIT
+                if integers["limit"] is None
+                else integers["limit"]
+            ),
+            zoom=integers["zoom"],
+        )
+
+        return Response(
+            {
+                "success": True,
+                "message": "Nearby crags fetched successfully.",
+                "data": data,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except ValueError as ve:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"validation": str(ve)},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except Exception as e:
+        return Response(
+            {
+                "success": False,
+                "message": "An error occurred while fetching nearby crags.",
+                "errors": {"exception": str(e)},
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
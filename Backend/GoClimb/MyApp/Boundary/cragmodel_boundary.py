@@ -5,8 +5,11 @@ from rest_framework import status
 from django.core.exceptions import ObjectDoesNotExist
 
 from MyApp.Controller import cragmodel_controller
+from MyApp.Utils.pagination import paginate_queryset, parse_page_params
+from MyApp.Exceptions.exceptions import InvalidCursorError
 from MyApp.Serializer.serializers import CragModelSerializer
 from MyApp.Firebase.helpers import authenticate_app_check_token
+from MyApp.Firebase.authentication import get_request_user
 from MyApp.Utils.helper import extract_files_and_clean_data
 
 
@@ -40,6 +43,17 @@ def get_models_by_crag_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cursor, page_size, page_errors = parse_page_params(request.query_params)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
         models_qs = cragmodel_controller.get_models_by_crag_id(crag_id)
@@ -54,17 +68,28 @@ def get_models_by_crag_id_view(request: Request) -> Response:
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = CragModelSerializer(models_qs, many=True)
+        page, next_cursor = paginate_queryset(models_qs, cursor, page_size)
+        serializer = CragModelSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Models fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except ValueError as ve:
         return Response(
             {
@@ -90,7 +115,7 @@ def create_crag_model_view(request: Request) -> Response:
     Boundary: Handle HTTP request to create a crag model.
     
     INPUT (Form Data): {
-        "user_id": str (required),
+        "user_id": str (required unless a bearer token identifies the user),
         "crag_id": str (required),
         "name": str (optional),
         "status": str (optional, default: "active"),
@@ -111,8 +136,11 @@ def create_crag_model_view(request: Request) -> Response:
     # Extract model files and clean form data
     model_files, clean_data = extract_files_and_clean_data(request, "model_files")
     
+    # Default to the user behind the bearer token (see GoClimbUserMiddleware)
+    user = get_request_user(request)
+    user_id = clean_data.get("user_id", "") or (user.pk if user else "")
+
     # Basic validation
-    user_id = clean_data.get("user_id", "")
     crag_id = clean_data.get("crag_id", "")
     
     if not user_id:
@@ -125,6 +153,16 @@ def create_crag_model_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    if user is not None and user.pk != user_id:
+        return Response(
+            {
+                "success": False,
+                "message": "Forbidden.",
+                "errors": {"user_id": "Does not match the authenticated user."},
+            },
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
     if not crag_id:
         return Response(
             {
@@ -150,7 +188,8 @@ def create_crag_model_view(request: Request) -> Response:
         crag_model = cragmodel_controller.create_crag_model(
             user_id, 
             clean_data, 
-            model_files
+            model_files,
+            user=user,
         )
 
         serializer = CragModelSerializer(crag_model)
@@ -316,6 +355,17 @@ def get_models_by_user_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cursor, page_size, page_errors = parse_page_params(request.query_params)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
         models_qs = cragmodel_controller.get_models_by_user_id(user_id)
 
@@ -329,17 +379,28 @@ def get_models_by_user_id_view(request: Request) -> Response:
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = CragModelSerializer(models_qs, many=True)
+        page, next_cursor = paginate_queryset(models_qs, cursor, page_size)
+        serializer = CragModelSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Models fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except ValueError as ve:
         return Response(
             {
@@ -1,27 +1,36 @@
-from rest_framework.decorators import api_view
+from rest_framework.decorators import api_view, renderer_classes
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.settings import api_settings
 from django.core.exceptions import ObjectDoesNotExist
 
 from MyApp.Controller import modelroutedata_controller
+from MyApp.Utils.pagination import paginate_queryset, parse_page_params
 from MyApp.Serializer.serializers import ModelRouteDataSerializer
 from MyApp.Firebase.helpers import authenticate_app_check_token
+from MyApp.Firebase.authentication import get_request_user
+from MyApp.Utils.route_codec import RoutePageRenderer
+from MyApp.Exceptions.exceptions import InvalidNormalizationError, InvalidCursorError
 
 
 
 @api_view(["GET"])
+@renderer_classes([*api_settings.DEFAULT_RENDERER_CLASSES, RoutePageRenderer])
 def get_by_model_id_view(request: Request) -> Response:
     """
     Boundary: Handle HTTP request to get route data by model ID.
 
-    INPUT: ?model_id=MODEL-000001
+    INPUT: ?model_id=MODEL-000001&format=json|binary
     OUTPUT: {
         "success": bool,
         "message": str,
         "data": [ModelRouteData objects],
         "errors": dict  # Only if success is False
     }
+    With format=binary a successful page is returned as one
+    application/vnd.goclimb.route-data body instead (packed, quantized
+    coordinates; see MyApp.Utils.route_codec). Errors stay JSON.
     """
     auth_result = authenticate_app_check_token(request)
     if not auth_result.get("success"):
@@ -38,8 +47,33 @@ def get_by_model_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    response_format = request.query_params.get("format", "json").strip() or "json"
+    if response_format not in ("json", "binary"):
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"format": "Must be 'json' or 'binary'."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    cursor, page_size, page_errors = parse_page_params(request.query_params)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
-        route_data_qs = modelroutedata_controller.get_by_model_id(model_id)
+        if response_format == "binary":
+            route_data_qs = modelroutedata_controller.get_packed_by_model_id(model_id)
+        else:
+            route_data_qs = modelroutedata_controller.get_by_model_id(model_id)
 
         if route_data_qs is None:
             return Response(
@@ -51,17 +85,34 @@ def get_by_model_id_view(request: Request) -> Response:
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = ModelRouteDataSerializer(route_data_qs, many=True)
+        page, next_cursor = paginate_queryset(route_data_qs, cursor, page_size)
+        if response_format == "binary":
+            return Response(
+                modelroutedata_controller.encode_packed_page(model_id, page, next_cursor),
+                status=status.HTTP_200_OK,
+            )
+
+        serializer = ModelRouteDataSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Route data fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except ValueError as ve:
         return Response(
             {
@@ -82,13 +133,101 @@ def get_by_model_id_view(request: Request) -> Response:
         )
 
 
+@api_view(["GET"])
+def get_normalized_view(request: Request) -> Response:
+    """
+    Boundary: Handle HTTP request to get a model's route data with the
+    model's normalization_data (scale, rotation, offset) already applied to
+    the points.
+
+    INPUT: ?model_id=MODEL-000001
+    OUTPUT: {
+        "success": bool,
+        "message": str,
+        "data": {
+            "model_id": str,
+            "normalization": dict,
+            "normalization_version": str,
+            "routes": [{"model_route_data_id", "route_id", "user_id", "status",
+                        "normalized": bool,
+                        "route_data": {"route_name", "points": [{"order", "pos": {x, y, z}}], ...}}]
+        },
+        "errors": dict  # Only if success is False
+    }
+    """
+    auth_result = authenticate_app_check_token(request)
+    if not auth_result.get("success"):
+        return Response(auth_result, status=status.HTTP_401_UNAUTHORIZED)
+
+    model_id = request.query_params.get("model_id", "").strip()
+    if not model_id:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"model_id": "This field is required."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
+    try:
+        normalized = modelroutedata_controller.get_normalized_by_model_id(model_id)
+
+        if normalized is None:
+            return Response(
+                {
+                    "success": False,
+                    "message": "Model not found.",
+                    "errors": {"model_id": "Invalid ID."},
+                },
+                status=status.HTTP_404_NOT_FOUND,
+            )
+
+        return Response(
+            {
+                "success": True,
+                "message": "Normalized route data fetched successfully.",
+                "data": normalized,
+            },
+            status=status.HTTP_200_OK,
+        )
+
+    except InvalidNormalizationError as ne:
+        return Response(
+            {
+                "success": False,
+                "message": "Model has invalid normalization data.",
+                "errors": {"normalization_data": str(ne)},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except ValueError as ve:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"model_id": str(ve)},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    except Exception as e:
+        return Response(
+            {
+                "success": False,
+                "message": "An error occurred while normalizing route data.",
+                "errors": {"exception": str(e)},
+            },
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR,
+        )
+
+
 @api_view(["POST"])
 def create_model_route_data_view(request: Request) -> Response:
     """
     Boundary: Handle HTTP request to create model route data.
 
     INPUT: {
-        "user_id": str (required),
+        "user_id": str (required unless a bearer token identifies the user),
         "model_id": str (required),
         "route_id": str (required),
         "route_data": dict (required) - JSON data containing route information,
@@ -107,8 +246,11 @@ def create_model_route_data_view(request: Request) -> Response:
 
     data = request.data if isinstance(request.data, dict) else {}
 
+    # Default to the user behind the bearer token (see GoClimbUserMiddleware)
+    user = get_request_user(request)
+    user_id = data.get("user_id", "") or (user.pk if user else "")
+
     # Basic validation
-    user_id = data.get("user_id", "")
     model_id = data.get("model_id", "")
     route_id = data.get("route_id", "")
     route_data = data.get("route_data")
@@ -123,6 +265,16 @@ def create_model_route_data_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    if user is not None and user.pk != user_id:
+        return Response(
+            {
+                "success": False,
+                "message": "Forbidden.",
+                "errors": {"user_id": "Does not match the authenticated user."},
+            },
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
     if not model_id:
         return Response(
             {
@@ -155,7 +307,7 @@ def create_model_route_data_view(request: Request) -> Response:
 
     try:
         model_route_data = modelroutedata_controller.create_model_route_data(
-            user_id, data
+            user_id, data, user=user
         )
 
         serializer = ModelRouteDataSerializer(model_route_data)
@@ -298,6 +450,17 @@ def get_by_user_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cursor, page_size, page_errors = parse_page_params(request.query_params)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
         route_data_qs = modelroutedata_controller.get_by_user_id(user_id)
 
@@ -311,17 +474,28 @@ def get_by_user_id_view(request: Request) -> Response:
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = ModelRouteDataSerializer(route_data_qs, many=True)
+        page, next_cursor = paginate_queryset(route_data_qs, cursor, page_size)
+        serializer = ModelRouteDataSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Route data fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except ValueError as ve:
         return Response(
             {
@@ -8,9 +8,16 @@ from rest_framework import status
 from MyApp.Controller import post_controller
 from MyApp.Serializer.serializers import PostSerializer
 from MyApp.Firebase.helpers import authenticate_app_check_token
+from MyApp.Firebase.authentication import get_request_user
 from MyApp.Utils.helper import extract_files_and_clean_data
 
 
+def _viewer_context(request: Request) -> dict[str, Any]:
+    """Serializer context for the authenticated user (drives ``liked_by_me``)."""
+    user = get_request_user(request)
+    return {"viewer_id": user.pk} if user is not None else {}
+
+
 @api_view(["GET"])
 def get_post_view(request: Request) -> Response:
 
@@ -43,7 +50,9 @@ def get_post_view(request: Request) -> Response:
                 status=status.HTTP_404_NOT_FOUND,
             )
 
-        serializer = PostSerializer(post)
+        serializer = PostSerializer(
+            post, context=_viewer_context(request)
+        )
 
         return Response(
             {
@@ -75,6 +84,7 @@ def get_random_post_view(request: Request) -> Response:
 
     count = data.get("count", 10)
     blacklist = data.get("blacklist", [])
+    cursor = data.get("cursor") or None
 
     try:
         count = int(count)
@@ -98,17 +108,30 @@ def get_random_post_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    if cursor is not None and not isinstance(cursor, str):
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Must be a string."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
-        post_list = post_controller.get_random_post(count, blacklist)
+        post_list, next_cursor = post_controller.get_random_post(count, blacklist, cursor)
 
-        serializer = PostSerializer(post_list, many=True)
+        serializer = PostSerializer(
+            post_list, many=True, context=_viewer_context(request)
+        )
 
         return Response(
             {
                 "success": True,
                 "message": "Posts fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
@@ -144,6 +167,7 @@ def get_post_by_user_id_view(request: Request) -> Response:
     user_id = data.get("user_id", "").strip() if isinstance(data.get("user_id"), str) else ""
     count = data.get("count", 10)
     blacklist = data.get("blacklist", [])
+    cursor = data.get("cursor") or None
 
     if not user_id:
         return Response(
@@ -177,17 +201,32 @@ def get_post_by_user_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    if cursor is not None and not isinstance(cursor, str):
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Must be a string."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
-        post_list = post_controller.get_post_by_user_id(user_id, count, blacklist)
+        post_list, next_cursor = post_controller.get_post_by_user_id(
+            user_id, count, blacklist, cursor
+        )
 
-        serializer = PostSerializer(post_list, many=True)
+        serializer = PostSerializer(
+            post_list, many=True, context=_viewer_context(request)
+        )
 
         return Response(
             {
                 "success": True,
                 "message": "Posts fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
@@ -221,8 +260,11 @@ def create_post_view(request: Request) -> Response:
     # Extract files and clean form data for normal serializer usage
     images, clean_data = extract_files_and_clean_data(request)
     
+    # Default to the user behind the bearer token (see GoClimbUserMiddleware)
+    user = get_request_user(request)
+    user_id = clean_data.get("user_id", "") or (user.pk if user else "")
+
     # Basic validation
-    user_id = clean_data.get("user_id", "")
     content = clean_data.get("content", "")
     
     if not user_id:
@@ -235,6 +277,16 @@ def create_post_view(request: Request) -> Response:
             status=status.HTTP_500_INTERNAL_SERVER_ERROR,
         )
 
+    if user is not None and user.pk != user_id:
+        return Response(
+            {
+                "success": False,
+                "message": "Forbidden.",
+                "errors": {"user_id": "Does not match the authenticated user."},
+            },
+            status=status.HTTP_403_FORBIDDEN,
+        )
+
     if not content:
         return Response(
             {
@@ -247,7 +299,7 @@ def create_post_view(request: Request) -> Response:
 
     try:
 
-        post = post_controller.create_post(user_id, clean_data, images)
+        post = post_controller.create_post(user_id, clean_data, images, user=user)
 
         serializer = PostSerializer(post)
 
@@ -392,7 +444,9 @@ def search_posts_view(request: Request) -> Response:
 
     try:
         posts = post_controller.search_posts(query, limit)
-        serializer = PostSerializer(posts, many=True)
+        serializer = PostSerializer(
+            posts, many=True, context=_viewer_context(request)
+        )
 
         return Response(
             {
@@ -467,7 +521,9 @@ def search_posts_by_tags_view(request: Request) -> Response:
 
     try:
         posts = post_controller.search_posts_by_tags(tags, limit)
-        serializer = PostSerializer(posts, many=True)
+        serializer = PostSerializer(
+            posts, many=True, context=_viewer_context(request)
+        )
 
         return Response(
             {
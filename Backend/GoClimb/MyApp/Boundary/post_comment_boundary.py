@@ -6,6 +6,8 @@ from rest_framework import status
 from MyApp.Firebase.helpers import authenticate_app_check_token
 from MyApp.Serializer.serializers import PostCommentSerializer
 from MyApp.Controller import post_comment_controller
+from MyApp.Utils.pagination import paginate_queryset, parse_page_params
+from MyApp.Exceptions.exceptions import InvalidCursorError
 
 from django.core.exceptions import ObjectDoesNotExist
 
@@ -130,21 +132,43 @@ def get_post_comments_by_post_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cursor, page_size, page_errors = parse_page_params(request.query_params)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
         comments = post_comment_controller.get_post_comments_by_post_id(post_id)
 
-        serializer = PostCommentSerializer(comments, many=True)
+        page, next_cursor = paginate_queryset(comments, cursor, page_size)
+        serializer = PostCommentSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Comments fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except ValueError as ve:
         return Response(
             {
@@ -183,21 +207,43 @@ def get_post_comments_by_user_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cursor, page_size, page_errors = parse_page_params(request.query_params)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
         comments = post_comment_controller.get_post_comments_by_user_id(user_id)
 
-        serializer = PostCommentSerializer(comments, many=True)
+        page, next_cursor = paginate_queryset(comments, cursor, page_size)
+        serializer = PostCommentSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Comments fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except ValueError as ve:
         return Response(
             {
@@ -15,9 +15,11 @@ from MyApp.Serializer.serializers import (
     TopClimbersSerializer
 )
 from MyApp.Firebase.helpers import authenticate_app_check_token
+from MyApp.Utils.response_cache import cached_response
 
 
 @api_view(["GET"])
+@cached_response("route", "climb_log", "user")
 def get_weekly_user_ranking_view(request: Request) -> Response:
     """
     Boundary: Handle HTTP request to get weekly user ranking.
@@ -81,6 +83,7 @@ def get_weekly_user_ranking_view(request: Request) -> Response:
 
 
 @api_view(["GET"])
+@cached_response("route", "climb_log", "user")
 def get_alltime_user_ranking_view(request: Request) -> Response:
     """
     Boundary: Handle HTTP request to get all-time user ranking.
@@ -144,6 +147,7 @@ def get_alltime_user_ranking_view(request: Request) -> Response:
 
 
 @api_view(["GET"])
+@cached_response("route", "climb_log", "user")
 def get_average_grade_ranking_view(request: Request) -> Response:
     """
     Boundary: Handle HTTP request to get average grade ranking.
@@ -219,6 +223,7 @@ def get_average_grade_ranking_view(request: Request) -> Response:
 
 
 @api_view(["GET"])
+@cached_response("route", "climb_log", "user")
 def get_top_climbers_view(request: Request) -> Response:
     """
     Boundary: Handle HTTP request to get top climbers.
@@ -4,8 +4,11 @@ from rest_framework.decorators import api_view
 from rest_framework import status
 
 from MyApp.Firebase.helpers import authenticate_app_check_token
+from MyApp.Utils.response_cache import cached_response
 from MyApp.Serializer.serializers import RouteSerializer
 from MyApp.Controller import route_controller
+from MyApp.Utils.pagination import paginate_queryset, parse_page_params
+from MyApp.Exceptions.exceptions import InvalidCursorError
 from MyApp.Utils.helper import extract_files_and_clean_data
 
 from django.core.exceptions import ObjectDoesNotExist
@@ -115,6 +118,7 @@ def delete_route_view(request: Request) -> Response:
         )
 
 @api_view(["GET"])
+@cached_response("route", "crag", "user")
 def get_route_by_crag_id_view(request: Request) -> Response:
 
     auth_result = authenticate_app_check_token(request)
@@ -133,21 +137,43 @@ def get_route_by_crag_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cursor, page_size, page_errors = parse_page_params(request.query_params)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
 
         routes = route_controller.get_route_by_crag_id(crag_id)
 
-        serializer = RouteSerializer(routes, many=True)
+        page, next_cursor = paginate_queryset(routes, cursor, page_size)
+        serializer = RouteSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Routes fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except ValueError as ve:
         return Response(
             {
@@ -260,19 +286,41 @@ def get_routes_by_user_id_view(request: Request) -> Response:
             status=status.HTTP_400_BAD_REQUEST,
         )
 
+    cursor, page_size, page_errors = parse_page_params(request.query_params)
+    if page_errors:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": page_errors,
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+
     try:
         routes = route_controller.get_routes_by_user_id(user_id)
-        serializer = RouteSerializer(routes, many=True)
+        page, next_cursor = paginate_queryset(routes, cursor, page_size)
+        serializer = RouteSerializer(page, many=True)
 
         return Response(
             {
                 "success": True,
                 "message": "Routes fetched successfully.",
                 "data": serializer.data,
+                "next_cursor": next_cursor,
             },
             status=status.HTTP_200_OK,
         )
 
+    except InvalidCursorError:
+        return Response(
+            {
+                "success": False,
+                "message": "Invalid input.",
+                "errors": {"cursor": "Invalid cursor."},
+            },
+            status=status.HTTP_400_BAD_REQUEST,
+        )
     except ValueError as ve:
         return Response(
             {
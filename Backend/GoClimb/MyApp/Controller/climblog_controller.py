@@ -1,19 +1,34 @@
-from typing import List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
 
 from django.core.exceptions import ObjectDoesNotExist
 
 from MyApp.Entity.climblog import ClimbLog
-from MyApp.Exceptions.exceptions import InvalidUIDError
-from MyApp.Serializer.serializers import ClimbLogSerializer
+from MyApp.Entity.route import Route
+from MyApp.Entity.user import User
+from MyApp.Exceptions.exceptions import InvalidUIDError, TooManyRowsError
+from MyApp.Serializer.serializers import (
+    ClimbLogImportSerializer,
+    ClimbLogSerializer,
+    setup_eager_loading,
+)
+from MyApp.Utils import climb_stats, crag_stats, response_cache
+from MyApp.Utils.bulk_import import ImportRow
 from MyApp.Utils.helper import PrefixedIDConverter
 
-def get_user_climb_logs(user_id: str) -> List[ClimbLog]:
+CLIMB_LOG_BULK_CHUNK_SIZE = getattr(settings, "CLIMB_LOG_BULK_CHUNK_SIZE", 500)
+CLIMB_LOG_BULK_MAX_ROWS = getattr(settings, "CLIMB_LOG_BULK_MAX_ROWS", 10000)
+
+def get_user_climb_logs(user_id: str) -> QuerySet[ClimbLog]:
 
     if not user_id:
         raise InvalidUIDError("User ID is null or empty.")
 
     logs = ClimbLog.objects.filter(user=user_id).order_by("-date_climbed")
-    return list(logs)
+    return setup_eager_loading(logs, ClimbLogSerializer)
 
 def get_user_climb_state(user_id: str) -> int:
 
@@ -45,3 +60,109 @@ def delete_climb_log(log_id: str) -> bool:
         return True
     except ClimbLog.DoesNotExist:
         raise ObjectDoesNotExist(f"Climb log with ID {log_id} does not exist.")
+
+
+def _write_climb_log_chunk(
+    user_id: str,
+    chunk: List[Tuple[int, Dict[str, Any]]],
+    errors: List[Dict[str, Any]],
+) -> List[ClimbLog]:
+    """
+    Check a chunk's routes with one query, insert the rows that pass and
+    apply their leaderboard and crag rollup deltas.
+    """
+    routes = {
+        route_id: (crag_id, grade)
+        for route_id, crag_id, grade in Route.objects.filter(
+            route_id__in={values["route_id"] for _, values in chunk}
+        ).values_list("route_id", "crag_id", "route_grade")
+    }
+
+    logs = []
+    for row, values in chunk:
+        if values["route_id"] not in routes:
+            errors.append({"row": row, "errors": {"route_id": ["Route not found."]}})
+            continue
+        logs.append(
+            ClimbLog(
+                user_id=user_id,
+                route_id=values["route_id"],
+                date_climbed=values["date_climbed"],
+                notes=values.get("notes"),
+                title=values.get("title"),
+                status=values["status"],
+                attempt=values["attempt"],
+            )
+        )
+    if not logs:
+        return []
+
+    # bulk_create sends no post_save, so the aggregates the signals keep are updated here
+    ClimbLog.objects.bulk_create(logs)
+    climb_stats.apply_contributions(
+        (user_id, log.date_climbed, routes[log.route_id][1]) for log in logs if log.status
+    )
+    crag_stats.apply_crag_buckets((routes[log.route_id][0], log.date_climbed) for log in logs)
+    return logs
+
+
+def bulk_create_climb_logs(user_id: str, records: Iterable[ImportRow]) -> Dict[str, Any]:
+    """
+    Import climb logs for ``user_id`` from parsed rows (see
+    ``MyApp.Utils.bulk_import``). Rows are validated on their own, then
+    written in chunks of ``CLIMB_LOG_BULK_CHUNK_SIZE`` with one route lookup
+    and one ``bulk_create`` each. Rows that fail are reported by row number
+    and do not stop the others. Rows may only name ``user_id`` itself.
+    The whole import is one transaction, so a body that breaks off part way
+    (bad UTF-8, an overlong line, more than ``CLIMB_LOG_BULK_MAX_ROWS`` rows)
+    or a failed write leaves nothing behind.
+    """
+    if not user_id:
+        raise InvalidUIDError("User ID is null or empty.")
+    if not User.objects.filter(user_id=user_id).exists():
+        raise ObjectDoesNotExist(f"User with ID {user_id} does not exist.")
+
+    created: List[ClimbLog] = []
+    errors: List[Dict[str, Any]] = []
+    chunk: List[Tuple[int, Dict[str, Any]]] = []
+    rows = 0
+
+    with transaction.atomic():
+        for row, record, error in records:
+            rows += 1
+            if rows > CLIMB_LOG_BULK_MAX_ROWS:
+                # Raised inside the transaction, so chunks already written roll back
+                raise TooManyRowsError(
+                    f"At most {CLIMB_LOG_BULK_MAX_ROWS} rows per import; nothing was imported."
+                )
+            if error:
+                errors.append({"row": row, "errors": {"row": [error]}})
+                continue
+
+            serializer = ClimbLogImportSerializer(data=record)
+            if not serializer.is_valid():
+                errors.append({"row": row, "errors": serializer.errors})
+                continue
+            values = serializer.validated_data
+            if values.get("user_id", user_id) != user_id:
+                errors.append({"row": row, "errors": {"user_id": ["Does not match the importing user."]}})
+                continue
+
+            chunk.append((row, values))
+            if len(chunk) >= CLIMB_LOG_BULK_CHUNK_SIZE:
+                created += _write_climb_log_chunk(user_id, chunk, errors)
+                chunk = []
+
+        if chunk:
+            created += _write_climb_log_chunk(user_id, chunk, errors)
+
+    if created:
+        response_cache.invalidate_tags(["climb_log"])
+
+    errors.sort(key=lambda entry: entry["row"])
+    return {
+        "created": len(created),
+        "failed": len(errors),
+        "log_ids": [log.formatted_id for log in created],
+        "errors": errors,
+    }
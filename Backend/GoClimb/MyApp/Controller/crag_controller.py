@@ -2,9 +2,11 @@ from typing import Any, Optional
 from MyApp.Entity.crag import Crag
 from datetime import timedelta
 from django.utils.timezone import now
-from MyApp.Entity.climblog import ClimbLog
-from django.db.models import Count
 from MyApp.Utils.helper import PrefixedIDConverter
+from MyApp.Utils.crag_stats import window_climb_counts
+from MyApp.Utils.random_feed import sample_random_page
+from MyApp.Utils import geo, search
+from django.db.models import Q
 from django.core.exceptions import ObjectDoesNotExist
 
 
@@ -38,74 +40,62 @@ def get_crag_info(crag_id: str) -> Optional[Crag]:
     raw_id = PrefixedIDConverter.to_raw_id(crag_id)
     return Crag.objects.filter(crag_id=raw_id).first()
 
-def get_monthly_ranking(count: int) -> list:
+def _validate_window(count: int, days: int, half_life: Optional[float]) -> None:
 
-    if count < 1:
-        raise ValueError("count must be a positive integer")
-
-    today = now().date()
-    period_start = today - timedelta(days=30)
-    ranking = (
-        ClimbLog.objects.filter(date_climbed__gte=period_start)
-        .values("route__crag")
-        .annotate(total_climbs=Count("log_id"))
-        .order_by("-total_climbs")[:count]
-    )
-
-    crag_list = []
-    for item in ranking:
-        crag_obj = Crag.objects.filter(crag_id=item["route__crag"]).first()
-        if crag_obj:
-            crag_list.append(crag_obj)
-    return crag_list
-
-def get_trending_crags(count: int) -> list[dict[str, Any]]:
     if count < 1:
         raise ValueError(f"count must be a positive integer, count:{count}")
+    if days < 1:
+        raise ValueError(f"days must be a positive integer, days:{days}")
+    if half_life is not None and half_life <= 0:
+        raise ValueError(f"half_life must be a positive number, half_life:{half_life}")
+
+
+def get_monthly_ranking(count: int, days: int = 30, half_life: Optional[float] = None) -> list:
+    """
+    Crags ranked by climbs over the last ``days`` days (30 by default), read
+    from the daily rollups. With ``half_life`` older days count for less.
+    """
+    _validate_window(count, days, half_life)
+
+    period_start = now().date() - timedelta(days=days)
+    totals = window_climb_counts(period_start, half_life=half_life)
+
+    ranked_ids = sorted(totals, key=lambda crag_id: (-totals[crag_id], crag_id))[:count]
+    crags = Crag.objects.select_related("user").in_bulk(ranked_ids)
+    return [crags[crag_id] for crag_id in ranked_ids if crag_id in crags]
+
+def get_trending_crags(
+    count: int, days: int = 7, half_life: Optional[float] = None
+) -> list[dict[str, Any]]:
+    """
+    Crags whose climbs over the last ``days`` days grew compared with the
+    ``days`` before that, fastest growth first. With ``half_life`` each
+    window is decay-weighted towards its most recent day.
+    """
+    _validate_window(count, days, half_life)
 
-    days = 7
     today = now().date()
     period_start = today - timedelta(days=days)
     lastperiod_start = today - timedelta(days=days * 2)
 
-    current_counts = (
-        ClimbLog.objects.filter(date_climbed__gte=period_start)
-        .values("route__crag")
-        .annotate(current_count=Count("route__crag"))
-    )
-
-    previous_counts = (
-        ClimbLog.objects.filter(
-            date_climbed__gte=lastperiod_start, date_climbed__lt=period_start
-        )
-        .values("route__crag")
-        .annotate(previous_count=Count("log_id"))
-    )
-
-    previous_lookup = {
-        item["route__crag"]: item["previous_count"] for item in previous_counts
-    }
-
-    crag_ids = [item["route__crag"] for item in current_counts]
-    crags = {c.crag_id: c for c in Crag.objects.filter(crag_id__in=crag_ids)}
+    current_counts = window_climb_counts(period_start, half_life=half_life)
+    previous_lookup = window_climb_counts(lastperiod_start, period_start, half_life=half_life)
 
     trending_list: list[dict[str, Any]] = []
 
-    for current in current_counts:
-        crag_id = current["route__crag"]
-        crag_obj = crags.get(crag_id)
-        if not crag_obj:
-            continue
-
-        current_count = current["current_count"]
+    for crag_id, current_count in current_counts.items():
         previous_count = previous_lookup.get(crag_id, 0)
         growth = current_count - previous_count
         growth_rate = (growth / previous_count) if previous_count > 0 else growth
 
         if growth > 0:
+            if half_life is not None:
+                current_count = round(current_count, 3)
+                previous_count = round(previous_count, 3)
+                growth = round(growth, 3)
             trending_list.append(
                 {
-                    "crag": crag_obj,
+                    "crag_id": crag_id,
                     "current_count": current_count,
                     "previous_count": previous_count,
                     "growth": growth,
@@ -113,8 +103,15 @@ def get_trending_crags(count: int) -> list[dict[str, Any]]:
                 }
             )
 
-    trending_list.sort(key=lambda x: x["growth_rate"], reverse=True)
-    return trending_list[:count]
+    trending_list.sort(key=lambda x: (-x["growth_rate"], x["crag_id"]))
+    trending_list = trending_list[:count]
+
+    crags = Crag.objects.select_related("user").in_bulk([item["crag_id"] for item in trending_list])
+    return [
+        {"crag": crags[item.pop("crag_id")], **item}
+        for item in trending_list
+        if item["crag_id"] in crags
+    ]
 
 
 # --------------------
@@ -211,8 +208,13 @@ def create_crag_with_images(*, name, location_lat, location_lon, description="",
 # ------------------
 # CREATING_01 (end)
 # ------------------
-def get_random_crag(count: int = 10, blacklist: list[str] | None = None):
-
+def get_random_crag(
+    count: int = 10, blacklist: list[str] | None = None, cursor: str | None = None
+):
+    """
+    Next page of a random crag feed and the cursor for the page after it
+    (None when every crag has been served).
+    """
     if count < 0:
         raise ValueError("Count must be a positive integer.")
 
@@ -226,21 +228,40 @@ def get_random_crag(count: int = 10, blacklist: list[str] | None = None):
         data: int = converter.to_raw_id(item)
         blacklist_int.append(data)
 
-    crags = Crag.objects.exclude(crag_id__in=blacklist_int).order_by("?")[:count]
-    return crags
+    return sample_random_page(
+        Crag.objects.select_related("user"), count, "crags", cursor, blacklist_int
+    )
 
 
 def get_all_crag_ids():
-    # Get crag objects to access properties
-    crags = Crag.objects.all().order_by('crag_id')
+    from MyApp.Utils.geocoding import (
+        empty_location_details,
+        get_cached_location_details_bulk,
+        round_coordinates,
+    )
+
+    # Only the fields we need, location details resolved from the geocode cache in one query
+    crags = list(
+        Crag.objects.only("crag_id", "name", "location_lat", "location_lon").order_by('crag_id')
+    )
+    location_lookup = get_cached_location_details_bulk(
+        (crag.location_lat, crag.location_lon)
+        for crag in crags
+        if crag.location_lat is not None and crag.location_lon is not None
+    )
     
     # Build response with only selected fields
     crag_list = []
     for crag in crags:
+        location_details = None
+        if crag.location_lat is not None and crag.location_lon is not None:
+            location_details = location_lookup.get(
+                round_coordinates(crag.location_lat, crag.location_lon)
+            )
         crag_list.append({
             "crag_id": crag.formatted_id,
             "name": crag.name,
-            "location_details": crag.location_details or {}
+            "location_details": location_details or empty_location_details()
         })
     
     return crag_list
@@ -255,11 +276,8 @@ def search_crags(query: str, limit: int = 20):
     
     query = query.strip()
     
-    # Search by name or description (case-insensitive)
-    from django.db.models import Q
-    crags = Crag.objects.filter(
-        Q(name__icontains=query) | Q(description__icontains=query)
-    ).order_by('name')[:limit]
+    # Ranked full-text match on name/description, plus fuzzy name match
+    crags = search.search_crags(Crag.objects.all(), query)[:limit]
     
     return crags
 
@@ -278,5 +296,122 @@ def get_crags_by_user_id(user_id: str):
     except User.DoesNotExist:
         raise ObjectDoesNotExist(f"User with ID {user_id} does not exist")
     
+    from MyApp.Serializer.serializers import CragSerializer, setup_eager_loading
+
     # Return crags created by this user
-    return Crag.objects.filter(user__user_id=raw_user_id).order_by('-crag_id')
\ No newline at end of file
+    crags = Crag.objects.filter(user__user_id=raw_user_id).order_by('-crag_id')
+    return setup_eager_loading(crags, CragSerializer)
+
+NEARBY_DEFAULT_RADIUS_KM = 10.0
+NEARBY_MAX_RADIUS_KM = 500.0
+NEARBY_DEFAULT_LIMIT = 100
+NEARBY_MAX_LIMIT = 1000
+MAX_MAP_ZOOM = 22
+# Clusters are tiles this many zoom levels below the map's, i.e. an 8 x 8 grid per tile
+CLUSTER_ZOOM_OFFSET = 3
+
+
+def _crags_in_box(box: geo.BoundingBox):
+
+    condition = Q()
+    for part in geo.split_antimeridian(box):
+        min_lat, min_lon, max_lat, max_lon = part
+        in_part = Q(
+            location_lat__gte=min_lat,
+            location_lat__lte=max_lat,
+            location_lon__gte=min_lon,
+            location_lon__lte=max_lon,
+        )
+        cells = Q()
+        for cell in geo.covering_cells(part):
+            cells |= Q(geohash__startswith=cell)
+        condition |= in_part & cells
+    return Crag.objects.filter(condition).only("crag_id", "name", "location_lat", "location_lon")
+
+
+def _box_center(box: geo.BoundingBox) -> tuple[float, float]:
+
+    min_lat, min_lon, max_lat, max_lon = box
+    if min_lon > max_lon:
+        max_lon += 360.0
+    lon = (min_lon + max_lon) / 2
+    return (min_lat + max_lat) / 2, lon - 360.0 if lon > 180.0 else lon
+
+
+def _validate_nearby(lat, lon, radius_km, bbox, limit, zoom) -> None:
+
+    if bbox is None and (lat is None or lon is None):
+        raise ValueError("lat and lon, or a bounding box, are required")
+    if lat is not None and not -90.0 <= lat <= 90.0:
+        raise ValueError("lat must be between -90 and 90")
+    if lon is not None and not -180.0 <= lon <= 180.0:
+        raise ValueError("lon must be between -180 and 180")
+    if radius_km is not None and not 0 < radius_km <= NEARBY_MAX_RADIUS_KM:
+        raise ValueError(f"radius_km must be greater than 0 and at most {NEARBY_MAX_RADIUS_KM:g}")
+    if bbox is not None:
+        min_lat, min_lon, max_lat, max_lon = bbox
+        if not (-90.0 <= min_lat <= max_lat <= 90.0):
+            raise ValueError("Bounding box latitudes must satisfy -90 <= min_lat <= max_lat <= 90")
+        if not (-180.0 <= min_lon <= 180.0 and -180.0 <= max_lon <= 180.0):
+            raise ValueError("Bounding box longitudes must be between -180 and 180")
+    if not 0 < limit <= NEARBY_MAX_LIMIT:
+        raise ValueError(f"limit must be between 1 and {NEARBY_MAX_LIMIT}")
+    if zoom is not None and not 0 <= zoom <= MAX_MAP_ZOOM:
+        raise ValueError(f"zoom must be between 0 and {MAX_MAP_ZOOM}")
+
+
+def get_nearby_crags(
+    *,
+    lat: Optional[float] = None,
+    lon: Optional[float] = None,
+    radius_km: Optional[float] = None,
+    bbox: Optional[geo.BoundingBox] = None,
+    limit: int = NEARBY_DEFAULT_LIMIT,
+    zoom: Optional[int] = None,
+) -> dict[str, Any]:
+    """
+    Crags within ``radius_km`` of (``lat``, ``lon``), or inside ``bbox``
+    (min_lat, min_lon, max_lat, max_lon; min_lon > max_lon crosses the
+    antimeridian), nearest first. Box distances are measured from
+    (``lat``, ``lon``) when given, else from the box centre. With ``zoom``
+    every match is also grouped into map-tile clusters.
+    """
+    _validate_nearby(lat, lon, radius_km, bbox, limit, zoom)
+
+    if bbox is None:
+        radius_km = radius_km or NEARBY_DEFAULT_RADIUS_KM
+        box = geo.radius_bounding_box(lat, lon, radius_km)
+    else:
+        box = bbox
+        if lat is None or lon is None:
+            lat, lon = _box_center(bbox)
+
+    matches = []
+    for crag in _crags_in_box(box):
+        distance = geo.haversine_km(lat, lon, crag.location_lat, crag.location_lon)
+        if bbox is None and distance > radius_km:
+            continue
+        matches.append((distance, crag.crag_id, crag))
+    matches.sort(key=lambda match: match[:2])
+
+    result: dict[str, Any] = {
+        "total": len(matches),
+        "crags": [
+            {
+                "crag_id": crag.formatted_id,
+                "name": crag.name,
+                "location_lat": crag.location_lat,
+                "location_lon": crag.location_lon,
+                "distance_km": round(distance, 3),
+            }
+            for distance, _, crag in matches[:limit]
+        ],
+    }
+    if zoom is not None:
+        result["clusters"] = geo.cluster_by_tile(
+            (crag for _, _, crag in matches),
+            zoom + CLUSTER_ZOOM_OFFSET,
+            coordinates=lambda crag: (crag.location_lat, crag.location_lon),
+            describe=lambda crag: {"crag_id": crag.formatted_id, "name": crag.name},
+        )
+    return result
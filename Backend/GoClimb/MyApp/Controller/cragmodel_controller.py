@@ -14,7 +14,10 @@ def get_models_by_crag_id(crag_id: str) -> Optional[QuerySet[CragModel]]:
     if not Crag.objects.filter(crag_id=raw_id).exists():
         return None
 
-    return CragModel.objects.filter(crag__crag_id=raw_id)
+    from MyApp.Serializer.serializers import CragModelSerializer, setup_eager_loading
+
+    models_qs = CragModel.objects.filter(crag__crag_id=raw_id).order_by("-model_id")
+    return setup_eager_loading(models_qs, CragModelSerializer)
 
 
 def get_models_by_user_id(user_id: str) -> Optional[QuerySet[CragModel]]:
@@ -25,7 +28,10 @@ def get_models_by_user_id(user_id: str) -> Optional[QuerySet[CragModel]]:
     if not User.objects.filter(user_id=user_id).exists():
         return None
 
-    return CragModel.objects.filter(user__user_id=user_id)
+    from MyApp.Serializer.serializers import CragModelSerializer, setup_eager_loading
+
+    models_qs = CragModel.objects.filter(user__user_id=user_id).order_by("-model_id")
+    return setup_eager_loading(models_qs, CragModelSerializer)
 
 from typing import Dict, Any, List, Optional
 from django.db import transaction
@@ -34,18 +40,24 @@ from django.core.files.uploadedfile import InMemoryUploadedFile
 from MyApp.Entity.user import User
 from MyApp.Serializer.serializers import CragModelSerializer
 from MyApp.Firebase.helpers import upload_zipped_model_files
+from MyApp.Utils.jobs import enqueue_model_lods
 
 def create_crag_model(
     user_id: str, 
     data: dict, 
-    model_files: Optional[List[InMemoryUploadedFile]] = None
+    model_files: Optional[List[InMemoryUploadedFile]] = None,
+    user: Optional[User] = None,
 ):
-    user = User.objects.get(pk=user_id)
+    # Boundaries pass the user the auth middleware already resolved
+    if user is None:
+        user = User.objects.get(pk=user_id)
 
     # Add user_id to data for serializer
-    model_data = {**data, "user_id": user_id}
+    model_data = {**data, "user_id": user.pk}
     
-    serializer = CragModelSerializer(data=model_data)
+    serializer = CragModelSerializer(
+        data=model_data, context={"resolved_relations": {"user": user}}
+    )
     if not serializer.is_valid():
         raise ValueError(serializer.errors)
 
@@ -56,12 +68,15 @@ def create_crag_model(
         try:
             folder_path = crag_model.bucket_path
             # Upload zip files (decompress and upload)
-            upload_zipped_model_files(
+            uploaded_paths = upload_zipped_model_files(
                 model_files, 
                 folder_path, 
                 user_id, 
                 "crag_model"
             )
+            enqueue_model_lods(
+                crag_model.model_id, [f"{folder_path}/{path}" for path in uploaded_paths]
+            )
         except ValueError as e:
             # If file upload fails, delete the model and raise error
             crag_model.delete()
@@ -144,12 +159,15 @@ def update_crag_model(
             try:
                 folder_path = updated_model.bucket_path
                 # Upload new zip files (this will replace existing files)
-                upload_zipped_model_files(
+                uploaded_paths = upload_zipped_model_files(
                     model_files, 
                     folder_path, 
                     user_id, 
                     "crag_model"
                 )
+                enqueue_model_lods(
+                    updated_model.model_id, [f"{folder_path}/{path}" for path in uploaded_paths]
+                )
             except ValueError as e:
                 raise ValueError(f"Failed to upload model files: {str(e)}")
     
@@ -1,12 +1,25 @@
-from typing import Optional, Dict, Any
-from django.db.models import QuerySet
+from typing import Optional, Dict, Any, List
+from django.conf import settings
+from django.core.cache import caches
+from django.db.models import QuerySet, JSONField
+from django.db.models.expressions import RawSQL
 from django.db import transaction
 
 from MyApp.Entity.modelroutedata import ModelRouteData
 from MyApp.Entity.cragmodel import CragModel
 from MyApp.Entity.user import User
 from MyApp.Utils.helper import PrefixedIDConverter
-from MyApp.Serializer.serializers import ModelRouteDataSerializer
+from MyApp.Serializer.serializers import ModelRouteDataSerializer, setup_eager_loading
+from MyApp.Utils import normalization, response_cache
+from MyApp.Utils.route_codec import encode_route_page, route_point_array, with_points
+
+# Keyed by normalization and route data versions, but those versions live in
+# the response cache, which is per process with the default local memory
+# backend, so entries age out as fast as cached responses do
+NORMALIZED_ROUTES_CACHE_TIMEOUT = getattr(
+    settings, "NORMALIZED_ROUTES_CACHE_TIMEOUT", response_cache.RESPONSE_CACHE_TIMEOUT
+)
+NORMALIZED_DECIMALS = 6
 
 
 def get_by_model_id(model_id: str) -> Optional[QuerySet[ModelRouteData]]:
@@ -19,16 +32,155 @@ def get_by_model_id(model_id: str) -> Optional[QuerySet[ModelRouteData]]:
     if not CragModel.objects.filter(model_id=raw_id).exists():
         return None
 
-    return ModelRouteData.objects.filter(model__model_id=raw_id)
+    return setup_eager_loading(
+        ModelRouteData.objects.filter(model__model_id=raw_id).order_by("-model_route_data_id"),
+        ModelRouteDataSerializer,
+    )
+
+
+def get_packed_by_model_id(model_id: str) -> Optional[QuerySet[ModelRouteData]]:
+    """
+    Like ``get_by_model_id`` but for ``format=binary``: no nested relations,
+    and Postgres strips the packed points from ``route_data`` wherever they
+    are in ``route_points`` (as ``route_meta``), so they are never read twice.
+    For the app's ``points`` it also lists their orders, sorted the way
+    ``route_codec.posed_array`` packs them (as ``route_orders``).
+    """
+    if not model_id:
+        raise ValueError("model_id is required")
+
+    raw_id = PrefixedIDConverter.to_raw_id(model_id)
+
+    if not CragModel.objects.filter(model_id=raw_id).exists():
+        return None
+
+    table = ModelRouteData._meta.db_table
+    # Byte 6 holds the blob's flags; bit 1 marks the app's points layout
+    posed = f"{table}.route_points IS NOT NULL AND get_byte({table}.route_points, 6) & 2 = 2"
+    route_meta = RawSQL(
+        f"CASE WHEN {table}.route_points IS NULL THEN {table}.route_data "
+        f"WHEN {posed} THEN {table}.route_data - 'points' "
+        f"ELSE {table}.route_data - 'coordinates' END",
+        (),
+        output_field=JSONField(),
+    )
+    route_orders = RawSQL(
+        f"CASE WHEN {posed} THEN ("
+        f"SELECT jsonb_agg(point -> 'order' ORDER BY (point ->> 'order')::float8, position) "
+        f"FROM jsonb_array_elements({table}.route_data -> 'points') WITH ORDINALITY AS p(point, position)"
+        f") END",
+        (),
+        output_field=JSONField(),
+    )
+    return (
+        ModelRouteData.objects.filter(model__model_id=raw_id)
+        .only("model_route_data_id", "route_id", "user_id", "status", "route_points")
+        .annotate(route_meta=route_meta, route_orders=route_orders)
+        .order_by("-model_route_data_id")
+    )
+
+
+def encode_packed_page(
+    model_id: str, page: List[ModelRouteData], next_cursor: Optional[str] = None
+) -> bytes:
+
+    rows = [
+        {
+            "model_route_data_id": row.formatted_id,
+            "route_id": f"ROUTE-{row.route_id:06d}",
+            "user_id": row.user_id,
+            "status": row.status,
+            "route_data": row.route_meta,
+            "route_points": row.route_points,
+            "orders": row.route_orders,
+        }
+        for row in page
+    ]
+    return encode_route_page(model_id, rows, next_cursor)
+
+
+def get_normalized_by_model_id(model_id: str) -> Optional[Dict[str, Any]]:
+    """
+    Every route of ``model_id`` with its points moved by the model's
+    normalization (see ``MyApp.Utils.normalization``), all routes in one
+    batch. The app's ``points[].pos`` (sorted by ``order``) or a
+    ``coordinates`` list are transformed and every other field of
+    ``route_data`` is kept. Cached per (model, normalization version); any
+    route data change moves the ``model_route_data`` tag version and with it
+    the key. Routes whose points are not in either shape come back as stored,
+    with ``normalized`` False.
+    """
+    if not model_id:
+        raise ValueError("model_id is required")
+
+    raw_id = PrefixedIDConverter.to_raw_id(model_id)
+
+    crag_model = CragModel.objects.filter(model_id=raw_id).only("model_id", "normalization_data").first()
+    if crag_model is None:
+        return None
+
+    parsed = normalization.parse_normalization(crag_model.normalization_data)
+    version = normalization.normalization_version(parsed)
+    cache = caches[response_cache.RESPONSE_CACHE_ALIAS]
+    cache_key = (
+        f"normalized-routes:{raw_id}:{version}:"
+        f"{response_cache.tag_version('model_route_data')}"
+    )
+    result = cache.get(cache_key)
+    if result is not None:
+        return result
+
+    rows = list(
+        ModelRouteData.objects.filter(model_id=raw_id)
+        .order_by("-model_route_data_id")
+        .values("model_route_data_id", "route_id", "user_id", "status", "route_data")
+    )
+    parsed_rows = [route_point_array(row["route_data"]) for row in rows]
+    matrix = normalization.normalization_matrix(parsed)
+    normalized = iter(
+        normalization.normalize_point_sets([p[0] for p in parsed_rows if p is not None], matrix)
+    )
+
+    routes = []
+    for row, parsed_points in zip(rows, parsed_rows):
+        route_data = row["route_data"]
+        if parsed_points is not None:
+            _, flags, orders = parsed_points
+            route_data = with_points(route_data, next(normalized).round(NORMALIZED_DECIMALS), flags, orders)
+        routes.append(
+            {
+                "model_route_data_id": f"ROUTE_DATA-{row['model_route_data_id']:06d}",
+                "route_id": f"ROUTE-{row['route_id']:06d}",
+                "user_id": row["user_id"],
+                "status": row["status"],
+                "normalized": parsed_points is not None,
+                "route_data": route_data,
+            }
+        )
+
+    result = {
+        "model_id": crag_model.formatted_id,
+        "normalization": parsed,
+        "normalization_version": version,
+        "routes": routes,
+    }
+    cache.set(cache_key, result, NORMALIZED_ROUTES_CACHE_TIMEOUT)
+    return result
 
 
-def create_model_route_data(user_id: str, data: dict) -> ModelRouteData:
-    user = User.objects.get(pk=user_id)
+def create_model_route_data(
+    user_id: str, data: dict, user: Optional[User] = None
+) -> ModelRouteData:
+    # Boundaries pass the user the auth middleware already resolved
+    if user is None:
+        user = User.objects.get(pk=user_id)
 
     # Add user_id to data for serializer
-    route_data = {**data, "user_id": user_id}
+    route_data = {**data, "user_id": user.pk}
 
-    serializer = ModelRouteDataSerializer(data=route_data)
+    serializer = ModelRouteDataSerializer(
+        data=route_data, context={"resolved_relations": {"user": user}}
+    )
     if not serializer.is_valid():
         raise ValueError(serializer.errors)
 
@@ -75,4 +227,7 @@ def get_by_user_id(user_id: str) -> Optional[QuerySet[ModelRouteData]]:
     if not User.objects.filter(user_id=user_id).exists():
         return None
 
-    return ModelRouteData.objects.filter(user__user_id=user_id)
+    return setup_eager_loading(
+        ModelRouteData.objects.filter(user__user_id=user_id).order_by("-model_route_data_id"),
+        ModelRouteDataSerializer,
+    )
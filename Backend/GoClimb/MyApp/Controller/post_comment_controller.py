@@ -1,3 +1,5 @@
+from django.db import transaction
+
 from MyApp.Entity.postcomment import PostComment
 from MyApp.Utils.helper import PrefixedIDConverter
 from django.core.exceptions import ObjectDoesNotExist
@@ -10,7 +12,9 @@ def create_post_comment(comment_data: dict) -> PostComment:
     if not serializer.is_valid():
         raise ValueError(serializer.errors)
 
-    comment = serializer.save()
+    # The comment row and the post's comment_count commit together
+    with transaction.atomic():
+        comment = serializer.save()
     return comment
 
 def delete_post_comment(comment_id: str) -> bool:
@@ -32,12 +36,18 @@ def get_post_comments_by_post_id(post_id: str):
     if not post_id:
         raise ValueError("post_id is required")
 
+    from MyApp.Serializer.serializers import PostCommentSerializer, setup_eager_loading
+
     raw_post_id = PrefixedIDConverter.to_raw_id(post_id)
-    return PostComment.objects.filter(post__post_id=raw_post_id).order_by("-created_at")
+    comments = PostComment.objects.filter(post__post_id=raw_post_id).order_by("-created_at")
+    return setup_eager_loading(comments, PostCommentSerializer)
 
 def get_post_comments_by_user_id(user_id: str):
 
     if not user_id:
         raise ValueError("user_id is required")
 
-    return PostComment.objects.filter(user__user_id=user_id).order_by("-created_at")
+    from MyApp.Serializer.serializers import PostCommentSerializer, setup_eager_loading
+
+    comments = PostComment.objects.filter(user__user_id=user_id).order_by("-created_at")
+    return setup_eager_loading(comments, PostCommentSerializer)
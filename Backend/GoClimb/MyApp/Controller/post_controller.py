@@ -1,6 +1,8 @@
 from MyApp.Entity.post import Post
 from MyApp.Entity.user import User
 from MyApp.Utils.helper import PrefixedIDConverter
+from MyApp.Utils.random_feed import sample_random_page
+from MyApp.Utils import search
 
 from firebase_admin import auth
 
@@ -15,8 +17,14 @@ def get_post_by_id(post_id: str):
     except Post.DoesNotExist:
         return None
 
-def get_random_post(count: int = 10, blacklist: list[str] | None = None):
-
+def get_random_post(
+    count: int = 10, blacklist: list[str] | None = None, cursor: str | None = None
+):
+    """
+    Next page of a random post feed and the cursor for the page after it
+    (None when every post has been served). The blacklist is still honoured
+    for older clients, but the cursor already guarantees no repeats.
+    """
     if count < 0:
         raise ValueError("Count must be a positive integer.")
 
@@ -30,8 +38,9 @@ def get_random_post(count: int = 10, blacklist: list[str] | None = None):
         data: int = converter.to_raw_id(item)
         blacklist_int.append(data)
 
-    posts = Post.objects.exclude(post_id__in=blacklist_int).order_by("?")[:count]
-    return posts
+    return sample_random_page(
+        Post.objects.select_related("user"), count, "posts", cursor, blacklist_int
+    )
 
 def search_posts(query: str, limit: int = 20):
     if not query or not query.strip():
@@ -42,14 +51,11 @@ def search_posts(query: str, limit: int = 20):
     
     query = query.strip()
     
-    # Search by title, content, or tags (case-insensitive)
-    from django.db.models import Q
-    posts = Post.objects.filter(
-        Q(title__icontains=query) | 
-        Q(content__icontains=query) |
-        Q(tags__icontains=query),
-        status="active"  # Only active posts
-    ).order_by('-created_at')[:limit]
+    # Ranked full-text match on title/content, plus exact tag match
+    posts = search.search_posts(
+        Post.objects.filter(status="active"),  # Only active posts
+        query,
+    )[:limit]
     
     return posts
 
@@ -61,30 +67,26 @@ def search_posts_by_tags(tags: list, limit: int = 20):
     if limit <= 0:
         raise ValueError("Limit must be a positive integer")
     
-    # Clean up tags (remove empty strings and strip whitespace)
-    clean_tags = [tag.strip().lower() for tag in tags if tag and tag.strip()]
+    # Clean up tags the same way Post.save stores them
+    clean_tags = search.normalize_tags(tags)
     
     if not clean_tags:
         raise ValueError("At least one valid tag is required")
     
-    # Search for posts that contain any of the specified tags
-    from django.db.models import Q
-    
-    # Build query to match any of the tags (case-insensitive)
-    tag_queries = Q()
-    for tag in clean_tags:
-        tag_queries |= Q(tags__icontains=tag)
-    
-    posts = Post.objects.filter(
-        tag_queries,
-        status="active"  # Only active posts
-    ).order_by('-created_at')[:limit]
+    # Posts that contain any of the specified tags (GIN-indexed overlap)
+    posts = search.search_posts_by_tags(
+        Post.objects.filter(status="active"),  # Only active posts
+        clean_tags,
+    )[:limit]
     
     return posts
 
 
 def get_post_by_user_id(
-    user_id: str, count: int = 10, blacklist: list[str] | None = None
+    user_id: str,
+    count: int = 10,
+    blacklist: list[str] | None = None,
+    cursor: str | None = None,
 ):
     if not user_id:
         raise InvalidUIDError("User ID is null or empty.")
@@ -101,12 +103,13 @@ def get_post_by_user_id(
         data: int = PrefixedIDConverter.to_raw_id(item)
         blacklist_int.append(data)
 
-    posts = (
-        Post.objects.filter(user_id=user_id)
-        .exclude(post_id__in=blacklist_int)
-        .order_by("?")[:count]
+    return sample_random_page(
+        Post.objects.filter(user_id=user_id).select_related("user"),
+        count,
+        f"posts:{user_id}",
+        cursor,
+        blacklist_int,
     )
-    return posts
 
 from typing import Any, Dict
 from django.db import transaction
@@ -138,13 +141,22 @@ from MyApp.Entity.postlikes import PostLike
 from MyApp.Serializer.serializers import PostSerializer
 from MyApp.Firebase.helpers import upload_multiple_images_to_storage
 
-def create_post(user_id: str, data: dict, images: Optional[List[InMemoryUploadedFile]] = None):
-    user = User.objects.get(pk=user_id)
+def create_post(
+    user_id: str,
+    data: dict,
+    images: Optional[List[InMemoryUploadedFile]] = None,
+    user: Optional[User] = None,
+):
+    # Boundaries pass the user the auth middleware already resolved
+    if user is None:
+        user = User.objects.get(pk=user_id)
 
     # Add user_id to data for serializer
-    post_data = {**data, "user_id": user_id}
+    post_data = {**data, "user_id": user.pk}
     
-    serializer = PostSerializer(data=post_data)
+    serializer = PostSerializer(
+        data=post_data, context={"resolved_relations": {"user": user}}
+    )
     if not serializer.is_valid():
         raise ValueError(serializer.errors)
 
@@ -1,3 +1,6 @@
+from django.db import transaction
+
+from MyApp.Entity.post import Post
 from MyApp.Entity.postlikes import PostLike
 from MyApp.Utils.helper import PrefixedIDConverter
 
@@ -11,7 +14,9 @@ def like_post(post_id: str, user_id: str) -> PostLike:
     if not serializer.is_valid():
         raise ValueError(serializer.errors)
 
-    return serializer.save()
+    # The like row and the post's like_count commit together
+    with transaction.atomic():
+        return serializer.save()
 
 def unlike_post(post_id: str, user_id: str) -> bool:
 
@@ -28,7 +33,8 @@ def get_post_likes_count(post_id: str) -> int:
         raise ValueError("post_id is required")
 
     raw_id = PrefixedIDConverter.to_raw_id(post_id)
-    return PostLike.objects.filter(post_id=raw_id).count()
+    like_count = Post.objects.filter(post_id=raw_id).values_list("like_count", flat=True).first()
+    return like_count or 0
 
 def get_post_likes_users(post_id: str) -> list:
 
@@ -1,203 +1,175 @@
 """
 Ranking Controller - Business logic for user rankings and leaderboards.
+
+Leaderboards are read from the aggregate tables maintained in
+MyApp.Utils.climb_stats rather than grouping climb_log on every request.
 """
 
 from typing import List, Dict, Any, Optional
 from django.utils.timezone import now
-from django.db.models import Count, Avg, Q, F
-from datetime import datetime, timedelta
+from django.db.models import Sum
+from datetime import date, timedelta
 from MyApp.Entity.user import User
-from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.userclimbstats import UserClimbStats
+from MyApp.Entity.userdailyclimbstats import UserDailyClimbStats
+from MyApp.Utils.climb_stats import average_grade_expression, score_expression
+
+MIN_GRADED_ROUTES = 5
+
+
+def _timeframe_start(timeframe: str) -> Optional[date]:
+
+    today = now().date()
+    if timeframe == "weekly":
+        return today - timedelta(days=7)
+    if timeframe == "monthly":
+        return today.replace(day=1)
+    return None
+
+
+def _windowed_stats(start_date: date):
+    """Per-user totals summed from the daily buckets between start_date and today."""
+    return (
+        UserDailyClimbStats.objects.filter(day__gte=start_date, day__lte=now().date())
+        .values("user_id")
+        .annotate(total_routes=Sum("topped_count"), total_grade=Sum("grade_sum"))
+        .filter(total_routes__gt=0)
+    )
+
+
+def _attach_users(rows: List[Dict[str, Any]]) -> Dict[str, User]:
+
+    user_ids = [row["user_id"] for row in rows]
+    return {u.user_id: u for u in User.objects.filter(user_id__in=user_ids)}
 
 
 def get_weekly_user_ranking(count: int = 50) -> List[Dict[str, Any]]:
     if count <= 0:
         raise ValueError("Count must be a positive integer.")
-    
-    # Calculate date range for this week (last 7 days)
-    end_date = now().date()
-    start_date = end_date - timedelta(days=7)
-    
-    # Get users with their climb counts for the week
-    ranking = (
-        ClimbLog.objects.filter(
-            date_climbed__gte=start_date,
-            date_climbed__lte=end_date,
-            status=True  # Only completed/topped routes
-        )
-        .values("user__user_id")
-        .annotate(total_routes=Count("log_id"))
-        .order_by("-total_routes")[:count]
-    )
-    
-    # Get user objects
-    user_ids = [row["user__user_id"] for row in ranking]
-    users = {u.user_id: u for u in User.objects.filter(user_id__in=user_ids)}
-    
+
+    # Topped routes over the last 7 days
+    start_date = now().date() - timedelta(days=7)
+    ranking = list(_windowed_stats(start_date).order_by("-total_routes", "user_id")[:count])
+    users = _attach_users(ranking)
+
     # Build ranking list
     user_ranking = []
     for idx, row in enumerate(ranking, start=1):
-        user = users.get(row["user__user_id"])
+        user = users.get(row["user_id"])
         if user:
             user_ranking.append({
                 "user": user,
                 "rank": idx,
                 "total_routes": row["total_routes"]
             })
-    
+
     return user_ranking
 
 
 def get_alltime_user_ranking(count: int = 50) -> List[Dict[str, Any]]:
     if count <= 0:
         raise ValueError("Count must be a positive integer.")
-    
-    # Get users with their total climb counts
+
     ranking = (
-        ClimbLog.objects.filter(
-            status=True  # Only completed/topped routes
-        )
-        .values("user__user_id")
-        .annotate(total_routes=Count("log_id"))
-        .order_by("-total_routes")[:count]
+        UserClimbStats.objects.select_related("user")
+        .filter(topped_count__gt=0)
+        .order_by("-topped_count", "user_id")[:count]
     )
-    
-    # Get user objects
-    user_ids = [row["user__user_id"] for row in ranking]
-    users = {u.user_id: u for u in User.objects.filter(user_id__in=user_ids)}
-    
-    # Build ranking list
-    user_ranking = []
-    for idx, row in enumerate(ranking, start=1):
-        user = users.get(row["user__user_id"])
-        if user:
-            user_ranking.append({
-                "user": user,
-                "rank": idx,
-                "total_routes": row["total_routes"]
-            })
-    
-    return user_ranking
+
+    return [
+        {"user": stats.user, "rank": idx, "total_routes": stats.topped_count}
+        for idx, stats in enumerate(ranking, start=1)
+    ]
 
 
 def get_average_grade_ranking(count: int = 50, timeframe: str = "alltime") -> List[Dict[str, Any]]:
     if count <= 0:
         raise ValueError("Count must be a positive integer.")
-    
+
     if timeframe not in ["monthly", "weekly", "alltime"]:
         raise ValueError("Timeframe must be 'monthly', 'weekly', or 'alltime'.")
-    
-    # Calculate date filters based on timeframe
-    today = now().date()
-    date_filter = Q()
-    
-    if timeframe == "weekly":
-        start_date = today - timedelta(days=7)
-        date_filter = Q(date_climbed__gte=start_date, date_climbed__lte=today)
-    elif timeframe == "monthly":
-        start_date = today.replace(day=1)
-        date_filter = Q(date_climbed__gte=start_date, date_climbed__lte=today)
-    # For alltime, no date filter needed
-    
-    # Get users with average grades (minimum 5 routes)
-    ranking = (
-        ClimbLog.objects.filter(
-            date_filter,
-            status=True,  # Only completed/topped routes
-            route__route_grade__isnull=False  # Must have grade
-        )
-        .values("user__user_id")
-        .annotate(
-            total_routes=Count("log_id"),
-            average_grade=Avg("route__route_grade")
+
+    start_date = _timeframe_start(timeframe)
+
+    # Users with at least 5 topped routes, best average grade first
+    if start_date is None:
+        ranking = [
+            {
+                "user": stats.user,
+                "total_routes": stats.topped_count,
+                "average_grade": stats.average_grade,
+            }
+            for stats in UserClimbStats.objects.select_related("user")
+            .filter(topped_count__gte=MIN_GRADED_ROUTES)
+            .order_by("-average_grade", "user_id")[:count]
+        ]
+    else:
+        rows = list(
+            _windowed_stats(start_date)
+            .filter(total_routes__gte=MIN_GRADED_ROUTES)
+            .annotate(average_grade=average_grade_expression("total_routes", "total_grade"))
+            .order_by("-average_grade", "user_id")[:count]
         )
-        .filter(total_routes__gte=5)  # Minimum 5 routes
-        .order_by("-average_grade")[:count]
-    )
-    
-    # Get user objects
-    user_ids = [row["user__user_id"] for row in ranking]
-    users = {u.user_id: u for u in User.objects.filter(user_id__in=user_ids)}
-    
-    # Build ranking list
-    user_ranking = []
-    for idx, row in enumerate(ranking, start=1):
-        user = users.get(row["user__user_id"])
-        if user:
-            user_ranking.append({
-                "user": user,
-                "rank": idx,
-                "average_grade": round(row["average_grade"], 1),
-                "total_routes": row["total_routes"]
-            })
-    
-    return user_ranking
+        users = _attach_users(rows)
+        ranking = [
+            {**row, "user": users[row["user_id"]]} for row in rows if row["user_id"] in users
+        ]
+
+    return [
+        {
+            "user": row["user"],
+            "rank": idx,
+            "average_grade": round(row["average_grade"], 1),
+            "total_routes": row["total_routes"]
+        }
+        for idx, row in enumerate(ranking, start=1)
+    ]
 
 
 def get_top_climbers(count: int = 50, timeframe: str = "alltime") -> List[Dict[str, Any]]:
     if count <= 0:
         raise ValueError("Count must be a positive integer.")
-    
+
     if timeframe not in ["monthly", "weekly", "alltime"]:
         raise ValueError("Timeframe must be 'monthly', 'weekly', or 'alltime'.")
-    
-    # Calculate date filters based on timeframe
-    today = now().date()
-    date_filter = Q()
-    
-    if timeframe == "weekly":
-        start_date = today - timedelta(days=7)
-        date_filter = Q(date_climbed__gte=start_date, date_climbed__lte=today)
-    elif timeframe == "monthly":
-        start_date = today.replace(day=1)
-        date_filter = Q(date_climbed__gte=start_date, date_climbed__lte=today)
-    # For alltime, no date filter needed
-    
-    # Get users with stats and calculate combined score
-    ranking = (
-        ClimbLog.objects.filter(
-            date_filter,
-            status=True,  # Only completed/topped routes
-            route__route_grade__isnull=False  # Must have grade
-        )
-        .values("user__user_id")
-        .annotate(
-            total_routes=Count("log_id"),
-            average_grade=Avg("route__route_grade")
+
+    start_date = _timeframe_start(timeframe)
+
+    # Score = routes * 10 + average grade * 100, computed and sorted in the database
+    if start_date is None:
+        ranking = [
+            {
+                "user": stats.user,
+                "total_routes": stats.topped_count,
+                "average_grade": stats.average_grade,
+                "total_score": stats.score,
+            }
+            for stats in UserClimbStats.objects.select_related("user")
+            .filter(topped_count__gte=MIN_GRADED_ROUTES)
+            .order_by("-score", "user_id")[:count]
+        ]
+    else:
+        rows = list(
+            _windowed_stats(start_date)
+            .filter(total_routes__gte=MIN_GRADED_ROUTES)
+            .annotate(
+                average_grade=average_grade_expression("total_routes", "total_grade"),
+                total_score=score_expression("total_routes", "total_grade"),
+            )
+            .order_by("-total_score", "user_id")[:count]
         )
-        .filter(total_routes__gte=5)  # Minimum 5 routes
-    )
-    
-    # Calculate scores and sort
-    scored_users = []
-    for row in ranking:
-        total_score = (row["total_routes"] * 10) + (row["average_grade"] * 100)
-        scored_users.append({
-            "user_id": row["user__user_id"],
+        users = _attach_users(rows)
+        ranking = [
+            {**row, "user": users[row["user_id"]]} for row in rows if row["user_id"] in users
+        ]
+
+    return [
+        {
+            "user": row["user"],
+            "rank": idx,
+            "total_score": int(round(row["total_score"], 0)),
             "total_routes": row["total_routes"],
-            "average_grade": round(row["average_grade"], 1),
-            "total_score": round(total_score, 0)
-        })
-    
-    # Sort by total score descending and limit
-    scored_users.sort(key=lambda x: x["total_score"], reverse=True)
-    scored_users = scored_users[:count]
-    
-    # Get user objects
-    user_ids = [row["user_id"] for row in scored_users]
-    users = {u.user_id: u for u in User.objects.filter(user_id__in=user_ids)}
-    
-    # Build ranking list
-    user_ranking = []
-    for idx, row in enumerate(scored_users, start=1):
-        user = users.get(row["user_id"])
-        if user:
-            user_ranking.append({
-                "user": user,
-                "rank": idx,
-                "total_score": int(row["total_score"]),
-                "total_routes": row["total_routes"],
-                "average_grade": row["average_grade"]
-            })
-    
-    return user_ranking
\ No newline at end of file
+            "average_grade": round(row["average_grade"], 1)
+        }
+        for idx, row in enumerate(ranking, start=1)
+    ]
@@ -54,8 +54,11 @@ def get_route_by_crag_id(crag_id: str):
     if not crag_id:
         raise ValueError("crag_id is required")
 
+    from MyApp.Serializer.serializers import RouteSerializer, setup_eager_loading
+
     raw_crag_id = PrefixedIDConverter.to_raw_id(crag_id)
-    return Route.objects.filter(crag__crag_id=raw_crag_id).all()
+    routes = Route.objects.filter(crag__crag_id=raw_crag_id).order_by("route_id")
+    return setup_eager_loading(routes, RouteSerializer)
 
 def get_route_by_id(route_id: str):
 
@@ -80,5 +83,8 @@ def get_routes_by_user_id(user_id: str):
     except User.DoesNotExist:
         raise ObjectDoesNotExist(f"User with ID {user_id} does not exist")
     
+    from MyApp.Serializer.serializers import RouteSerializer, setup_eager_loading
+
     # Return routes created by this user
-    return Route.objects.filter(user__user_id=raw_user_id).order_by('-route_id')
+    routes = Route.objects.filter(user__user_id=raw_user_id).order_by('-route_id')
+    return setup_eager_loading(routes, RouteSerializer)
@@ -1,6 +1,7 @@
 from typing import Optional, Any
 
 from firebase_admin import auth
+from google.api_core.exceptions import NotFound
 from django.core.files.uploadedfile import InMemoryUploadedFile
 
 from django.utils.timezone import now
@@ -8,7 +9,13 @@ from django.db.models import Count
 
 from MyApp.Entity.user import User
 from MyApp.Entity.climblog import ClimbLog
-from MyApp.Firebase.helpers import upload_image_to_storage
+from MyApp.Utils import search
+from MyApp.Utils.token_cache import verify_with_cache
+from MyApp.Firebase.helpers import (
+    upload_image_to_storage,
+    invalidate_signed_url_cache,
+    remove_media_objects,
+)
 
 from MyApp.Exceptions.exceptions import UserAlreadyExistsError, InvalidUIDError
 
@@ -16,7 +23,7 @@ from MyApp.Exceptions.exceptions import UserAlreadyExistsError, InvalidUIDError
 def verify_firebase_token(token: str) -> dict:
     try:
         # First try to verify as ID token
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = verify_with_cache("id", token, auth.verify_id_token)
         return decoded_token
     except auth.InvalidIdTokenError:
         try:
@@ -122,12 +129,11 @@ def search_users(query: str, limit: int = 20):
     
     query = query.strip()
     
-    # Search by username or email (case-insensitive)
-    from django.db.models import Q
-    users = User.objects.filter(
-        Q(username__icontains=query) | Q(email__icontains=query),
-        status=True  # Only active users
-    ).order_by('username')[:limit]
+    # Search by username or email, closest username first
+    users = search.search_users(
+        User.objects.filter(status=True),  # Only active users
+        query,
+    )[:limit]
     
     return users
 
@@ -195,11 +201,14 @@ def update_user(
             if user.profile_picture:
                 old_image_path = f"{user.images_bucket_path}/{user.profile_picture}"
                 try:
-                    bucket = storage.bucket()
-                    blob = bucket.blob(old_image_path)
-                    if blob.exists():
-                        blob.delete()
+                    # Delete without an exists() round trip; a missing blob is already gone
+                    try:
+                        storage.bucket().delete_blob(old_image_path)
                         print(f"Deleted old profile picture: {old_image_path}")
+                    except NotFound:
+                        pass
+                    remove_media_objects(old_image_path)
+                    invalidate_signed_url_cache(old_image_path)
                 except Exception as e:
                     print(f"Warning: Could not delete old profile picture: {e}")
 
@@ -233,12 +242,6 @@ from django.db import transaction
 from django.db.models import ProtectedError
 from MyApp.Entity.user import User
 
-# If you have a helper for storage cleanup, keep it optional:
-try:
-    import MyApp.Utils.helper as helper  # may have delete_bucket_folder
-except Exception:  # pragma: no cover
-    helper = None  # type: ignore
-
 
 def delete_user_account(user_id: str) -> Dict[str, Any]:
     user_id = str(user_id or "").strip()
@@ -260,17 +263,11 @@ def delete_user_account(user_id: str) -> Dict[str, Any]:
 
     try:
         with transaction.atomic():
-            # Delete the user (FKs with CASCADE will be removed automatically)
+            # Delete the user (FKs with CASCADE will be removed automatically).
+            # User.delete queues the users/<id>/ storage cleanup as a
+            # background job, so a storage outage cannot fail or stall this.
             user.delete()
 
-        # Best-effort storage cleanup (non-blocking)
-        if helper and hasattr(helper, "delete_bucket_folder"):
-            try:
-                helper.delete_bucket_folder(f"users/{user_id}")
-            except Exception:
-                # Ignore cleanup failures; core operation already succeeded
-                pass
-
         return {
             "success": True,
             "message": "Account deleted successfully.",
@@ -1,125 +1,123 @@
-import json
-import requests
-from django.conf import settings
-from django.db import models
+from django.db import models, transaction
 from typing import Tuple, Dict, Any
+from MyApp.Utils.jobs import enqueue_storage_delete
 from MyApp.Firebase.helpers import (
-    delete_bucket_folder,
     get_download_urls_in_folder,
 )
+from MyApp.Utils.geocoding import (
+    empty_location_details,
+    get_cached_location_details,
+    refresh_location_details,
+)
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
+from MyApp.Utils.geo import encode_geohash
+from MyApp.Utils.random_feed import new_random_key
+from MyApp.Utils.search import SEARCH_CONFIG
 
 class Crag(models.Model):
     class Meta:
         db_table = "crag"
         managed = True
+        indexes = [
+            models.Index(fields=["random_key", "crag_id"]),
+            GinIndex(fields=["search_vector"], name="crag_search_vector_gin"),
+            # Pattern ops so geohash prefix (LIKE 'abc%') lookups use the index
+            models.Index(
+                fields=["geohash"], name="crag_geohash_prefix", opclasses=["varchar_pattern_ops"]
+            ),
+        ]
 
     crag_id = models.AutoField(primary_key=True)
     name = models.CharField(max_length=255)
     location_lat = models.FloatField()
     location_lon = models.FloatField()
+    geohash = models.CharField(max_length=12, blank=True, default="", editable=False)
     description = models.TextField(blank=True, null=True)
     user = models.ForeignKey('User', on_delete=models.CASCADE, related_name='crags', null=True, blank=True)
+    random_key = models.FloatField(default=new_random_key)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("name", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("description", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     def __str__(self) -> str:
         return f"{self.name} | {self.crag_id}"
 
-    def delete(self, *args, **kwargs) -> Tuple[int, Dict[Any, int]]:
+    @classmethod
+    def from_db(cls, db, field_names, values):
+
+        instance = super().from_db(db, field_names, values)
+        # Stored coordinates, so save() only geocodes when they move
+        instance._saved_location = (
+            instance.__dict__.get("location_lat"),
+            instance.__dict__.get("location_lon"),
+        )
+        return instance
+
+    def save(self, *args, **kwargs) -> None:
+
+        self.geohash = encode_geohash(self.location_lat, self.location_lon)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and {"location_lat", "location_lon"} & set(update_fields):
+            kwargs["update_fields"] = {*update_fields, "geohash"}
+
+        location = (self.location_lat, self.location_lon)
+        moved = self._state.adding or location != getattr(self, "_saved_location", None)
+
+        super().save(*args, **kwargs)
+        self._saved_location = location
 
-        folder_path = self.bucket_path
-        if folder_path:
+        # Fill the geocode cache on create / coordinate change so reads never hit the API
+        if moved and self.location_lat is not None and self.location_lon is not None:
             try:
-                delete_bucket_folder(folder_path)
+                refresh_location_details(self.location_lat, self.location_lon)
             except Exception as e:
-                print(f"Warning: could not delete bucket folder '{folder_path}': {e}")
+                print(f"Warning: could not refresh location details: {e}")
 
-        return super().delete(*args, **kwargs)
+    def delete(self, *args, **kwargs) -> Tuple[int, Dict[Any, int]]:
+
+        # Blob cleanup goes to the job worker and only happens if this commits
+        with transaction.atomic():
+            enqueue_storage_delete(self.bucket_path)
+            return super().delete(*args, **kwargs)
 
     @property
     def location_details(self):
 
-        if not self.location_lat or not self.location_lon:
-            return {"city": None, "country": None, "state": None, "district": None, "postal_code": None}
+        if self.location_lat is None or self.location_lon is None:
+            return empty_location_details()
 
         try:
-            api_key = settings.GOOGLE_MAPS_API_KEY
-            url = (
-                f"https://maps.googleapis.com/maps/api/geocode/json"
-                f"?latlng={self.location_lat},{self.location_lon}&key={api_key}"
-            )
-            response = requests.get(url)
-            data = response.json()
-            if data.get("status") == "OK":
-                components = data["results"][0]["address_components"]
-                
-                # Initialize all location fields
-                location_info = {
-                    "city": None,
-                    "country": None,
-                    "state": None,
-                    "district": None,
-                    "postal_code": None,
-                    "formatted_address": data["results"][0].get("formatted_address", "")
-                }
-                
-                # Extract detailed location information
-                for comp in components:
-                    types = comp["types"]
-                    long_name = comp["long_name"]
-                    
-                    # Country
-                    if "country" in types:
-                        location_info["country"] = long_name
-                    
-                    # State/Province/Administrative Area Level 1
-                    elif "administrative_area_level_1" in types:
-                        location_info["state"] = long_name
-                    
-                    # City/Locality or Administrative Area Level 2 (for places like Singapore)
-                    elif "locality" in types:
-                        location_info["city"] = long_name
-                    elif "administrative_area_level_2" in types and not location_info["city"]:
-                        location_info["city"] = long_name
-                    
-                    # District/Sublocality (neighborhoods, districts)
-                    elif "sublocality" in types or "sublocality_level_1" in types:
-                        location_info["district"] = long_name
-                    elif "administrative_area_level_3" in types and not location_info["district"]:
-                        location_info["district"] = long_name
-                    
-                    # Postal Code
-                    elif "postal_code" in types:
-                        location_info["postal_code"] = long_name
-                
-                # Special handling for Singapore - use more specific areas
-                if location_info["country"] == "Singapore":
-                    # For Singapore, if we don't have a district, try to get it from other components
-                    if not location_info["district"]:
-                        for comp in components:
-                            types = comp["types"]
-                            if "neighborhood" in types or "sublocality_level_2" in types:
-                                location_info["district"] = comp["long_name"]
-                                break
-                    
-                    # Set city to Singapore if not already set
-                    if not location_info["city"]:
-                        location_info["city"] = "Singapore"
-
-                return location_info
-                
+            return get_cached_location_details(self.location_lat, self.location_lon)
         except Exception as e:
-            print(f"Warning: could not fetch location details: {e}")
-        
-        return {"city": None, "country": None, "state": None, "district": None, "postal_code": None}
+            print(f"Warning: could not read cached location details: {e}")
+
+        return empty_location_details()
+
+    @staticmethod
+    def format_id(crag_id: int) -> str:
+        """Public ID of the crag with primary key ``crag_id``."""
+        return f"CRAG-{crag_id:06d}"
+
+    @staticmethod
+    def bucket_path_for(crag_id: int) -> str:
+        """Storage folder of a crag; its routes and models live under it."""
+        return f"crags/{Crag.format_id(crag_id)}"
 
     @property
     def formatted_id(self) -> str:
 
-        return f"CRAG-{self.crag_id:06d}"
+        return Crag.format_id(self.crag_id)
 
     @property
     def bucket_path(self):
 
-        return f"crags/{self.formatted_id}"
+        return Crag.bucket_path_for(self.crag_id)
 
     @property
     def images_bucket_path(self):
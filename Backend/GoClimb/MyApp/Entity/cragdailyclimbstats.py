@@ -0,0 +1,30 @@
+from django.db import models
+from MyApp.Entity.crag import Crag
+
+class CragDailyClimbStats(models.Model):
+    """
+    Number of climb logs recorded at a crag on one day. Crag rankings and
+    trending windows sum these rollups instead of scanning climb_log.
+    """
+
+    class Meta:
+        db_table = "crag_daily_climb_stats"
+        managed = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=["crag", "day"], name="crag_daily_climb_stats_crag_day"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["day", "crag"]),
+        ]
+
+    stats_id = models.BigAutoField(primary_key=True)
+    crag = models.ForeignKey(
+        Crag, on_delete=models.CASCADE, related_name="daily_climb_stats"
+    )
+    day = models.DateField()
+    climb_count = models.IntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.crag_id} | {self.day} | {self.climb_count} climbs"
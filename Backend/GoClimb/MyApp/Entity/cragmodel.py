@@ -1,9 +1,9 @@
-from django.db import models
+from django.db import models, transaction
 from MyApp.Entity.user import User
 from MyApp.Entity.crag import Crag
 from typing import Tuple, Dict, Any
+from MyApp.Utils.jobs import enqueue_storage_delete
 from MyApp.Firebase.helpers import (
-    delete_bucket_folder,
     get_download_urls_json_in_folder,
 )
 
@@ -34,20 +34,18 @@ class CragModel(models.Model):
     )
     
     normalization_data = models.JSONField(blank=True, null=True)
+    # Source GLB path -> bounds, stats and LOD levels (MyApp.Utils.mesh_lod)
+    lod_manifest = models.JSONField(blank=True, null=True)
 
     def __str__(self) -> str:
         return f"Model for {self.crag.name} upload by {self.user}"
 
     def delete(self, *args, **kwargs) -> Tuple[int, Dict[Any, int]]:
 
-        folder_path = self.bucket_path
-        if folder_path:
-            try:
-                delete_bucket_folder(folder_path)
-            except Exception as e:
-                print(f"Warning: could not delete bucket folder '{folder_path}': {e}")
-
-        return super().delete(*args, **kwargs)
+        # Blob cleanup goes to the job worker and only happens if this commits
+        with transaction.atomic():
+            enqueue_storage_delete(self.bucket_path)
+            return super().delete(*args, **kwargs)
 
     @property
     def formatted_id(self) -> str:
@@ -57,7 +55,7 @@ class CragModel(models.Model):
     @property
     def bucket_path(self):
 
-        return f"crags/{self.crag.formatted_id}/models/{self.formatted_id}"
+        return f"{Crag.bucket_path_for(self.crag_id)}/models/{self.formatted_id}"
 
     @property
     def download_urls_json(self):
@@ -0,0 +1,19 @@
+from django.db import models
+
+class GeocodeCache(models.Model):
+    class Meta:
+        db_table = "geocode_cache"
+        managed = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=["lat_key", "lon_key"], name="geocode_cache_lat_lon_key"
+            ),
+        ]
+
+    lat_key = models.DecimalField(max_digits=8, decimal_places=4)
+    lon_key = models.DecimalField(max_digits=8, decimal_places=4)
+    location_details = models.JSONField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.lat_key}, {self.lon_key}"
@@ -0,0 +1,34 @@
+from django.db import models
+
+class MediaObject(models.Model):
+    class Meta:
+        db_table = "media_object"
+        managed = True
+        indexes = [
+            models.Index(fields=["owner_type", "owner_id"]),
+        ]
+
+    OWNER_TYPES = [
+        ("user", "User"),
+        ("crag", "Crag"),
+        ("route", "Route"),
+        ("post", "Post"),
+        ("crag_model", "Crag Model"),
+    ]
+
+    media_id = models.BigAutoField(primary_key=True)
+    path = models.CharField(max_length=1024, unique=True)
+    folder = models.CharField(max_length=1024, db_index=True)
+    size = models.BigIntegerField(null=True, blank=True)
+    content_type = models.CharField(max_length=100, blank=True, default="")
+    owner_type = models.CharField(max_length=20, choices=OWNER_TYPES, blank=True, default="")
+    owner_id = models.CharField(max_length=128, blank=True, default="")
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self) -> str:
+        return f"{self.path} | {self.owner_type} {self.owner_id}"
+
+    @property
+    def name(self) -> str:
+
+        return self.path.split("/")[-1]
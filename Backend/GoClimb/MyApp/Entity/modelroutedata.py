@@ -7,6 +7,7 @@ from MyApp.Firebase.helpers import (
     delete_bucket_folder,
     get_download_urls_json_in_folder,
 )
+from MyApp.Utils.route_codec import pack_route_data
 
 class ModelRouteData(models.Model):
     class Meta:
@@ -34,6 +35,9 @@ class ModelRouteData(models.Model):
 
     route_data = models.JSONField()
 
+    # route_data's point positions, quantized and packed (see MyApp.Utils.route_codec)
+    route_points = models.BinaryField(null=True, blank=True, editable=False)
+
     status = models.CharField(
         max_length=10,
         choices=[("active", "Active"), ("suspended", "Suspended")],
@@ -43,6 +47,15 @@ class ModelRouteData(models.Model):
     def __str__(self) -> str:
         return f"Route for model {self.model.formatted_id} of {self.model.crag.name} upload by {self.user}"
 
+    def save(self, *args, **kwargs) -> None:
+
+        self.route_points = pack_route_data(self.route_data)
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None and "route_data" in update_fields:
+            kwargs["update_fields"] = {*update_fields, "route_points"}
+
+        super().save(*args, **kwargs)
+
     @property
     def formatted_id(self) -> str:
 
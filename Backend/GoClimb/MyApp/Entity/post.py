@@ -1,16 +1,26 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.postgres.fields import ArrayField
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector, SearchVectorField
 from MyApp.Entity.user import User
 from typing import Tuple, Dict, Any
+from MyApp.Utils.jobs import enqueue_storage_delete
 from MyApp.Firebase.helpers import (
-    delete_bucket_folder,
     get_download_urls_in_folder,
 )
+from MyApp.Utils.random_feed import new_random_key
+from MyApp.Utils.search import SEARCH_CONFIG, normalize_tags
 
 class Post(models.Model):
     class Meta:
         db_table = "post"
         managed = True
+        indexes = [
+            models.Index(fields=["random_key", "post_id"]),
+            models.Index(fields=["user", "random_key", "post_id"]),
+            GinIndex(fields=["search_vector"], name="post_search_vector_gin"),
+            GinIndex(fields=["tags"], name="post_tags_gin"),
+        ]
 
     post_id = models.AutoField(primary_key=True)
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="posts")
@@ -23,20 +33,33 @@ class Post(models.Model):
         default="active",
     )
     created_at = models.DateTimeField(auto_now_add=True)
+    random_key = models.FloatField(default=new_random_key)
+    like_count = models.PositiveIntegerField(default=0)
+    comment_count = models.PositiveIntegerField(default=0)
+    search_vector = models.GeneratedField(
+        expression=(
+            SearchVector("title", weight="A", config=SEARCH_CONFIG)
+            + SearchVector("content", weight="B", config=SEARCH_CONFIG)
+        ),
+        output_field=SearchVectorField(),
+        db_persist=True,
+    )
 
     def __str__(self) -> str:
         return f"Post by {self.user} at {self.created_at}"
 
-    def delete(self, *args, **kwargs) -> Tuple[int, Dict[Any, int]]:
+    def save(self, *args, **kwargs) -> None:
 
-        folder_path = self.bucket_path
-        if folder_path:
-            try:
-                delete_bucket_folder(folder_path)
-            except Exception as e:
-                print(f"Warning: could not delete bucket folder '{folder_path}': {e}")
+        # Tags are stored normalized so tag search can use exact containment.
+        self.tags = normalize_tags(self.tags)
+        super().save(*args, **kwargs)
+
+    def delete(self, *args, **kwargs) -> Tuple[int, Dict[Any, int]]:
 
-        return super().delete(*args, **kwargs)
+        # Blob cleanup goes to the job worker and only happens if this commits
+        with transaction.atomic():
+            enqueue_storage_delete(self.bucket_path)
+            return super().delete(*args, **kwargs)
 
     @property
     def formatted_id(self) -> str:
@@ -46,7 +69,7 @@ class Post(models.Model):
     @property
     def bucket_path(self):
 
-        return f"users/{self.user.user_id}/posts/{self.formatted_id}"
+        return f"users/{self.user_id}/posts/{self.formatted_id}"
 
     @property
     def images_bucket_path(self):
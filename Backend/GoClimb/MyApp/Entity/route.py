@@ -1,8 +1,8 @@
 from typing import Tuple, Dict, Any
-from django.db import models
+from django.db import models, transaction
 from MyApp.Entity.crag import Crag
+from MyApp.Utils.jobs import enqueue_storage_delete
 from MyApp.Firebase.helpers import (
-    delete_bucket_folder,
     get_download_urls_in_folder,
 )
 
@@ -23,14 +23,10 @@ class Route(models.Model):
 
     def delete(self, *args, **kwargs) -> Tuple[int, Dict[Any, int]]:
 
-        folder_path = self.bucket_path
-        if folder_path:
-            try:
-                delete_bucket_folder(folder_path)
-            except Exception as e:
-                print(f"Warning: could not delete bucket folder '{folder_path}': {e}")
-
-        return super().delete(*args, **kwargs)
+        # Blob cleanup goes to the job worker and only happens if this commits
+        with transaction.atomic():
+            enqueue_storage_delete(self.bucket_path)
+            return super().delete(*args, **kwargs)
 
     @property
     def formatted_id(self) -> str:
@@ -40,7 +36,7 @@ class Route(models.Model):
     @property
     def bucket_path(self):
 
-        return f"crags/{self.crag.formatted_id}/routes/{self.formatted_id}"
+        return f"{Crag.bucket_path_for(self.crag_id)}/routes/{self.formatted_id}"
 
     @property
     def images_bucket_path(self):
@@ -1,7 +1,8 @@
 from typing import Any, Tuple, Dict, Optional
-from django.db import models
+from django.db import models, transaction
 
-from MyApp.Firebase.helpers import delete_bucket_folder, get_download_url
+from MyApp.Utils.jobs import enqueue_storage_delete
+from MyApp.Firebase.helpers import get_download_url
 
 class User(models.Model):
     class Meta:
@@ -17,16 +18,16 @@ class User(models.Model):
     def __str__(self) -> str:
         return f"{self.username} | {self.email}"
 
-    def delete(self, *args, **kwargs) -> Tuple[int, Dict[Any, int]]:
+    # Lets DRF permission classes treat a resolved User as request.user
+    is_authenticated = True
+    is_anonymous = False
 
-        folder_path = self.bucket_path
-        if folder_path:
-            try:
-                delete_bucket_folder(folder_path)
-            except Exception as e:
-                print(f"Warning: could not delete bucket folder '{folder_path}': {e}")
+    def delete(self, *args, **kwargs) -> Tuple[int, Dict[Any, int]]:
 
-        return super().delete(*args, **kwargs)
+        # Blob cleanup goes to the job worker and only happens if this commits
+        with transaction.atomic():
+            enqueue_storage_delete(self.bucket_path)
+            return super().delete(*args, **kwargs)
 
     @property
     def bucket_path(self):
@@ -40,13 +41,20 @@ class User(models.Model):
             return None
         return f"{self.bucket_path}/images"
 
+    @property
+    def profile_picture_path(self):
+
+        if not self.profile_picture or not self.images_bucket_path:
+            return None
+        return f"{self.images_bucket_path}/{self.profile_picture}"
+
     @property
     def profile_picture_download_url(self):
         try:
-            if not self.profile_picture or not self.images_bucket_path:
+            if not self.profile_picture_path:
                 return None
 
-            return get_download_url(f"{self.images_bucket_path}/{self.profile_picture}")
+            return get_download_url(self.profile_picture_path)
         except Exception as e:
             print(
                 f"Warning: failed to get download URL for {self.profile_picture}: {e}"
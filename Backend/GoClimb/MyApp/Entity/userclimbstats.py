@@ -0,0 +1,24 @@
+from django.db import models
+from MyApp.Entity.user import User
+
+class UserClimbStats(models.Model):
+    """
+    All-time leaderboard aggregates for one user, maintained incrementally from
+    topped climb logs (see MyApp.Utils.climb_stats).
+    """
+
+    class Meta:
+        db_table = "user_climb_stats"
+        managed = True
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="climb_stats"
+    )
+    topped_count = models.IntegerField(default=0, db_index=True)
+    grade_sum = models.BigIntegerField(default=0)
+    average_grade = models.FloatField(default=0, db_index=True)
+    score = models.FloatField(default=0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"{self.user_id} | {self.topped_count} topped | avg {self.average_grade:.1f}"
@@ -0,0 +1,32 @@
+from django.db import models
+from MyApp.Entity.user import User
+
+class UserDailyClimbStats(models.Model):
+    """
+    Per-user, per-day bucket of topped climb logs. Weekly and monthly
+    leaderboards sum at most one row per user per day instead of scanning
+    climb_log.
+    """
+
+    class Meta:
+        db_table = "user_daily_climb_stats"
+        managed = True
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "day"], name="user_daily_climb_stats_user_day"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["day", "user"]),
+        ]
+
+    stats_id = models.BigAutoField(primary_key=True)
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="daily_climb_stats"
+    )
+    day = models.DateField()
+    topped_count = models.IntegerField(default=0)
+    grade_sum = models.BigIntegerField(default=0)
+
+    def __str__(self) -> str:
+        return f"{self.user_id} | {self.day} | {self.topped_count} topped"
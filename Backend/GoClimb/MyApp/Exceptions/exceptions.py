@@ -6,3 +6,30 @@ class InvalidUIDError(Exception):
 
 class BadRequestException(Exception):
     pass
+
+class InvalidCursorError(ValueError):
+    pass
+
+class StorageDeleteError(Exception):
+    """Some blobs could not be deleted; ``failed`` lists their names."""
+
+    def __init__(self, message, failed=None, deleted=0):
+        super().__init__(message)
+        self.failed = failed or []
+        self.deleted = deleted
+
+class ImageVariantsError(Exception):
+    """Some variants could not be uploaded; ``failed`` lists their originals."""
+
+    def __init__(self, message, failed=None):
+        super().__init__(message)
+        self.failed = failed or []
+
+class InvalidNormalizationError(ValueError):
+    pass
+
+class LineTooLongError(ValueError):
+    pass
+
+class TooManyRowsError(ValueError):
+    pass
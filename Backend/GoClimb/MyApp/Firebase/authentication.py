@@ -0,0 +1,101 @@
+"""
+Request authentication from a Firebase ID token.
+
+Clients send ``Authorization: Bearer <id token>``. The token is verified (via
+the verified-token cache) and the matching ``User`` row loaded at most once per
+request, and only when something asks for it. ``GoClimbUserMiddleware``
+exposes the result lazily as ``request.goclimb_user``; views that must reject
+bad tokens opt into ``FirebaseAuthentication``, which reuses the same result
+as DRF's ``request.user``.
+"""
+
+from typing import Any, Dict, Optional, Tuple
+
+from django.http import HttpRequest
+from firebase_admin import auth
+from rest_framework import authentication
+from rest_framework.exceptions import AuthenticationFailed
+
+from MyApp.Entity.user import User
+from MyApp.Utils.token_cache import verify_with_cache
+
+AUTH_HEADER_PREFIX = "Bearer"
+
+# Attribute on the Django HttpRequest holding (user, claims, error)
+_RESOLVED_ATTR = "_goclimb_auth"
+
+
+def get_bearer_token(request: HttpRequest) -> Optional[str]:
+
+    header = request.headers.get("Authorization", "")
+    parts = header.split()
+    if len(parts) != 2 or parts[0].lower() != AUTH_HEADER_PREFIX.lower():
+        return None
+    return parts[1]
+
+
+def _resolve(request: HttpRequest) -> Tuple[Optional[User], Optional[Dict[str, Any]], Optional[str]]:
+
+    resolved = getattr(request, _RESOLVED_ATTR, None)
+    if resolved is not None:
+        return resolved
+
+    token = get_bearer_token(request)
+    if token is None:
+        resolved = (None, None, None)
+    else:
+        try:
+            claims = verify_with_cache("id", token, auth.verify_id_token)
+            uid = claims.get("uid")
+            user = User.objects.filter(pk=uid).first() if uid else None
+            if user is None:
+                resolved = (None, claims, "No user matches this token")
+            else:
+                resolved = (user, claims, None)
+        except Exception as e:
+            resolved = (None, None, f"Invalid ID token: {str(e)}")
+
+    setattr(request, _RESOLVED_ATTR, resolved)
+    return resolved
+
+
+def resolve_request_user(request: HttpRequest) -> Optional[User]:
+    """Return the ``User`` the request's bearer token belongs to, or None."""
+    user, _, _ = _resolve(request)
+    return user
+
+
+def get_request_user(request) -> Optional[User]:
+    """
+    The request's ``User`` or None. Reads ``request.goclimb_user`` when
+    ``GoClimbUserMiddleware`` ran and resolves the token directly otherwise
+    (RequestFactory requests, views called from other code).
+    """
+    user = getattr(request, "goclimb_user", None)
+    if user is None:
+        return resolve_request_user(getattr(request, "_request", request))
+    return user if user.is_authenticated else None
+
+
+class FirebaseAuthentication(authentication.BaseAuthentication):
+    """
+    DRF authentication backed by the same per-request resolution as the
+    middleware. Requests without a bearer token stay anonymous; a bearer token
+    that fails verification, or has no matching user, is rejected with 401.
+    Not a global default: DRF authenticates eagerly on every view, so apply it
+    with ``@authentication_classes`` where a verified user is required.
+    """
+
+    def authenticate(self, request):
+        # DRF wraps the HttpRequest; resolve on the inner one so the
+        # middleware's work is reused
+        django_request = getattr(request, "_request", request)
+        user, claims, error = _resolve(django_request)
+        if error:
+            raise AuthenticationFailed(error)
+        if user is None:
+            return None
+        return user, claims
+
+    def authenticate_header(self, request):
+        return AUTH_HEADER_PREFIX
@@ -1,14 +1,27 @@
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, Iterable, List, Tuple
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import contextvars
 from firebase_admin import auth, exceptions, app_check, storage
+from google.api_core.exceptions import NotFound, PreconditionFailed
+from django.conf import settings
 from datetime import timedelta, datetime, timezone
 from rest_framework.request import Request
 from django.core.files.uploadedfile import InMemoryUploadedFile
+import bisect
+import itertools
 import json
+import threading
+import time
 import uuid
 
+from MyApp.Exceptions.exceptions import StorageDeleteError
+from MyApp.Utils.response_cache import invalidate_tags
+from MyApp.Utils.token_cache import verify_with_cache
+
 def verify_id_token(id_token: str) -> dict[str, Any]:
     try:
-        decoded_token = auth.verify_id_token(id_token)
+        decoded_token = verify_with_cache("id", id_token, auth.verify_id_token)
         uid = decoded_token.get("uid")
 
         return {
@@ -26,7 +39,7 @@ def verify_id_token(id_token: str) -> dict[str, Any]:
 def verify_app_check_token(app_check_token) -> dict[str, Any]:
 
     try:
-        decoded_token = app_check.verify_token(app_check_token)
+        decoded_token = verify_with_cache("app_check", app_check_token, app_check.verify_token)
         return {
             "success": True,
             "message": "App Check token verified successfully",
@@ -60,49 +73,446 @@ def authenticate_app_check_token(request: Request) -> Dict[str, Any]:
         },
     }
 
-def delete_bucket_folder(bucket_folder) -> None:
+# Signed URLs are cached per folder prefix (and per file path) so serializers
+# don't list the bucket and re-sign every blob on every read. Entries expire
+# shortly before the signatures do, and uploads/deletes invalidate them.
+SIGNED_URL_CACHE_MARGIN_SECONDS = 60
+SIGNED_URL_CACHE_SIZE = getattr(settings, "SIGNED_URL_CACHE_SIZE", 10000)
+
+
+class _SignedUrlCache:
+    """
+    LRU keyed by ``(kind, path, ...)``, bounded to ``maxsize`` entries. A
+    sorted index of the cached paths lets ``invalidate`` find a path's
+    ancestors and descendants without walking every key.
+    """
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self._keys_by_path: Dict[str, set] = {}
+        self._paths: List[str] = []
+        self._lock = threading.Lock()
+
+    def _remove(self, key: tuple) -> None:
+        del self._entries[key]
+        path = key[1]
+        keys = self._keys_by_path[path]
+        keys.discard(key)
+        if not keys:
+            del self._keys_by_path[path]
+            del self._paths[bisect.bisect_left(self._paths, path)]
+
+    def get(self, key: tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def set(self, key: tuple, value, ttl_seconds: float) -> None:
+        if ttl_seconds <= 0:
+            return
+        current = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            else:
+                path = key[1]
+                keys = self._keys_by_path.get(path)
+                if keys is None:
+                    keys = self._keys_by_path[path] = set()
+                    bisect.insort(self._paths, path)
+                keys.add(key)
+            self._entries[key] = (current + ttl_seconds, value)
+
+            # Expired entries go from the cold end, then whatever is over the bound
+            while self._entries:
+                oldest, (expires_at, _) = next(iter(self._entries.items()))
+                if expires_at > current and len(self._entries) <= self.maxsize:
+                    break
+                self._remove(oldest)
+
+    def invalidate(self, path: str) -> None:
+        """
+        Drop every entry affected by a change under `path`, which may be a
+        single blob or a folder prefix.
+        """
+        with self._lock:
+            affected = {path[:end] for end in range(len(path) + 1)} & self._keys_by_path.keys()
+            index = bisect.bisect_left(self._paths, path)
+            while index < len(self._paths) and self._paths[index].startswith(path):
+                affected.add(self._paths[index])
+                index += 1
+            for cached_path in affected:
+                for key in list(self._keys_by_path[cached_path]):
+                    self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_path.clear()
+            self._paths.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_signed_url_cache = _SignedUrlCache(SIGNED_URL_CACHE_SIZE)
+
+
+def _signed_url_ttl(expiry: timedelta) -> float:
+    return expiry.total_seconds() - SIGNED_URL_CACHE_MARGIN_SECONDS
+
+
+def invalidate_signed_url_cache(path: str) -> None:
+    if path:
+        _signed_url_cache.invalidate(path)
+
+
+def clear_signed_url_cache() -> None:
+    _signed_url_cache.clear()
+
+
+# Every uploaded blob is recorded in the media_object manifest table, so read
+# paths resolve file lists with a DB query instead of a bucket listing.
+def _parent_folder(path: str) -> str:
+    return path.rsplit("/", 1)[0] + "/" if "/" in path else ""
+
+
+def _infer_media_owner(path: str) -> Tuple[str, str]:
+    """
+    Map a storage path onto the entity that owns it, e.g.
+    "crags/CRAG-000001/routes/ROUTE-000002/images/a.jpg" -> ("route", "2").
+    """
+    parts = path.split("/")
+    owner_type, owner_id = "", ""
+
+    if parts[0] == "crags" and len(parts) > 2:
+        owner_type, owner_id = "crag", parts[1]
+        if len(parts) > 4 and parts[2] == "routes":
+            owner_type, owner_id = "route", parts[3]
+        elif len(parts) > 4 and parts[2] == "models":
+            owner_type, owner_id = "crag_model", parts[3]
+    elif parts[0] == "users" and len(parts) > 2:
+        owner_type, owner_id = "user", parts[1]
+        if len(parts) > 4 and parts[2] == "posts":
+            owner_type, owner_id = "post", parts[3]
+
+    if owner_type and owner_type != "user":
+        try:
+            owner_id = str(int(owner_id.split("-")[-1]))
+        except ValueError:
+            pass
+
+    return owner_type, owner_id
+
+
+def record_media_objects(entries: List[Dict[str, Any]]) -> None:
+    """
+    Upsert manifest rows for uploaded blobs. Each entry needs a "path" and may
+    carry "size" and "content_type".
+    """
+    from MyApp.Entity.mediaobject import MediaObject
+
+    if not entries:
+        return
+
+    objects = []
+    for entry in entries:
+        path = entry["path"]
+        owner_type, owner_id = _infer_media_owner(path)
+        objects.append(
+            MediaObject(
+                path=path,
+                folder=_parent_folder(path),
+                size=entry.get("size"),
+                content_type=entry.get("content_type") or "",
+                owner_type=owner_type,
+                owner_id=owner_id,
+            )
+        )
+
+    MediaObject.objects.bulk_create(
+        objects,
+        update_conflicts=True,
+        unique_fields=["path"],
+        update_fields=["folder", "size", "content_type", "owner_type", "owner_id"],
+    )
+    # Image lists are part of the cached crag/route payloads
+    invalidate_tags(obj.owner_type for obj in objects)
+
+
+def remove_media_objects(path_prefix: str) -> None:
+    from MyApp.Entity.mediaobject import MediaObject
+
+    if path_prefix:
+        MediaObject.objects.filter(path__startswith=path_prefix).delete()
+        owner_type, _ = _infer_media_owner(path_prefix.rstrip("/") + "/")
+        invalidate_tags([owner_type])
+
+
+def get_media_paths_in_folders(folder_paths: List[str]) -> Dict[str, List[str]]:
+    """
+    Files directly inside each folder, resolved with a single query.
+    Folder keys are returned with a trailing slash.
+    """
+    from MyApp.Entity.mediaobject import MediaObject
+
+    folders = {f if f.endswith("/") else f + "/" for f in folder_paths if f}
+    result: Dict[str, List[str]] = {folder: [] for folder in folders}
+    if not folders:
+        return result
+
+    rows = (
+        MediaObject.objects.filter(folder__in=folders)
+        .order_by("path")
+        .values_list("folder", "path")
+    )
+    for folder, path in rows:
+        result[folder].append(path)
+
+    return result
+
+
+def get_media_paths_under_prefixes(prefixes: List[str]) -> Dict[str, List[str]]:
+    """
+    Files anywhere below each prefix (recursive, like bucket.list_blobs),
+    resolved with a single query. Prefix keys are returned with a trailing slash.
+    """
+    from django.db.models import Q
+    from MyApp.Entity.mediaobject import MediaObject
+
+    normalized = {p if p.endswith("/") else p + "/" for p in prefixes if p}
+    result: Dict[str, List[str]] = {prefix: [] for prefix in normalized}
+    if not normalized:
+        return result
+
+    query = Q()
+    for prefix in normalized:
+        query |= Q(path__startswith=prefix)
+
+    paths = MediaObject.objects.filter(query).order_by("path").values_list("path", flat=True)
+    for path in paths:
+        for prefix in normalized:
+            if path.startswith(prefix):
+                result[prefix].append(path)
+
+    return result
+
 
+def get_existing_media_paths(paths: List[str]) -> set:
+    """Subset of ``paths`` present in the manifest, resolved with a single query."""
+    from MyApp.Entity.mediaobject import MediaObject
+
+    paths = {p for p in paths if p}
+    if not paths:
+        return set()
+    return set(MediaObject.objects.filter(path__in=paths).values_list("path", flat=True))
+
+
+def sign_media_paths(paths: List[str], expiry: timedelta) -> List[str]:
+    """
+    Signed download URLs for blob paths known to exist. Signing is local to the
+    service account credentials, and each URL is cached until shortly before
+    it expires.
+    """
+    urls = []
+    bucket = None
+    for path in paths:
+        cache_key = ("file", path, expiry.total_seconds())
+        url = _signed_url_cache.get(cache_key)
+        if url is None:
+            if bucket is None:
+                bucket = storage.bucket()
+            url = bucket.blob(path).generate_signed_url(expiration=expiry)
+            _signed_url_cache.set(cache_key, url, _signed_url_ttl(expiry))
+        urls.append(url)
+    return urls
+
+
+def _submit_in_context(executor: ThreadPoolExecutor, fn: Callable, *args):
+
+    # Worker threads see the caller's context variables (request metrics)
+    return executor.submit(contextvars.copy_context().run, fn, *args)
+
+
+# Bulk deletes go through the JSON batch endpoint: up to 100 DELETEs per
+# HTTP request, with several batch requests in flight at once. The client
+# keeps its open batch on a thread-local stack, so pool threads can each run
+# a batch on the shared client.
+STORAGE_DELETE_BATCH_SIZE = 100
+STORAGE_DELETE_MAX_WORKERS = getattr(settings, "STORAGE_DELETE_MAX_WORKERS", 4)
+
+
+def _delete_blob(bucket, name: str) -> bool:
+    """Delete one blob outside a batch; False if it is still there."""
+    try:
+        bucket.delete_blob(name)
+    except NotFound:
+        pass  # already gone, which is what we wanted
+    except Exception as e:
+        print(f"Warning: could not delete {name}: {e}")
+        return False
+    return True
+
+
+def _delete_blob_batch(bucket, names: List[str]) -> List[str]:
+    """Delete up to one batch of blobs; returns the names that failed."""
+    try:
+        with bucket.client.batch():
+            for name in names:
+                bucket.delete_blob(name)
+        return []
+    except Exception as e:
+        # The batch raises only its last bad sub-response, which does not say
+        # which blobs failed; settle them one by one (deleted ones now 404)
+        if not isinstance(e, NotFound):
+            print(f"Warning: storage batch delete failed: {e}")
+        return [name for name in names if not _delete_blob(bucket, name)]
+
+
+def _chunked(items: Iterable[str], size: int):
+
+    iterator = iter(items)
+    while True:
+        chunk = list(itertools.islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def delete_blobs(names: Iterable[str]) -> Dict[str, Any]:
+    """
+    Delete blobs by name in batches of STORAGE_DELETE_BATCH_SIZE, running
+    up to STORAGE_DELETE_MAX_WORKERS batches concurrently. ``names`` may be
+    a lazy iterator (e.g. straight off list_blobs); batches are dispatched as
+    they fill. Returns {"deleted": count, "failed": [names]}.
+    """
     bucket = storage.bucket()
+    batches = _chunked(names, STORAGE_DELETE_BATCH_SIZE)
+    first = next(batches, None)
+    second = next(batches, None)
+    if first is None:
+        return {"deleted": 0, "failed": []}
 
-    blobs = bucket.list_blobs(prefix=bucket_folder)
+    sizes = []
+    failed: List[str] = []
+    if second is None or STORAGE_DELETE_MAX_WORKERS <= 1:
+        # A single batch needs no extra thread
+        for names_in_batch in itertools.chain([first], [second] if second else [], batches):
+            sizes.append(len(names_in_batch))
+            failed.extend(_delete_blob_batch(bucket, names_in_batch))
+    else:
+        with ThreadPoolExecutor(
+            max_workers=STORAGE_DELETE_MAX_WORKERS, thread_name_prefix="blob-delete"
+        ) as executor:
+            futures = []
+            for names_in_batch in itertools.chain([first, second], batches):
+                sizes.append(len(names_in_batch))
+                futures.append(
+                    _submit_in_context(executor, _delete_blob_batch, bucket, names_in_batch)
+                )
+            for future in as_completed(futures):
+                failed.extend(future.result())
 
-    for blob in blobs:
-        blob.delete()
-        print(f"Deleted: {blob.name}")
+    return {"deleted": sum(sizes) - len(failed), "failed": failed}
 
-    print(f"All files in folder '{bucket_folder}' have been deleted.")
 
-def get_download_url(file_path, expires_in_hours=1) -> str:
+def _discard_uploaded_files(folder_path: str, relative_paths: List[str]) -> None:
+    """Roll back a partially completed upload."""
+    paths = [f"{folder_path}/{relative_path}" for relative_path in relative_paths]
+    try:
+        report = delete_blobs(paths)
+        if report["failed"]:
+            print(f"Warning: could not roll back {len(report['failed'])} uploaded file(s)")
+    except Exception as e:
+        print(f"Warning: could not roll back uploaded files: {e}")
+    for path in paths:
+        try:
+            remove_media_objects(path)
+        except Exception as e:
+            print(f"Warning: could not remove media manifest entry: {e}")
+    invalidate_signed_url_cache(folder_path)
 
+
+def delete_bucket_folder(bucket_folder) -> Dict[str, Any]:
+    """
+    Delete every blob under ``bucket_folder`` with batched requests. Raises
+    StorageDeleteError listing the blobs that could not be deleted, so a
+    background job running this is retried.
+    """
     bucket = storage.bucket()
-    blob = bucket.blob(file_path)
 
-    if not blob.exists():
+    try:
+        names = (blob.name for blob in bucket.list_blobs(prefix=bucket_folder))
+        report = delete_blobs(names)
+    finally:
+        remove_media_objects(bucket_folder)
+        invalidate_signed_url_cache(bucket_folder)
+
+    if report["failed"]:
+        raise StorageDeleteError(
+            f"Could not delete {len(report['failed'])} file(s) in folder '{bucket_folder}'",
+            failed=report["failed"],
+            deleted=report["deleted"],
+        )
+
+    print(f"Deleted {report['deleted']} file(s) in folder '{bucket_folder}'.")
+    return report
+
+def get_download_url(file_path, expires_in_hours=1) -> str:
+    from MyApp.Entity.mediaobject import MediaObject
+
+    expiration = timedelta(hours=expires_in_hours)
+    cache_key = ("file", file_path, expiration.total_seconds())
+    url = _signed_url_cache.get(cache_key)
+    if url is not None:
+        return url
+
+    if not MediaObject.objects.filter(path=file_path).exists():
         raise FileNotFoundError(f"File '{file_path}' does not exist in the bucket.")
 
-    url = blob.generate_signed_url(expiration=timedelta(hours=expires_in_hours))
-    return url
+    return sign_media_paths([file_path], expiration)[0]
 
-def get_download_urls_json_in_folder(folder_path, expiry_minutes=15):
+def _list_signed_files_in_folder(
+    folder_path: str, expiry_minutes: int, recursive: bool
+) -> List[Dict[str, str]]:
 
-    bucket = storage.bucket()
+    cache_key = ("folder", folder_path, expiry_minutes, recursive)
+    files = _signed_url_cache.get(cache_key)
+    if files is not None:
+        return files
 
-    if not folder_path.endswith("/"):
-        folder_path += "/"
+    if recursive:
+        paths = get_media_paths_under_prefixes([folder_path])[folder_path]
+    else:
+        paths = get_media_paths_in_folders([folder_path])[folder_path]
 
-    blobs = bucket.list_blobs(prefix=folder_path)
+    expiration = timedelta(minutes=expiry_minutes)
+    urls = sign_media_paths(paths, expiration)
 
-    files = []
-    for blob in blobs:
+    files = [
+        {"name": path.split("/")[-1], "path": path, "download_url": url}
+        for path, url in zip(paths, urls)
+    ]
 
-        if blob.name.endswith("/"):
-            continue
+    _signed_url_cache.set(cache_key, files, _signed_url_ttl(expiration))
+    return files
 
-        url = blob.generate_signed_url(expiration=timedelta(minutes=expiry_minutes))
+def get_download_urls_json_in_folder(folder_path, expiry_minutes=15):
 
-        files.append(
-            {"name": blob.name.split("/")[-1], "path": blob.name, "download_url": url}
-        )
+    if not folder_path.endswith("/"):
+        folder_path += "/"
+
+    files = [
+        dict(f) for f in _list_signed_files_in_folder(folder_path, expiry_minutes, recursive=True)
+    ]
 
     result = {"folder": folder_path, "files": files}
 
@@ -110,24 +520,60 @@ def get_download_urls_json_in_folder(folder_path, expiry_minutes=15):
 
 def get_download_urls_in_folder(folder_path, expiry_minutes=15) -> list:
 
-    bucket = storage.bucket()
-
     if not folder_path.endswith("/"):
         folder_path += "/"
 
-    blobs = bucket.list_blobs(prefix=folder_path)
+    files = _list_signed_files_in_folder(folder_path, expiry_minutes, recursive=False)
 
-    files = []
-    for blob in blobs:
+    return [f["download_url"] for f in files]
 
-        if blob.name.endswith("/"):
-            continue
+ALLOWED_IMAGE_TYPES = ["image/jpeg", "image/jpg", "image/png", "image/gif", "image/webp"]
+MAX_IMAGE_SIZE = 10 * 1024 * 1024  # 10MB
 
-        url = blob.generate_signed_url(expiration=timedelta(minutes=expiry_minutes))
+# Upper bound on concurrent blob uploads for one request
+UPLOAD_MAX_WORKERS = getattr(settings, "UPLOAD_MAX_WORKERS", 8)
 
-        files.append(url)
 
-    return files
+def _validate_image(file: InMemoryUploadedFile) -> None:
+    if not file:
+        raise ValueError("No file provided")
+
+    if file.content_type not in ALLOWED_IMAGE_TYPES:
+        raise ValueError(f"Invalid file type. Allowed types: {', '.join(ALLOWED_IMAGE_TYPES)}")
+
+    if file.size > MAX_IMAGE_SIZE:
+        raise ValueError(
+            f"File size exceeds maximum allowed size of {MAX_IMAGE_SIZE / (1024 * 1024)}MB"
+        )
+
+
+def _put_blob(
+    file: InMemoryUploadedFile,
+    storage_path: str,
+    user_id: str,
+    purpose: str,
+    if_generation_match: int = None,
+) -> None:
+    """
+    Upload one file. Pass ``if_generation_match=0`` to make the write fail
+    with PreconditionFailed instead of overwriting an existing blob.
+    """
+    bucket = storage.bucket()
+    blob = bucket.blob(storage_path)
+
+    # Set metadata
+    blob.metadata = {
+        "uploadedBy": str(user_id),
+        "purpose": purpose,
+        "upload_time": datetime.now(timezone.utc).isoformat(),
+        "contentType": file.content_type,
+        "original_filename": file.name,
+    }
+
+    blob.upload_from_file(
+        file, content_type=file.content_type, if_generation_match=if_generation_match
+    )
+
 
 def upload_image_to_storage(
     file: InMemoryUploadedFile,
@@ -150,34 +596,14 @@ def upload_image_to_storage(
     Raises:
         ValueError: If file is invalid or upload fails
     """
-    if not file:
-        raise ValueError("No file provided")
-    
-    # Validate file type
-    allowed_types = ["image/jpeg", "image/jpg", "image/png", "image/gif", "image/webp"]
-    if file.content_type not in allowed_types:
-        raise ValueError(f"Invalid file type. Allowed types: {', '.join(allowed_types)}")
-    
-    # Validate file size (max 10MB)
-    max_size = 10 * 1024 * 1024  # 10MB
-    if file.size > max_size:
-        raise ValueError(f"File size exceeds maximum allowed size of {max_size / (1024 * 1024)}MB")
+    _validate_image(file)
     
     try:
-        bucket = storage.bucket()
-        blob = bucket.blob(storage_path)
-        
-        # Set metadata
-        blob.metadata = {
-            "uploadedBy": str(user_id),
-            "purpose": purpose,
-            "upload_time": datetime.now(timezone.utc).isoformat(),
-            "contentType": file.content_type,
-            "original_filename": file.name,
-        }
-        
-        # Upload file
-        blob.upload_from_file(file, content_type=file.content_type)
+        _put_blob(file, storage_path, user_id, purpose)
+        record_media_objects(
+            [{"path": storage_path, "size": file.size, "content_type": file.content_type}]
+        )
+        invalidate_signed_url_cache(storage_path)
         
         # Get just the filename from the path
         filename = storage_path.split("/")[-1]
@@ -187,15 +613,80 @@ def upload_image_to_storage(
         raise ValueError(f"Failed to upload image: {str(e)}")
 
 
+def _enqueue_image_variants(paths: List[str]) -> None:
+
+    # Only the post / crag / route image batches; profile pictures are served as is
+    from MyApp.Utils.jobs import enqueue_image_variants
+
+    enqueue_image_variants(paths)
+
+
+def _suffixed_name(name: str, suffix: str) -> str:
+    name_parts = name.rsplit(".", 1)
+    if len(name_parts) == 2:
+        return f"{name_parts[0]}_{suffix}.{name_parts[1]}"
+    return f"{name}_{suffix}"
+
+
+def _plan_image_names(files: List[InMemoryUploadedFile], flatten_structure: bool) -> List[str]:
+    """
+    Pick the relative path each file is uploaded to. Flattened uploads get a
+    random name; otherwise the sanitized original name is kept, numbered when
+    the same name appears more than once in the batch.
+    """
+    names = []
+    taken = set()
+    for file in files:
+        if flatten_structure:
+            file_extension = file.name.split(".")[-1] if "." in file.name else "jpg"
+            names.append(f"{uuid.uuid4()}.{file_extension}")
+            continue
+
+        # Sanitize filename for storage (remove any path separators)
+        sanitized_name = file.name.replace("\\", "_").replace("/", "_")
+        relative_path = sanitized_name
+        counter = 1
+        while relative_path in taken:
+            relative_path = _suffixed_name(sanitized_name, str(counter))
+            counter += 1
+        taken.add(relative_path)
+        names.append(relative_path)
+    return names
+
+
+def _upload_new_image(
+    file: InMemoryUploadedFile,
+    folder_path: str,
+    relative_path: str,
+    user_id: str,
+    purpose: str,
+) -> str:
+    """
+    Upload without overwriting. The create-only precondition replaces the old
+    exists() probes: on a name clash the file gets a random suffix instead.
+    Returns the relative path actually written.
+    """
+    try:
+        _put_blob(file, f"{folder_path}/{relative_path}", user_id, purpose, if_generation_match=0)
+        return relative_path
+    except PreconditionFailed:
+        file.seek(0)
+        relative_path = _suffixed_name(relative_path, uuid.uuid4().hex[:8])
+        _put_blob(file, f"{folder_path}/{relative_path}", user_id, purpose, if_generation_match=0)
+        return relative_path
+
+
 def upload_multiple_images_to_storage(
     files: List[InMemoryUploadedFile],
     folder_path: str,
     user_id: str,
     purpose: str = "image",
     flatten_structure: bool = True,
+    progress: Callable[[int, int, str], None] = None,
 ) -> List[str]:
     """
-    Upload multiple image files to Firebase Storage.
+    Upload multiple image files to Firebase Storage concurrently, all or
+    nothing: if any upload fails, the ones that succeeded are deleted again.
     
     Args:
         files: List of uploaded file objects
@@ -204,60 +695,74 @@ def upload_multiple_images_to_storage(
         purpose: Purpose of the upload (e.g., "post_image", "crag_image")
         flatten_structure: If True, all files are placed directly in folder_path. 
                           If False, preserves original file paths/names when possible.
+        progress: Optional callback, called as progress(completed, total, relative_path)
+                  on the calling thread after each file finishes uploading.
     
     Returns:
-        List of relative paths of files that were uploaded (from folder_path)
+        List of relative paths of files that were uploaded (from folder_path),
+        in the same order as files
     
     Raises:
         ValueError: If any file is invalid or upload fails
     """
     if not files:
         return []
-    
-    uploaded_paths = []
-    
+
+    # Validate everything before the first byte is sent
     for file in files:
-        if flatten_structure:
-            # Generate unique filename to avoid conflicts
-            file_extension = file.name.split(".")[-1] if "." in file.name else "jpg"
-            unique_filename = f"{uuid.uuid4()}.{file_extension}"
-            relative_path = unique_filename
-        else:
-            # Preserve original filename, but ensure uniqueness if needed
-            original_name = file.name
-            # Sanitize filename for storage (remove any path separators)
-            sanitized_name = original_name.replace("\\", "_").replace("/", "_")
-            relative_path = sanitized_name
-            
-            # Check if file already exists and make unique if needed
-            test_storage_path = f"{folder_path}/{relative_path}"
-            bucket = storage.bucket()
-            counter = 1
-            while bucket.blob(test_storage_path).exists():
-                name_parts = sanitized_name.rsplit(".", 1)
-                if len(name_parts) == 2:
-                    relative_path = f"{name_parts[0]}_{counter}.{name_parts[1]}"
-                else:
-                    relative_path = f"{sanitized_name}_{counter}"
-                test_storage_path = f"{folder_path}/{relative_path}"
-                counter += 1
-        
-        storage_path = f"{folder_path}/{relative_path}"
-        
         try:
-            upload_image_to_storage(file, storage_path, user_id, purpose)
-            uploaded_paths.append(relative_path)
+            _validate_image(file)
         except ValueError as e:
-            # If any upload fails, clean up previously uploaded files
-            for uploaded_path in uploaded_paths:
-                try:
-                    bucket = storage.bucket()
-                    blob = bucket.blob(f"{folder_path}/{uploaded_path}")
-                    blob.delete()
-                except:
-                    pass
-            raise ValueError(f"Failed to upload {file.name}: {str(e)}")
-    
+            raise ValueError(f"Failed to upload {getattr(file, 'name', None)}: {str(e)}")
+
+    planned_paths = _plan_image_names(files, flatten_structure)
+    uploaded_paths: List[str] = [None] * len(files)
+    completed = 0
+    failure = None
+
+    workers = max(1, min(UPLOAD_MAX_WORKERS, len(files)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="image-upload") as executor:
+        futures = {
+            _submit_in_context(
+                executor, _upload_new_image, file, folder_path, relative_path, user_id, purpose
+            ): index
+            for index, (file, relative_path) in enumerate(zip(files, planned_paths))
+        }
+        for future in as_completed(futures):
+            index = futures[future]
+            try:
+                uploaded_paths[index] = future.result()
+            except Exception as e:
+                if failure is None:
+                    failure = (files[index].name, e)
+                    for pending in futures:
+                        pending.cancel()
+                continue
+
+            completed += 1
+            if progress is not None and failure is None:
+                progress(completed, len(files), uploaded_paths[index])
+
+    if failure is not None:
+        # Roll back whatever made it into the bucket
+        _discard_uploaded_files(folder_path, [path for path in uploaded_paths if path])
+        name, error = failure
+        raise ValueError(f"Failed to upload {name}: Failed to upload image: {str(error)}")
+
+    # Manifest rows are written here, on the request thread and its DB connection
+    record_media_objects(
+        [
+            {
+                "path": f"{folder_path}/{relative_path}",
+                "size": file.size,
+                "content_type": file.content_type,
+            }
+            for file, relative_path in zip(files, uploaded_paths)
+        ]
+    )
+    invalidate_signed_url_cache(folder_path)
+    _enqueue_image_variants([f"{folder_path}/{relative_path}" for relative_path in uploaded_paths])
+
     return uploaded_paths
 
 def upload_file_to_storage(
@@ -312,6 +817,10 @@ def upload_file_to_storage(
         
         # Upload file
         blob.upload_from_file(file, content_type=file.content_type)
+        record_media_objects(
+            [{"path": storage_path, "size": file.size, "content_type": file.content_type}]
+        )
+        invalidate_signed_url_cache(storage_path)
         
         # Get just the filename from the path
         filename = storage_path.split("/")[-1]
@@ -397,13 +906,7 @@ def upload_model_to_storage(
             uploaded_filenames.append(target_filename)
         except ValueError as e:
             # If any upload fails, clean up previously uploaded files
-            for uploaded_file in uploaded_filenames:
-                try:
-                    bucket = storage.bucket()
-                    blob = bucket.blob(f"{folder_path}/{uploaded_file}")
-                    blob.delete()
-                except:
-                    pass
+            _discard_uploaded_files(folder_path, uploaded_filenames)
             raise ValueError(f"Failed to upload {file.name}: {str(e)}")
     
     return uploaded_filenames
@@ -431,6 +934,116 @@ def get_content_type_from_extension(extension: str) -> str:
     }
     return content_types.get(extension.lower(), 'application/octet-stream')
         
+# Streaming zip uploads: members are piped straight from the archive into the
+# bucket. Members up to the library's multipart threshold are sent in one
+# request (held in memory whole); larger ones go through a resumable upload
+# that buffers one chunk at a time. A byte budget bounds how much of that is
+# in flight across the worker threads.
+ZIP_UPLOAD_MAX_WORKERS = getattr(settings, "ZIP_UPLOAD_MAX_WORKERS", 4)
+ZIP_UPLOAD_CHUNK_SIZE = getattr(settings, "ZIP_UPLOAD_CHUNK_SIZE", 8 * 1024 * 1024)
+ZIP_UPLOAD_MEMORY_BUDGET = getattr(settings, "ZIP_UPLOAD_MEMORY_BUDGET", 64 * 1024 * 1024)
+MULTIPART_UPLOAD_THRESHOLD = 8 * 1024 * 1024
+
+
+class _MemoryBudget:
+    """
+    Counting semaphore over bytes. A reservation larger than the whole budget
+    is still granted once nothing else is in flight, so it cannot deadlock.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.in_use = 0
+        self.peak = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, amount: int) -> None:
+        with self._condition:
+            while self.in_use and self.in_use + amount > self.limit:
+                self._condition.wait()
+            self.in_use += amount
+            self.peak = max(self.peak, self.in_use)
+
+    def release(self, amount: int) -> None:
+        with self._condition:
+            self.in_use -= amount
+            self._condition.notify_all()
+
+
+def _zip_member_memory_cost(size: int) -> int:
+
+    if size <= MULTIPART_UPLOAD_THRESHOLD:
+        return size
+    return ZIP_UPLOAD_CHUNK_SIZE
+
+
+def _plan_zip_targets(members: List[zipfile.ZipInfo]) -> List[Tuple[zipfile.ZipInfo, str]]:
+    """
+    Map each archive member onto its path under the model folder. The first
+    .glb/.fbx becomes model.glb/model.fbx, later ones model_2.glb and so on;
+    everything else keeps its path.
+    """
+    targets = []
+    model_counts = {"glb": 0, "fbx": 0}
+
+    for member in members:
+        file_path = member.filename
+        file_ext = file_path.lower().split('.')[-1] if '.' in file_path else 'bin'
+
+        if file_ext in model_counts:
+            model_counts[file_ext] += 1
+            count = model_counts[file_ext]
+            directory = '/'.join(file_path.split('/')[:-1])
+            target_filename = f"model.{file_ext}" if count == 1 else f"model_{count}.{file_ext}"
+            target_path = f"{directory}/{target_filename}" if directory else target_filename
+        else:
+            # Keep original path for non-model files
+            target_path = file_path
+
+        targets.append((member, target_path))
+    return targets
+
+
+def _stream_zip_member(
+    zip_ref: zipfile.ZipFile,
+    member: zipfile.ZipInfo,
+    storage_path: str,
+    target_path: str,
+    user_id: str,
+    purpose: str,
+    budget: _MemoryBudget,
+) -> Dict[str, Any]:
+    file_ext = member.filename.lower().split('.')[-1] if '.' in member.filename else 'bin'
+    content_type = get_content_type_from_extension(file_ext)
+
+    cost = _zip_member_memory_cost(member.file_size)
+    budget.acquire(cost)
+    try:
+        bucket = storage.bucket()
+        blob = bucket.blob(storage_path, chunk_size=ZIP_UPLOAD_CHUNK_SIZE)
+
+        # Set metadata
+        blob.metadata = {
+            "uploadedBy": str(user_id),
+            "purpose": purpose,
+            "upload_time": datetime.now(timezone.utc).isoformat(),
+            "contentType": content_type,
+            "original_filename": member.filename.split('/')[-1],
+            "renamed_filename": target_path.split('/')[-1],
+            "relative_path": target_path,
+            "original_path": member.filename,
+        }
+
+        # ZipFile serialises access to the archive, so members can be read
+        # from several threads at once
+        with zip_ref.open(member) as stream:
+            blob.upload_from_file(stream, size=member.file_size, content_type=content_type)
+    finally:
+        budget.release(cost)
+
+    return {"path": storage_path, "size": member.file_size, "content_type": content_type}
+
+
 def upload_zipped_model_to_storage(
     zip_file: InMemoryUploadedFile,
     folder_path: str,
@@ -439,6 +1052,8 @@ def upload_zipped_model_to_storage(
 ) -> List[str]:
     """
     Upload a zipped model folder to Firebase Storage, preserving directory structure.
+    Members are streamed from the archive and uploaded concurrently, within
+    ZIP_UPLOAD_MEMORY_BUDGET bytes of buffered data.
     
     Args:
         zip_file: Uploaded zip file containing the model folder
@@ -467,108 +1082,69 @@ def upload_zipped_model_to_storage(
     uploaded_paths = []
     
     try:
-        # Extract zip file
         with zipfile.ZipFile(zip_file, 'r') as zip_ref:
-            # Get list of all files in zip
-            file_list = zip_ref.namelist()
-            
             # Filter out directories and hidden files
-            files_to_upload = [
-                f for f in file_list 
-                if not f.endswith('/') and not f.startswith('.') and not '/.DS_Store' in f
+            members = [
+                info for info in zip_ref.infolist()
+                if not info.is_dir()
+                and not info.filename.startswith('.')
+                and not '/.DS_Store' in info.filename
             ]
             
-            if not files_to_upload:
+            if not members:
                 raise ValueError("No valid files found in zip archive")
             
-            # Track model file counts for renaming
-            model_counts = {"glb": 0, "fbx": 0}
+            targets = _plan_zip_targets(members)
+            budget = _MemoryBudget(ZIP_UPLOAD_MEMORY_BUDGET)
+            entries = []
+            failure = None
+            
+            workers = max(1, min(ZIP_UPLOAD_MAX_WORKERS, len(targets)))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="zip-upload") as executor:
+                futures = {
+                    _submit_in_context(
+                        executor,
+                        _stream_zip_member,
+                        zip_ref,
+                        member,
+                        f"{folder_path}/{target_path}",
+                        target_path,
+                        user_id,
+                        purpose,
+                        budget,
+                    ): (member, target_path)
+                    for member, target_path in targets
+                }
+                for future in as_completed(futures):
+                    member, target_path = futures[future]
+                    try:
+                        entries.append(future.result())
+                        uploaded_paths.append(target_path)
+                    except Exception as e:
+                        if failure is None:
+                            failure = (member.filename, e)
+                            for pending in futures:
+                                pending.cancel()
             
-            for file_path in files_to_upload:
-                try:
-                    # Read file content from zip
-                    file_content = zip_ref.read(file_path)
-                    
-                    # Determine content type based on file extension
-                    file_ext = file_path.lower().split('.')[-1] if '.' in file_path else 'bin'
-                    content_type = get_content_type_from_extension(file_ext)
-                    
-                    # Determine the target file path with renaming for model files
-                    if file_ext == 'glb':
-                        model_counts["glb"] += 1
-                        if model_counts["glb"] == 1:
-                            # First .glb file becomes model.glb
-                            directory = '/'.join(file_path.split('/')[:-1])
-                            target_filename = "model.glb"
-                            target_path = f"{directory}/{target_filename}" if directory else target_filename
-                        else:
-                            # Additional .glb files get numbered
-                            directory = '/'.join(file_path.split('/')[:-1])
-                            target_filename = f"model_{model_counts['glb']}.glb"
-                            target_path = f"{directory}/{target_filename}" if directory else target_filename
-                    elif file_ext == 'fbx':
-                        model_counts["fbx"] += 1
-                        if model_counts["fbx"] == 1:
-                            # First .fbx file becomes model.fbx
-                            directory = '/'.join(file_path.split('/')[:-1])
-                            target_filename = "model.fbx"
-                            target_path = f"{directory}/{target_filename}" if directory else target_filename
-                        else:
-                            # Additional .fbx files get numbered
-                            directory = '/'.join(file_path.split('/')[:-1])
-                            target_filename = f"model_{model_counts['fbx']}.fbx"
-                            target_path = f"{directory}/{target_filename}" if directory else target_filename
-                    else:
-                        # Keep original path for non-model files
-                        target_path = file_path
-                    
-                    # Create storage path
-                    storage_path = f"{folder_path}/{target_path}"
-                    
-                    # Upload to Firebase Storage
-                    bucket = storage.bucket()
-                    blob = bucket.blob(storage_path)
-                    
-                    # Set metadata
-                    blob.metadata = {
-                        "uploadedBy": str(user_id),
-                        "purpose": purpose,
-                        "upload_time": datetime.now(timezone.utc).isoformat(),
-                        "contentType": content_type,
-                        "original_filename": file_path.split('/')[-1],
-                        "renamed_filename": target_path.split('/')[-1],
-                        "relative_path": target_path,
-                        "original_path": file_path,
-                    }
-                    
-                    # Upload file content
-                    blob.upload_from_string(file_content, content_type=content_type)
-                    uploaded_paths.append(target_path)
-                    
-                except Exception as e:
-                    # If any file upload fails, clean up previously uploaded files
-                    for uploaded_path in uploaded_paths:
-                        try:
-                            bucket = storage.bucket()
-                            blob = bucket.blob(f"{folder_path}/{uploaded_path}")
-                            blob.delete()
-                        except:
-                            pass
-                    raise ValueError(f"Failed to upload {file_path}: {str(e)}")
+            if failure is not None:
+                # If any file upload fails, clean up the files that did upload
+                _discard_uploaded_files(folder_path, uploaded_paths)
+                uploaded_paths = []
+                file_path, error = failure
+                raise ValueError(f"Failed to upload {file_path}: {str(error)}")
+            
+            record_media_objects(entries)
+            invalidate_signed_url_cache(folder_path)
         
-        return uploaded_paths
+        # Same order as the archive
+        order = {target_path: index for index, (_, target_path) in enumerate(targets)}
+        return sorted(uploaded_paths, key=order.__getitem__)
         
     except zipfile.BadZipFile:
         raise ValueError("Invalid zip file format")
     except Exception as e:
         # Clean up any uploaded files on error
-        for uploaded_path in uploaded_paths:
-            try:
-                bucket = storage.bucket()
-                blob = bucket.blob(f"{folder_path}/{uploaded_path}")
-                blob.delete()
-            except:
-                pass
+        _discard_uploaded_files(folder_path, uploaded_paths)
         raise ValueError(f"Failed to process zip file: {str(e)}")
 
 
@@ -8,11 +8,36 @@ from MyApp.Entity.postlikes import PostLike
 from MyApp.Entity.cragmodel import CragModel
 from MyApp.Entity.modelroutedata import ModelRouteData
 
+from datetime import timedelta
+from django.db.models import Manager, QuerySet
+
 from MyApp.Utils.helper import PrefixedIDConverter
+from MyApp.Utils.geocoding import (
+    empty_location_details,
+    get_cached_location_details_bulk,
+    round_coordinates,
+)
+from MyApp.Utils.image_variants import keyed_variant_paths, variants_folder
+from MyApp.Utils.mesh_lod import is_lod_path, lightest_first
+from MyApp.Firebase.helpers import (
+    get_existing_media_paths,
+    get_media_paths_in_folders,
+    get_media_paths_under_prefixes,
+    sign_media_paths,
+)
+
+MEDIA_URL_EXPIRY = timedelta(minutes=15)
+PROFILE_PICTURE_URL_EXPIRY = timedelta(hours=1)
 
 class FormattedPKRelatedField(serializers.PrimaryKeyRelatedField):
     def to_internal_value(self, data):
 
+        # Controllers that already hold the related row pass it in
+        # context["resolved_relations"] to skip the lookup query
+        resolved = self.context.get("resolved_relations", {}).get(self.source)
+        if resolved is not None and str(data) == str(resolved.pk):
+            return resolved
+
         if isinstance(data, str) and "-" in data:
             try:
                 raw_id = PrefixedIDConverter.to_raw_id(data)
@@ -21,13 +46,320 @@ class FormattedPKRelatedField(serializers.PrimaryKeyRelatedField):
                 raise serializers.ValidationError("Invalid formatted ID")
         return super().to_internal_value(data)
 
+def _eager_relations(serializer, prefix, select, prefetch):
+    """
+    Expand the relations a serializer declares (``select_related_fields`` /
+    ``prefetch_related_fields``) through its nested serializers into
+    double-underscore lookups for the root queryset.
+    """
+    for name in getattr(serializer, "select_related_fields", ()):
+        select.add(prefix + name)
+    for name in getattr(serializer, "prefetch_related_fields", ()):
+        prefetch.add(prefix + name)
+
+    for field in serializer.fields.values():
+        if field.write_only or not isinstance(field, serializers.BaseSerializer):
+            continue
+
+        nested = field.child if isinstance(field, serializers.ListSerializer) else field
+        path = prefix + field.source
+
+        if path in select:
+            _eager_relations(nested, path + "__", select, prefetch)
+        elif path in prefetch:
+            # Anything below a prefetched relation has to be prefetched as well
+            _eager_relations(nested, path + "__", prefetch, prefetch)
+
+
+_eager_relations_by_class = {}
+
+
+def get_eager_relations(serializer_class):
+
+    relations = _eager_relations_by_class.get(serializer_class)
+    if relations is None:
+        select, prefetch = set(), set()
+        _eager_relations(serializer_class(), "", select, prefetch)
+        relations = (sorted(select), sorted(prefetch - select))
+        _eager_relations_by_class[serializer_class] = relations
+    return relations
+
+
+def setup_eager_loading(queryset, serializer_class):
+    """
+    Apply the select_related / prefetch_related lookups that ``serializer_class``
+    (and every serializer nested inside it) needs, so serializing the queryset
+    costs a constant number of queries.
+    """
+    select, prefetch = get_eager_relations(serializer_class)
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def _collect_page_lookups(serializer, instances, lookups):
+    """
+    Walk a serializer and its nested serializers, gathering everything the
+    page will need from outside the ORM: storage folders (flat image folders),
+    prefixes (recursive model folders), single files (profile pictures), crag
+    coordinates and the posts whose ``liked_by_me`` flag is shown.
+    """
+    folder_attr = getattr(serializer, "media_folder_attr", None)
+    prefix_attr = getattr(serializer, "media_prefix_attr", None)
+    file_attr = getattr(serializer, "media_file_attr", None)
+    coordinate_attrs = getattr(serializer, "coordinate_attrs", None)
+    liked_post_attr = getattr(serializer, "liked_post_attr", None)
+
+    for obj in instances:
+        if folder_attr:
+            folder = getattr(obj, folder_attr, None)
+            if folder:
+                lookups["folders"].add(folder if folder.endswith("/") else folder + "/")
+                lookups["folders"].add(variants_folder(folder) + "/")
+        if prefix_attr:
+            prefix = getattr(obj, prefix_attr, None)
+            if prefix:
+                lookups["prefixes"].add(prefix if prefix.endswith("/") else prefix + "/")
+        if file_attr:
+            path = getattr(obj, file_attr, None)
+            if path:
+                lookups["files"].add(path)
+        if coordinate_attrs:
+            lat, lon = (getattr(obj, attr, None) for attr in coordinate_attrs)
+            if lat is not None and lon is not None:
+                lookups["coordinates"].add((lat, lon))
+        if liked_post_attr:
+            lookups["posts"].add(getattr(obj, liked_post_attr))
+
+    for field in serializer.fields.values():
+        if field.write_only or not isinstance(field, serializers.BaseSerializer):
+            continue
+
+        is_many = isinstance(field, serializers.ListSerializer)
+        nested = field.child if is_many else field
+
+        related = []
+        for obj in instances:
+            value = obj.get(field.source) if isinstance(obj, dict) else getattr(obj, field.source, None)
+            if value is None:
+                continue
+            if is_many:
+                related.extend(value.all() if isinstance(value, Manager) else value)
+            else:
+                related.append(value)
+
+        if related:
+            _collect_page_lookups(nested, related, lookups)
+
+
+def build_page_index(serializer, instances):
+    """
+    Resolve the external lookups for a page of objects up front: one manifest
+    query per media lookup type, one geocode-cache query and, when the request
+    is authenticated, one query for the posts the viewer has liked.
+    """
+    lookups = {
+        "folders": set(),
+        "prefixes": set(),
+        "files": set(),
+        "coordinates": set(),
+        "posts": set(),
+    }
+    _collect_page_lookups(serializer, instances, lookups)
+
+    existing_files = get_existing_media_paths(list(lookups["files"]))
+    locations = {}
+    if lookups["coordinates"]:
+        locations = get_cached_location_details_bulk(lookups["coordinates"])
+    liked_posts = set()
+    viewer_id = serializer.context.get("viewer_id")
+    if viewer_id and lookups["posts"]:
+        liked_posts = set(
+            PostLike.objects.filter(user_id=viewer_id, post_id__in=lookups["posts"])
+            .values_list("post_id", flat=True)
+        )
+
+    return {
+        "folders": get_media_paths_in_folders(list(lookups["folders"])),
+        "prefixes": get_media_paths_under_prefixes(list(lookups["prefixes"])),
+        "files": {path: path in existing_files for path in lookups["files"]},
+        "locations": locations,
+        "liked_posts": liked_posts,
+    }
+
+
+class BatchedListSerializer(serializers.ListSerializer):
+    """
+    List serializer that eager-loads the relations the child serializer
+    declares and resolves media, profile pictures and location details for
+    the whole page (including nested objects) before serializing it.
+    """
+
+    def to_representation(self, data):
+        if isinstance(data, Manager):
+            data = data.all()
+        if isinstance(data, QuerySet) and data._result_cache is None:
+            data = setup_eager_loading(data, type(self.child))
+        instances = list(data)
+
+        if "page_index" not in self.context:
+            self.context["page_index"] = build_page_index(self.child, instances)
+
+        return super().to_representation(instances)
+
+
+def _page_index(serializer, kind):
+    index = serializer.context.get("page_index")
+    if index is None:
+        return None
+    return index[kind]
+
+
+def _indexed_media_paths(serializer, kind, path):
+    index = _page_index(serializer, kind)
+    if index is None or not path:
+        return None
+    return index.get(path if path.endswith("/") else path + "/")
+
+
+def _batched_images_urls(serializer, obj):
+    paths = _indexed_media_paths(serializer, "folders", obj.images_bucket_path)
+    if paths is None:
+        return obj.images_download_urls
+    try:
+        return sign_media_paths(paths, MEDIA_URL_EXPIRY)
+    except Exception as e:
+        print(f"Warning: could not sign download URLs for '{obj.images_bucket_path}': {e}")
+        return None
+
+
+def _batched_image_variants(serializer, obj):
+    folder = obj.images_bucket_path
+    if not folder:
+        return []
+    originals = _indexed_media_paths(serializer, "folders", folder)
+    variants = _indexed_media_paths(serializer, "folders", variants_folder(folder))
+    if originals is None or variants is None:
+        found = get_media_paths_in_folders([folder, variants_folder(folder)])
+        originals = found[folder.rstrip("/") + "/"]
+        variants = found[variants_folder(folder) + "/"]
+
+    keyed = keyed_variant_paths(originals, variants)
+    paths = list(dict.fromkeys(path for entry in keyed for path in entry.values()))
+    try:
+        urls = dict(zip(paths, sign_media_paths(paths, MEDIA_URL_EXPIRY)))
+    except Exception as e:
+        print(f"Warning: could not sign image variant URLs for '{folder}': {e}")
+        return []
+    return [{size: urls[path] for size, path in entry.items()} for entry in keyed]
+
+
+def _batched_download_urls_json(serializer, obj):
+    paths = _indexed_media_paths(serializer, "prefixes", obj.bucket_path)
+    if paths is None:
+        result = obj.download_urls_json
+    else:
+        try:
+            urls = sign_media_paths(paths, MEDIA_URL_EXPIRY)
+        except Exception as e:
+            print(f"Warning: could not sign download URLs for '{obj.bucket_path}': {e}")
+            return None
+        folder = obj.bucket_path if obj.bucket_path.endswith("/") else obj.bucket_path + "/"
+        result = {
+            "folder": folder,
+            "files": [
+                {"name": path.split("/")[-1], "path": path, "download_url": url}
+                for path, url in zip(paths, urls)
+            ],
+        }
+    if result is None:
+        return None
+    return _with_lod_tiers(result, getattr(obj, "lod_manifest", None))
+
+
+def _with_lod_tiers(result, manifest):
+    """
+    Move generated LOD files out of ``files`` and into ``lods``: one entry
+    per source model, its levels lightest first.
+    """
+    urls = {f["path"]: f["download_url"] for f in result["files"]}
+    lods = []
+    for source, entry in sorted((manifest or {}).items()):
+        if source not in urls:
+            continue
+        levels = [
+            {
+                **{key: value for key, value in level.items() if key != "path"},
+                "download_url": urls[level["path"]],
+            }
+            for level in lightest_first(entry.get("levels", []))
+            if level["path"] in urls
+        ]
+        lods.append(
+            {
+                "source": source,
+                "bounds": entry.get("bounds"),
+                "stats": entry.get("stats"),
+                "levels": levels,
+            }
+        )
+    return {
+        **result,
+        "files": [f for f in result["files"] if not is_lod_path(f["path"])],
+        "lods": lods,
+    }
+
+
+def _liked_by_viewer(serializer, post_id):
+    viewer_id = serializer.context.get("viewer_id")
+    if not viewer_id:
+        return False
+    liked_posts = _page_index(serializer, "liked_posts")
+    if liked_posts is None:
+        return PostLike.objects.filter(user_id=viewer_id, post_id=post_id).exists()
+    return post_id in liked_posts
+
+
+class ProfilePictureUrlField(serializers.ReadOnlyField):
+    """Profile picture URL, served from the page index when one is available."""
+
+    def get_attribute(self, instance):
+        files = _page_index(self.parent, "files")
+        path = getattr(instance, "profile_picture_path", None)
+        if files is None or path not in files:
+            return instance.profile_picture_download_url
+        if not files[path]:
+            return None
+        try:
+            return sign_media_paths([path], PROFILE_PICTURE_URL_EXPIRY)[0]
+        except Exception as e:
+            print(f"Warning: failed to get download URL for {instance.profile_picture}: {e}")
+            return None
+
+
+class LocationDetailsField(serializers.JSONField):
+    """Crag location details, served from the page index when one is available."""
+
+    def get_attribute(self, instance):
+        locations = _page_index(self.parent, "locations")
+        if locations is None or instance.location_lat is None or instance.location_lon is None:
+            return super().get_attribute(instance)
+        key = round_coordinates(instance.location_lat, instance.location_lon)
+        return locations.get(key) or empty_location_details()
+
+
 class UserSerializer(serializers.ModelSerializer):
-    profile_picture_url = serializers.ReadOnlyField(
+    profile_picture_url = ProfilePictureUrlField(
         source="profile_picture_download_url"
     )
 
+    media_file_attr = "profile_picture_path"
+
     class Meta:
         model = User
+        list_serializer_class = BatchedListSerializer
 
         fields = [
             "user_id",
@@ -43,14 +375,20 @@ class UserSerializer(serializers.ModelSerializer):
 class CragSerializer(serializers.ModelSerializer):
     crag_id = serializers.SerializerMethodField()
     images_urls = serializers.SerializerMethodField()
-    location_details = serializers.JSONField()
+    image_variants = serializers.SerializerMethodField()
+    location_details = LocationDetailsField()
     user = UserSerializer(read_only=True)
     user_id = FormattedPKRelatedField(
         source="user", queryset=User.objects.all(), write_only=True
     )
 
+    media_folder_attr = "images_bucket_path"
+    coordinate_attrs = ("location_lat", "location_lon")
+    select_related_fields = ("user",)
+
     class Meta:
         model = Crag
+        list_serializer_class = BatchedListSerializer
         fields = [
             "crag_id",
             "name",
@@ -59,10 +397,11 @@ class CragSerializer(serializers.ModelSerializer):
             "location_details",
             "description",
             "images_urls",
+            "image_variants",
             "user",
             "user_id",
         ]
-        read_only_fields = ["crag_id", "images_urls", "user"]
+        read_only_fields = ["crag_id", "images_urls", "image_variants", "user"]
 
     def get_crag_id(self, obj):
 
@@ -70,11 +409,15 @@ class CragSerializer(serializers.ModelSerializer):
 
     def get_images_urls(self, obj):
 
-        urls = obj.images_download_urls
+        urls = _batched_images_urls(self, obj)
         if urls is None:
             return []
         return urls
 
+    def get_image_variants(self, obj):
+
+        return _batched_image_variants(self, obj)
+
     def get_location_details(self, obj):
         return obj.location_details
 
@@ -88,32 +431,42 @@ class RouteSerializer(serializers.ModelSerializer):
 
     route_id = serializers.SerializerMethodField()
     images_urls = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
     crag = CragSerializer(read_only=True)
     user = UserSerializer(read_only=True)
 
+    media_folder_attr = "images_bucket_path"
+    select_related_fields = ("crag", "user")
+
     class Meta:
         model = Route
+        list_serializer_class = BatchedListSerializer
         fields = [
             "route_id",
             "route_name",
             "route_grade",
             "crag",
             "images_urls",
+            "image_variants",
             "user",
             "crag_id",
             "user_id",
         ]
-        read_only_fields = ["route_id", "images_urls", "crag", "user"]
+        read_only_fields = ["route_id", "images_urls", "image_variants", "crag", "user"]
 
     def get_route_id(self, obj):
         return obj.formatted_id
 
     def get_images_urls(self, obj):
-        urls = obj.images_download_urls
+        urls = _batched_images_urls(self, obj)
         if urls is None:
             return []
         return urls
 
+    def get_image_variants(self, obj):
+
+        return _batched_image_variants(self, obj)
+
 class ClimbLogSerializer(serializers.ModelSerializer):
     log_id = serializers.SerializerMethodField()
 
@@ -127,8 +480,11 @@ class ClimbLogSerializer(serializers.ModelSerializer):
         source="route", queryset=Route.objects.all(), write_only=True
     )
 
+    select_related_fields = ("user", "route")
+
     class Meta:
         model = ClimbLog
+        list_serializer_class = BatchedListSerializer
         fields = [
             "log_id",
             "user",
@@ -146,6 +502,26 @@ class ClimbLogSerializer(serializers.ModelSerializer):
     def get_log_id(self, obj):
         return obj.formatted_id
 
+class ClimbLogImportSerializer(serializers.Serializer):
+    """
+    One row of a bulk climb-log import. Only the row itself is validated;
+    the controller checks the route and user ids for a whole batch at once.
+    """
+
+    route_id = serializers.CharField()
+    user_id = serializers.CharField(required=False)
+    date_climbed = serializers.DateField()
+    notes = serializers.CharField(required=False, allow_blank=True, allow_null=True)
+    title = serializers.CharField(required=False, allow_blank=True, allow_null=True, max_length=255)
+    status = serializers.BooleanField(required=False, default=True)
+    attempt = serializers.IntegerField(required=False, default=1, min_value=1)
+
+    def validate_route_id(self, value):
+        try:
+            return PrefixedIDConverter.to_raw_id(value)
+        except ValueError:
+            raise serializers.ValidationError("Invalid formatted ID")
+
 class PostSerializer(serializers.ModelSerializer):
     post_id = serializers.SerializerMethodField()
 
@@ -155,9 +531,16 @@ class PostSerializer(serializers.ModelSerializer):
     )
 
     images_urls = serializers.SerializerMethodField()
+    image_variants = serializers.SerializerMethodField()
+    liked_by_me = serializers.SerializerMethodField()
+
+    media_folder_attr = "images_bucket_path"
+    liked_post_attr = "post_id"
+    select_related_fields = ("user",)
 
     class Meta:
         model = Post
+        list_serializer_class = BatchedListSerializer
         fields = [
             "post_id",
             "user",
@@ -167,18 +550,38 @@ class PostSerializer(serializers.ModelSerializer):
             "status",
             "created_at",
             "images_urls",
+            "image_variants",
+            "like_count",
+            "comment_count",
+            "liked_by_me",
             "user_id",
         ]
-        read_only_fields = ["post_id", "created_at", "images_urls", "user"]
+        read_only_fields = [
+            "post_id",
+            "created_at",
+            "images_urls",
+            "image_variants",
+            "like_count",
+            "comment_count",
+            "liked_by_me",
+            "user",
+        ]
 
     def get_post_id(self, obj):
         return obj.formatted_id
 
     def get_images_urls(self, obj):
-        urls = obj.images_download_urls
+        urls = _batched_images_urls(self, obj)
         if urls is None:
             return []
         return urls
+
+    def get_image_variants(self, obj):
+
+        return _batched_image_variants(self, obj)
+
+    def get_liked_by_me(self, obj):
+        return _liked_by_viewer(self, obj.post_id)
     
 
 
@@ -193,8 +596,11 @@ class PostLikeSerializer(serializers.ModelSerializer):
         source="post", queryset=Post.objects.all(), write_only=True
     )
 
+    select_related_fields = ("user", "post")
+
     class Meta:
         model = PostLike
+        list_serializer_class = BatchedListSerializer
         fields = [
             "id",
             "post",
@@ -221,8 +627,12 @@ class CragModelSerializer(serializers.ModelSerializer):
     download_urls_json = serializers.SerializerMethodField()
     normalization_data = serializers.JSONField(required=False, allow_null=True)
 
+    media_prefix_attr = "bucket_path"
+    select_related_fields = ("user", "crag")
+
     class Meta:
         model = CragModel
+        list_serializer_class = BatchedListSerializer
         fields = [
             "model_id",
             "name",
@@ -240,7 +650,7 @@ class CragModelSerializer(serializers.ModelSerializer):
         return obj.formatted_id
 
     def get_download_urls_json(self, obj):
-        urls = obj.download_urls_json
+        urls = _batched_download_urls_json(self, obj)
         if urls is None:
             return {}
         return urls
@@ -266,8 +676,11 @@ class ModelRouteDataSerializer(serializers.ModelSerializer):
 
     route_data = serializers.JSONField()
 
+    select_related_fields = ("user", "route", "model")
+
     class Meta:
         model = ModelRouteData
+        list_serializer_class = BatchedListSerializer
         fields = [
             "model_route_data_id",
             "model",
@@ -298,12 +711,18 @@ class WeeklyRankingSerializer(serializers.Serializer):
     rank = serializers.IntegerField()
     total_routes = serializers.IntegerField()
 
+    class Meta:
+        list_serializer_class = BatchedListSerializer
+
 
 class AlltimeRankingSerializer(serializers.Serializer):
     user = UserSerializer(read_only=True)
     rank = serializers.IntegerField()
     total_routes = serializers.IntegerField()
 
+    class Meta:
+        list_serializer_class = BatchedListSerializer
+
 
 class AverageGradeRankingSerializer(serializers.Serializer):
     user = UserSerializer(read_only=True)
@@ -311,6 +730,9 @@ class AverageGradeRankingSerializer(serializers.Serializer):
     average_grade = serializers.FloatField()
     total_routes = serializers.IntegerField()
 
+    class Meta:
+        list_serializer_class = BatchedListSerializer
+
 
 class TopClimbersSerializer(serializers.Serializer):
     user = UserSerializer(read_only=True)
@@ -319,6 +741,9 @@ class TopClimbersSerializer(serializers.Serializer):
     total_routes = serializers.IntegerField()
     average_grade = serializers.FloatField()
 
+    class Meta:
+        list_serializer_class = BatchedListSerializer
+
 
 class PostCommentSerializer(serializers.ModelSerializer):
     comment_id = serializers.SerializerMethodField()
@@ -333,8 +758,11 @@ class PostCommentSerializer(serializers.ModelSerializer):
         source="post", queryset=Post.objects.all(), write_only=True
     )
 
+    select_related_fields = ("post", "user")
+
     class Meta:
         model = PostComment
+        list_serializer_class = BatchedListSerializer
         fields = [
             "comment_id",
             "post",
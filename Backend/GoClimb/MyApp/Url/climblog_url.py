@@ -4,6 +4,7 @@ from MyApp.Boundary.climblog_boundary import (
     get_user_climb_logs_view,
     get_user_climb_stats_view,
     create_climb_log_view,
+    bulk_create_climb_logs_view,
     delete_climb_log_view,
 )
 
@@ -13,5 +14,6 @@ urlpatterns = [
         "get_user_climb_stats/", get_user_climb_stats_view, name="get_user_climb_stats"
     ),
     path("create/", create_climb_log_view, name="create_climb_log"),
+    path("bulk_create/", bulk_create_climb_logs_view, name="bulk_create_climb_logs"),
     path("delete/", delete_climb_log_view, name="delete_climb_log"),
 ]
@@ -10,6 +10,7 @@ from MyApp.Boundary.crag_boundary import (
     delete_crag_view,
     get_crags_by_user_id_view,
     search_crags_view,
+    get_nearby_crags_view,
 )
 
 urlpatterns = [
@@ -26,4 +27,5 @@ urlpatterns = [
     path("delete_crag/", delete_crag_view, name="delete_crag"),
     path("get_crags_by_user_id/", get_crags_by_user_id_view, name="get_crags_by_user_id"),
     path("search/", search_crags_view, name="search_crags"),
+    path("nearby/", get_nearby_crags_view, name="get_nearby_crags"),
 ]
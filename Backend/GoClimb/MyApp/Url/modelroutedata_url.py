@@ -2,6 +2,7 @@ from django.urls import path
 from MyApp.Boundary.modelroutedata_boundary import (
     get_by_model_id_view,
     get_by_user_id_view,
+    get_normalized_view,
     create_model_route_data_view,
     delete_model_route_data_view,
 )
@@ -17,6 +18,11 @@ urlpatterns = [
         get_by_user_id_view,
         name="get_model_route_data_by_user_id",
     ),
+    path(
+        "get_normalized/",
+        get_normalized_view,
+        name="get_normalized_model_route_data",
+    ),
     path(
         "create_model_route_data/",
         create_model_route_data_view,
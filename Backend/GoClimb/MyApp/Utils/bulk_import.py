@@ -0,0 +1,95 @@
+"""
+Streaming readers for bulk-import request bodies.
+
+NDJSON (one JSON object per line) and CSV (a header row, then one record per
+line) are read from the request stream a line at a time, so an import of
+thousands of rows is never held in memory as a whole. Each reader yields
+``(row, record, error)``: ``row`` is the body line the record ends on,
+``record`` is a dict (or None) and ``error`` a message for a row that could
+not be parsed. Empty CSV cells are dropped so optional fields take their
+defaults.
+"""
+
+import csv
+import json
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from django.conf import settings
+
+from MyApp.Exceptions.exceptions import LineTooLongError
+
+NDJSON_CONTENT_TYPES = ("application/x-ndjson", "application/jsonl", "application/jsonlines")
+CSV_CONTENT_TYPES = ("text/csv",)
+IMPORT_MAX_LINE_BYTES = getattr(settings, "IMPORT_MAX_LINE_BYTES", 64 * 1024)
+
+ImportRow = Tuple[int, Optional[Dict[str, Any]], Optional[str]]
+
+
+def import_format(content_type: str) -> Optional[str]:
+    """"ndjson", "csv" or None for a request's content type."""
+    media_type = (content_type or "").split(";")[0].strip().lower()
+    if media_type in NDJSON_CONTENT_TYPES:
+        return "ndjson"
+    if media_type in CSV_CONTENT_TYPES:
+        return "csv"
+    return None
+
+
+def _lines(stream) -> Iterator[str]:
+    """Decoded lines of a binary stream; raises UnicodeDecodeError on bad UTF-8."""
+    first = True
+    while True:
+        line = stream.readline(IMPORT_MAX_LINE_BYTES + 1)
+        if not line:
+            return
+        if len(line) > IMPORT_MAX_LINE_BYTES:
+            raise LineTooLongError(f"Lines must be at most {IMPORT_MAX_LINE_BYTES} bytes.")
+        text = line.decode("utf-8")
+        if first:
+            text = text.lstrip("\ufeff")
+            first = False
+        yield text
+
+
+def read_ndjson(stream) -> Iterator[ImportRow]:
+
+    for row, line in enumerate(_lines(stream), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row, None, "Invalid JSON."
+            continue
+        if not isinstance(record, dict):
+            yield row, None, "Each line must be a JSON object."
+            continue
+        yield row, record, None
+
+
+def read_csv(stream) -> Iterator[ImportRow]:
+
+    reader = csv.DictReader(_lines(stream), skipinitialspace=True)
+    for record in reader:
+        if None in record:
+            yield reader.line_num, None, "More cells than header columns."
+            continue
+        yield reader.line_num, {
+            key.strip(): value.strip()
+            for key, value in record.items()
+            if key and value is not None and value.strip()
+        }, None
+
+
+def read_records(stream, fmt: str) -> Iterator[ImportRow]:
+
+    return read_csv(stream) if fmt == "csv" else read_ndjson(stream)
+
+
+def enumerate_records(records: Iterable[Any]) -> Iterator[ImportRow]:
+    """Rows of an already-parsed JSON list, numbered from 1."""
+    for row, record in enumerate(records, start=1):
+        if isinstance(record, dict):
+            yield row, record, None
+        else:
+            yield row, None, "Each entry must be an object."
@@ -0,0 +1,195 @@
+"""
+Leaderboard aggregates maintained from climb logs.
+
+Every topped climb log (``status=True``) contributes one route and its route
+grade to ``user_climb_stats`` (all-time totals with indexed average/score
+columns) and to the ``user_daily_climb_stats`` bucket for the day it was
+climbed. The signal handlers in ``MyApp.signals`` apply deltas to the
+locked rows as logs are created, edited or deleted. ``rebuild_climb_stats``
+recomputes everything from ``climb_log`` for backfills and repairs.
+"""
+
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.userclimbstats import UserClimbStats
+from MyApp.Entity.userdailyclimbstats import UserDailyClimbStats
+
+SCORE_PER_ROUTE = 10
+SCORE_PER_GRADE = 100
+
+# (user_id, day, route_grade) of a topped log, or None if it does not count
+Contribution = Optional[Tuple[str, date, int]]
+
+
+def average_grade_expression(topped="topped_count", grade_sum="grade_sum"):
+
+    return Case(
+        When(**{f"{topped}__gt": 0}, then=Cast(F(grade_sum), FloatField()) / F(topped)),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def score_expression(topped="topped_count", grade_sum="grade_sum"):
+
+    return Case(
+        When(
+            **{f"{topped}__gt": 0},
+            then=F(topped) * SCORE_PER_ROUTE
+            + Cast(F(grade_sum), FloatField()) * SCORE_PER_GRADE / F(topped),
+        ),
+        default=Value(0.0),
+        output_field=FloatField(),
+    )
+
+
+def average_and_score(topped: int, grade_sum: int) -> Tuple[float, float]:
+    """Python counterpart of the two expressions above, for rows computed in memory."""
+    if topped <= 0:
+        return 0.0, 0.0
+    return grade_sum / topped, topped * SCORE_PER_ROUTE + grade_sum * SCORE_PER_GRADE / topped
+
+
+def climb_log_contribution(log: ClimbLog) -> Contribution:
+
+    if not log.status or log.route_id is None or log.user_id is None:
+        return None
+    return log.user_id, log.date_climbed, log.route.route_grade
+
+
+def stored_climb_log_contribution(log_id: int) -> Contribution:
+    """Contribution of the row as it currently is in the database."""
+    row = (
+        ClimbLog.objects.filter(pk=log_id)
+        .values_list("user_id", "date_climbed", "status", "route__route_grade")
+        .first()
+    )
+    if row is None or not row[2]:
+        return None
+    return row[0], row[1], row[3]
+
+
+def apply_contribution(contribution: Contribution, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one topped log from the aggregates."""
+    apply_contributions([contribution], sign)
+
+
+def apply_contributions(contributions: Iterable[Contribution], sign: int = 1) -> None:
+    """
+    Add or remove many topped logs at once (bulk imports skip the signals).
+    The affected rows are locked and read, their new totals worked out here
+    and written back with one ``bulk_update`` per table, however many users
+    and days the batch spans.
+    """
+    totals: Dict[str, List[int]] = {}
+    daily: Dict[Tuple[str, date], List[int]] = {}
+    for contribution in contributions:
+        if contribution is None:
+            continue
+        user_id, day, grade = contribution
+        for key, sums in ((user_id, totals), ((user_id, day), daily)):
+            entry = sums.setdefault(key, [0, 0])
+            entry[0] += 1
+            entry[1] += int(grade)
+    if not totals:
+        return
+
+    with transaction.atomic():
+        if sign > 0:
+            UserClimbStats.objects.bulk_create(
+                [UserClimbStats(user_id=user_id) for user_id in totals], ignore_conflicts=True
+            )
+            UserDailyClimbStats.objects.bulk_create(
+                [UserDailyClimbStats(user_id=user_id, day=day) for user_id, day in daily],
+                ignore_conflicts=True,
+            )
+
+        stats = list(
+            UserClimbStats.objects.select_for_update().filter(user_id__in=list(totals)).order_by("pk")
+        )
+        for row in stats:
+            topped, grades = totals[row.user_id]
+            row.topped_count += sign * topped
+            row.grade_sum += sign * grades
+            row.average_grade, row.score = average_and_score(row.topped_count, row.grade_sum)
+        UserClimbStats.objects.bulk_update(stats, ["topped_count", "grade_sum", "average_grade", "score"])
+
+        buckets = [
+            bucket
+            for bucket in UserDailyClimbStats.objects.select_for_update()
+            .filter(user_id__in=list(totals), day__in={day for _, day in daily})
+            .order_by("pk")
+            if (bucket.user_id, bucket.day) in daily
+        ]
+        for bucket in buckets:
+            topped, grades = daily[bucket.user_id, bucket.day]
+            bucket.topped_count += sign * topped
+            bucket.grade_sum += sign * grades
+        emptied = [bucket.pk for bucket in buckets if bucket.topped_count <= 0]
+        if emptied:
+            UserDailyClimbStats.objects.filter(pk__in=emptied).delete()
+        UserDailyClimbStats.objects.bulk_update(
+            [bucket for bucket in buckets if bucket.topped_count > 0], ["topped_count", "grade_sum"]
+        )
+
+
+def rebuild_climb_stats(user_ids: Optional[Iterable[str]] = None) -> int:
+    """
+    Recompute the aggregates from climb_log, for the given users or for
+    everyone. Returns the number of users with topped logs.
+    """
+    logs = ClimbLog.objects.filter(status=True)
+    totals = UserClimbStats.objects.all()
+    daily = UserDailyClimbStats.objects.all()
+    if user_ids is not None:
+        user_ids = list(user_ids)
+        logs = logs.filter(user_id__in=user_ids)
+        totals = totals.filter(user_id__in=user_ids)
+        daily = daily.filter(user_id__in=user_ids)
+
+    daily_rows = (
+        logs.values("user_id", "date_climbed")
+        .annotate(topped=Count("log_id"), grades=Sum("route__route_grade"))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        totals.delete()
+        daily.delete()
+
+        per_user = {}
+        buckets = []
+        for row in daily_rows.iterator():
+            buckets.append(
+                UserDailyClimbStats(
+                    user_id=row["user_id"],
+                    day=row["date_climbed"],
+                    topped_count=row["topped"],
+                    grade_sum=row["grades"] or 0,
+                )
+            )
+            topped, grades = per_user.get(row["user_id"], (0, 0))
+            per_user[row["user_id"]] = (topped + row["topped"], grades + (row["grades"] or 0))
+
+        UserDailyClimbStats.objects.bulk_create(buckets, batch_size=1000)
+        UserClimbStats.objects.bulk_create(
+            [
+                UserClimbStats(
+                    user_id=user_id,
+                    topped_count=topped,
+                    grade_sum=grades,
+                    average_grade=grades / topped,
+                    score=topped * SCORE_PER_ROUTE + grades * SCORE_PER_GRADE / topped,
+                )
+                for user_id, (topped, grades) in per_user.items()
+            ],
+            batch_size=1000,
+        )
+
+    return len(per_user)
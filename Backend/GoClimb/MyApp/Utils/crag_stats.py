@@ -0,0 +1,143 @@
+"""
+Per-crag daily climb rollups and the rankings computed from them.
+
+Every climb log adds one to the ``crag_daily_climb_stats`` bucket of its
+route's crag for the day it was climbed; the signal handlers in
+``MyApp.signals`` keep the buckets in step with climb_log writes.
+Rankings over any window sum at most one row per crag per day, optionally
+weighting each day by an exponential decay with a configurable half-life.
+"""
+
+from datetime import date, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils.timezone import now
+
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.cragdailyclimbstats import CragDailyClimbStats
+
+# (crag_id, day) bucket a climb log counts towards
+CragBucket = Optional[Tuple[int, date]]
+
+
+def climb_log_crag_bucket(log: ClimbLog) -> CragBucket:
+
+    if log.route_id is None:
+        return None
+    return log.route.crag_id, log.date_climbed
+
+
+def stored_climb_log_crag_bucket(log_id: int) -> CragBucket:
+    """Bucket of the row as it currently is in the database."""
+    row = (
+        ClimbLog.objects.filter(pk=log_id)
+        .values_list("route__crag_id", "date_climbed")
+        .first()
+    )
+    return tuple(row) if row is not None else None
+
+
+def apply_crag_bucket(bucket: CragBucket, sign: int) -> None:
+    """Add (sign=1) or remove (sign=-1) one climb from a crag's daily bucket."""
+    apply_crag_buckets([bucket], sign)
+
+
+def apply_crag_buckets(buckets: Iterable[CragBucket], sign: int = 1) -> None:
+    """
+    Add or remove many climbs at once: the affected buckets are locked, read
+    and written back with one ``bulk_update``.
+    """
+    counts: Dict[Tuple[int, date], int] = {}
+    for bucket in buckets:
+        if bucket is not None:
+            counts[bucket] = counts.get(bucket, 0) + 1
+    if not counts:
+        return
+
+    with transaction.atomic():
+        if sign > 0:
+            CragDailyClimbStats.objects.bulk_create(
+                [CragDailyClimbStats(crag_id=crag_id, day=day) for crag_id, day in counts],
+                ignore_conflicts=True,
+            )
+
+        rows = [
+            row
+            for row in CragDailyClimbStats.objects.select_for_update()
+            .filter(crag_id__in={crag_id for crag_id, _ in counts}, day__in={day for _, day in counts})
+            .order_by("pk")
+            if (row.crag_id, row.day) in counts
+        ]
+        for row in rows:
+            row.climb_count += sign * counts[row.crag_id, row.day]
+        emptied = [row.pk for row in rows if row.climb_count <= 0]
+        if emptied:
+            CragDailyClimbStats.objects.filter(pk__in=emptied).delete()
+        CragDailyClimbStats.objects.bulk_update([row for row in rows if row.climb_count > 0], ["climb_count"])
+
+
+def rebuild_crag_stats(crag_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Recompute the daily buckets from climb_log, for the given crags or for
+    every crag. Returns the number of buckets written.
+    """
+    logs = ClimbLog.objects.all()
+    buckets = CragDailyClimbStats.objects.all()
+    if crag_ids is not None:
+        crag_ids = list(crag_ids)
+        logs = logs.filter(route__crag_id__in=crag_ids)
+        buckets = buckets.filter(crag_id__in=crag_ids)
+
+    rows = (
+        logs.values("route__crag_id", "date_climbed")
+        .annotate(climbs=Count("log_id"))
+        .order_by()
+    )
+
+    with transaction.atomic():
+        buckets.delete()
+        objects = [
+            CragDailyClimbStats(
+                crag_id=row["route__crag_id"], day=row["date_climbed"], climb_count=row["climbs"]
+            )
+            for row in rows.iterator()
+        ]
+        CragDailyClimbStats.objects.bulk_create(objects, batch_size=1000)
+
+    return len(objects)
+
+
+def decay_weight(day: date, window_end: date, half_life: float) -> float:
+
+    age = max((window_end - day).days, 0)
+    return 0.5 ** (age / half_life)
+
+
+def window_climb_counts(
+    start: date,
+    end: Optional[date] = None,
+    half_life: Optional[float] = None,
+) -> Dict[int, float]:
+    """
+    Climbs per crag for days in [start, end) (open-ended when ``end`` is None).
+    With ``half_life`` (days), each day is weighted by 0.5 ** (age / half_life),
+    where age is measured back from the last day of the window (today when
+    the window is open-ended).
+    """
+    buckets = CragDailyClimbStats.objects.filter(day__gte=start)
+    if end is not None:
+        buckets = buckets.filter(day__lt=end)
+
+    if half_life is None:
+        rows = buckets.values("crag_id").annotate(total=Sum("climb_count")).order_by()
+        return {row["crag_id"]: row["total"] for row in rows}
+
+    window_end = (end - timedelta(days=1)) if end is not None else now().date()
+    rows = buckets.values_list("crag_id", "day", "climb_count")
+
+    totals: Dict[int, float] = {}
+    for crag_id, day, climbs in rows:
+        totals[crag_id] = totals.get(crag_id, 0.0) + climbs * decay_weight(day, window_end, half_life)
+    return totals
@@ -0,0 +1,162 @@
+"""
+Geohash indexing and map-tile clustering for crag locations.
+
+Each crag stores the geohash of its coordinates in an indexed column. A
+geohash cell is a prefix of the hash of every point inside it, so a bounding
+box becomes a handful of ``LIKE 'prefix%'`` index range scans over the cells
+covering it, followed by an exact coordinate check. Radius queries search the
+circle's bounding box and keep the points within the haversine distance.
+"""
+
+import math
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+GEOHASH_PRECISION = 9  # cells of roughly 5 x 5 m
+MAX_COVER_CELLS = 32
+EARTH_RADIUS_KM = 6371.0088
+MAX_TILE_LAT = 85.05112878  # Web Mercator cut-off
+
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+BoundingBox = Tuple[float, float, float, float]  # min_lat, min_lon, max_lat, max_lon
+
+
+def _cell_size(precision: int) -> Tuple[float, float]:
+    """Height (degrees latitude) and width (degrees longitude) of a cell."""
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lon_bits)
+
+
+def _cell_index(lat: float, lon: float, precision: int) -> Tuple[int, int]:
+
+    height, width = _cell_size(precision)
+    rows, cols = round(180.0 / height), round(360.0 / width)
+    row = min(int((lat + 90.0) / height), rows - 1)
+    col = min(int((lon + 180.0) / width), cols - 1)
+    return row, col
+
+
+def _cell_hash(row: int, col: int, precision: int) -> str:
+
+    bits = 5 * precision
+    lon_bits = (bits + 1) // 2
+    lat_bits = bits // 2
+
+    # Interleave longitude and latitude bits, longitude first
+    value = 0
+    lon_shift, lat_shift = lon_bits, lat_bits
+    for i in range(bits):
+        if i % 2 == 0:
+            lon_shift -= 1
+            value = (value << 1) | ((col >> lon_shift) & 1)
+        else:
+            lat_shift -= 1
+            value = (value << 1) | ((row >> lat_shift) & 1)
+
+    return "".join(
+        _BASE32[(value >> (5 * (precision - 1 - i))) & 31] for i in range(precision)
+    )
+
+
+def encode_geohash(lat: float, lon: float, precision: int = GEOHASH_PRECISION) -> str:
+
+    row, col = _cell_index(lat, lon, precision)
+    return _cell_hash(row, col, precision)
+
+
+def covering_cells(box: BoundingBox, max_cells: int = MAX_COVER_CELLS) -> List[str]:
+    """
+    The finest set of at most ``max_cells`` geohash cells covering ``box``.
+    An empty list means the box is too large to narrow down at all.
+    """
+    min_lat, min_lon, max_lat, max_lon = box
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        min_row, min_col = _cell_index(min_lat, min_lon, precision)
+        max_row, max_col = _cell_index(max_lat, max_lon, precision)
+        if (max_row - min_row + 1) * (max_col - min_col + 1) <= max_cells:
+            return [
+                _cell_hash(row, col, precision)
+                for row in range(min_row, max_row + 1)
+                for col in range(min_col, max_col + 1)
+            ]
+    return []
+
+
+def split_antimeridian(box: BoundingBox) -> List[BoundingBox]:
+    """A box whose min_lon exceeds its max_lon wraps past 180 and is split in two."""
+    min_lat, min_lon, max_lat, max_lon = box
+    if min_lon <= max_lon:
+        return [box]
+    return [(min_lat, min_lon, max_lat, 180.0), (min_lat, -180.0, max_lat, max_lon)]
+
+
+def radius_bounding_box(lat: float, lon: float, radius_km: float) -> BoundingBox:
+    """Bounding box of the circle, wrapping across the antimeridian if needed."""
+    dlat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat, max_lat = lat - dlat, lat + dlat
+    if min_lat <= -90.0 or max_lat >= 90.0:
+        return max(min_lat, -90.0), -180.0, min(max_lat, 90.0), 180.0
+
+    dlon = math.degrees(
+        math.asin(min(1.0, math.sin(radius_km / EARTH_RADIUS_KM) / math.cos(math.radians(lat))))
+    )
+    if dlon >= 180.0:
+        return min_lat, -180.0, max_lat, 180.0
+    min_lon, max_lon = lon - dlon, lon + dlon
+    if min_lon < -180.0:
+        min_lon += 360.0
+    if max_lon > 180.0:
+        max_lon -= 360.0
+    return min_lat, min_lon, max_lat, max_lon
+
+
+def haversine_km(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def tile_for(lat: float, lon: float, zoom: int) -> Tuple[int, int]:
+    """Slippy-map (Web Mercator) tile x/y containing the point at ``zoom``."""
+    n = 1 << zoom
+    lat = max(-MAX_TILE_LAT, min(MAX_TILE_LAT, lat))
+    x = int((lon + 180.0) / 360.0 * n)
+    lat_rad = math.radians(lat)
+    y = int((1.0 - math.asinh(math.tan(lat_rad)) / math.pi) / 2.0 * n)
+    return min(x, n - 1), min(y, n - 1)
+
+
+def cluster_by_tile(
+    items: Iterable[Any],
+    zoom: int,
+    coordinates: Callable[[Any], Tuple[float, float]],
+    describe: Optional[Callable[[Any], Dict[str, Any]]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Group ``items`` by the tile they fall in at ``zoom``. Each cluster has its
+    tile key, size and centroid; a cluster of one is merged with
+    ``describe(item)``.
+    """
+    groups: Dict[Tuple[int, int], List[Any]] = {}
+    for item in items:
+        lat, lon = coordinates(item)
+        groups.setdefault(tile_for(lat, lon, zoom), []).append(item)
+
+    clusters = []
+    for (x, y), members in sorted(groups.items()):
+        points = [coordinates(member) for member in members]
+        cluster = {
+            "tile": f"{zoom}/{x}/{y}",
+            "count": len(members),
+            "location_lat": sum(p[0] for p in points) / len(points),
+            "location_lon": sum(p[1] for p in points) / len(points),
+        }
+        if len(members) == 1 and describe is not None:
+            cluster.update(describe(members[0]))
+        clusters.append(cluster)
+    return clusters
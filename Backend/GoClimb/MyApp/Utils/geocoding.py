@@ -0,0 +1,232 @@
+"""
+Reverse-geocode lookups for crag coordinates.
+
+Google Geocoding responses are stored in the ``geocode_cache`` table keyed by
+coordinates rounded to 4 decimal places (~11 m), with an in-process LRU in
+front of it. The table is filled on the write path (``Crag.save``) and the
+serializer path only ever reads from the cache, so listing crags never makes
+an outbound HTTP call.
+"""
+
+import threading
+from collections import OrderedDict
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import requests
+from django.conf import settings
+
+from MyApp.Entity.geocodecache import GeocodeCache
+
+GEOCODE_URL = "https://maps.googleapis.com/maps/api/geocode/json"
+GEOCODE_PRECISION = Decimal("0.0001")
+GEOCODE_TIMEOUT_SECONDS = 5
+GEOCODE_LRU_SIZE = getattr(settings, "GEOCODE_LRU_SIZE", 4096)
+
+CoordinateKey = Tuple[Decimal, Decimal]
+
+
+def empty_location_details() -> Dict[str, Any]:
+    return {"city": None, "country": None, "state": None, "district": None, "postal_code": None}
+
+
+def round_coordinates(lat: float, lon: float) -> CoordinateKey:
+    lat_key = Decimal(str(lat)).quantize(GEOCODE_PRECISION, rounding=ROUND_HALF_UP)
+    lon_key = Decimal(str(lon)).quantize(GEOCODE_PRECISION, rounding=ROUND_HALF_UP)
+    return lat_key, lon_key
+
+
+class _LocationLRU:
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[CoordinateKey, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: CoordinateKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: CoordinateKey, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_location_lru = _LocationLRU(GEOCODE_LRU_SIZE)
+
+
+def clear_location_lru() -> None:
+    _location_lru.clear()
+
+
+def parse_geocode_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    components = result["address_components"]
+
+    # Initialize all location fields
+    location_info = {
+        "city": None,
+        "country": None,
+        "state": None,
+        "district": None,
+        "postal_code": None,
+        "formatted_address": result.get("formatted_address", ""),
+    }
+
+    # Extract detailed location information
+    for comp in components:
+        types = comp["types"]
+        long_name = comp["long_name"]
+
+        # Country
+        if "country" in types:
+            location_info["country"] = long_name
+
+        # State/Province/Administrative Area Level 1
+        elif "administrative_area_level_1" in types:
+            location_info["state"] = long_name
+
+        # City/Locality or Administrative Area Level 2 (for places like Singapore)
+        elif "locality" in types:
+            location_info["city"] = long_name
+        elif "administrative_area_level_2" in types and not location_info["city"]:
+            location_info["city"] = long_name
+
+        # District/Sublocality (neighborhoods, districts)
+        elif "sublocality" in types or "sublocality_level_1" in types:
+            location_info["district"] = long_name
+        elif "administrative_area_level_3" in types and not location_info["district"]:
+            location_info["district"] = long_name
+
+        # Postal Code
+        elif "postal_code" in types:
+            location_info["postal_code"] = long_name
+
+    # Special handling for Singapore - use more specific areas
+    if location_info["country"] == "Singapore":
+        # For Singapore, if we don't have a district, try to get it from other components
+        if not location_info["district"]:
+            for comp in components:
+                types = comp["types"]
+                if "neighborhood" in types or "sublocality_level_2" in types:
+                    location_info["district"] = comp["long_name"]
+                    break
+
+        # Set city to Singapore if not already set
+        if not location_info["city"]:
+            location_info["city"] = "Singapore"
+
+    return location_info
+
+
+def fetch_location_details(lat: float, lon: float) -> Optional[Dict[str, Any]]:
+    """
+    Call the Google Geocoding API. Returns None when the lookup could not be
+    made or did not succeed, so callers never persist a failed response.
+    """
+    api_key = getattr(settings, "GOOGLE_MAPS_API_KEY", None)
+    if not api_key:
+        return None
+
+    try:
+        response = requests.get(
+            GEOCODE_URL,
+            params={"latlng": f"{lat},{lon}", "key": api_key},
+            timeout=GEOCODE_TIMEOUT_SECONDS,
+        )
+        data = response.json()
+        if data.get("status") == "OK" and data.get("results"):
+            return parse_geocode_result(data["results"][0])
+    except Exception as e:
+        print(f"Warning: could not fetch location details: {e}")
+
+    return None
+
+
+def get_cached_location_details(lat: float, lon: float) -> Dict[str, Any]:
+    """
+    Read-only lookup used on the serialization path. Never calls the
+    Geocoding API; unknown coordinates resolve to empty location details.
+    """
+    key = round_coordinates(lat, lon)
+
+    details = _location_lru.get(key)
+    if details is not None:
+        return details
+
+    row = GeocodeCache.objects.filter(lat_key=key[0], lon_key=key[1]).first()
+    if row is None:
+        return empty_location_details()
+
+    _location_lru.set(key, row.location_details)
+    return row.location_details
+
+
+def get_cached_location_details_bulk(
+    coordinates: Iterable[Tuple[float, float]],
+) -> Dict[CoordinateKey, Dict[str, Any]]:
+    """
+    Resolve many coordinates with at most one query. The result is keyed by
+    ``round_coordinates(lat, lon)``; missing keys have no cached details.
+    """
+    results: Dict[CoordinateKey, Dict[str, Any]] = {}
+    missing = set()
+
+    for lat, lon in coordinates:
+        key = round_coordinates(lat, lon)
+        if key in results or key in missing:
+            continue
+        details = _location_lru.get(key)
+        if details is not None:
+            results[key] = details
+        else:
+            missing.add(key)
+
+    if missing:
+        rows = GeocodeCache.objects.filter(
+            lat_key__in={k[0] for k in missing},
+            lon_key__in={k[1] for k in missing},
+        )
+        for row in rows:
+            key = (row.lat_key, row.lon_key)
+            if key in missing:
+                _location_lru.set(key, row.location_details)
+                results[key] = row.location_details
+
+    return results
+
+
+def refresh_location_details(lat: float, lon: float, force: bool = False) -> Dict[str, Any]:
+    """
+    Write-path lookup: fill the cache for these coordinates if they are not
+    cached yet (or unconditionally when ``force`` is set).
+    """
+    key = round_coordinates(lat, lon)
+
+    if not force:
+        details = _location_lru.get(key)
+        if details is not None:
+            return details
+        row = GeocodeCache.objects.filter(lat_key=key[0], lon_key=key[1]).first()
+        if row is not None:
+            _location_lru.set(key, row.location_details)
+            return row.location_details
+
+    details = fetch_location_details(lat, lon)
+    if details is None:
+        return empty_location_details()
+
+    GeocodeCache.objects.update_or_create(
+        lat_key=key[0], lon_key=key[1], defaults={"location_details": details}
+    )
+    _location_lru.set(key, details)
+    return details
@@ -5,6 +5,7 @@ import firebase_admin
 from firebase_admin import auth, credentials
 
 from MyApp.Firebase.helpers import verify_id_token as _real_verify_id_token
+from MyApp.Utils.token_cache import verify_with_cache
 
 def verify_id_token(id_token: str) -> Dict[str, Any]:
 
@@ -16,7 +17,7 @@ def verify_id_token(id_token: str) -> Dict[str, Any]:
         }
 
     try:
-        decoded_token = auth.verify_id_token(id_token)
+        decoded_token = verify_with_cache("id", id_token, auth.verify_id_token)
         uid = decoded_token.get("uid")
 
         if not uid:
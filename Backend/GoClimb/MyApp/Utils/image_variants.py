@@ -0,0 +1,135 @@
+"""
+Resized WebP variants of uploaded images.
+
+Uploads enqueue an ``images.generate_variants`` job (see ``MyApp.Utils.jobs``)
+and the worker writes one WebP per entry in ``IMAGE_VARIANTS`` next to the
+original, under ``<images folder>/_variants/``, recording each in the media
+manifest. Only post, crag and route images get variants; profile pictures
+are served as they are. Folder listings are not recursive, so variants never
+show up as images of their own. Serializers pair every original with
+whichever variants exist so far and fall back to the original for the rest.
+"""
+
+import io
+from typing import Dict, Iterable, List
+
+from django.conf import settings
+
+# Longest edge in pixels; images are never scaled up
+IMAGE_VARIANTS: Dict[str, int] = getattr(
+    settings, "IMAGE_VARIANTS", {"thumbnail": 320, "medium": 1024, "webp": 2560}
+)
+IMAGE_VARIANT_QUALITY = getattr(settings, "IMAGE_VARIANT_QUALITY", 80)
+VARIANTS_FOLDER = "_variants"
+VARIANT_CONTENT_TYPE = "image/webp"
+
+
+def variants_folder(images_folder: str) -> str:
+
+    return f"{images_folder.rstrip('/')}/{VARIANTS_FOLDER}"
+
+
+def variant_path(original_path: str, variant: str) -> str:
+
+    folder, _, name = original_path.rpartition("/")
+    return f"{variants_folder(folder)}/{name}.{variant}.webp"
+
+
+def keyed_variant_paths(originals: Iterable[str], existing: Iterable[str]) -> List[Dict[str, str]]:
+    """
+    For each original, its path under "original" and each variant's path,
+    or the original's where that variant has not been generated (yet).
+    """
+    existing = set(existing)
+    keyed = []
+    for original in originals:
+        entry = {"original": original}
+        for variant in IMAGE_VARIANTS:
+            path = variant_path(original, variant)
+            entry[variant] = path if path in existing else original
+        keyed.append(entry)
+    return keyed
+
+
+def render_variants(data: bytes) -> Dict[str, bytes]:
+    """Encode ``data`` (any format Pillow reads) once per variant size."""
+    from PIL import Image, ImageOps
+
+    largest = max(IMAGE_VARIANTS.values())
+    with Image.open(io.BytesIO(data)) as image:
+        # Lets the JPEG decoder skip detail no variant needs
+        image.draft("RGB", (largest, largest))
+        image = ImageOps.exif_transpose(image)
+        image = image.convert("RGBA" if image.mode in ("RGBA", "LA", "P") else "RGB")
+
+        rendered = {}
+        for variant, edge in IMAGE_VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail((edge, edge), Image.Resampling.LANCZOS)
+            buffer = io.BytesIO()
+            resized.save(buffer, "WEBP", quality=IMAGE_VARIANT_QUALITY, method=4)
+            rendered[variant] = buffer.getvalue()
+    return rendered
+
+
+def generate_image_variants(paths: Iterable[str], bucket=None) -> List[str]:
+    """
+    Render and upload the variants of each original in ``paths``, recording
+    each image's manifest rows as soon as its variants are written. Originals
+    that are gone (deleted before the job ran) or that already have every
+    variant are skipped, and one that cannot be decoded is logged and
+    skipped. Uploads that fail are raised together at the end as
+    ``ImageVariantsError``, so the job retries only those images. Returns the
+    variant paths written.
+    """
+    from firebase_admin import storage
+    from google.api_core.exceptions import NotFound
+
+    from MyApp.Exceptions.exceptions import ImageVariantsError
+    from MyApp.Firebase.helpers import (
+        get_media_paths_in_folders,
+        invalidate_signed_url_cache,
+        record_media_objects,
+    )
+
+    paths = list(paths)
+    bucket = bucket or storage.bucket()
+    folders = {variants_folder(path.rpartition("/")[0]) for path in paths}
+    done = {path for found in get_media_paths_in_folders(list(folders)).values() for path in found}
+
+    written: List[str] = []
+    failed: List[str] = []
+    for path in paths:
+        if all(variant_path(path, variant) in done for variant in IMAGE_VARIANTS):
+            continue
+        try:
+            data = bucket.blob(path).download_as_bytes()
+        except NotFound:
+            continue
+
+        try:
+            rendered = render_variants(data)
+        except Exception as e:  # not an image, truncated, or over Pillow's pixel limit
+            print(f"Warning: could not render variants of '{path}': {e}")
+            continue
+
+        entries = []
+        try:
+            for variant, content in rendered.items():
+                target = variant_path(path, variant)
+                blob = bucket.blob(target)
+                blob.metadata = {"source": path, "variant": variant}
+                blob.upload_from_file(io.BytesIO(content), content_type=VARIANT_CONTENT_TYPE)
+                entries.append({"path": target, "size": len(content), "content_type": VARIANT_CONTENT_TYPE})
+        except Exception as e:
+            print(f"Warning: could not upload variants of '{path}': {e}")
+            failed.append(path)
+        finally:
+            record_media_objects(entries)
+            if entries:
+                invalidate_signed_url_cache(variants_folder(path.rpartition("/")[0]))
+        written.extend(entry["path"] for entry in entries)
+
+    if failed:
+        raise ImageVariantsError(f"Could not upload variants of {len(failed)} image(s).", failed)
+    return written
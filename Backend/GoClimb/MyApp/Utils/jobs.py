@@ -0,0 +1,201 @@
+"""
+Database-backed background jobs for slow side effects (storage cleanup and
+the like) that should not run inside an HTTP request.
+
+``enqueue_job`` writes a ``background_job`` row in the caller's transaction,
+so a job only becomes visible to workers once the surrounding write commits
+and disappears with it on rollback; that is the ``on_commit`` guarantee
+without a window in which a committed delete can lose its cleanup job. The
+``run_jobs`` management command claims due jobs with
+``SELECT ... FOR UPDATE SKIP LOCKED`` (so any number of workers can run side
+by side), runs the handler registered for each kind, and reschedules
+failures with exponential backoff until ``max_attempts`` is reached.
+"""
+
+import random
+import traceback
+from datetime import timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils.timezone import now
+
+from MyApp.Entity.backgroundjob import BackgroundJob
+
+JOB_RETRY_BASE_SECONDS = getattr(settings, "JOB_RETRY_BASE_SECONDS", 30)
+JOB_RETRY_MAX_SECONDS = getattr(settings, "JOB_RETRY_MAX_SECONDS", 6 * 60 * 60)
+# A job still "running" after this long belongs to a worker that died
+JOB_LOCK_TIMEOUT_SECONDS = getattr(settings, "JOB_LOCK_TIMEOUT_SECONDS", 15 * 60)
+
+STORAGE_DELETE_JOB = "storage.delete_folder"
+IMAGE_VARIANTS_JOB = "images.generate_variants"
+MODEL_LODS_JOB = "models.generate_lods"
+
+_handlers: Dict[str, Callable[[Dict[str, Any]], None]] = {}
+
+
+def job_handler(kind: str):
+    """Register the function that runs jobs of ``kind``; it receives the payload."""
+
+    def register(func):
+        _handlers[kind] = func
+        return func
+
+    return register
+
+
+def enqueue_job(
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    delay_seconds: float = 0,
+    max_attempts: Optional[int] = None,
+) -> BackgroundJob:
+
+    if kind not in _handlers:
+        raise ValueError(f"Unknown job kind '{kind}'")
+
+    job = BackgroundJob(
+        kind=kind,
+        payload=payload or {},
+        run_after=now() + timedelta(seconds=delay_seconds),
+    )
+    if max_attempts is not None:
+        job.max_attempts = max_attempts
+    job.save()
+    return job
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff with jitter: ~base, 2*base, 4*base, ... capped."""
+    seconds = min(JOB_RETRY_BASE_SECONDS * (2 ** max(attempts - 1, 0)), JOB_RETRY_MAX_SECONDS)
+    return timedelta(seconds=seconds * random.uniform(0.8, 1.2))
+
+
+def claim_jobs(batch_size: int = 10, kinds: Optional[List[str]] = None) -> List[BackgroundJob]:
+    """
+    Lock up to ``batch_size`` due jobs and mark them running. Rows locked by
+    another worker are skipped rather than waited on. A stale running job
+    that has used up its attempts killed its worker every time, so it is
+    marked failed instead of being handed out again.
+    """
+    current = now()
+    stale = current - timedelta(seconds=JOB_LOCK_TIMEOUT_SECONDS)
+
+    with transaction.atomic():
+        due = BackgroundJob.objects.select_for_update(skip_locked=True).filter(
+            Q(status=BackgroundJob.STATUS_PENDING, run_after__lte=current)
+            | Q(status=BackgroundJob.STATUS_RUNNING, locked_at__lt=stale)
+        )
+        if kinds:
+            due = due.filter(kind__in=kinds)
+        jobs = list(due.order_by("run_after", "job_id")[:batch_size])
+
+        exhausted = [
+            job for job in jobs
+            if job.status == BackgroundJob.STATUS_RUNNING and job.attempts >= job.max_attempts
+        ]
+        for job in exhausted:
+            job.status = BackgroundJob.STATUS_FAILED
+            job.locked_at = None
+            job.last_error = (
+                f"Worker stopped while running attempt {job.attempts}/{job.max_attempts} "
+                f"(no result after {JOB_LOCK_TIMEOUT_SECONDS}s)"
+            )
+        BackgroundJob.objects.bulk_update(exhausted, ["status", "locked_at", "last_error"])
+
+        jobs = [job for job in jobs if job.status != BackgroundJob.STATUS_FAILED]
+        for job in jobs:
+            job.status = BackgroundJob.STATUS_RUNNING
+            job.locked_at = current
+            job.attempts += 1
+        BackgroundJob.objects.bulk_update(jobs, ["status", "locked_at", "attempts"])
+
+    return jobs
+
+
+def run_job(job: BackgroundJob) -> bool:
+    """
+    Run one claimed job. Finished jobs are deleted; failed ones are retried
+    later or, once out of attempts, left in the failed state for inspection.
+    """
+    handler = _handlers.get(job.kind)
+    try:
+        if handler is None:
+            raise LookupError(f"No handler registered for job kind '{job.kind}'")
+        handler(job.payload)
+    except Exception:
+        job.last_error = traceback.format_exc()[-4000:]
+        job.locked_at = None
+        if handler is None or job.attempts >= job.max_attempts:
+            job.status = BackgroundJob.STATUS_FAILED
+        else:
+            job.status = BackgroundJob.STATUS_PENDING
+            job.run_after = now() + retry_delay(job.attempts)
+        job.save(update_fields=["status", "run_after", "locked_at", "last_error"])
+        print(f"Warning: job {job} failed (attempt {job.attempts}/{job.max_attempts})")
+        return False
+
+    job.delete()
+    return True
+
+
+def run_pending_jobs(batch_size: int = 10, kinds: Optional[List[str]] = None) -> int:
+    """Claim and run one batch. Returns the number of jobs claimed."""
+    jobs = claim_jobs(batch_size, kinds)
+    for job in jobs:
+        run_job(job)
+    return len(jobs)
+
+
+@job_handler(STORAGE_DELETE_JOB)
+def _delete_storage_folder(payload: Dict[str, Any]) -> None:
+    from MyApp.Firebase.helpers import delete_bucket_folder
+
+    delete_bucket_folder(payload["folder"])
+
+
+def enqueue_storage_delete(folder_path: str) -> Optional[BackgroundJob]:
+    """
+    Schedule removal of every blob under ``folder_path``. The manifest rows
+    and cached URLs go immediately, so nothing serves the files while the
+    blobs wait for the worker.
+    """
+    from MyApp.Firebase.helpers import invalidate_signed_url_cache, remove_media_objects
+
+    if not folder_path:
+        return None
+    remove_media_objects(folder_path)
+    invalidate_signed_url_cache(folder_path)
+    return enqueue_job(STORAGE_DELETE_JOB, {"folder": folder_path})
+
+
+@job_handler(IMAGE_VARIANTS_JOB)
+def _generate_image_variants(payload: Dict[str, Any]) -> None:
+    from MyApp.Utils.image_variants import generate_image_variants
+
+    generate_image_variants(payload["paths"])
+
+
+def enqueue_image_variants(paths: List[str]) -> Optional[BackgroundJob]:
+    """Schedule thumbnail / WebP variants for freshly uploaded images."""
+    paths = [path for path in paths if path]
+    if not paths:
+        return None
+    return enqueue_job(IMAGE_VARIANTS_JOB, {"paths": paths})
+
+
+@job_handler(MODEL_LODS_JOB)
+def _generate_model_lods(payload: Dict[str, Any]) -> None:
+    from MyApp.Utils.mesh_lod import generate_model_lods
+
+    generate_model_lods(payload["model_id"], payload["paths"])
+
+
+def enqueue_model_lods(model_id: int, paths: List[str]) -> Optional[BackgroundJob]:
+    """Schedule decimated LOD levels for the GLB files of a crag model."""
+    paths = [path for path in paths if path and path.lower().endswith(".glb")]
+    if not paths:
+        return None
+    return enqueue_job(MODEL_LODS_JOB, {"model_id": model_id, "paths": paths})
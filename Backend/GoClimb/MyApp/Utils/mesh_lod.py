@@ -0,0 +1,509 @@
+"""
+Level-of-detail meshes for uploaded GLB crag models.
+
+After a model upload a ``models.generate_lods`` job (see ``MyApp.Utils.jobs``)
+reads each ``.glb``, decimates every triangle primitive to the fractions in
+``MODEL_LOD_RATIOS`` by vertex clustering, and writes one GLB per level to
+``<model folder>/_lod/``. Vertex clustering snaps vertices to a uniform grid
+and merges each occupied cell into one vertex; triangles that collapse are
+dropped. The grid resolution is bisected until the triangle count is just
+under the target, all in NumPy. Materials, textures and the node hierarchy
+are carried over unchanged.
+
+The level list, triangle/vertex counts and the scene bounding box are stored
+on ``CragModel.lod_manifest`` so serializers can offer the tiers without
+reading anything from storage. The original file is the full-detail level.
+Skinned, animated, morph-target and Draco/meshopt-compressed models keep
+only that level.
+"""
+
+import copy
+import io
+import json
+import struct
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+MODEL_LOD_RATIOS: Tuple[float, ...] = tuple(getattr(settings, "MODEL_LOD_RATIOS", (0.25, 0.05)))
+MODEL_LOD_MAX_BYTES = getattr(settings, "MODEL_LOD_MAX_BYTES", 200 * 1024 * 1024)
+LOD_FOLDER = "_lod"
+GLB_CONTENT_TYPE = "model/gltf-binary"
+
+_GLB_MAGIC = 0x46546C67  # "glTF"
+_CHUNK_JSON = 0x4E4F534A
+_CHUNK_BIN = 0x004E4942
+_TRIANGLES = 4
+
+_COMPONENT_DTYPES = {
+    5120: np.int8,
+    5121: np.uint8,
+    5122: np.int16,
+    5123: np.uint16,
+    5125: np.uint32,
+    5126: np.float32,
+}
+_TYPE_WIDTHS = {"SCALAR": 1, "VEC2": 2, "VEC3": 3, "VEC4": 4, "MAT4": 16}
+# Attributes that survive averaging; tangents and the like would not
+_KEPT_ATTRIBUTES = ("POSITION", "NORMAL", "TEXCOORD_0", "COLOR_0")
+_UNSUPPORTED_EXTENSIONS = {"KHR_draco_mesh_compression", "EXT_meshopt_compression"}
+
+
+class UnsupportedModelError(ValueError):
+    """The GLB uses a feature the decimator does not handle."""
+
+
+def lod_path(source_path: str, level: int) -> str:
+
+    folder, _, name = source_path.rpartition("/")
+    stem = name[: -len(".glb")] if name.lower().endswith(".glb") else name
+    return f"{folder}/{LOD_FOLDER}/{stem}.lod{level}.glb"
+
+
+# --------------------
+# GLB container
+# --------------------
+
+def read_glb(data: bytes) -> Tuple[Dict[str, Any], bytes]:
+    """Split a GLB into its JSON document and binary chunk."""
+    if len(data) < 20:
+        raise UnsupportedModelError("Not a GLB file")
+    magic, version, length = struct.unpack_from("<III", data, 0)
+    if magic != _GLB_MAGIC or version != 2:
+        raise UnsupportedModelError("Not a glTF 2.0 binary")
+
+    gltf, binary = None, b""
+    offset = 12
+    while offset + 8 <= min(length, len(data)):
+        chunk_length, chunk_type = struct.unpack_from("<II", data, offset)
+        chunk = data[offset + 8 : offset + 8 + chunk_length]
+        if chunk_type == _CHUNK_JSON:
+            gltf = json.loads(chunk.decode("utf-8"))
+        elif chunk_type == _CHUNK_BIN and not binary:
+            binary = bytes(chunk)
+        offset += 8 + chunk_length
+
+    if gltf is None:
+        raise UnsupportedModelError("GLB has no JSON chunk")
+    return gltf, binary
+
+
+def write_glb(gltf: Dict[str, Any], binary: bytes) -> bytes:
+
+    document = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    document += b" " * (-len(document) % 4)
+    binary += b"\x00" * (-len(binary) % 4)
+
+    chunks = struct.pack("<II", len(document), _CHUNK_JSON) + document
+    if binary:
+        chunks += struct.pack("<II", len(binary), _CHUNK_BIN) + binary
+    return struct.pack("<III", _GLB_MAGIC, 2, 12 + len(chunks)) + chunks
+
+
+def read_accessor(gltf: Dict[str, Any], binary: bytes, index: int) -> np.ndarray:
+    """Accessor contents as an (count, width) array; normalized integers become floats."""
+    accessor = gltf["accessors"][index]
+    if "sparse" in accessor:
+        raise UnsupportedModelError("Sparse accessors are not supported")
+
+    dtype = np.dtype(_COMPONENT_DTYPES[accessor["componentType"]]).newbyteorder("<")
+    width = _TYPE_WIDTHS[accessor["type"]]
+    count = accessor["count"]
+    if "bufferView" not in accessor:
+        return np.zeros((count, width), dtype=dtype)
+
+    view = gltf["bufferViews"][accessor["bufferView"]]
+    if view.get("buffer", 0) != 0:
+        raise UnsupportedModelError("Only the embedded GLB buffer is supported")
+    start = view.get("byteOffset", 0) + accessor.get("byteOffset", 0)
+    element = dtype.itemsize * width
+    stride = view.get("byteStride") or element
+
+    if stride == element:
+        values = np.frombuffer(binary, dtype=dtype, count=count * width, offset=start)
+    else:
+        raw = np.frombuffer(binary, dtype=np.uint8, count=(count - 1) * stride + element, offset=start)
+        rows = np.lib.stride_tricks.as_strided(raw, shape=(count, element), strides=(stride, 1))
+        values = np.ascontiguousarray(rows).view(dtype)
+    values = values.reshape(count, width)
+
+    if accessor.get("normalized") and dtype.kind in "iu":
+        values = np.maximum(values / np.iinfo(dtype).max, -1.0).astype(np.float32)
+    return values
+
+
+# --------------------
+# Decimation
+# --------------------
+
+def _cluster(positions: np.ndarray, triangles: np.ndarray, resolution: int):
+
+    low = positions.min(axis=0)
+    extent = float((positions.max(axis=0) - low).max()) or 1.0
+    cells = np.floor((positions - low) * (resolution / extent)).astype(np.int64)
+    cells = np.clip(cells, 0, resolution - 1)
+    keys = (cells[:, 0] * resolution + cells[:, 1]) * resolution + cells[:, 2]
+    _, cluster_of = np.unique(keys, return_inverse=True)
+    cluster_of = cluster_of.reshape(-1)
+
+    merged = cluster_of[triangles]
+    alive = (
+        (merged[:, 0] != merged[:, 1])
+        & (merged[:, 1] != merged[:, 2])
+        & (merged[:, 0] != merged[:, 2])
+    )
+    merged = merged[alive]
+    # Faces that collapsed onto the same three clusters are kept once
+    _, first = np.unique(np.sort(merged, axis=1), axis=0, return_index=True)
+    return cluster_of, merged[np.sort(first)]
+
+
+def decimate(
+    attributes: Dict[str, np.ndarray], triangles: np.ndarray, ratio: float
+) -> Tuple[Dict[str, np.ndarray], np.ndarray]:
+    """
+    Reduce a triangle list to about ``ratio`` of its faces. Merged vertices
+    take the mean of their attributes (normals are renormalized).
+    """
+    positions = attributes["POSITION"].astype(np.float64)
+    target = max(1, int(len(triangles) * ratio))
+    if ratio >= 1.0 or len(triangles) <= target:
+        return attributes, triangles
+
+    # More cells keep more faces; bisect for the finest grid under target
+    low, high = 1, 1 << 20
+    best = None
+    while low <= high:
+        resolution = (low + high) // 2
+        cluster_of, faces = _cluster(positions, triangles, resolution)
+        if len(faces) <= target:
+            best = (cluster_of, faces)
+            low = resolution + 1
+        else:
+            high = resolution - 1
+    if best is None:
+        best = _cluster(positions, triangles, 1)
+    cluster_of, faces = best
+
+    # Renumber the clusters still referenced by a face
+    used, faces = np.unique(faces, return_inverse=True)
+    faces = faces.reshape(-1, 3)
+    counts = np.bincount(cluster_of, minlength=int(cluster_of.max()) + 1)[used]
+
+    reduced = {}
+    for name, values in attributes.items():
+        sums = np.zeros((int(cluster_of.max()) + 1, values.shape[1]), dtype=np.float64)
+        np.add.at(sums, cluster_of, values.astype(np.float64))
+        mean = sums[used] / counts[:, None]
+        if name == "NORMAL":
+            lengths = np.linalg.norm(mean, axis=1, keepdims=True)
+            mean = np.divide(mean, lengths, out=np.zeros_like(mean), where=lengths > 0)
+        reduced[name] = mean.astype(np.float32)
+    return reduced, faces.astype(np.uint32)
+
+
+# --------------------
+# Scene bounds
+# --------------------
+
+def _node_matrix(node: Dict[str, Any]) -> np.ndarray:
+
+    if "matrix" in node:
+        return np.array(node["matrix"], dtype=np.float64).reshape(4, 4).T
+    x, y, z, w = node.get("rotation", (0.0, 0.0, 0.0, 1.0))
+    rotation = np.array(
+        [
+            [1 - 2 * (y * y + z * z), 2 * (x * y - z * w), 2 * (x * z + y * w)],
+            [2 * (x * y + z * w), 1 - 2 * (x * x + z * z), 2 * (y * z - x * w)],
+            [2 * (x * z - y * w), 2 * (y * z + x * w), 1 - 2 * (x * x + y * y)],
+        ]
+    )
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation * np.array(node.get("scale", (1.0, 1.0, 1.0)))
+    matrix[:3, 3] = node.get("translation", (0.0, 0.0, 0.0))
+    return matrix
+
+
+def scene_bounds(gltf: Dict[str, Any], mesh_bounds: Dict[int, Tuple[np.ndarray, np.ndarray]]):
+    """World-space axis-aligned bounds of every mesh instance in the default scene."""
+    nodes = gltf.get("nodes", [])
+    scenes = gltf.get("scenes") or [{"nodes": list(range(len(nodes)))}]
+    roots = scenes[gltf.get("scene", 0)].get("nodes", [])
+
+    corners = []
+    stack = [(index, np.eye(4)) for index in roots]
+    seen = set()
+    while stack:
+        index, parent = stack.pop()
+        if index in seen:
+            continue
+        seen.add(index)
+        node = nodes[index]
+        world = parent @ _node_matrix(node)
+        if node.get("mesh") in mesh_bounds:
+            low, high = mesh_bounds[node["mesh"]]
+            box = np.array(
+                [[x, y, z, 1.0] for x in (low[0], high[0]) for y in (low[1], high[1]) for z in (low[2], high[2])]
+            )
+            corners.append((box @ world.T)[:, :3])
+        stack.extend((child, world) for child in node.get("children", []))
+
+    if not corners:
+        # Meshes no node places are measured in their own space
+        corners = [np.array(bounds) for bounds in mesh_bounds.values()]
+    if not corners:
+        return None
+    points = np.vstack(corners)
+    low, high = points.min(axis=0), points.max(axis=0)
+    return {
+        "min": [round(float(v), 6) for v in low],
+        "max": [round(float(v), 6) for v in high],
+        "size": [round(float(v), 6) for v in high - low],
+    }
+
+
+# --------------------
+# Model processing
+# --------------------
+
+def _check_supported(gltf: Dict[str, Any]) -> None:
+
+    if gltf.get("skins") or gltf.get("animations"):
+        raise UnsupportedModelError("Skinned or animated models are not decimated")
+    extensions = set(gltf.get("extensionsUsed", [])) & _UNSUPPORTED_EXTENSIONS
+    if extensions:
+        raise UnsupportedModelError(f"Compressed meshes are not supported: {sorted(extensions)}")
+    for mesh in gltf.get("meshes", []):
+        for primitive in mesh.get("primitives", []):
+            if primitive.get("targets"):
+                raise UnsupportedModelError("Morph targets are not supported")
+
+
+def _load_primitive(gltf, binary, primitive) -> Optional[Tuple[Dict[str, np.ndarray], np.ndarray]]:
+
+    if primitive.get("mode", _TRIANGLES) != _TRIANGLES or "POSITION" not in primitive["attributes"]:
+        return None
+    attributes = {
+        name: read_accessor(gltf, binary, primitive["attributes"][name]).astype(np.float32)
+        for name in _KEPT_ATTRIBUTES
+        if name in primitive["attributes"]
+    }
+    vertex_count = len(attributes["POSITION"])
+    if "indices" in primitive:
+        indices = read_accessor(gltf, binary, primitive["indices"]).reshape(-1).astype(np.int64)
+    else:
+        indices = np.arange(vertex_count, dtype=np.int64)
+    indices = indices[: len(indices) - len(indices) % 3].reshape(-1, 3)
+    return attributes, indices
+
+
+class _BufferWriter:
+
+    def __init__(self, gltf: Dict[str, Any]):
+        self.gltf = gltf
+        self.data = bytearray()
+        gltf["bufferViews"] = []
+        gltf["accessors"] = []
+
+    def view(self, payload: bytes, target: Optional[int] = None) -> int:
+        self.data += b"\x00" * (-len(self.data) % 4)
+        view = {"buffer": 0, "byteOffset": len(self.data), "byteLength": len(payload)}
+        if target is not None:
+            view["target"] = target
+        self.data += payload
+        self.gltf["bufferViews"].append(view)
+        return len(self.gltf["bufferViews"]) - 1
+
+    def accessor(self, values: np.ndarray, kind: str, target: int, bounds: bool = False) -> int:
+        values = np.ascontiguousarray(values)
+        component = 5125 if values.dtype == np.uint32 else 5126
+        accessor = {
+            "bufferView": self.view(values.astype(values.dtype.newbyteorder("<")).tobytes(), target),
+            "componentType": component,
+            "count": int(values.shape[0]) if kind != "SCALAR" else int(values.size),
+            "type": kind,
+        }
+        if bounds:
+            accessor["min"] = [float(v) for v in values.min(axis=0)]
+            accessor["max"] = [float(v) for v in values.max(axis=0)]
+        self.gltf["accessors"].append(accessor)
+        return len(self.gltf["accessors"]) - 1
+
+
+def _build_level(gltf, binary, loaded, ratio) -> Tuple[bytes, int, int]:
+
+    out = copy.deepcopy(gltf)
+    writer = _BufferWriter(out)
+
+    # Embedded textures are copied into the new buffer as they are
+    for image in out.get("images", []):
+        if "bufferView" in image:
+            view = gltf["bufferViews"][image["bufferView"]]
+            start = view.get("byteOffset", 0)
+            image["bufferView"] = writer.view(binary[start : start + view["byteLength"]])
+        elif "uri" in image and not image["uri"].startswith("data:"):
+            # Levels live one folder below the source model
+            image["uri"] = f"../{image['uri']}"
+
+    triangles = vertices = 0
+    for mesh_index, mesh in enumerate(out.get("meshes", [])):
+        primitives = []
+        for primitive_index, primitive in enumerate(mesh.get("primitives", [])):
+            source = loaded.get((mesh_index, primitive_index))
+            if source is None:
+                continue
+            attributes, faces = decimate(*source, ratio)
+            if len(faces) == 0:
+                continue
+            primitive["attributes"] = {
+                name: writer.accessor(
+                    values,
+                    {2: "VEC2", 3: "VEC3", 4: "VEC4"}[values.shape[1]],
+                    34962,
+                    bounds=name == "POSITION",
+                )
+                for name, values in attributes.items()
+            }
+            primitive["indices"] = writer.accessor(
+                faces.reshape(-1).astype(np.uint32), "SCALAR", 34963
+            )
+            primitive["mode"] = _TRIANGLES
+            primitives.append(primitive)
+            triangles += len(faces)
+            vertices += len(attributes["POSITION"])
+        mesh["primitives"] = primitives
+
+    out["buffers"] = [{"byteLength": len(writer.data) + (-len(writer.data) % 4)}]
+    out.setdefault("asset", {"version": "2.0"})
+    out["asset"]["generator"] = "GoClimb LOD"
+    return write_glb(out, bytes(writer.data)), triangles, vertices
+
+
+def build_lods(data: bytes, ratios: Tuple[float, ...] = MODEL_LOD_RATIOS) -> Dict[str, Any]:
+    """
+    Decimated GLBs for ``data`` plus its stats. Returns ``{"bounds", "stats",
+    "levels": [(ratio, glb_bytes, triangles, vertices), ...]}``; ``levels``
+    is empty when the model cannot be decimated.
+    """
+    gltf, binary = read_glb(data)
+
+    loaded = {}
+    mesh_bounds = {}
+    triangles = vertices = 0
+    for mesh_index, mesh in enumerate(gltf.get("meshes", [])):
+        for primitive_index, primitive in enumerate(mesh.get("primitives", [])):
+            source = _load_primitive(gltf, binary, primitive)
+            if source is None:
+                continue
+            loaded[(mesh_index, primitive_index)] = source
+            positions = source[0]["POSITION"]
+            triangles += len(source[1])
+            vertices += len(positions)
+            if len(positions):
+                low, high = positions.min(axis=0), positions.max(axis=0)
+                if mesh_index in mesh_bounds:
+                    low = np.minimum(low, mesh_bounds[mesh_index][0])
+                    high = np.maximum(high, mesh_bounds[mesh_index][1])
+                mesh_bounds[mesh_index] = (low, high)
+
+    result = {
+        "bounds": scene_bounds(gltf, mesh_bounds),
+        "stats": {
+            "triangles": triangles,
+            "vertices": vertices,
+            "meshes": len(gltf.get("meshes", [])),
+            "materials": len(gltf.get("materials", [])),
+            "textures": len(gltf.get("textures", [])),
+        },
+        "levels": [],
+    }
+    try:
+        _check_supported(gltf)
+    except UnsupportedModelError as e:
+        result["unsupported"] = str(e)
+        return result
+
+    for ratio in sorted(ratios, reverse=True):
+        glb, level_triangles, level_vertices = _build_level(gltf, binary, loaded, ratio)
+        result["levels"].append((ratio, glb, level_triangles, level_vertices))
+    return result
+
+
+def generate_model_lods(model_id: int, paths: List[str], bucket=None) -> Dict[str, Any]:
+    """
+    Build, upload and record the LOD levels of each GLB in ``paths`` for the
+    crag model ``model_id``; returns the updated manifest. Files that vanished
+    or are too large keep only their full-detail level.
+    """
+    from firebase_admin import storage
+    from google.api_core.exceptions import NotFound
+
+    from MyApp.Entity.cragmodel import CragModel
+    from MyApp.Firebase.helpers import invalidate_signed_url_cache, record_media_objects
+
+    bucket = bucket or storage.bucket()
+    manifest = dict(
+        CragModel.objects.filter(pk=model_id).values_list("lod_manifest", flat=True).first() or {}
+    )
+    written: List[Dict[str, Any]] = []
+
+    for path in paths:
+        blob = bucket.blob(path)
+        try:
+            data = blob.download_as_bytes()
+        except NotFound:
+            manifest.pop(path, None)
+            continue
+
+        entry: Dict[str, Any] = {
+            "levels": [
+                {"name": "lod0", "ratio": 1.0, "path": path, "size": len(data)},
+            ]
+        }
+        if len(data) > MODEL_LOD_MAX_BYTES:
+            entry["unsupported"] = "Model is too large to decimate"
+            manifest[path] = entry
+            continue
+
+        lods = build_lods(data)
+        entry["bounds"] = lods["bounds"]
+        entry["stats"] = lods["stats"]
+        entry["levels"][0].update(triangles=lods["stats"]["triangles"], vertices=lods["stats"]["vertices"])
+        if "unsupported" in lods:
+            entry["unsupported"] = lods["unsupported"]
+
+        for level, (ratio, glb, triangles, vertices) in enumerate(lods["levels"], start=1):
+            target = lod_path(path, level)
+            lod_blob = bucket.blob(target)
+            lod_blob.metadata = {"source": path, "lod": str(level), "ratio": str(ratio)}
+            lod_blob.upload_from_file(io.BytesIO(glb), content_type=GLB_CONTENT_TYPE)
+            written.append({"path": target, "size": len(glb), "content_type": GLB_CONTENT_TYPE})
+            entry["levels"].append(
+                {
+                    "name": f"lod{level}",
+                    "ratio": ratio,
+                    "path": target,
+                    "size": len(glb),
+                    "triangles": triangles,
+                    "vertices": vertices,
+                }
+            )
+        manifest[path] = entry
+
+    # Manifest first, then the media rows, whose write expires cached responses
+    CragModel.objects.filter(pk=model_id).update(lod_manifest=manifest)
+    record_media_objects(written)
+    for folder in {entry["path"].rpartition("/")[0] for entry in written}:
+        invalidate_signed_url_cache(folder)
+    return manifest
+
+
+def lightest_first(levels: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+
+    return sorted(levels, key=lambda level: (level.get("ratio", 1.0), level["name"]))
+
+
+def is_lod_path(path: str) -> bool:
+
+    return f"/{LOD_FOLDER}/" in path
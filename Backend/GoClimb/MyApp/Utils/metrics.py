@@ -0,0 +1,260 @@
+"""
+Per-request instrumentation: SQL queries, Firebase Storage calls, other
+outbound HTTP calls and serializer time.
+
+``RequestMetricsMiddleware`` opens a ``RequestMetrics`` for each request in a
+context variable; the hooks installed by ``install_instrumentation`` (a
+database execute wrapper, a wrapper around ``requests.Session.request`` --
+which google-cloud-storage, Stripe and the geocoder all go through -- and
+wrappers around the DRF serializer ``data`` properties) add to whichever
+request is current. Totals are aggregated per view name in this process and
+rendered in Prometheus text format by ``render_prometheus``; with several
+gunicorn workers each worker reports its own series.
+"""
+
+import contextvars
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+import requests
+from rest_framework import serializers
+
+STORAGE_HOSTS = ("storage.googleapis.com", "firebasestorage.googleapis.com")
+
+# (kind, Server-Timing name, unit used in the description)
+TIMED_KINDS = (
+    ("db", "db", "queries"),
+    ("storage", "storage", "calls"),
+    ("http", "http", "calls"),
+    ("serializer", "serialize", None),
+)
+
+
+class RequestMetrics:
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.counts: Dict[str, int] = {kind: 0 for kind, _, _ in TIMED_KINDS}
+        self.seconds: Dict[str, float] = {kind: 0.0 for kind, _, _ in TIMED_KINDS}
+        self.serializing = False
+        # Worker threads started with the request's context add to it too
+        self._lock = threading.Lock()
+
+    def add(self, kind: str, elapsed: float) -> None:
+        with self._lock:
+            self.counts[kind] += 1
+            self.seconds[kind] += elapsed
+
+    @property
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started
+
+    def server_timing(self) -> str:
+        parts = []
+        for kind, name, unit in TIMED_KINDS:
+            if not self.counts[kind]:
+                continue
+            part = f"{name};dur={self.seconds[kind] * 1000:.1f}"
+            if unit:
+                part += f';desc="{self.counts[kind]} {unit}"'
+            parts.append(part)
+        parts.append(f"total;dur={self.elapsed * 1000:.1f}")
+        return ", ".join(parts)
+
+    def as_log_fields(self) -> Dict[str, float]:
+        fields: Dict[str, float] = {"duration_ms": round(self.elapsed * 1000, 1)}
+        for kind, _, unit in TIMED_KINDS:
+            if unit:
+                fields[f"{kind}_{unit}"] = self.counts[kind]
+            fields[f"{kind}_ms"] = round(self.seconds[kind] * 1000, 1)
+        return fields
+
+
+_current: "contextvars.ContextVar[Optional[RequestMetrics]]" = contextvars.ContextVar(
+    "goclimb_request_metrics", default=None
+)
+
+
+def start_request() -> contextvars.Token:
+    return _current.set(RequestMetrics())
+
+
+def finish_request(token: contextvars.Token) -> Optional[RequestMetrics]:
+    metrics = _current.get()
+    _current.reset(token)
+    return metrics
+
+
+def current_metrics() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+# ---------------------------------------------------------------------------
+# Hooks
+# ---------------------------------------------------------------------------
+
+def db_execute_wrapper(execute, sql, params, many, context):
+
+    metrics = _current.get()
+    if metrics is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        metrics.add("db", time.perf_counter() - start)
+
+
+def _outbound_kind(url: str) -> str:
+
+    host = urlsplit(str(url)).hostname or ""
+    return "storage" if host in STORAGE_HOSTS else "http"
+
+
+def _wrap_session_request(request):
+
+    def instrumented_request(self, method, url, *args, **kwargs):
+        metrics = _current.get()
+        if metrics is None:
+            return request(self, method, url, *args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return request(self, method, url, *args, **kwargs)
+        finally:
+            metrics.add(_outbound_kind(url), time.perf_counter() - start)
+
+    instrumented_request.__wrapped__ = request
+    instrumented_request._request_metrics = True
+    return instrumented_request
+
+
+def _wrap_serializer_data(prop):
+
+    fget = prop.fget
+
+    def data(self):
+        metrics = _current.get()
+        # Only the outermost .data is timed; nested serializers render inside it
+        if metrics is None or metrics.serializing:
+            return fget(self)
+        metrics.serializing = True
+        start = time.perf_counter()
+        try:
+            return fget(self)
+        finally:
+            metrics.serializing = False
+            metrics.add("serializer", time.perf_counter() - start)
+
+    data.__wrapped__ = fget
+    data._request_metrics = True
+    return property(data)
+
+
+_install_lock = threading.Lock()
+
+
+def _instrumented(func) -> bool:
+
+    return getattr(func, "_request_metrics", False)
+
+
+def install_instrumentation() -> None:
+    """
+    Install the outbound-HTTP and serializer hooks; only called when
+    REQUEST_METRICS_ENABLED. Each target is checked for an existing hook, so
+    calling this again (or after a module reload) never wraps twice.
+    """
+    with _install_lock:
+        if not _instrumented(requests.Session.request):
+            requests.Session.request = _wrap_session_request(requests.Session.request)
+        for cls in (serializers.Serializer, serializers.ListSerializer):
+            if not _instrumented(cls.data.fget):
+                cls.data = _wrap_serializer_data(cls.data)
+
+
+# ---------------------------------------------------------------------------
+# Per-view aggregation and Prometheus exposition
+# ---------------------------------------------------------------------------
+
+class _ViewStats:
+
+    def __init__(self):
+        self.requests = 0
+        self.seconds = 0.0
+        self.counts: Dict[str, int] = {kind: 0 for kind, _, _ in TIMED_KINDS}
+        self.kind_seconds: Dict[str, float] = {kind: 0.0 for kind, _, _ in TIMED_KINDS}
+        self.max_queries = 0
+
+
+_view_stats: "OrderedDict[str, _ViewStats]" = OrderedDict()
+_stats_lock = threading.Lock()
+
+
+def record_request(view_name: str, metrics: RequestMetrics) -> None:
+
+    with _stats_lock:
+        stats = _view_stats.get(view_name)
+        if stats is None:
+            stats = _view_stats[view_name] = _ViewStats()
+        stats.requests += 1
+        stats.seconds += metrics.elapsed
+        for kind, _, _ in TIMED_KINDS:
+            stats.counts[kind] += metrics.counts[kind]
+            stats.kind_seconds[kind] += metrics.seconds[kind]
+        stats.max_queries = max(stats.max_queries, metrics.counts["db"])
+
+
+def reset_metrics() -> None:
+    with _stats_lock:
+        _view_stats.clear()
+
+
+def _label(value: str) -> str:
+
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_prometheus() -> str:
+
+    with _stats_lock:
+        snapshot = [
+            (view, stats.requests, stats.seconds, dict(stats.counts),
+             dict(stats.kind_seconds), stats.max_queries)
+            for view, stats in _view_stats.items()
+        ]
+
+    families = [
+        ("goclimb_requests_total", "counter", "Requests handled.",
+         lambda row: row[1]),
+        ("goclimb_request_seconds_total", "counter", "Wall time spent handling requests.",
+         lambda row: row[2]),
+        ("goclimb_db_queries_total", "counter", "SQL queries executed.",
+         lambda row: row[3]["db"]),
+        ("goclimb_db_seconds_total", "counter", "Time spent executing SQL.",
+         lambda row: row[4]["db"]),
+        ("goclimb_db_queries_max", "gauge", "Most SQL queries seen in a single request.",
+         lambda row: row[5]),
+        ("goclimb_storage_calls_total", "counter", "Firebase Storage API calls.",
+         lambda row: row[3]["storage"]),
+        ("goclimb_storage_seconds_total", "counter", "Time spent in Firebase Storage calls.",
+         lambda row: row[4]["storage"]),
+        ("goclimb_http_calls_total", "counter", "Other outbound HTTP calls (geocoding, Stripe, ...).",
+         lambda row: row[3]["http"]),
+        ("goclimb_http_seconds_total", "counter", "Time spent in other outbound HTTP calls.",
+         lambda row: row[4]["http"]),
+        ("goclimb_serializer_seconds_total", "counter", "Time spent rendering serializers.",
+         lambda row: row[4]["serializer"]),
+    ]
+
+    lines = []
+    for name, metric_type, help_text, value in families:
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {metric_type}")
+        for row in snapshot:
+            number = value(row)
+            formatted = f"{number:.6f}" if isinstance(number, float) else str(number)
+            lines.append(f'{name}{{view="{_label(row[0])}"}} {formatted}')
+    return "\n".join(lines) + "\n"
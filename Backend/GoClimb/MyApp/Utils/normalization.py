@@ -0,0 +1,113 @@
+"""
+Server-side application of ``CragModel.normalization_data``.
+
+The app stores a model's alignment as
+
+    {"scale": 0.001, "pos_offset": {"x", "y", "z"}, "rot_offset": {"x", "y", "z"}}
+
+with the rotation in degrees, and the viewer places the mesh (and the traced
+routes with it) at ``pos_offset + R @ (scale * p)``. ``R`` follows Unity's
+``Quaternion.Euler``: the z rotation first, then x, then y. Missing values
+take the same defaults as the app.
+
+``normalize_point_sets`` transforms every route of a model in one matrix
+product. ``normalization_version`` hashes the parsed values, so a cache keyed
+by it can never serve points from an older alignment.
+"""
+
+import hashlib
+import json
+from typing import Any, Dict, List
+
+import numpy as np
+
+from MyApp.Exceptions.exceptions import InvalidNormalizationError
+
+# Mirrors the app's defaults for models uploaded without normalization data
+DEFAULT_SCALE = 0.001
+DEFAULT_POS_OFFSET = {"x": 0.0, "y": 0.0, "z": 0.0}
+DEFAULT_ROT_OFFSET = {"x": 90.0, "y": 0.0, "z": 0.0}
+_AXES = ("x", "y", "z")
+
+
+def _number(value: Any, field: str) -> float:
+
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise InvalidNormalizationError(f"{field} must be a number.")
+    if not np.isfinite(number):
+        raise InvalidNormalizationError(f"{field} must be finite.")
+    return number
+
+
+def _vector(value: Any, defaults: Dict[str, float], field: str) -> List[float]:
+
+    if value is None:
+        value = {}
+    if not isinstance(value, dict):
+        raise InvalidNormalizationError(f"{field} must be an object with x, y and z.")
+    return [_number(value.get(axis, defaults[axis]), f"{field}.{axis}") for axis in _AXES]
+
+
+def parse_normalization(data: Any) -> Dict[str, Any]:
+    """Canonical ``{"scale", "pos_offset", "rot_offset"}`` with defaults filled in."""
+    if data is None:
+        data = {}
+    if isinstance(data, str):
+        try:
+            data = json.loads(data)
+        except ValueError:
+            raise InvalidNormalizationError("normalization_data is not valid JSON.")
+    if not isinstance(data, dict):
+        raise InvalidNormalizationError("normalization_data must be an object.")
+
+    scale = _number(data.get("scale", DEFAULT_SCALE), "scale")
+    if scale == 0:
+        raise InvalidNormalizationError("scale must not be zero.")
+    return {
+        "scale": scale,
+        "pos_offset": dict(zip(_AXES, _vector(data.get("pos_offset"), DEFAULT_POS_OFFSET, "pos_offset"))),
+        "rot_offset": dict(zip(_AXES, _vector(data.get("rot_offset"), DEFAULT_ROT_OFFSET, "rot_offset"))),
+    }
+
+
+def normalization_version(normalization: Dict[str, Any]) -> str:
+    """Short stable hash of a parsed normalization."""
+    canonical = json.dumps(normalization, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(canonical.encode()).hexdigest()[:16]
+
+
+def rotation_matrix(degrees: Dict[str, float]) -> np.ndarray:
+    """Unity's Euler rotation: Ry @ Rx @ Rz."""
+    x, y, z = np.radians([degrees[axis] for axis in _AXES])
+    rx = np.array([[1, 0, 0], [0, np.cos(x), -np.sin(x)], [0, np.sin(x), np.cos(x)]])
+    ry = np.array([[np.cos(y), 0, np.sin(y)], [0, 1, 0], [-np.sin(y), 0, np.cos(y)]])
+    rz = np.array([[np.cos(z), -np.sin(z), 0], [np.sin(z), np.cos(z), 0], [0, 0, 1]])
+    return ry @ rx @ rz
+
+
+def normalization_matrix(normalization: Dict[str, Any]) -> np.ndarray:
+    """4x4 affine matrix for a parsed normalization."""
+    matrix = np.eye(4)
+    matrix[:3, :3] = rotation_matrix(normalization["rot_offset"]) * normalization["scale"]
+    matrix[:3, 3] = [normalization["pos_offset"][axis] for axis in _AXES]
+    return matrix
+
+
+def normalize_point_sets(point_sets: List[np.ndarray], matrix: np.ndarray) -> List[np.ndarray]:
+    """
+    Transform each (n, 2) or (n, 3) array by ``matrix`` in a single product;
+    2D points are taken to lie at z = 0. Returns (n, 3) arrays in order.
+    """
+    if not point_sets:
+        return []
+    counts = [len(points) for points in point_sets]
+    stacked = np.zeros((sum(counts), 3))
+    start = 0
+    for points in point_sets:
+        stacked[start : start + len(points), : points.shape[1]] = points
+        start += len(points)
+
+    transformed = stacked @ matrix[:3, :3].T + matrix[:3, 3]
+    return np.split(transformed, np.cumsum(counts)[:-1])
@@ -0,0 +1,152 @@
+"""
+Keyset (seek) pagination for list endpoints.
+
+A page is fetched with ``WHERE (sort key) < (last row's sort key) LIMIT n``
+instead of OFFSET, so deep pages cost the same as the first one and rows
+inserted while a client is paging do not shift later pages. The sort key is
+the queryset's ``order_by`` plus the primary key as a tie-breaker; the cursor
+is that key for the last row served, signed so clients cannot forge it.
+"""
+
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from django.core import signing
+from django.db.models import Q, QuerySet
+
+from MyApp.Exceptions.exceptions import InvalidCursorError
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+CURSOR_SALT = "MyApp.pagination"
+
+
+def _check_state(state: Any) -> Dict[str, Any]:
+    """The signed cursor payload, if it has the shape ``paginate_queryset`` writes."""
+    if not isinstance(state, dict):
+        raise InvalidCursorError("Invalid cursor.")
+    ordering, values = state.get("ordering"), state.get("values")
+    if (
+        not isinstance(state.get("scope"), str)
+        or not isinstance(ordering, list)
+        or not all(isinstance(entry, str) for entry in ordering)
+        or not isinstance(values, list)
+        or len(values) != len(ordering)
+    ):
+        raise InvalidCursorError("Invalid cursor.")
+    return state
+
+
+def parse_page_params(
+    params: Mapping[str, Any],
+) -> Tuple[Optional[Dict[str, Any]], int, Dict[str, str]]:
+    """
+    Read ``cursor`` and ``page_size`` from query params or a request body.
+    Returns (cursor state, page size, errors); errors is empty when valid.
+    """
+    errors = {}
+    state = None
+    page_size = DEFAULT_PAGE_SIZE
+
+    raw_size = params.get("page_size")
+    if raw_size not in (None, ""):
+        try:
+            page_size = int(raw_size)
+            if page_size < 1:
+                raise ValueError
+            page_size = min(page_size, MAX_PAGE_SIZE)
+        except (TypeError, ValueError):
+            errors["page_size"] = f"Must be an integer between 1 and {MAX_PAGE_SIZE}."
+
+    cursor = params.get("cursor")
+    if cursor not in (None, ""):
+        try:
+            if not isinstance(cursor, str):
+                raise InvalidCursorError("Invalid cursor.")
+            state = _check_state(signing.loads(cursor, salt=CURSOR_SALT))
+        except (signing.BadSignature, InvalidCursorError):
+            state = None
+            errors["cursor"] = "Invalid cursor."
+
+    return state, page_size, errors
+
+
+def _concrete_field(model, name: str):
+
+    for field in model._meta.concrete_fields:
+        if name in (field.name, field.attname):
+            return field
+    raise ValueError(f"Cannot paginate on {name!r}.")
+
+
+def _keyset(queryset: QuerySet) -> List[Tuple[str, bool]]:
+    """(field name, descending) pairs, always ending with the primary key."""
+    model = queryset.model
+    ordering = list(queryset.query.order_by) or list(model._meta.ordering)
+
+    keys = []
+    for entry in ordering:
+        if not isinstance(entry, str) or entry == "?":
+            raise ValueError(f"Cannot paginate on ordering {entry!r}.")
+        descending = entry.startswith("-")
+        name = entry.lstrip("-")
+        if name == "pk":
+            name = model._meta.pk.name
+        field = _concrete_field(model, name)
+        keys.append((field.attname, descending))
+
+    pk_name = model._meta.pk.attname
+    if pk_name not in (name for name, _ in keys):
+        keys.append((pk_name, keys[-1][1] if keys else False))
+    return keys
+
+
+def _after_position(keys: List[Tuple[str, bool]], values: List[Any]) -> Q:
+    """Rows strictly after ``values`` in the keyset order."""
+    condition = Q()
+    for index, (name, descending) in enumerate(keys):
+        step = Q(**{f"{name}__{'lt' if descending else 'gt'}": values[index]})
+        for earlier in range(index):
+            step &= Q(**{keys[earlier][0]: values[earlier]})
+        condition |= step
+    return condition
+
+
+def paginate_queryset(
+    queryset: QuerySet,
+    cursor: Optional[Dict[str, Any]] = None,
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> Tuple[list, Optional[str]]:
+    """
+    One page of ``queryset`` (which should already be ordered) after the
+    position in ``cursor``, and the cursor for the next page or None on the
+    last page.
+    """
+    model = queryset.model
+    keys = _keyset(queryset)
+    scope = model._meta.label_lower
+    ordering = [f"{'-' if descending else ''}{name}" for name, descending in keys]
+
+    if cursor is not None:
+        if cursor.get("scope") != scope or cursor.get("ordering") != ordering:
+            raise InvalidCursorError("Cursor does not belong to this list.")
+        values = [
+            _concrete_field(model, name).to_python(value)
+            for (name, _), value in zip(keys, cursor["values"])
+        ]
+        queryset = queryset.filter(_after_position(keys, values))
+
+    rows = list(queryset.order_by(*ordering)[: page_size + 1])
+    if len(rows) <= page_size:
+        return rows, None
+
+    rows = rows[:page_size]
+    last = rows[-1]
+    values = []
+    for name, _ in keys:
+        value = getattr(last, name)
+        values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+
+    next_cursor = signing.dumps(
+        {"scope": scope, "ordering": ordering, "values": values}, salt=CURSOR_SALT
+    )
+    return rows, next_cursor
@@ -0,0 +1,65 @@
+"""
+Denormalized like and comment counters on ``post``.
+
+``Post.like_count`` and ``Post.comment_count`` are adjusted with F()
+expressions by the signal handlers in ``MyApp.signals`` whenever a like or
+comment row is created or deleted, inside the same transaction as that write.
+``reconcile_post_counters`` recomputes them from ``post_like`` and
+``post_comment`` and is meant to run periodically to repair any drift (raw
+SQL writes, restores, bulk operations that bypass signals).
+"""
+
+from typing import Iterable, Optional
+
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from MyApp.Entity.post import Post
+from MyApp.Entity.postcomment import PostComment
+from MyApp.Entity.postlikes import PostLike
+
+COUNTER_FIELDS = ("like_count", "comment_count")
+
+
+def adjust_post_counter(post_id: int, field: str, delta: int) -> None:
+    """Atomically add ``delta`` to one counter, never going below zero."""
+    if field not in COUNTER_FIELDS:
+        raise ValueError(f"Unknown post counter '{field}'")
+    Post.objects.filter(pk=post_id).update(**{field: Greatest(F(field) + delta, Value(0))})
+
+
+def _count_subquery(model):
+
+    counts = (
+        model.objects.filter(post_id=OuterRef("pk"))
+        .order_by()
+        .values("post_id")
+        .annotate(total=Count("*"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts, output_field=IntegerField()), Value(0))
+
+
+def reconcile_post_counters(post_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Reset counters that disagree with the source tables. Returns the number
+    of posts that were corrected.
+    """
+    posts = Post.objects.all()
+    if post_ids is not None:
+        posts = posts.filter(pk__in=list(post_ids))
+
+    drifted = (
+        posts.annotate(
+            actual_likes=_count_subquery(PostLike),
+            actual_comments=_count_subquery(PostComment),
+        )
+        .filter(~Q(like_count=F("actual_likes")) | ~Q(comment_count=F("actual_comments")))
+        .values_list("pk", "actual_likes", "actual_comments")
+    )
+
+    corrected = 0
+    for post_id, likes, comments in drifted.iterator():
+        Post.objects.filter(pk=post_id).update(like_count=likes, comment_count=comments)
+        corrected += 1
+    return corrected
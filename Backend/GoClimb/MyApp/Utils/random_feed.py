@@ -0,0 +1,96 @@
+"""
+Random feeds without ORDER BY RANDOM().
+
+Every sampled table carries an indexed ``random_key`` (uniform in [0, 1)),
+which puts its rows in one fixed, shuffled ring order shared by all sessions.
+A feed session starts at a random point on that ring and walks it in
+``(random_key, pk)`` order, wrapping once past 1.0 back to 0, and ends when it
+comes round to its start again; sessions differ only in where they start.
+Each page is an index range scan with a LIMIT, so its cost does not depend on
+table size. The walk visits every row at most once per session, which
+replaces the client-side blacklist: the opaque cursor (the start and the last
+position visited) is the whole "seen" state.
+"""
+
+import random
+from typing import List, Optional, Tuple
+
+from django.core import signing
+from django.db.models import Q, QuerySet
+
+from MyApp.Exceptions.exceptions import InvalidCursorError
+
+CURSOR_SALT = "MyApp.random_feed"
+
+
+def new_random_key() -> float:
+
+    return random.random()
+
+
+def _encode_cursor(state: dict) -> str:
+
+    return signing.dumps(state, salt=CURSOR_SALT, compress=True)
+
+
+def _decode_cursor(cursor: str, scope: str) -> dict:
+
+    try:
+        state = signing.loads(cursor, salt=CURSOR_SALT)
+    except signing.BadSignature:
+        raise InvalidCursorError("Invalid cursor.")
+
+    if not isinstance(state, dict) or state.get("scope") != scope:
+        raise InvalidCursorError("Cursor does not belong to this feed.")
+    return state
+
+
+def _after(key: float, pk: int) -> Q:
+
+    return Q(random_key__gt=key) | Q(random_key=key, pk__gt=pk)
+
+
+def sample_random_page(
+    queryset: QuerySet,
+    count: int,
+    scope: str,
+    cursor: Optional[str] = None,
+    exclude_ids: Optional[List[int]] = None,
+) -> Tuple[list, Optional[str]]:
+    """
+    Return the next ``count`` rows of the ring walk over ``queryset``,
+    starting at a random point, and the cursor for the page after it (None once the walk has come full
+    circle). ``scope`` ties a cursor to one feed so it cannot be replayed
+    against another.
+    """
+    if cursor:
+        state = _decode_cursor(cursor, scope)
+    else:
+        start = random.random()
+        state = {"scope": scope, "start": start, "key": start, "pk": 0, "wrapped": False}
+
+    if exclude_ids:
+        queryset = queryset.exclude(pk__in=exclude_ids)
+
+    rows: list = []
+    while len(rows) < count:
+        position = _after(state["key"], state["pk"])
+        if state["wrapped"]:
+            # Second lap: from 0 up to where the session started
+            window = queryset.filter(position, random_key__lt=state["start"])
+        else:
+            window = queryset.filter(position)
+
+        page = list(window.order_by("random_key", "pk")[: count - len(rows)])
+        rows.extend(page)
+        if page:
+            state["key"], state["pk"] = page[-1].random_key, page[-1].pk
+
+        if len(rows) >= count:
+            break
+        if state["wrapped"]:
+            return rows, None
+
+        state.update(wrapped=True, key=-1.0, pk=0)
+
+    return rows, _encode_cursor(state)
@@ -0,0 +1,179 @@
+"""
+Cache for read-mostly GET endpoints, invalidated by entity tags.
+
+``cached_response(*tags)`` wraps a DRF view function (below ``@api_view``).
+Successful responses are stored in the ``RESPONSE_CACHE_ALIAS`` cache (local
+memory by default, file-based when ``RESPONSE_CACHE_BACKEND=file``) under a
+key made of the view, the normalized query params and the current version of
+each tag. Saving or deleting a tagged model (see ``MyApp.signals``) or
+changing its files bumps the tag's version, so every dependent entry misses
+from then on and simply ages out. Every response carries a weak ``ETag``;
+a matching ``If-None-Match`` gets an empty 304.
+"""
+
+import functools
+import hashlib
+import json
+import time
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework import status
+from rest_framework.response import Response
+
+# Kept well under the 15 minute signed media URLs embedded in the payloads
+RESPONSE_CACHE_TIMEOUT = getattr(settings, "RESPONSE_CACHE_TIMEOUT", 300)
+RESPONSE_CACHE_ALIAS = getattr(settings, "RESPONSE_CACHE_ALIAS", "responses")
+CACHE_STATUS_HEADER = "X-Response-Cache"
+
+# Model -> tag, keyed by model label so this module imports no entities
+MODEL_TAGS = {
+    "MyApp.Crag": "crag",
+    "MyApp.Route": "route",
+    "MyApp.ClimbLog": "climb_log",
+    "MyApp.CragModel": "crag_model",
+    "MyApp.ModelRouteData": "model_route_data",
+    "MyApp.Post": "post",
+    "MyApp.User": "user",
+}
+
+
+def _cache():
+
+    return caches[RESPONSE_CACHE_ALIAS]
+
+
+def _tag_key(tag: str) -> str:
+
+    return f"response-tag:{tag}"
+
+
+def _tag_versions(tags: Iterable[str]) -> List[int]:
+
+    cache = _cache()
+    tags = list(tags)
+    found = cache.get_many([_tag_key(tag) for tag in tags])
+    versions = []
+    for tag in tags:
+        version = found.get(_tag_key(tag))
+        if version is None:
+            # A fresh nanosecond stamp, so a tag that was evicted never comes
+            # back with a version an old entry was stored under
+            cache.add(_tag_key(tag), time.time_ns(), timeout=None)
+            version = cache.get(_tag_key(tag))
+        versions.append(version)
+    return versions
+
+
+def tag_version(tag: str) -> int:
+    """Current version of ``tag``, for caches keyed outside ``cached_response``."""
+    return _tag_versions([tag])[0]
+
+
+def _bump(tags: List[str]) -> None:
+
+    cache = _cache()
+    cache.set_many({_tag_key(tag): time.time_ns() for tag in tags}, timeout=None)
+
+
+def invalidate_tags(tags: Iterable[str]) -> None:
+    """
+    Expire every cached response depending on ``tags``. Bumps now and again
+    after the surrounding transaction commits, so a request that read the old
+    rows mid-transaction cannot re-cache them under the new version.
+    """
+    tags = sorted({tag for tag in tags if tag})
+    if not tags:
+        return
+    _bump(tags)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: _bump(tags))
+
+
+def clear_response_cache() -> None:
+
+    _cache().clear()
+
+
+def normalized_params(query_params) -> str:
+    """Query params as canonical JSON: keys sorted, values stripped."""
+    items = sorted(
+        (key, [value.strip() for value in query_params.getlist(key)])
+        for key in query_params.keys()
+    )
+    return json.dumps(items, separators=(",", ":"))
+
+
+def compute_etag(data) -> str:
+
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+    return f'W/"{hashlib.sha256(payload.encode()).hexdigest()[:32]}"'
+
+
+def _etag_matches(header: Optional[str], etag: str) -> bool:
+
+    if not header:
+        return False
+    opaque = etag.removeprefix("W/")
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == opaque:
+            return True
+    return False
+
+
+def _respond(request, data, etag: str, cache_status: str) -> Response:
+
+    if _etag_matches(request.headers.get("If-None-Match"), etag):
+        response = Response(status=status.HTTP_304_NOT_MODIFIED)
+    else:
+        response = Response(data)
+    response["ETag"] = etag
+    response[CACHE_STATUS_HEADER] = cache_status
+    return response
+
+
+def cached_response(*tags: str, timeout: Optional[int] = None):
+    """Cache a GET view's 200 responses until one of ``tags`` changes."""
+
+    def decorator(view):
+        view_key = f"{view.__module__}.{view.__qualname__}"
+
+        @functools.wraps(view)
+        def wrapper(request, *args, **kwargs):
+            if request.method not in ("GET", "HEAD"):
+                return view(request, *args, **kwargs)
+
+            cache = _cache()
+            versions = ".".join(str(v) for v in _tag_versions(tags))
+            params = hashlib.sha256(normalized_params(request.query_params).encode()).hexdigest()
+            key = f"response:{view_key}:{hashlib.sha256(versions.encode()).hexdigest()[:16]}:{params}"
+
+            entry = cache.get(key)
+            if entry is not None:
+                # Hits skip the view, so they must pass its App Check gate here
+                from MyApp.Firebase.helpers import authenticate_app_check_token
+
+                auth_result = authenticate_app_check_token(request)
+                if not auth_result.get("success"):
+                    return Response(auth_result, status=status.HTTP_401_UNAUTHORIZED)
+                data, etag = entry
+                return _respond(request, data, etag, "hit")
+
+            response = view(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+
+            etag = compute_etag(response.data)
+            cache.set(
+                key,
+                (response.data, etag),
+                RESPONSE_CACHE_TIMEOUT if timeout is None else timeout,
+            )
+            return _respond(request, response.data, etag, "miss")
+
+        return wrapper
+
+    return decorator
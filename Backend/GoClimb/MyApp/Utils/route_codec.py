@@ -0,0 +1,261 @@
+"""
+Packed, quantized encoding of traced route coordinates.
+
+``ModelRouteData.route_data`` stays the free-form JSON the app sends; on save
+its points are also packed into ``ModelRouteData.route_points``:
+
+    header   "<4sBBHI"   magic b"GCRP", version, dims, flags, point count
+    origin   float64[dims]
+    step     float64[dims]
+    points   uint16[count * dims]   value = origin + q * step
+
+Each axis is quantized to 16 bits over its own range, so the error is at most
+half a step (under half a millimetre on a 50 m wall). The app traces routes as
+
+    {"route_name": .., "points": [{"order": 1, "pos": {"x", "y", "z"}}, ..]}
+
+and only the ``pos`` values are packed, sorted by ``order`` (flag bit 1); the
+orders and every other field stay in the JSON. Older rows with a
+``coordinates`` list of ``[x, y, z]`` lists or ``{"x", "y", "z"}`` dicts
+(flag bit 0) are packed too. Points in any other shape are not packed.
+
+``encode_route_page`` frames a page of rows for ``format=binary`` responses:
+
+    "<4sBxxxI"   magic b"GCRD", version, JSON header length
+    JSON header  {"model_id", "next_cursor", "routes": [...]}, space padded to 4 bytes
+    blobs        each row's ``route_points``, 4-byte aligned
+
+Every route in the header carries its ids, status, ``route_data`` without the
+packed points, the point ``orders`` (null for ``coordinates`` rows) and
+``points: [offset, length]`` into the blob section, or null (with the points
+left in ``route_data``) when the row has no packed points.
+``decode_route_page`` is the reference decoder. ``RoutePageRenderer`` lets
+DRF views answer ``?format=binary``.
+"""
+
+import json
+import struct
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+ROUTE_PAGE_CONTENT_TYPE = "application/vnd.goclimb.route-data"
+
+_POINTS_HEADER = struct.Struct("<4sBBHI")
+_POINTS_MAGIC = b"GCRP"
+_PAGE_HEADER = struct.Struct("<4sBxxxI")
+_PAGE_MAGIC = b"GCRD"
+_VERSION = 1
+_FLAG_KEYED = 1
+_FLAG_POSED = 2
+_AXES = ("x", "y", "z")
+_LEVELS = 65535
+
+
+def _pad(length: int) -> int:
+
+    return -length % 4
+
+
+def _numeric(values: Iterable[Any]) -> bool:
+
+    return all(not isinstance(value, bool) and isinstance(value, (int, float)) for value in values)
+
+
+def coordinate_array(coordinates: Any) -> Optional[Tuple[np.ndarray, bool]]:
+    """(points, keyed) for a uniform list of numeric points, else None."""
+    if not isinstance(coordinates, list) or not coordinates:
+        return None
+
+    first = coordinates[0]
+    if isinstance(first, dict):
+        axes = _AXES[: len(first)]
+        if len(axes) < 2 or tuple(first) != axes:
+            return None
+        rows = [
+            [point[axis] for axis in axes]
+            for point in coordinates
+            if isinstance(point, dict) and tuple(point) == axes
+        ]
+        keyed = True
+    elif isinstance(first, (list, tuple)):
+        if len(first) not in (2, 3):
+            return None
+        rows = [list(point) for point in coordinates if isinstance(point, (list, tuple))]
+        keyed = False
+    else:
+        return None
+
+    if len(rows) != len(coordinates):
+        return None
+    if not _numeric(value for row in rows for value in row):
+        return None
+    try:
+        points = np.array(rows, dtype=np.float64)
+    except ValueError:  # ragged lists
+        return None
+    if points.ndim != 2 or not np.isfinite(points).all():
+        return None
+    return points, keyed
+
+
+def posed_array(points: Any) -> Optional[Tuple[np.ndarray, List[Any]]]:
+    """
+    (positions sorted by order, the sorted orders) for the app's
+    ``[{"order", "pos": {"x", "y", "z"}}]`` points, else None.
+    """
+    if not isinstance(points, list) or not points:
+        return None
+
+    orders, rows = [], []
+    for point in points:
+        if not isinstance(point, dict) or set(point) != {"order", "pos"}:
+            return None
+        pos = point["pos"]
+        if not isinstance(pos, dict) or set(pos) != set(_AXES):
+            return None
+        orders.append(point["order"])
+        rows.append([pos[axis] for axis in _AXES])
+
+    if not _numeric(orders) or not _numeric(value for row in rows for value in row):
+        return None
+    positions = np.array(rows, dtype=np.float64)
+    if not np.isfinite(positions).all() or not np.isfinite(np.array(orders, dtype=np.float64)).all():
+        return None
+    index = sorted(range(len(orders)), key=orders.__getitem__)
+    return positions[index], [orders[i] for i in index]
+
+
+def route_point_array(route_data: Any) -> Optional[Tuple[np.ndarray, int, Optional[List[Any]]]]:
+    """
+    (points, flags, orders) for the packable points of ``route_data``, else
+    None. The app's ``points`` win over a ``coordinates`` list; ``orders`` is
+    None for the latter.
+    """
+    if not isinstance(route_data, dict):
+        return None
+    posed = posed_array(route_data.get("points"))
+    if posed is not None:
+        return posed[0], _FLAG_POSED, posed[1]
+    parsed = coordinate_array(route_data.get("coordinates"))
+    if parsed is not None:
+        return parsed[0], _FLAG_KEYED if parsed[1] else 0, None
+    return None
+
+
+def with_points(
+    route_data: Dict[str, Any], points: np.ndarray, flags: int, orders: Optional[List[Any]] = None
+) -> Dict[str, Any]:
+    """``route_data`` with its points replaced by ``points``, laid out as ``flags`` says."""
+    values = points.tolist()
+    if flags & _FLAG_POSED:
+        return {
+            **route_data,
+            "points": [{"order": order, "pos": dict(zip(_AXES, row))} for order, row in zip(orders, values)],
+        }
+    if flags & _FLAG_KEYED:
+        values = [dict(zip(_AXES[: points.shape[1]], row)) for row in values]
+    return {**route_data, "coordinates": values}
+
+
+def pack_route_data(route_data: Any) -> Optional[bytes]:
+    """Quantize and pack the points of ``route_data``; None if they cannot be packed."""
+    parsed = route_point_array(route_data)
+    if parsed is None:
+        return None
+    points, flags, _ = parsed
+
+    origin = points.min(axis=0)
+    extent = points.max(axis=0) - origin
+    step = np.where(extent > 0, extent / _LEVELS, 1.0)
+    quantized = np.rint((points - origin) / step).astype("<u2")
+
+    header = _POINTS_HEADER.pack(_POINTS_MAGIC, _VERSION, points.shape[1], flags, len(points))
+    return header + origin.astype("<f8").tobytes() + step.astype("<f8").tobytes() + quantized.tobytes()
+
+
+def unpack_points(blob: bytes) -> Tuple[np.ndarray, int]:
+    """Decode a ``route_points`` blob into (float64 array of shape (count, dims), flags)."""
+    blob = bytes(blob)
+    magic, version, dims, flags, count = _POINTS_HEADER.unpack_from(blob, 0)
+    if magic != _POINTS_MAGIC or version != _VERSION:
+        raise ValueError("Not a packed route points blob.")
+
+    offset = _POINTS_HEADER.size
+    origin = np.frombuffer(blob, "<f8", dims, offset)
+    step = np.frombuffer(blob, "<f8", dims, offset + 8 * dims)
+    quantized = np.frombuffer(blob, "<u2", count * dims, offset + 16 * dims).reshape(count, dims)
+    return origin + quantized * step, flags
+
+
+def encode_route_page(
+    model_id: str, rows: Iterable[Dict[str, Any]], next_cursor: Optional[str] = None
+) -> bytes:
+    """
+    Frame ``rows`` (dicts with ``model_route_data_id``, ``route_id``,
+    ``user_id``, ``status``, ``route_data``, ``route_points`` and
+    ``orders``) as one binary page. ``route_data`` is expected to omit the
+    packed points wherever ``route_points`` is set.
+    """
+    routes, blobs, offset = [], [], 0
+    for row in rows:
+        blob = row["route_points"]
+        points = None
+        if blob is not None:
+            blob = bytes(blob)
+            points = [offset, len(blob)]
+            blobs.append(blob + b"\x00" * _pad(len(blob)))
+            offset += len(blobs[-1])
+        routes.append(
+            {
+                "model_route_data_id": row["model_route_data_id"],
+                "route_id": row["route_id"],
+                "user_id": row["user_id"],
+                "status": row["status"],
+                "route_data": row["route_data"],
+                "orders": row["orders"] if points is not None else None,
+                "points": points,
+            }
+        )
+
+    header = json.dumps(
+        {"model_id": model_id, "next_cursor": next_cursor, "routes": routes},
+        separators=(",", ":"),
+    ).encode()
+    header += b" " * _pad(len(header))
+    return _PAGE_HEADER.pack(_PAGE_MAGIC, _VERSION, len(header)) + header + b"".join(blobs)
+
+
+def decode_route_page(data: bytes) -> Dict[str, Any]:
+    """Parse a binary page back into its header, with the points restored."""
+    magic, version, header_length = _PAGE_HEADER.unpack_from(data, 0)
+    if magic != _PAGE_MAGIC or version != _VERSION:
+        raise ValueError("Not a binary route data page.")
+
+    start = _PAGE_HEADER.size
+    page = json.loads(data[start : start + header_length])
+    blobs = data[start + header_length :]
+    for route in page["routes"]:
+        if route["points"] is not None:
+            offset, length = route["points"]
+            points, flags = unpack_points(blobs[offset : offset + length])
+            route["route_data"] = with_points(route["route_data"], points, flags, route["orders"])
+    return page
+
+
+class RoutePageRenderer(BaseRenderer):
+    """Passes encoded pages through; error envelopes are still sent as JSON."""
+
+    media_type = ROUTE_PAGE_CONTENT_TYPE
+    format = "binary"
+    charset = None
+    render_style = "binary"
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if isinstance(data, bytes):
+            return data
+        response = (renderer_context or {}).get("response")
+        if response is not None:
+            response["Content-Type"] = JSONRenderer.media_type
+        return JSONRenderer().render(data)
@@ -0,0 +1,151 @@
+"""
+Ranked search over posts, crags and users.
+
+Posts and crags carry a stored ``search_vector`` (a generated tsvector column
+with a GIN index), so the database keeps it current on every write, bulk
+writes included. Queries are matched as prefix terms, so partial words typed
+into a search box still hit the index. Usernames, emails and crag names have
+trigram GIN indexes for fuzzy matching; these need the ``pg_trgm`` extension,
+which migration 0021 installs when the server provides it. Without it, fuzzy
+matching degrades to ``icontains``. On a database other than PostgreSQL every
+search falls back to the original ``icontains`` filters.
+"""
+
+import re
+from typing import List, Optional
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, TrigramSimilarity
+from django.db import connection
+from django.db.models import F, Q, QuerySet, Value
+from django.db.models.functions import Greatest
+
+SEARCH_CONFIG = "english"
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_trigram_available: Optional[bool] = None
+
+
+def is_postgres() -> bool:
+
+    return connection.vendor == "postgresql"
+
+
+def trigram_available() -> bool:
+    """
+    Whether ``pg_trgm`` is installed in the current database. Looked up once
+    per process.
+    """
+    global _trigram_available
+    if _trigram_available is None:
+        if not is_postgres():
+            _trigram_available = False
+        else:
+            with connection.cursor() as cursor:
+                cursor.execute("SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm'")
+                _trigram_available = cursor.fetchone() is not None
+    return _trigram_available
+
+
+def reset_trigram_available() -> None:
+    global _trigram_available
+    _trigram_available = None
+
+
+def prefix_search_query(query: str) -> Optional[SearchQuery]:
+    """
+    Build a tsquery that matches every word of ``query`` as a prefix
+    (``boul`` matches "bouldering"). Returns None when the query has no
+    searchable words.
+    """
+    tokens = _TOKEN_RE.findall(query.lower())
+    if not tokens:
+        return None
+    raw = " & ".join(f"{token}:*" for token in tokens)
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
+
+
+def normalize_tags(tags: Optional[List[str]]) -> Optional[List[str]]:
+    """Strip, lowercase and de-duplicate tags, keeping their order."""
+    if tags is None:
+        return None
+    cleaned = []
+    for tag in tags:
+        if not tag or not str(tag).strip():
+            continue
+        tag = str(tag).strip().lower()
+        if tag not in cleaned:
+            cleaned.append(tag)
+    return cleaned
+
+
+def search_posts(queryset: QuerySet, query: str) -> QuerySet:
+    """Posts matching ``query`` in title, content or tags, best match first."""
+    if not is_postgres():
+        return queryset.filter(
+            Q(title__icontains=query) | Q(content__icontains=query) | Q(tags__icontains=query)
+        ).order_by("-created_at")
+
+    tag_match = Q(tags__contains=[query.lower()])
+    search_query = prefix_search_query(query)
+    if search_query is None:
+        return queryset.filter(tag_match).order_by("-created_at")
+
+    return (
+        queryset.filter(Q(search_vector=search_query) | tag_match)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-created_at")
+    )
+
+
+def search_posts_by_tags(queryset: QuerySet, tags: List[str]) -> QuerySet:
+    """
+    Posts carrying any of ``tags`` (already normalized). Tags are stored
+    lowercased, so this is an exact array overlap served by the GIN index.
+    """
+    if not is_postgres():
+        tag_queries = Q()
+        for tag in tags:
+            tag_queries |= Q(tags__icontains=tag)
+        return queryset.filter(tag_queries).order_by("-created_at")
+
+    return queryset.filter(tags__overlap=tags).order_by("-created_at")
+
+
+def search_crags(queryset: QuerySet, query: str) -> QuerySet:
+    """Crags matching ``query`` in name or description, best match first."""
+    name_match = Q(name__icontains=query)
+    if not is_postgres():
+        return queryset.filter(name_match | Q(description__icontains=query)).order_by("name")
+
+    similarity = Value(0.0)
+    if trigram_available():
+        name_match |= Q(name__trigram_similar=query)
+        similarity = TrigramSimilarity("name", query)
+
+    search_query = prefix_search_query(query)
+    if search_query is None:
+        return (
+            queryset.filter(name_match)
+            .annotate(rank=similarity)
+            .order_by("-rank", "name")
+        )
+
+    return (
+        queryset.filter(Q(search_vector=search_query) | name_match)
+        .annotate(rank=Greatest(SearchRank(F("search_vector"), search_query), similarity))
+        .order_by("-rank", "name")
+    )
+
+
+def search_users(queryset: QuerySet, query: str) -> QuerySet:
+    """Users whose username or email matches ``query``, closest username first."""
+    matches = Q(username__icontains=query) | Q(email__icontains=query)
+    if not trigram_available():
+        return queryset.filter(matches).order_by("username")
+
+    return (
+        queryset.filter(matches | Q(username__trigram_similar=query))
+        .annotate(rank=TrigramSimilarity("username", query))
+        .order_by("-rank", "username")
+    )
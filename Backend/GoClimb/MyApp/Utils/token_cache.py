@@ -0,0 +1,123 @@
+"""
+Cache of already-verified Firebase ID and App Check tokens.
+
+Verifying a token means checking its JWT signature (and now and then fetching
+Google's public keys), and clients send the same bearer token on every call
+they make. Successful verifications are kept in an in-process LRU keyed by
+the SHA-256 of the token, and are only served until shortly before the
+token's own ``exp``, so a cached verdict never outlives the token. Set
+``TOKEN_CACHE_ALIAS`` to a Django cache alias (e.g. a Redis cache) to share
+verdicts between worker processes as well. Failed verifications and claims
+without an ``exp`` are never cached.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import caches
+
+TOKEN_CACHE_SIZE = getattr(settings, "TOKEN_CACHE_SIZE", 10000)
+# Stop serving a verdict this long before the token expires (covers clock skew)
+TOKEN_CACHE_EXPIRY_MARGIN_SECONDS = 30
+
+Claims = Dict[str, Any]
+
+
+class _VerifiedTokenLRU:
+
+    def __init__(self, maxsize: int):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, tuple[float, Claims]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Claims]:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return claims
+
+    def set(self, key: str, claims: Claims, expires_at: float) -> None:
+        with self._lock:
+            self._data[key] = (expires_at, claims)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+_verified_tokens = _VerifiedTokenLRU(TOKEN_CACHE_SIZE)
+
+
+def clear_token_cache() -> None:
+    _verified_tokens.clear()
+
+
+def _token_key(kind: str, token: str) -> str:
+
+    return f"verified-token:{kind}:{hashlib.sha256(token.encode()).hexdigest()}"
+
+
+def _shared_cache():
+
+    alias = getattr(settings, "TOKEN_CACHE_ALIAS", None)
+    return caches[alias] if alias else None
+
+
+def _cache_deadline(claims: Claims) -> Optional[float]:
+
+    try:
+        exp = float(claims["exp"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    return exp - TOKEN_CACHE_EXPIRY_MARGIN_SECONDS
+
+
+def verify_with_cache(kind: str, token: str, verify: Callable[[str], Claims]) -> Claims:
+    """
+    Return the decoded claims for ``token``, calling ``verify`` (e.g.
+    ``auth.verify_id_token``) only when no live cached verdict exists.
+    Exceptions from ``verify`` propagate unchanged.
+    """
+    if not token or not isinstance(token, str):
+        return verify(token)
+
+    key = _token_key(kind, token)
+    claims = _verified_tokens.get(key)
+    if claims is not None:
+        return dict(claims)
+
+    shared = _shared_cache()
+    if shared is not None:
+        claims = shared.get(key)
+        if claims is not None:
+            deadline = _cache_deadline(claims)
+            if deadline is not None and deadline > time.time():
+                _verified_tokens.set(key, claims, deadline)
+                return dict(claims)
+
+    claims = verify(token)
+
+    deadline = _cache_deadline(claims) if isinstance(claims, dict) else None
+    if deadline is not None:
+        remaining = deadline - time.time()
+        if remaining > 0:
+            _verified_tokens.set(key, dict(claims), deadline)
+            if shared is not None:
+                shared.set(key, dict(claims), timeout=int(remaining))
+    return claims
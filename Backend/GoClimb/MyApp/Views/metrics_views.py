@@ -0,0 +1,28 @@
+import hmac
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+from django.views.decorators.http import require_GET
+
+from MyApp.Utils.metrics import render_prometheus
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+@require_GET
+def metrics_view(request):
+    """
+    Per-view request metrics in Prometheus text format. Scrapers must send
+    METRICS_TOKEN as ``Authorization: Bearer <token>``; without a configured
+    token the endpoint does not exist, except under DEBUG.
+    """
+    expected = getattr(settings, "METRICS_TOKEN", "")
+    if not expected:
+        if not settings.DEBUG:
+            raise Http404()
+    else:
+        supplied = request.headers.get("Authorization", "").removeprefix("Bearer ").strip()
+        if not hmac.compare_digest(supplied, expected):
+            return HttpResponse("Unauthorized", status=401)
+
+    return HttpResponse(render_prometheus(), content_type=PROMETHEUS_CONTENT_TYPE)
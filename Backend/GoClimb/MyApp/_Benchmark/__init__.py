@@ -0,0 +1,6 @@
+"""
+Offline load-testing harness: deterministic fakes for external services,
+dataset generators and endpoint scenarios. Driven by
+``python manage.py run_benchmarks``; nothing here is collected by the test
+runner.
+"""
@@ -0,0 +1,173 @@
+"""
+Deterministic in-process stand-ins for Firebase Storage, Firebase Auth /
+App Check, the Google geocoder and Stripe, so benchmarks never leave the
+machine and every run sees the same responses.
+"""
+
+import hashlib
+import threading
+import time
+from contextlib import ExitStack, contextmanager
+from types import SimpleNamespace
+from typing import Any, Dict, Iterator, Optional
+from unittest.mock import patch
+
+from google.api_core.exceptions import NotFound, PreconditionFailed
+
+
+class InMemoryBlob:
+
+    def __init__(self, bucket: "InMemoryBucket", name: str, chunk_size: Optional[int] = None):
+        self.bucket = bucket
+        self.name = name
+        self.chunk_size = chunk_size
+        self.metadata: Optional[Dict[str, str]] = None
+        self.content_type: Optional[str] = None
+        self.size: Optional[int] = None
+
+    def upload_from_file(self, file, size=None, content_type=None, if_generation_match=None, **kwargs):
+        data = file.read() if size is None else file.read(size)
+        with self.bucket._lock:
+            if if_generation_match == 0 and self.name in self.bucket.objects:
+                raise PreconditionFailed(f"{self.name} already exists")
+            self.content_type = content_type
+            self.size = len(data)
+            self.bucket.objects[self.name] = (data, content_type, self.metadata)
+
+    def exists(self) -> bool:
+        return self.name in self.bucket.objects
+
+    def download_as_bytes(self, **kwargs) -> bytes:
+        try:
+            return self.bucket.objects[self.name][0]
+        except KeyError:
+            raise NotFound(self.name)
+
+    def delete(self) -> None:
+        self.bucket.delete_blob(self.name)
+
+    def generate_signed_url(self, expiration=None, **kwargs) -> str:
+        # Signing is local in production too; only the URL shape matters here
+        digest = hashlib.sha1(self.name.encode()).hexdigest()[:16]
+        return f"https://storage.invalid/{self.bucket.name}/{self.name}?sig={digest}"
+
+
+class _InMemoryBatch:
+    """Like storage's Batch: thread-local, raises only the last missing blob."""
+
+    def __init__(self, client: "_InMemoryClient"):
+        self.client = client
+        self.missing = []
+
+    def __enter__(self):
+        self.client._batch.active = self
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        self.client._batch.active = None
+        if exc_type is None and self.missing:
+            raise NotFound(self.missing[-1])
+        return False
+
+
+class _InMemoryClient:
+
+    def __init__(self):
+        self.project = "benchmark"
+        self._batch = threading.local()
+
+    def batch(self):
+        return _InMemoryBatch(self)
+
+
+class InMemoryBucket:
+    """Thread-safe object store with the subset of the GCS bucket API the app uses."""
+
+    def __init__(self, name: str = "benchmark-bucket"):
+        self.name = name
+        self.objects: Dict[str, Any] = {}
+        self.client = _InMemoryClient()
+        self._lock = threading.Lock()
+
+    def blob(self, name: str, chunk_size: Optional[int] = None) -> InMemoryBlob:
+        return InMemoryBlob(self, name, chunk_size=chunk_size)
+
+    def list_blobs(self, prefix: str = "") -> Iterator[InMemoryBlob]:
+        with self._lock:
+            items = sorted((k, v) for k, v in self.objects.items() if k.startswith(prefix))
+        for name, (data, content_type, metadata) in items:
+            blob = InMemoryBlob(self, name)
+            blob.size, blob.content_type, blob.metadata = len(data), content_type, metadata
+            yield blob
+
+    def delete_blob(self, name: str) -> None:
+        with self._lock:
+            found = self.objects.pop(name, None) is not None
+        batch = getattr(self.client._batch, "active", None)
+        if batch is not None:
+            if not found:
+                batch.missing.append(name)
+        elif not found:
+            raise NotFound(name)
+
+
+def fake_verify_token(token: str) -> Dict[str, Any]:
+    """Tokens are the uid itself; claims stay valid for an hour."""
+    return {"uid": token, "sub": token, "exp": int(time.time()) + 3600}
+
+
+def fake_location_details(lat: float, lon: float) -> Dict[str, Any]:
+    """Stable pseudo-address derived from the rounded coordinates."""
+    cell = int(hashlib.sha1(f"{round(lat, 2)}:{round(lon, 2)}".encode()).hexdigest()[:8], 16)
+    district = cell % 28 + 1
+    return {
+        "city": "Singapore",
+        "country": "Singapore",
+        "state": None,
+        "district": f"District {district:02d}",
+        "postal_code": f"{district:02d}{cell % 10000:04d}",
+    }
+
+
+class FakeStripe:
+    """PaymentIntents that are created and immediately succeed."""
+
+    def __init__(self):
+        self.intents: Dict[str, SimpleNamespace] = {}
+        self._lock = threading.Lock()
+
+    def create(self, amount=0, currency="sgd", **kwargs) -> SimpleNamespace:
+        with self._lock:
+            intent_id = f"pi_bench_{len(self.intents) + 1:08d}"
+            intent = SimpleNamespace(
+                id=intent_id,
+                client_secret=f"{intent_id}_secret",
+                amount=amount,
+                currency=currency,
+                status="succeeded",
+                metadata=kwargs.get("metadata", {}),
+                created=int(time.time()),
+            )
+            self.intents[intent_id] = intent
+            return intent
+
+    def retrieve(self, intent_id: str, **kwargs) -> SimpleNamespace:
+        with self._lock:
+            return self.intents[intent_id]
+
+
+@contextmanager
+def offline_services(bucket: Optional[InMemoryBucket] = None):
+    """Patch every external dependency for the duration of the block."""
+    bucket = bucket or InMemoryBucket()
+    stripe = FakeStripe()
+    with ExitStack() as stack:
+        stack.enter_context(patch("firebase_admin.storage.bucket", return_value=bucket))
+        stack.enter_context(patch("firebase_admin.auth.verify_id_token", side_effect=fake_verify_token))
+        stack.enter_context(patch("firebase_admin.app_check.verify_token", side_effect=fake_verify_token))
+        stack.enter_context(
+            patch("MyApp.Utils.geocoding.fetch_location_details", side_effect=fake_location_details)
+        )
+        stack.enter_context(patch("stripe.PaymentIntent.create", side_effect=stripe.create))
+        stack.enter_context(patch("stripe.PaymentIntent.retrieve", side_effect=stripe.retrieve))
+        yield SimpleNamespace(bucket=bucket, stripe=stripe)
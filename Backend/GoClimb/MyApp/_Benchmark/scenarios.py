@@ -0,0 +1,202 @@
+"""
+Endpoint scenarios and the loop that times them.
+
+Each scenario issues requests through the Django test client (the full
+middleware stack, no network) with parameters drawn from a seeded RNG, and
+reads the query/storage counts from the ``Server-Timing`` header written by
+``RequestMetricsMiddleware``. Results are plain dicts, ready for JSON.
+"""
+
+import math
+import random
+import re
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.user import User
+from MyApp._Benchmark.seed import TAGS, VOCABULARY
+
+_TIMING_DESC = re.compile(r'(\w+);dur=[\d.]+;desc="(\d+) \w+"')
+
+# name -> (HTTP method, url name, builds query params or JSON body); a "_bearer"
+# entry is sent as the Authorization token instead (fake tokens are the uid)
+ScenarioSpec = Tuple[str, str, Callable[[random.Random, Dict[str, List[str]]], Dict[str, Any]]]
+
+SCENARIOS: Dict[str, ScenarioSpec] = {
+    "ranking_weekly": (
+        "GET", "get_weekly_user_ranking", lambda rng, ids: {"count": 50},
+    ),
+    "ranking_alltime": (
+        "GET", "get_alltime_user_ranking", lambda rng, ids: {"count": 50},
+    ),
+    "ranking_trending_crags": (
+        "GET", "get_trending_crags", lambda rng, ids: {"count": 10},
+    ),
+    "feed_random_posts": (
+        "POST", "get_random_post",
+        lambda rng, ids: {"count": 10, "_bearer": rng.choice(ids["users"])},
+    ),
+    "feed_user_posts": (
+        "POST", "get_post_by_user_id",
+        lambda rng, ids: {"user_id": rng.choice(ids["users"]), "count": 10},
+    ),
+    "search_posts": (
+        "GET", "search_posts",
+        lambda rng, ids: {"query": rng.choice(VOCABULARY), "limit": 20},
+    ),
+    "search_posts_by_tags": (
+        "POST", "search_posts_by_tags",
+        lambda rng, ids: {"tags": rng.sample(TAGS, 2), "limit": 20},
+    ),
+    "search_crags": (
+        "GET", "search_crags",
+        lambda rng, ids: {"query": rng.choice(VOCABULARY), "limit": 20},
+    ),
+    "search_users": (
+        "GET", "search_users",
+        lambda rng, ids: {"query": f"climber_{rng.randint(0, 99):02d}", "limit": 20},
+    ),
+    "crag_nearby": (
+        "GET", "get_nearby_crags",
+        lambda rng, ids: {
+            "lat": round(1.25 + rng.random() * 0.2, 4),
+            "lon": round(103.65 + rng.random() * 0.35, 4),
+            "radius_km": 5,
+            "zoom": 12,
+        },
+    ),
+    "crag_detail": (
+        "GET", "get_crag_info", lambda rng, ids: {"crag_id": rng.choice(ids["crags"])},
+    ),
+}
+
+SAMPLE_IDS = 1000
+
+
+def sample_ids(rng: random.Random) -> Dict[str, List[str]]:
+    """Ids the scenarios pick from, drawn once per run."""
+    user_ids = list(User.objects.order_by("user_id").values_list("user_id", flat=True)[:SAMPLE_IDS * 10])
+    crag_ids = [
+        Crag.format_id(pk)
+        for pk in Crag.objects.order_by("crag_id").values_list("crag_id", flat=True)[:SAMPLE_IDS * 10]
+    ]
+    return {
+        "users": rng.sample(user_ids, min(SAMPLE_IDS, len(user_ids))),
+        "crags": rng.sample(crag_ids, min(SAMPLE_IDS, len(crag_ids))),
+    }
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (which must be non-empty)."""
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def _timing_counts(header: str) -> Dict[str, int]:
+
+    return {name: int(count) for name, count in _TIMING_DESC.findall(header or "")}
+
+
+def run_scenario(
+    client: Client,
+    name: str,
+    ids: Dict[str, List[str]],
+    rng: random.Random,
+    iterations: int,
+    warmup: int,
+) -> Dict[str, Any]:
+
+    method, url_name, build = SCENARIOS[name]
+    url = reverse(url_name)
+
+    latencies: List[float] = []
+    queries: List[int] = []
+    storage_calls: List[int] = []
+    status_codes: Dict[str, int] = {}
+
+    for i in range(warmup + iterations):
+        params = build(rng, ids)
+        bearer = params.pop("_bearer", None)
+        headers = {"Authorization": f"Bearer {bearer}"} if bearer else {}
+        start = time.perf_counter()
+        if method == "GET":
+            response = client.get(url, params, headers=headers)
+        else:
+            response = client.post(url, params, content_type="application/json", headers=headers)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        if i < warmup:
+            continue
+
+        counts = _timing_counts(response.get("Server-Timing"))
+        latencies.append(elapsed_ms)
+        queries.append(counts.get("db", 0))
+        storage_calls.append(counts.get("storage", 0))
+        key = str(response.status_code)
+        status_codes[key] = status_codes.get(key, 0) + 1
+
+    return {
+        "method": method,
+        "url": url,
+        "requests": iterations,
+        "status_codes": status_codes,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50), 3),
+            "p95": round(percentile(latencies, 95), 3),
+            "p99": round(percentile(latencies, 99), 3),
+            "mean": round(statistics.fmean(latencies), 3),
+            "max": round(max(latencies), 3),
+        },
+        "queries_per_request": {
+            "mean": round(statistics.fmean(queries), 2),
+            "max": max(queries),
+        },
+        "storage_calls_per_request": {
+            "mean": round(statistics.fmean(storage_calls), 2),
+            "max": max(storage_calls),
+        },
+    }
+
+
+def run_scenarios(
+    names: Optional[List[str]] = None,
+    iterations: int = 200,
+    warmup: int = 20,
+    seed: int = 1,
+    log: Callable[[str], None] = lambda message: None,
+) -> Dict[str, Dict[str, Any]]:
+
+    rng = random.Random(seed)
+    ids = sample_ids(rng)
+    client = Client()
+    results = {}
+    # The counts come from Server-Timing, whatever the deployment settings say
+    with override_settings(REQUEST_METRICS_ENABLED=True):
+        for name in names or list(SCENARIOS):
+            log(f"Running {name} ({iterations} requests)")
+            results[name] = run_scenario(client, name, ids, rng, iterations, warmup)
+    return results
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """One line per scenario present in both runs: p50/p99 and query deltas."""
+    lines = []
+    for name, result in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        parts = []
+        for pct in ("p50", "p99"):
+            old, new = before["latency_ms"][pct], result["latency_ms"][pct]
+            change = (new - old) / old * 100 if old else 0.0
+            parts.append(f"{pct} {old:.1f} -> {new:.1f} ms ({change:+.0f}%)")
+        old_q = before["queries_per_request"]["mean"]
+        new_q = result["queries_per_request"]["mean"]
+        parts.append(f"queries {old_q:g} -> {new_q:g}")
+        lines.append(f"{name}: " + ", ".join(parts))
+    return lines
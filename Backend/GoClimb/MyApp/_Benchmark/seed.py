@@ -0,0 +1,214 @@
+"""
+Deterministic dataset generators for benchmarks.
+
+Rows are written with ``bulk_create`` in batches, which skips model ``save``
+and the signal handlers, so the derived tables (leaderboards, crag rollups,
+post counters) are rebuilt from scratch once everything is inserted and the
+response cache is cleared.
+"""
+
+import random
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.post import Post
+from MyApp.Entity.postcomment import PostComment
+from MyApp.Entity.postlikes import PostLike
+from MyApp.Entity.route import Route
+from MyApp.Entity.user import User
+from MyApp.Utils.climb_stats import rebuild_climb_stats
+from MyApp.Utils.crag_stats import rebuild_crag_stats
+from MyApp.Utils.geo import encode_geohash
+from MyApp.Utils.post_counters import reconcile_post_counters
+from MyApp.Utils.response_cache import clear_response_cache
+
+DEFAULT_SIZES = {
+    "users": 100_000,
+    "crags": 500,
+    "routes_per_crag": 20,
+    "climb_logs": 1_000_000,
+    "posts": 50_000,
+    "likes_per_post": 4,
+    "comments_per_post": 1,
+}
+
+BATCH_SIZE = 5000
+HISTORY_DAYS = 365
+
+# Search scenarios query these, so every word is guaranteed to have hits
+VOCABULARY = [
+    "boulder", "crimp", "sloper", "overhang", "slab", "dyno", "heel", "hook",
+    "jug", "pinch", "project", "send", "flash", "onsight", "beta", "crux",
+    "arete", "roof", "traverse", "mantle", "pocket", "sidepull", "undercling", "chalk",
+]
+TAGS = ["bouldering", "sport", "trad", "indoor", "outdoor", "training", "competition", "beginner"]
+CRAG_AREAS = ["Bukit", "Dairy Farm", "Pulau Ubin", "Mandai", "Kent Ridge", "Labrador", "Punggol"]
+
+
+def scaled_sizes(scale: float = 1.0, **overrides: Optional[int]) -> Dict[str, int]:
+
+    sizes = {
+        key: value if key.endswith("_per_post") or key.endswith("_per_crag") else max(1, int(value * scale))
+        for key, value in DEFAULT_SIZES.items()
+    }
+    sizes.update({key: value for key, value in overrides.items() if value is not None})
+    return sizes
+
+
+def _batched(rows: Iterable, size: int = BATCH_SIZE) -> Iterator[List]:
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _insert(model, rows: Iterable, log: Callable[[str], None], label: str) -> None:
+
+    total = 0
+    for batch in _batched(rows):
+        model.objects.bulk_create(batch, batch_size=BATCH_SIZE, ignore_conflicts=model is PostLike)
+        total += len(batch)
+        if total % (BATCH_SIZE * 20) == 0:
+            log(f"  {label}: {total}")
+    log(f"  {label}: {total} done")
+
+
+def dataset_counts() -> Dict[str, int]:
+
+    return {
+        "users": User.objects.count(),
+        "crags": Crag.objects.count(),
+        "routes": Route.objects.count(),
+        "climb_logs": ClimbLog.objects.count(),
+        "posts": Post.objects.count(),
+        "post_likes": PostLike.objects.count(),
+        "post_comments": PostComment.objects.count(),
+    }
+
+
+def _words(rng: random.Random, count: int) -> str:
+
+    return " ".join(rng.choice(VOCABULARY) for _ in range(count))
+
+
+def seed_dataset(
+    sizes: Dict[str, int],
+    seed: int = 1,
+    log: Callable[[str], None] = lambda message: None,
+) -> Dict[str, int]:
+    """Insert a synthetic dataset; returns the row count per table."""
+    rng = random.Random(seed)
+    today = date.today()
+
+    user_ids = [f"bench-user-{i:06d}" for i in range(sizes["users"])]
+    _insert(
+        User,
+        (
+            User(user_id=uid, username=f"climber_{uid[-6:]}", email=f"{uid}@bench.invalid", status=True)
+            for uid in user_ids
+        ),
+        log,
+        "users",
+    )
+
+    def crag(i: int) -> Crag:
+        name = f"{rng.choice(CRAG_AREAS)} {rng.choice(VOCABULARY).title()} Wall {i}"
+        lat, lon = 1.25 + rng.random() * 0.2, 103.65 + rng.random() * 0.35
+        return Crag(
+            name=name,
+            location_lat=lat,
+            location_lon=lon,
+            geohash=encode_geohash(lat, lon),
+            description=_words(rng, 12),
+            user_id=rng.choice(user_ids),
+            random_key=rng.random(),
+        )
+
+    _insert(Crag, (crag(i) for i in range(sizes["crags"])), log, "crags")
+    crag_ids = list(Crag.objects.order_by("crag_id").values_list("crag_id", flat=True))
+
+    _insert(
+        Route,
+        (
+            Route(
+                route_name=f"{rng.choice(VOCABULARY).title()} {n}",
+                route_grade=rng.randint(1, 17),
+                crag_id=crag_id,
+                user_id=rng.choice(user_ids),
+            )
+            for crag_id in crag_ids
+            for n in range(sizes["routes_per_crag"])
+        ),
+        log,
+        "routes",
+    )
+    route_ids = list(Route.objects.order_by("route_id").values_list("route_id", flat=True))
+
+    # Activity is skewed: a minority of climbers logs most of the sends
+    active_users = user_ids[: max(1, len(user_ids) // 5)]
+    _insert(
+        ClimbLog,
+        (
+            ClimbLog(
+                user_id=rng.choice(active_users) if rng.random() < 0.8 else rng.choice(user_ids),
+                route_id=rng.choice(route_ids),
+                date_climbed=today - timedelta(days=int(rng.expovariate(1 / 60)) % HISTORY_DAYS),
+                status=rng.random() < 0.7,
+                attempt=rng.randint(1, 6),
+                title=_words(rng, 3),
+            )
+            for _ in range(sizes["climb_logs"])
+        ),
+        log,
+        "climb_logs",
+    )
+
+    _insert(
+        Post,
+        (
+            Post(
+                user_id=rng.choice(user_ids),
+                title=_words(rng, 4).capitalize(),
+                content=_words(rng, 30),
+                tags=sorted(set(rng.sample(TAGS, rng.randint(0, 3)))),
+                random_key=rng.random(),
+            )
+            for _ in range(sizes["posts"])
+        ),
+        log,
+        "posts",
+    )
+    post_ids = list(Post.objects.order_by("post_id").values_list("post_id", flat=True))
+
+    _insert(
+        PostLike,
+        (
+            PostLike(post_id=rng.choice(post_ids), user_id=rng.choice(user_ids))
+            for _ in range(len(post_ids) * sizes["likes_per_post"])
+        ),
+        log,
+        "post_likes",
+    )
+    _insert(
+        PostComment,
+        (
+            PostComment(post_id=rng.choice(post_ids), user_id=rng.choice(user_ids), content=_words(rng, 8))
+            for _ in range(len(post_ids) * sizes["comments_per_post"])
+        ),
+        log,
+        "post_comments",
+    )
+
+    log("Rebuilding derived tables")
+    rebuild_climb_stats()
+    rebuild_crag_stats()
+    reconcile_post_counters()
+    clear_response_cache()
+    return dataset_counts()
@@ -0,0 +1,119 @@
+"""
+Django TestCase for the background job queue in MyApp.Utils.jobs and the
+deferred storage cleanup on entity deletes.
+
+Run with: python manage.py test MyApp._TestCode.test_background_jobs
+"""
+
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch, MagicMock
+
+from django.core.management import call_command
+from django.db import transaction
+from django.test import TestCase
+from django.utils.timezone import now
+
+from MyApp.Entity.user import User
+from MyApp.Entity.post import Post
+from MyApp.Entity.backgroundjob import BackgroundJob
+from MyApp.Firebase import helpers
+from MyApp.Utils import jobs
+
+
+class BackgroundJobTestCase(TestCase):
+    """Entity deletes queue their storage cleanup; the worker runs and retries it."""
+
+    def setUp(self):
+        self.user = User.objects.create(
+            user_id="job_user", username="jobuser", email="job@example.com"
+        )
+        self.post = Post.objects.create(user=self.user, title="Post", content="content")
+        helpers.record_media_objects([{"path": f"{self.post.images_bucket_path}/a.jpg"}])
+
+    def test_01_delete_queues_cleanup_without_touching_storage(self):
+        folder = self.post.bucket_path
+
+        with patch("MyApp.Firebase.helpers.storage.bucket") as mock_bucket:
+            self.post.delete()
+
+        mock_bucket.assert_not_called()
+        job = BackgroundJob.objects.get()
+        self.assertEqual((job.kind, job.payload), (jobs.STORAGE_DELETE_JOB, {"folder": folder}))
+        # Nothing serves the files while the blobs wait for the worker
+        self.assertEqual(helpers.get_media_paths_in_folders([folder + "/images/"])[folder + "/images/"], [])
+
+    def test_02_rolled_back_delete_leaves_no_job(self):
+        post_id = self.post.pk
+        try:
+            with transaction.atomic():
+                self.post.delete()
+                raise RuntimeError("abort")
+        except RuntimeError:
+            pass
+
+        self.assertFalse(BackgroundJob.objects.exists())
+        self.assertTrue(Post.objects.filter(pk=post_id).exists())
+
+    def test_03_worker_runs_job(self):
+        folder = self.post.bucket_path
+        self.post.delete()
+        blob = MagicMock()
+        blob.name = f"{folder}/images/a.jpg"
+        bucket = MagicMock()
+        bucket.list_blobs.return_value = [blob]
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            call_command("run_jobs", "--once", stdout=StringIO())
+
+        bucket.list_blobs.assert_called_once_with(prefix=folder)
+        bucket.delete_blob.assert_called_once_with(blob.name)
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    def test_04_failures_back_off_then_fail(self):
+        job = jobs.enqueue_storage_delete("users/job_user")
+        job.max_attempts = 2
+        job.save()
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", side_effect=ConnectionError("outage")):
+            self.assertEqual(jobs.run_pending_jobs(), 1)
+            job.refresh_from_db()
+            self.assertEqual((job.status, job.attempts), (BackgroundJob.STATUS_PENDING, 1))
+            self.assertGreater(job.run_after, now() + timedelta(seconds=20))
+            self.assertIn("outage", job.last_error)
+
+            # Not due yet
+            self.assertEqual(jobs.run_pending_jobs(), 0)
+
+            BackgroundJob.objects.filter(pk=job.pk).update(run_after=now())
+            self.assertEqual(jobs.run_pending_jobs(), 1)
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (BackgroundJob.STATUS_FAILED, 2))
+
+    def test_05_stale_running_job_is_reclaimed(self):
+        job = jobs.enqueue_storage_delete("users/job_user")
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=BackgroundJob.STATUS_RUNNING,
+            locked_at=now() - timedelta(seconds=jobs.JOB_LOCK_TIMEOUT_SECONDS + 1),
+        )
+
+        claimed = jobs.claim_jobs()
+
+        self.assertEqual([j.pk for j in claimed], [job.pk])
+        self.assertEqual(claimed[0].attempts, 1)
+
+    def test_06_stale_job_out_of_attempts_fails(self):
+        job = jobs.enqueue_storage_delete("users/job_user")
+        BackgroundJob.objects.filter(pk=job.pk).update(
+            status=BackgroundJob.STATUS_RUNNING,
+            attempts=job.max_attempts,
+            locked_at=now() - timedelta(seconds=jobs.JOB_LOCK_TIMEOUT_SECONDS + 1),
+        )
+
+        self.assertEqual(jobs.claim_jobs(), [])
+
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), (BackgroundJob.STATUS_FAILED, job.max_attempts))
+        self.assertIsNone(job.locked_at)
+        self.assertIn("Worker stopped", job.last_error)
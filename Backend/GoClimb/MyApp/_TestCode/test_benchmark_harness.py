@@ -0,0 +1,64 @@
+"""
+Django TestCase keeping the offline benchmark harness (MyApp._Benchmark)
+runnable: a tiny dataset is seeded and every scenario answers.
+
+Run with: python manage.py test MyApp._TestCode.test_benchmark_harness
+"""
+
+import io
+
+from django.test import TestCase
+
+from MyApp.Entity.post import Post
+from MyApp.Entity.userclimbstats import UserClimbStats
+from MyApp.Firebase import helpers
+from MyApp.Utils.response_cache import clear_response_cache
+from MyApp._Benchmark.fakes import offline_services
+from MyApp._Benchmark.scenarios import SCENARIOS, percentile, run_scenarios
+from MyApp._Benchmark.seed import dataset_counts, scaled_sizes, seed_dataset
+
+
+class BenchmarkHarnessTestCase(TestCase):
+    """Seeding is deterministic and the scenarios run against the fakes."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+        clear_response_cache()
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+        clear_response_cache()
+
+    def test_01_seed_and_run_every_scenario(self):
+        sizes = scaled_sizes(0.0002)
+
+        with offline_services():
+            counts = seed_dataset(sizes, seed=7)
+            # No warmup: the first timed request of a cached endpoint is a miss
+            results = run_scenarios(iterations=3, warmup=0, seed=7)
+
+        self.assertEqual(counts, dataset_counts())
+        self.assertEqual((counts["users"], counts["climb_logs"], counts["posts"]), (20, 200, 10))
+        # Signals are bypassed by bulk inserts; derived tables are rebuilt
+        self.assertTrue(UserClimbStats.objects.exists())
+        self.assertEqual(
+            sum(Post.objects.values_list("like_count", flat=True)), counts["post_likes"]
+        )
+        self.assertEqual(set(results), set(SCENARIOS))
+        for name, result in results.items():
+            self.assertEqual(result["status_codes"], {"200": 3}, name)
+            self.assertGreater(result["queries_per_request"]["max"], 0, name)
+
+    def test_02_in_memory_bucket_serves_storage_helpers(self):
+        with offline_services() as services:
+            services.bucket.blob("crags/CRAG-000001/images/a.jpg").upload_from_file(io.BytesIO(b"a"))
+            report = helpers.delete_bucket_folder("crags/CRAG-000001")
+
+        self.assertEqual(report["deleted"], 1)
+        self.assertEqual(services.bucket.objects, {})
+
+    def test_03_percentile_is_nearest_rank(self):
+        values = list(range(1, 101))
+        self.assertEqual(
+            (percentile(values, 50), percentile(values, 99), percentile(values, 100)), (50, 99, 100)
+        )
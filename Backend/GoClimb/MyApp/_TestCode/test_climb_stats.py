@@ -0,0 +1,107 @@
+"""
+Django TestCase for the incrementally maintained leaderboard tables.
+
+Run with: python manage.py test MyApp._TestCode.test_climb_stats
+"""
+
+from datetime import timedelta
+
+from django.test import TestCase
+from django.utils.timezone import now
+
+from MyApp.Entity.user import User
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.route import Route
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.userclimbstats import UserClimbStats
+from MyApp.Entity.userdailyclimbstats import UserDailyClimbStats
+from MyApp.Controller import ranking_controller
+from MyApp.Utils.climb_stats import rebuild_climb_stats
+
+
+class ClimbStatsTestCase(TestCase):
+    """Log writes keep the aggregates equal to a full rebuild."""
+
+    def setUp(self):
+        self.user = User.objects.create(user_id="stats_user", username="stats", email="s@example.com")
+        self.other = User.objects.create(user_id="other_user", username="other", email="o@example.com")
+        with self.settings(GOOGLE_MAPS_API_KEY=None):
+            crag = Crag.objects.create(name="Crag", location_lat=1.0, location_lon=2.0)
+        self.easy = Route.objects.create(route_name="Easy", route_grade=3, crag=crag)
+        self.hard = Route.objects.create(route_name="Hard", route_grade=7, crag=crag)
+        self.today = now().date()
+
+    def _snapshot(self):
+        totals = sorted(
+            UserClimbStats.objects.values_list("user_id", "topped_count", "grade_sum", "average_grade", "score")
+        )
+        daily = sorted(
+            UserDailyClimbStats.objects.values_list("user_id", "day", "topped_count", "grade_sum")
+        )
+        return totals, daily
+
+    def _assert_matches_rebuild(self):
+        incremental = self._snapshot()
+        rebuild_climb_stats()
+        self.assertEqual(incremental, self._snapshot())
+
+    def test_01_create_update_delete_are_incremental(self):
+        log = ClimbLog.objects.create(user=self.user, route=self.easy, date_climbed=self.today)
+        ClimbLog.objects.create(user=self.user, route=self.hard, date_climbed=self.today)
+        ClimbLog.objects.create(user=self.user, route=self.hard, date_climbed=self.today, status=False)
+        ClimbLog.objects.create(
+            user=self.other, route=self.hard, date_climbed=self.today - timedelta(days=30)
+        )
+
+        stats = UserClimbStats.objects.get(user=self.user)
+        self.assertEqual((stats.topped_count, stats.grade_sum), (2, 10))
+        self.assertAlmostEqual(stats.average_grade, 5.0)
+        self.assertAlmostEqual(stats.score, 2 * 10 + 5.0 * 100)
+        self._assert_matches_rebuild()
+
+        log.route = self.hard
+        log.date_climbed = self.today - timedelta(days=1)
+        log.save()
+        self._assert_matches_rebuild()
+
+        log.status = False
+        log.save()
+        self._assert_matches_rebuild()
+
+        ClimbLog.objects.filter(user=self.user).delete()
+        self.assertEqual(UserClimbStats.objects.get(user=self.user).topped_count, 0)
+        self.assertFalse(UserDailyClimbStats.objects.filter(user=self.user).exists())
+
+    def test_02_regrading_a_route_updates_sums(self):
+        ClimbLog.objects.create(user=self.user, route=self.easy, date_climbed=self.today)
+        self.easy.route_grade = 5
+        self.easy.save()
+
+        self.assertEqual(UserClimbStats.objects.get(user=self.user).grade_sum, 5)
+        self._assert_matches_rebuild()
+
+    def test_03_rankings_read_from_aggregates(self):
+        for i in range(6):
+            ClimbLog.objects.create(user=self.user, route=self.hard, date_climbed=self.today)
+        for i in range(5):
+            ClimbLog.objects.create(
+                user=self.other, route=self.easy, date_climbed=self.today - timedelta(days=20)
+            )
+
+        with self.assertNumQueries(2):
+            weekly = ranking_controller.get_weekly_user_ranking(10)
+        with self.assertNumQueries(1):
+            alltime = ranking_controller.get_alltime_user_ranking(10)
+        top = ranking_controller.get_top_climbers(10)
+        top_weekly = ranking_controller.get_top_climbers(10, "weekly")
+        average = ranking_controller.get_average_grade_ranking(10)
+
+        self.assertEqual([r["user"].user_id for r in weekly], ["stats_user"])
+        self.assertEqual(
+            [(r["user"].user_id, r["total_routes"]) for r in alltime],
+            [("stats_user", 6), ("other_user", 5)],
+        )
+        self.assertEqual(top[0]["total_score"], 6 * 10 + 7 * 100)
+        self.assertEqual(top[1]["total_score"], 5 * 10 + 3 * 100)
+        self.assertEqual([r["user"].user_id for r in top_weekly], ["stats_user"])
+        self.assertEqual([r["average_grade"] for r in average], [7.0, 3.0])
@@ -0,0 +1,166 @@
+"""
+Django TestCase for climb_log/bulk_create/ (NDJSON, CSV and JSON bodies).
+
+Run with: python manage.py test MyApp._TestCode.test_climblog_bulk_import
+"""
+
+import json
+from datetime import date
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from MyApp.Controller import climblog_controller
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.cragdailyclimbstats import CragDailyClimbStats
+from MyApp.Entity.route import Route
+from MyApp.Entity.user import User
+from MyApp.Entity.userclimbstats import UserClimbStats
+from MyApp.Entity.userdailyclimbstats import UserDailyClimbStats
+from MyApp.Utils.climb_stats import rebuild_climb_stats
+from MyApp.Utils.crag_stats import rebuild_crag_stats
+from MyApp.Utils.response_cache import clear_response_cache, tag_version
+
+
+@patch("MyApp.Boundary.climblog_boundary.authenticate_app_check_token")
+class ClimbLogBulkImportTestCase(TestCase):
+    """Valid rows land in batches with their aggregates; bad rows are reported."""
+
+    def setUp(self):
+        clear_response_cache()
+        self.url = reverse("bulk_create_climb_logs")
+        self.user = User.objects.create(user_id="bulk_user", username="bulk", email="b@example.com")
+        User.objects.create(user_id="someone_else", username="else", email="e@example.com")
+        with self.settings(GOOGLE_MAPS_API_KEY=None):
+            crag = Crag.objects.create(name="Bulk Crag", location_lat=1.0, location_lon=2.0)
+            other_crag = Crag.objects.create(name="Other Crag", location_lat=3.0, location_lon=4.0)
+        self.easy = Route.objects.create(route_name="Easy", route_grade=3, crag=crag)
+        self.hard = Route.objects.create(route_name="Hard", route_grade=7, crag=other_crag)
+
+    def tearDown(self):
+        clear_response_cache()
+
+    def _post(self, body, content_type, user_id="bulk_user"):
+        return self.client.post(f"{self.url}?user_id={user_id}", data=body, content_type=content_type)
+
+    def _snapshot(self):
+        return (
+            sorted(UserClimbStats.objects.values_list("user_id", "topped_count", "grade_sum", "average_grade", "score")),
+            sorted(UserDailyClimbStats.objects.values_list("user_id", "day", "topped_count", "grade_sum")),
+            sorted(CragDailyClimbStats.objects.values_list("crag_id", "day", "climb_count")),
+        )
+
+    def _assert_aggregates_match_rebuild(self):
+        incremental = self._snapshot()
+        rebuild_climb_stats()
+        rebuild_crag_stats()
+        self.assertEqual(incremental, self._snapshot())
+
+    def test_01_ndjson_reports_bad_rows_and_keeps_good_ones(self, mock_auth):
+        mock_auth.return_value = {"success": True}
+        lines = [
+            {"route_id": self.easy.formatted_id, "date_climbed": "2025-03-01"},
+            {"route_id": self.hard.formatted_id, "date_climbed": "2025-03-01", "attempt": 3, "notes": "flash"},
+            "{not json",
+            {"route_id": "ROUTE-999999", "date_climbed": "2025-03-02"},
+            {"route_id": self.hard.formatted_id, "date_climbed": "yesterday"},
+            {"route_id": self.easy.formatted_id, "date_climbed": "2025-03-02", "user_id": "someone_else"},
+            "",
+            {"route_id": self.hard.formatted_id, "date_climbed": "2025-03-02", "status": False},
+        ]
+        body = "\n".join(line if isinstance(line, str) else json.dumps(line) for line in lines)
+        before = tag_version("climb_log")
+
+        response = self._post(body, "application/x-ndjson")
+
+        self.assertEqual(response.status_code, 201)
+        data = response.json()["data"]
+        self.assertEqual((data["created"], data["failed"]), (3, 4))
+        self.assertEqual([e["row"] for e in data["errors"]], [3, 4, 5, 6])
+        self.assertEqual(data["errors"][1]["errors"], {"route_id": ["Route not found."]})
+        self.assertIn("date_climbed", data["errors"][2]["errors"])
+        self.assertEqual(
+            list(ClimbLog.objects.order_by("log_id").values_list("attempt", "notes", "status")),
+            [(1, None, True), (3, "flash", True), (1, None, False)],
+        )
+        self.assertEqual(UserClimbStats.objects.get(user=self.user).grade_sum, 10)
+        self._assert_aggregates_match_rebuild()
+        self.assertNotEqual(tag_version("climb_log"), before)
+
+    def test_02_csv_in_chunks_with_constant_queries(self, mock_auth):
+        mock_auth.return_value = {"success": True}
+
+        def csv_body(rows, days=28):
+            lines = ["route_id,date_climbed,attempt,status,notes"]
+            for i in range(rows):
+                route = self.easy if i % 2 else self.hard
+                lines.append(f"{route.formatted_id},2025-04-{1 + i % days:02d},,{'false' if i % 5 == 0 else ''},")
+            return "\ufeff" + "\r\n".join(lines)
+
+        with patch.object(climblog_controller, "CLIMB_LOG_BULK_CHUNK_SIZE", 40):
+            with CaptureQueriesContext(connection) as small:
+                self.assertEqual(self._post(csv_body(10, days=1), "text/csv").json()["data"]["created"], 10)
+            with CaptureQueriesContext(connection) as large:
+                response = self._post(csv_body(40), "text/csv; charset=utf-8")
+                self.assertEqual(response.json()["data"]["created"], 40)
+            chunked = self._post(csv_body(100), "text/csv")
+
+        # Queries depend on chunks, not on rows or on how many days they span
+        self.assertEqual(len(small.captured_queries), len(large.captured_queries))
+        self.assertEqual(chunked.json()["data"]["created"], 100)
+        self.assertEqual(ClimbLog.objects.filter(attempt=1).count(), 150)
+        self._assert_aggregates_match_rebuild()
+
+    def test_03_json_body_and_rejections(self, mock_auth):
+        mock_auth.return_value = {"success": True}
+
+        as_json = self.client.post(
+            self.url,
+            {"user_id": "bulk_user", "logs": [{"route_id": str(self.easy.route_id), "date_climbed": str(date.today())}]},
+            content_type="application/json",
+        )
+        all_failed = self._post(json.dumps({"route_id": "nope"}), "application/x-ndjson")
+        unknown_user = self._post("{}", "application/x-ndjson", user_id="ghost")
+        wrong_type = self._post("route_id\n", "text/plain")
+        empty_list = self.client.post(self.url, {"user_id": "bulk_user", "logs": []}, content_type="application/json")
+
+        self.assertEqual(as_json.status_code, 201)
+        self.assertEqual(as_json.json()["data"]["log_ids"], [ClimbLog.objects.get().formatted_id])
+        self.assertEqual(all_failed.status_code, 400)
+        self.assertEqual(all_failed.json()["errors"]["rows"][0]["row"], 1)
+        self.assertEqual(unknown_user.status_code, 404)
+        self.assertEqual(wrong_type.status_code, 415)
+        self.assertEqual(empty_list.status_code, 400)
+
+    def test_04_broken_body_rolls_back_earlier_chunks(self, mock_auth):
+        mock_auth.return_value = {"success": True}
+        lines = [f"{self.easy.formatted_id},2025-05-{1 + i % 28:02d}" for i in range(50)]
+        body = ("route_id,date_climbed\n" + "\n".join(lines) + "\n").encode() + b"\xff\xfe,2025-05-01\n"
+
+        with patch.object(climblog_controller, "CLIMB_LOG_BULK_CHUNK_SIZE", 20):
+            response = self._post(body, "text/csv")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"], {"body": "Request body must be UTF-8."})
+        self.assertFalse(ClimbLog.objects.exists())
+        self.assertEqual(self._snapshot(), ([], [], []))
+
+    def test_05_over_the_row_limit_imports_nothing(self, mock_auth):
+        mock_auth.return_value = {"success": True}
+        lines = [f"{self.easy.formatted_id},2025-06-{1 + i % 28:02d}" for i in range(30)]
+        body = "route_id,date_climbed\n" + "\n".join(lines)
+
+        with patch.object(climblog_controller, "CLIMB_LOG_BULK_CHUNK_SIZE", 10):
+            with patch.object(climblog_controller, "CLIMB_LOG_BULK_MAX_ROWS", 25):
+                response = self._post(body, "text/csv")
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()["errors"], {"body": "At most 25 rows per import; nothing was imported."}
+        )
+        self.assertFalse(ClimbLog.objects.exists())
+        self.assertEqual(self._snapshot(), ([], [], []))
@@ -0,0 +1,100 @@
+"""
+Django TestCase for the per-crag daily rollups behind trending and monthly rankings.
+
+Run with: python manage.py test MyApp._TestCode.test_crag_stats
+"""
+
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils.timezone import now
+
+from MyApp.Entity.user import User
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.route import Route
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.cragdailyclimbstats import CragDailyClimbStats
+from MyApp.Controller import crag_controller
+from MyApp.Utils.crag_stats import rebuild_crag_stats
+
+
+class CragStatsTestCase(TestCase):
+    """Rollups follow climb log writes and rankings never read climb_log."""
+
+    def setUp(self):
+        self.user = User.objects.create(user_id="crag_stats_user", username="cs", email="cs@example.com")
+        with self.settings(GOOGLE_MAPS_API_KEY=None):
+            self.busy = Crag.objects.create(name="Busy", location_lat=1.0, location_lon=2.0)
+            self.rising = Crag.objects.create(name="Rising", location_lat=3.0, location_lon=4.0)
+        self.busy_route = Route.objects.create(route_name="B", route_grade=4, crag=self.busy)
+        self.rising_route = Route.objects.create(route_name="R", route_grade=4, crag=self.rising)
+        self.today = now().date()
+
+    def _log(self, route, days_ago, count=1):
+        for _ in range(count):
+            ClimbLog.objects.create(
+                user=self.user, route=route, date_climbed=self.today - timedelta(days=days_ago)
+            )
+
+    def _snapshot(self):
+        return sorted(CragDailyClimbStats.objects.values_list("crag_id", "day", "climb_count"))
+
+    def test_01_rollups_match_rebuild(self):
+        self._log(self.busy_route, 1, 3)
+        self._log(self.rising_route, 2)
+        log = ClimbLog.objects.filter(route=self.busy_route).first()
+        log.route = self.rising_route
+        log.save()
+        ClimbLog.objects.filter(route=self.busy_route).first().delete()
+
+        incremental = self._snapshot()
+        rebuild_crag_stats()
+        self.assertEqual(incremental, self._snapshot())
+        self.assertEqual(
+            incremental,
+            [
+                (self.busy.crag_id, self.today - timedelta(days=1), 1),
+                (self.rising.crag_id, self.today - timedelta(days=2), 1),
+                (self.rising.crag_id, self.today - timedelta(days=1), 1),
+            ],
+        )
+
+    def test_02_rankings_and_windows(self):
+        self._log(self.busy_route, 10, 6)
+        self._log(self.busy_route, 2, 4)
+        self._log(self.rising_route, 1, 3)
+
+        with self.assertNumQueries(3):
+            trending = crag_controller.get_trending_crags(10)
+        self.assertEqual([item["crag"].name for item in trending], ["Rising"])
+        self.assertEqual(trending[0]["current_count"], 3)
+
+        monthly = crag_controller.get_monthly_ranking(10)
+        self.assertEqual([crag.name for crag in monthly], ["Busy", "Rising"])
+
+        short = crag_controller.get_monthly_ranking(10, days=3)
+        self.assertEqual([crag.name for crag in short], ["Busy", "Rising"])
+
+        # With a 1-day half-life Rising's fresher climbs outweigh Busy's older ones
+        decayed = crag_controller.get_monthly_ranking(10, days=3, half_life=1)
+        self.assertEqual([crag.name for crag in decayed], ["Rising", "Busy"])
+
+        with self.assertRaises(ValueError):
+            crag_controller.get_trending_crags(10, days=0)
+
+    @patch("MyApp.Boundary.crag_boundary.authenticate_app_check_token")
+    def test_03_endpoints_accept_window_params(self, mock_auth):
+        mock_auth.return_value = {"success": True}
+        self._log(self.rising_route, 0, 2)
+
+        response = self.client.get(
+            reverse("get_trending_crags"), {"count": 5, "days": 3, "half_life": 2}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["data"][0]["crag"]["name"], "Rising")
+
+        response = self.client.get(reverse("get_crag_monthly_ranking"), {"count": 5, "days": "x"})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("days", response.json()["errors"])
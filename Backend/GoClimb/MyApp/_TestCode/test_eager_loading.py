@@ -0,0 +1,128 @@
+"""
+Django TestCase for eager loading and page-level batching in list serializers.
+
+Run with: python manage.py test MyApp._TestCode.test_eager_loading
+"""
+
+from datetime import date
+from unittest.mock import patch, MagicMock
+
+from django.test import TestCase
+from django.urls import reverse
+
+from MyApp.Entity.user import User
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.route import Route
+from MyApp.Entity.cragmodel import CragModel
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Firebase import helpers
+from MyApp.Serializer.serializers import (
+    ClimbLogSerializer,
+    RouteSerializer,
+    get_eager_relations,
+)
+
+
+def _make_bucket():
+    bucket = MagicMock()
+
+    def blob(path):
+        blob = MagicMock()
+        blob.generate_signed_url.return_value = f"https://signed/{path}"
+        return blob
+
+    bucket.blob.side_effect = blob
+    return bucket
+
+
+class EagerLoadingTestCase(TestCase):
+    """Serializing a list costs the same number of queries regardless of its size."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+        self.user = User.objects.create(
+            user_id="eager_user",
+            username="eager",
+            email="eager@example.com",
+            profile_picture="me.jpg",
+        )
+        with self.settings(GOOGLE_MAPS_API_KEY=None):
+            self.crags = [
+                Crag.objects.create(
+                    name=f"Crag {i}", location_lat=1.3 + i, location_lon=103.8, user=self.user
+                )
+                for i in range(5)
+            ]
+        self.routes = [
+            Route.objects.create(
+                route_name=f"Route {i}", route_grade=i % 10, crag=self.crags[i % 5], user=self.user
+            )
+            for i in range(20)
+        ]
+        helpers.record_media_objects(
+            [{"path": self.user.profile_picture_path}]
+            + [{"path": f"{route.images_bucket_path}/topo.jpg"} for route in self.routes]
+        )
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+
+    def _create_logs(self, count):
+        ClimbLog.objects.bulk_create(
+            ClimbLog(user=self.user, route=self.routes[i % 20], date_climbed=date(2025, 1, 1))
+            for i in range(count)
+        )
+
+    def test_01_relations_expand_through_nested_serializers(self):
+        select, prefetch = get_eager_relations(ClimbLogSerializer)
+
+        self.assertEqual(
+            select, ["route", "route__crag", "route__crag__user", "route__user", "user"]
+        )
+        self.assertEqual(prefetch, [])
+        self.assertEqual(get_eager_relations(RouteSerializer)[0], ["crag", "crag__user", "user"])
+
+    def test_02_climb_log_list_uses_constant_queries(self):
+        self._create_logs(500)
+        bucket = _make_bucket()
+
+        # logs with relations, image folders, profile pictures, geocode cache
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            with self.assertNumQueries(4):
+                response = self.client.post(
+                    reverse("get_user_climb_logs"),
+                    {"user_id": self.user.user_id, "page_size": 200},
+                    content_type="application/json",
+                )
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(len(data), 200)
+        first = data[0]
+        self.assertEqual(len(first["route"]["images_urls"]), 1)
+        self.assertTrue(first["user"]["profile_picture_url"].endswith("me.jpg"))
+        self.assertTrue(first["route"]["crag"]["user"]["profile_picture_url"].endswith("me.jpg"))
+        self.assertIsNone(first["route"]["crag"]["location_details"]["city"])
+
+    def test_03_route_list_matches_single_serialization(self):
+        routes = Route.objects.filter(crag=self.crags[0]).order_by("route_id")
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=_make_bucket()):
+            batched = RouteSerializer(routes, many=True).data
+            single = [RouteSerializer(route).data for route in routes]
+
+        self.assertEqual(batched, single)
+
+    def test_04_bucket_paths_share_the_crag_folder(self):
+        crag = self.crags[2]
+        model = CragModel.objects.create(name="Scan", crag=crag, user=self.user)
+        route = Route.objects.get(pk=self.routes[2].pk)
+        model = CragModel.objects.get(pk=model.pk)
+
+        with self.assertNumQueries(0):  # the crag row is not needed
+            paths = [route.bucket_path, model.bucket_path]
+
+        self.assertEqual(crag.bucket_path, f"crags/{crag.formatted_id}")
+        self.assertEqual(paths, [
+            f"{crag.bucket_path}/routes/{route.formatted_id}",
+            f"{crag.bucket_path}/models/{model.formatted_id}",
+        ])
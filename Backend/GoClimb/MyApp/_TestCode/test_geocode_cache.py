@@ -0,0 +1,122 @@
+"""
+Django TestCase for the persistent geocode cache behind Crag.location_details.
+
+Run with: python manage.py test MyApp._TestCode.test_geocode_cache
+"""
+
+from unittest.mock import patch, MagicMock
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.geocodecache import GeocodeCache
+from MyApp.Serializer.serializers import CragSerializer
+from MyApp.Utils.geocoding import clear_location_lru, round_coordinates
+
+
+def _geocode_response():
+    response = MagicMock()
+    response.json.return_value = {
+        "status": "OK",
+        "results": [
+            {
+                "formatted_address": "Bukit Timah, Singapore",
+                "address_components": [
+                    {"long_name": "Singapore", "types": ["country"]},
+                    {"long_name": "Bukit Timah", "types": ["neighborhood"]},
+                ],
+            }
+        ],
+    }
+    return response
+
+
+@override_settings(GOOGLE_MAPS_API_KEY="test-key")
+class GeocodeCacheTestCase(TestCase):
+    """Geocoding happens on write; reads are served from the cache."""
+
+    def setUp(self):
+        clear_location_lru()
+
+    @patch("MyApp.Utils.geocoding.requests.get")
+    def test_01_create_fills_cache(self, mock_get):
+        mock_get.return_value = _geocode_response()
+
+        Crag.objects.create(name="Dairy Farm", location_lat=1.3626, location_lon=103.7765)
+
+        self.assertEqual(mock_get.call_count, 1)
+        lat_key, lon_key = round_coordinates(1.3626, 103.7765)
+        row = GeocodeCache.objects.get(lat_key=lat_key, lon_key=lon_key)
+        self.assertEqual(row.location_details["city"], "Singapore")
+        self.assertEqual(row.location_details["district"], "Bukit Timah")
+
+    @patch("MyApp.Utils.geocoding.requests.get")
+    def test_02_same_coordinates_not_refetched(self, mock_get):
+        mock_get.return_value = _geocode_response()
+
+        crag = Crag.objects.create(name="Dairy Farm", location_lat=1.3626, location_lon=103.7765)
+        crag.description = "Updated"
+        crag.save()
+        Crag.objects.create(name="Dairy Farm Wall B", location_lat=1.36261, location_lon=103.77651)
+
+        self.assertEqual(mock_get.call_count, 1)
+
+    @patch("MyApp.Utils.geocoding.requests.get")
+    def test_03_read_paths_make_no_http_calls(self, mock_get):
+        mock_get.return_value = _geocode_response()
+        crag = Crag.objects.create(name="Dairy Farm", location_lat=1.3626, location_lon=103.7765)
+        with self.settings(GOOGLE_MAPS_API_KEY=None):
+            Crag.objects.create(name="Uncached", location_lat=10.0, location_lon=20.0)
+        mock_get.reset_mock()
+        clear_location_lru()
+
+        with patch("MyApp.Firebase.helpers.authenticate_app_check_token") as mock_auth:
+            mock_auth.return_value = {"success": True}
+            ids_response = self.client.get(reverse("get_all_crag_ids"))
+            info_response = self.client.get(
+                reverse("get_crag_info"), {"crag_id": crag.formatted_id}
+            )
+
+        mock_get.assert_not_called()
+        self.assertEqual(ids_response.status_code, 200)
+        self.assertEqual(info_response.status_code, 200)
+
+        details = {item["name"]: item["location_details"] for item in ids_response.json()["data"]}
+        self.assertEqual(details["Dairy Farm"]["city"], "Singapore")
+        self.assertIsNone(details["Uncached"]["city"])
+        self.assertEqual(info_response.json()["data"]["location_details"]["city"], "Singapore")
+
+    @patch("MyApp.Entity.crag.refresh_location_details")
+    def test_04_only_coordinate_changes_refresh(self, mock_refresh):
+        crag = Crag.objects.create(name="Null Island", location_lat=0.0, location_lon=0.0)
+        mock_refresh.assert_called_once_with(0.0, 0.0)
+        mock_refresh.reset_mock()
+
+        crag.description = "Updated"
+        crag.save()
+        loaded = Crag.objects.get(pk=crag.pk)
+        loaded.name = "Renamed"
+        loaded.save()
+        mock_refresh.assert_not_called()
+
+        loaded.location_lat = 1.5
+        loaded.save(update_fields=["location_lat"])
+        mock_refresh.assert_called_once_with(1.5, 0.0)
+
+    @patch("MyApp.Utils.geocoding.requests.get")
+    def test_05_zero_coordinates_are_looked_up(self, mock_get):
+        mock_get.return_value = _geocode_response()
+        Crag.objects.create(name="Null Island", location_lat=0.0, location_lon=0.0)
+        Crag.objects.create(name="Equator", location_lat=0.0, location_lon=103.7765)
+        clear_location_lru()
+
+        with patch("MyApp.Firebase.helpers.storage.bucket"):
+            listed = CragSerializer(Crag.objects.order_by("crag_id"), many=True).data
+        with patch("MyApp.Firebase.helpers.authenticate_app_check_token", return_value={"success": True}):
+            ids_response = self.client.get(reverse("get_all_crag_ids"))
+
+        self.assertEqual([c["location_details"]["city"] for c in listed], ["Singapore", "Singapore"])
+        self.assertEqual(
+            [c["location_details"]["city"] for c in ids_response.json()["data"]], ["Singapore", "Singapore"]
+        )
@@ -0,0 +1,140 @@
+"""
+Django TestCase for the thumbnail / WebP image variants generated after
+upload (MyApp.Utils.image_variants) and their size-keyed URLs.
+
+Run with: python manage.py test MyApp._TestCode.test_image_variants
+"""
+
+import io
+from unittest.mock import patch
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from PIL import Image
+
+from MyApp.Entity.backgroundjob import BackgroundJob
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.mediaobject import MediaObject
+from MyApp.Entity.user import User
+from MyApp.Exceptions.exceptions import ImageVariantsError
+from MyApp.Firebase import helpers
+from MyApp.Serializer.serializers import CragSerializer
+from MyApp.Utils import jobs
+from MyApp.Utils.image_variants import generate_image_variants, variant_path
+from MyApp.Utils.response_cache import clear_response_cache
+from MyApp._Benchmark.fakes import offline_services
+
+
+def _png(width, height, name="wall.png"):
+    buffer = io.BytesIO()
+    Image.new("RGB", (width, height), (200, 60, 20)).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
+
+
+class ImageVariantsTestCase(TestCase):
+    """Uploads queue a variants job; serializers key URLs by size."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+        clear_response_cache()
+        self.crag = Crag.objects.create(name="Variant Crag", location_lat=1.3, location_lon=103.8)
+
+    def _upload(self, *files):
+        folder = self.crag.images_bucket_path
+        uploaded = helpers.upload_multiple_images_to_storage(list(files), folder, "variant_user", "crag_image")
+        return [f"{folder}/{relative_path}" for relative_path in uploaded]
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+        clear_response_cache()
+
+    def test_01_upload_queues_job_and_worker_writes_variants(self):
+        with offline_services() as services:
+            path, = self._upload(_png(2000, 1000))
+            job = BackgroundJob.objects.get()
+            self.assertEqual((job.kind, job.payload), (jobs.IMAGE_VARIANTS_JOB, {"paths": [path]}))
+
+            jobs.run_pending_jobs()
+
+        sizes = {}
+        for variant in ("thumbnail", "medium", "webp"):
+            data, content_type, metadata = services.bucket.objects[variant_path(path, variant)]
+            with Image.open(io.BytesIO(data)) as image:
+                sizes[variant] = (image.format, image.size)
+            self.assertEqual(content_type, "image/webp")
+            self.assertEqual(metadata, {"source": path, "variant": variant})
+        self.assertEqual(
+            sizes,
+            {
+                "thumbnail": ("WEBP", (320, 160)),
+                "medium": ("WEBP", (1024, 512)),
+                "webp": ("WEBP", (2000, 1000)),  # never scaled up
+            },
+        )
+        self.assertEqual(MediaObject.objects.filter(path__contains="/_variants/").count(), 3)
+        self.assertFalse(BackgroundJob.objects.exists())
+
+    def test_02_serializer_falls_back_until_variants_exist(self):
+        with offline_services():
+            path, = self._upload(_png(800, 600))
+            before = CragSerializer(self.crag).data
+            jobs.run_pending_jobs()
+            helpers.clear_signed_url_cache()
+            single = CragSerializer(self.crag).data
+            listed = CragSerializer(Crag.objects.all(), many=True).data[0]
+
+        self.assertEqual(len(before["image_variants"]), 1)
+        self.assertEqual(set(before["image_variants"][0].values()), {before["images_urls"][0]})
+
+        for data in (single, listed):
+            self.assertEqual(len(data["images_urls"]), 1)  # variants are not images of their own
+            entry = data["image_variants"][0]
+            self.assertEqual(set(entry), {"original", "thumbnail", "medium", "webp"})
+            self.assertEqual(entry["original"], data["images_urls"][0])
+            self.assertIn(variant_path(path, "thumbnail"), entry["thumbnail"])
+
+    def test_03_deleted_originals_are_skipped(self):
+        with offline_services():
+            written = generate_image_variants([f"{self.crag.images_bucket_path}/gone.png"])
+
+        self.assertEqual(written, [])
+
+    def test_04_bad_images_do_not_fail_the_rest(self):
+        broken = SimpleUploadedFile("broken.png", b"\x89PNG\r\n\x1a\nnot really", content_type="image/png")
+        with offline_services() as services:
+            path, _ = self._upload(_png(400, 300), broken)
+            jobs.run_pending_jobs()
+
+        self.assertFalse(BackgroundJob.objects.exists())
+        self.assertIn(variant_path(path, "thumbnail"), services.bucket.objects)
+        self.assertEqual(MediaObject.objects.filter(path__contains="/_variants/").count(), 3)
+
+    def test_05_failed_uploads_are_recorded_and_retried_alone(self):
+        with offline_services() as services:
+            first, second = self._upload(_png(400, 300, "a.png"), _png(400, 300, "b.png"))
+            real_upload = type(services.bucket.blob(first)).upload_from_file
+
+            def flaky(blob, *args, **kwargs):
+                if blob.name == variant_path(second, "medium"):
+                    raise ConnectionError("reset")
+                return real_upload(blob, *args, **kwargs)
+
+            with patch.object(type(services.bucket.blob(first)), "upload_from_file", flaky):
+                with self.assertRaises(ImageVariantsError) as raised:
+                    generate_image_variants([first, second])
+            self.assertEqual(raised.exception.failed, [second])
+            # What was written is in the manifest, so nothing is orphaned
+            self.assertEqual(MediaObject.objects.filter(path__contains="/_variants/").count(), 4)
+
+            retried = generate_image_variants([first, second])
+
+        self.assertEqual(retried, [variant_path(second, variant) for variant in ("thumbnail", "medium", "webp")])
+
+    def test_06_profile_pictures_get_no_variants(self):
+        User.objects.create(user_id="variant_user", username="variants", email="v@example.com")
+        with offline_services():
+            helpers.upload_image_to_storage(
+                _png(400, 300), "users/variant_user/images/profile.png", "variant_user", "profile_picture"
+            )
+
+        self.assertFalse(BackgroundJob.objects.exists())
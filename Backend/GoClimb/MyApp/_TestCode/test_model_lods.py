@@ -0,0 +1,165 @@
+"""
+Django TestCase for the GLB level-of-detail pipeline (MyApp.Utils.mesh_lod)
+and the LOD tiers in CragModelSerializer.download_urls_json.
+
+Run with: python manage.py test MyApp._TestCode.test_model_lods
+"""
+
+import io
+import zipfile
+
+import numpy as np
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from MyApp.Controller import cragmodel_controller
+from MyApp.Entity.backgroundjob import BackgroundJob
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.cragmodel import CragModel
+from MyApp.Entity.user import User
+from MyApp.Firebase import helpers
+from MyApp.Serializer.serializers import CragModelSerializer
+from MyApp.Utils import jobs, mesh_lod
+from MyApp.Utils.response_cache import clear_response_cache
+from MyApp._Benchmark.fakes import offline_services
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\nfake-texture"
+
+
+def _grid_glb(size=64, animated=False):
+    """A bumpy size x size quad grid, translated by (10, 0, 0), with an embedded texture."""
+    xs, zs = np.meshgrid(np.linspace(0, 1, size + 1), np.linspace(0, 1, size + 1))
+    ys = 0.05 * np.sin(xs * 12) * np.cos(zs * 9)
+    positions = np.stack([xs, ys, zs], axis=-1).reshape(-1, 3).astype(np.float32)
+    normals = np.tile(np.array([0, 1, 0], dtype=np.float32), (len(positions), 1))
+    uvs = np.stack([xs, zs], axis=-1).reshape(-1, 2).astype(np.float32)
+
+    rows = []
+    for r in range(size):
+        for c in range(size):
+            a = r * (size + 1) + c
+            rows += [[a, a + size + 1, a + 1], [a + 1, a + size + 1, a + size + 2]]
+    indices = np.array(rows, dtype=np.uint32).reshape(-1)
+
+    blobs = [positions.tobytes(), normals.tobytes(), uvs.tobytes(), indices.tobytes(), PNG_BYTES]
+    views, binary = [], b""
+    for blob in blobs:
+        binary += b"\x00" * (-len(binary) % 4)
+        views.append({"buffer": 0, "byteOffset": len(binary), "byteLength": len(blob)})
+        binary += blob
+
+    gltf = {
+        "asset": {"version": "2.0"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"mesh": 0, "translation": [10, 0, 0]}],
+        "meshes": [
+            {
+                "primitives": [
+                    {
+                        "attributes": {"POSITION": 0, "NORMAL": 1, "TEXCOORD_0": 2},
+                        "indices": 3,
+                        "material": 0,
+                    }
+                ]
+            }
+        ],
+        "materials": [{"pbrMetallicRoughness": {"baseColorTexture": {"index": 0}}}],
+        "textures": [{"source": 0}],
+        "images": [{"bufferView": 4, "mimeType": "image/png"}],
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": len(positions), "type": "VEC3",
+             "min": positions.min(0).tolist(), "max": positions.max(0).tolist()},
+            {"bufferView": 1, "componentType": 5126, "count": len(normals), "type": "VEC3"},
+            {"bufferView": 2, "componentType": 5126, "count": len(uvs), "type": "VEC2"},
+            {"bufferView": 3, "componentType": 5125, "count": len(indices), "type": "SCALAR"},
+        ],
+        "bufferViews": views,
+        "buffers": [{"byteLength": len(binary)}],
+    }
+    if animated:
+        gltf["animations"] = [{"channels": [], "samplers": []}]
+    return mesh_lod.write_glb(gltf, binary)
+
+
+def _zip(files):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in files.items():
+            archive.writestr(name, data)
+    return SimpleUploadedFile("model.zip", buffer.getvalue(), content_type="application/zip")
+
+
+class ModelLodTestCase(TestCase):
+    """GLB uploads get decimated levels; the serializer lists them lightest first."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+        clear_response_cache()
+        self.user = User.objects.create(user_id="lod_user", username="loduser", email="lod@example.com")
+        self.crag = Crag.objects.create(name="LOD Crag", location_lat=1.3, location_lon=103.8)
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+        clear_response_cache()
+
+    def test_01_levels_hit_their_triangle_budgets(self):
+        source = _grid_glb()
+        lods = mesh_lod.build_lods(source)
+
+        self.assertEqual(lods["stats"]["triangles"], 8192)
+        self.assertEqual(lods["bounds"]["min"][0], 10.0)  # node translation applied
+        self.assertEqual(lods["bounds"]["max"][0], 11.0)
+        self.assertEqual([level[0] for level in lods["levels"]], [0.25, 0.05])
+
+        for ratio, glb, triangles, vertices in lods["levels"]:
+            self.assertLessEqual(triangles, 8192 * ratio)
+            self.assertGreater(triangles, 8192 * ratio * 0.5)
+
+            gltf, binary = mesh_lod.read_glb(glb)
+            primitive = gltf["meshes"][0]["primitives"][0]
+            positions = mesh_lod.read_accessor(gltf, binary, primitive["attributes"]["POSITION"])
+            faces = mesh_lod.read_accessor(gltf, binary, primitive["indices"]).reshape(-1, 3)
+            normals = mesh_lod.read_accessor(gltf, binary, primitive["attributes"]["NORMAL"])
+            self.assertEqual((len(faces), len(positions)), (triangles, vertices))
+            self.assertLess(int(faces.max()), len(positions))
+            np.testing.assert_allclose(np.linalg.norm(normals, axis=1), 1.0, rtol=1e-5)
+            self.assertEqual(primitive["material"], 0)
+
+            image_view = gltf["bufferViews"][gltf["images"][0]["bufferView"]]
+            start = image_view["byteOffset"]
+            self.assertEqual(binary[start : start + image_view["byteLength"]], PNG_BYTES)
+
+    def test_02_upload_job_and_serializer_tiers(self):
+        with offline_services():
+            crag_model = cragmodel_controller.create_crag_model(
+                "lod_user",
+                {"name": "Wall scan", "crag_id": self.crag.formatted_id},
+                model_files=[_zip({"scan/model.glb": _grid_glb(), "scan/wall.png": PNG_BYTES})],
+            )
+            self.assertEqual(BackgroundJob.objects.get().kind, jobs.MODEL_LODS_JOB)
+            jobs.run_pending_jobs()
+
+            crag_model.refresh_from_db()
+            single = CragModelSerializer(crag_model).data["download_urls_json"]
+            listed = CragModelSerializer(CragModel.objects.all(), many=True).data[0]["download_urls_json"]
+
+        source = f"{crag_model.bucket_path}/scan/model.glb"
+        self.assertEqual(
+            [level["path"] for level in crag_model.lod_manifest[source]["levels"]],
+            [source, mesh_lod.lod_path(source, 1), mesh_lod.lod_path(source, 2)],
+        )
+        for data in (single, listed):
+            self.assertEqual(sorted(f["name"] for f in data["files"]), ["model.glb", "wall.png"])
+            (tiers,) = data["lods"]
+            self.assertEqual(tiers["source"], source)
+            self.assertEqual([level["name"] for level in tiers["levels"]], ["lod2", "lod1", "lod0"])
+            self.assertTrue(all(level["download_url"] for level in tiers["levels"]))
+            self.assertEqual(tiers["stats"]["triangles"], 8192)
+
+    def test_03_animated_models_keep_only_full_detail(self):
+        lods = mesh_lod.build_lods(_grid_glb(size=8, animated=True))
+
+        self.assertEqual(lods["levels"], [])
+        self.assertIn("animated", lods["unsupported"])
+        self.assertEqual(lods["stats"]["triangles"], 128)
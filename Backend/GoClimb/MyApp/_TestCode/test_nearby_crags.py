@@ -0,0 +1,93 @@
+"""
+Django TestCase for the geohash-indexed nearby-crag endpoint (crag/nearby/).
+
+Run with: python manage.py test MyApp._TestCode.test_nearby_crags
+"""
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from MyApp.Entity.crag import Crag
+from MyApp.Utils import geo
+from MyApp.Utils.response_cache import clear_response_cache
+
+
+class NearbyCragsTestCase(TestCase):
+    """Radius and viewport queries go through the geohash prefix index."""
+
+    def setUp(self):
+        clear_response_cache()
+        self.url = reverse("get_nearby_crags")
+        # Around Singapore: ~1 km, ~4 km and ~15 km from the centre point
+        self.near = Crag.objects.create(name="Near", location_lat=1.3000, location_lon=103.8090)
+        self.mid = Crag.objects.create(name="Mid", location_lat=1.3300, location_lon=103.8200)
+        self.far = Crag.objects.create(name="Far", location_lat=1.4350, location_lon=103.8000)
+        self.fiji = Crag.objects.create(name="Fiji", location_lat=-17.7, location_lon=179.9)
+
+    def tearDown(self):
+        clear_response_cache()
+
+    def test_01_geohash_is_stored_and_follows_moves(self):
+        self.assertEqual(geo.encode_geohash(57.64911, 10.40744, 11), "u4pruydqqvj")
+        self.assertEqual(self.near.geohash, geo.encode_geohash(1.3, 103.809))
+
+        self.near.location_lat = 1.35
+        self.near.save(update_fields=["location_lat"])
+        self.near.refresh_from_db()
+        self.assertEqual(self.near.geohash, geo.encode_geohash(1.35, 103.809))
+
+    def test_02_radius_query_sorted_by_distance(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url, {"lat": 1.3, "lon": 103.8, "radius_km": 10})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual([c["name"] for c in data["crags"]], ["Near", "Mid"])
+        self.assertEqual(data["total"], 2)
+        self.assertLess(data["crags"][0]["distance_km"], data["crags"][1]["distance_km"])
+        self.assertTrue(any('"geohash"::text LIKE' in q["sql"] for q in queries.captured_queries))
+
+    def test_03_bounding_box_and_limit(self):
+        response = self.client.get(
+            self.url,
+            {"min_lat": 1.29, "min_lon": 103.79, "max_lat": 1.44, "max_lon": 103.83, "limit": 2},
+        )
+
+        data = response.json()["data"]
+        self.assertEqual(data["total"], 3)
+        self.assertEqual(len(data["crags"]), 2)
+
+    def test_04_antimeridian(self):
+        box = self.client.get(
+            self.url, {"min_lat": -18, "min_lon": 179.5, "max_lat": -17, "max_lon": -179.5}
+        )
+        radius = self.client.get(self.url, {"lat": -17.7, "lon": -179.95, "radius_km": 20})
+
+        self.assertEqual([c["name"] for c in box.json()["data"]["crags"]], ["Fiji"])
+        self.assertEqual([c["name"] for c in radius.json()["data"]["crags"]], ["Fiji"])
+
+    def test_05_zoom_adds_tile_clusters(self):
+        response = self.client.get(
+            self.url, {"min_lat": 1.2, "min_lon": 103.6, "max_lat": 1.5, "max_lon": 104.0, "zoom": 7}
+        )
+
+        clusters = response.json()["data"]["clusters"]
+        self.assertEqual(sum(c["count"] for c in clusters), 3)
+        singles = [c for c in clusters if c["count"] == 1]
+        for cluster in singles:
+            self.assertIn("crag_id", cluster)
+        self.assertTrue(all(c["tile"].startswith("10/") for c in clusters))
+
+    def test_06_invalid_input(self):
+        missing = self.client.get(self.url, {"lat": 1.3})
+        partial_box = self.client.get(self.url, {"min_lat": 1.2, "max_lat": 1.5})
+        bad_radius = self.client.get(self.url, {"lat": 1.3, "lon": 103.8, "radius_km": 5000})
+        not_a_number = self.client.get(self.url, {"lat": "north", "lon": 103.8})
+
+        self.assertEqual(missing.status_code, 400)
+        self.assertEqual(partial_box.status_code, 400)
+        self.assertIn("min_lon", partial_box.json()["errors"])
+        self.assertEqual(bad_radius.status_code, 400)
+        self.assertEqual(not_a_number.json()["errors"], {"lat": "Must be a number."})
@@ -0,0 +1,98 @@
+"""
+Django TestCase for keyset pagination on list endpoints.
+
+Run with: python manage.py test MyApp._TestCode.test_pagination
+"""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.core import signing
+from django.test import TestCase
+from django.urls import reverse
+
+from MyApp.Entity.user import User
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.route import Route
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Exceptions.exceptions import InvalidCursorError
+from MyApp.Utils.pagination import CURSOR_SALT, MAX_PAGE_SIZE, paginate_queryset, parse_page_params
+
+
+@patch("MyApp.Firebase.helpers.storage.bucket")
+class PaginationTestCase(TestCase):
+    """Pages follow the list ordering, never overlap and end with a null cursor."""
+
+    def setUp(self):
+        self.user = User.objects.create(user_id="page_user", username="pager", email="p@example.com")
+        with self.settings(GOOGLE_MAPS_API_KEY=None):
+            crag = Crag.objects.create(name="Crag", location_lat=1.0, location_lon=2.0, user=self.user)
+        route = Route.objects.create(route_name="R", route_grade=3, crag=crag, user=self.user)
+        # Several logs share a date, so the pk tie-breaker matters
+        ClimbLog.objects.bulk_create(
+            ClimbLog(user=self.user, route=route, date_climbed=date(2025, 1, 1) + timedelta(days=i // 3))
+            for i in range(25)
+        )
+
+    def test_01_pages_cover_ordered_list(self, mock_bucket):
+        expected = list(
+            ClimbLog.objects.order_by("-date_climbed", "-log_id").values_list("log_id", flat=True)
+        )
+        queryset = ClimbLog.objects.filter(user=self.user).order_by("-date_climbed")
+
+        seen, cursor = [], None
+        while True:
+            state = parse_page_params({"cursor": cursor, "page_size": 7})[0] if cursor else None
+            page, cursor = paginate_queryset(queryset, state, 7)
+            seen.extend(log.log_id for log in page)
+            if cursor is None:
+                break
+
+        self.assertEqual(seen, expected)
+
+    def test_02_params_are_validated(self, mock_bucket):
+        self.assertEqual(parse_page_params({"page_size": "1000"})[1], MAX_PAGE_SIZE)
+        self.assertIn("page_size", parse_page_params({"page_size": "0"})[2])
+        self.assertIn("cursor", parse_page_params({"cursor": "forged"})[2])
+        no_values = signing.dumps({"scope": "myapp.climblog", "ordering": ["-log_id"]}, salt=CURSOR_SALT)
+        self.assertEqual(parse_page_params({"cursor": no_values})[::2], (None, {"cursor": "Invalid cursor."}))
+
+        _, cursor = paginate_queryset(ClimbLog.objects.order_by("-date_climbed"), None, 5)
+        state = parse_page_params({"cursor": cursor})[0]
+        with self.assertRaises(InvalidCursorError):
+            paginate_queryset(Route.objects.order_by("route_id"), state, 5)
+
+    @patch("MyApp.Boundary.climblog_boundary.authenticate_app_check_token")
+    def test_03_endpoint_returns_next_cursor(self, mock_auth, mock_bucket):
+        mock_auth.return_value = {"success": True}
+        url = reverse("get_user_climb_logs")
+
+        first = self.client.post(
+            url, {"user_id": self.user.user_id, "page_size": 20}, content_type="application/json"
+        ).json()
+        second = self.client.post(
+            url,
+            {"user_id": self.user.user_id, "page_size": 20, "cursor": first["next_cursor"]},
+            content_type="application/json",
+        ).json()
+
+        self.assertEqual(len(first["data"]), 20)
+        self.assertEqual(len(second["data"]), 5)
+        self.assertIsNone(second["next_cursor"])
+        ids = [log["log_id"] for log in first["data"] + second["data"]]
+        self.assertEqual(len(set(ids)), 25)
+
+    @patch("MyApp.Boundary.climblog_boundary.authenticate_app_check_token")
+    def test_04_foreign_cursor_is_rejected(self, mock_auth, mock_bucket):
+        mock_auth.return_value = {"success": True}
+        Route.objects.create(route_name="S", route_grade=4, crag=Crag.objects.get(), user=self.user)
+        _, route_cursor = paginate_queryset(Route.objects.order_by("route_id"), None, 1)
+
+        response = self.client.post(
+            reverse("get_user_climb_logs"),
+            {"user_id": self.user.user_id, "cursor": route_cursor},
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["errors"], {"cursor": "Invalid cursor."})
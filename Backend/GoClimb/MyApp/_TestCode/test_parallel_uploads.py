@@ -0,0 +1,214 @@
+"""
+Django TestCase for the concurrent image and zipped-model upload engines in
+MyApp.Firebase.helpers.
+
+Run with: python manage.py test MyApp._TestCode.test_parallel_uploads
+"""
+
+import io
+import threading
+import time
+import zipfile
+from unittest.mock import patch, MagicMock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from google.api_core.exceptions import PreconditionFailed
+
+from MyApp.Entity.mediaobject import MediaObject
+from MyApp.Firebase import helpers
+
+FOLDER = "users/upload_user/posts/POST-000001/images"
+
+
+def _image(name, content_type="image/jpeg"):
+    return SimpleUploadedFile(name, b"image-bytes", content_type=content_type)
+
+
+class _FakeBucket:
+    """Bucket stand-in recording uploads; ``fail`` / ``existing`` name blobs to reject."""
+
+    def __init__(self, fail=(), existing=(), barrier=None, delay=0):
+        self.fail = set(fail)
+        self.existing = set(existing)
+        self.barrier = barrier
+        self.delay = delay
+        self.uploaded = []
+        self.contents = {}
+        self.active = 0
+        self.max_active = 0
+        self.deleted = []
+        self.exists_calls = 0
+        self.threads = set()
+        self._lock = threading.Lock()
+        self.client = MagicMock()
+        self.client.batch.return_value = MagicMock()
+
+    def delete_blob(self, name):
+        with self._lock:
+            self.deleted.append(name)
+
+    def blob(self, path, chunk_size=None):
+        blob = MagicMock()
+        blob.name = path
+
+        def upload_from_file(file, size=None, content_type=None, if_generation_match=None):
+            with self._lock:
+                self.threads.add(threading.get_ident())
+                self.active += 1
+                self.max_active = max(self.max_active, self.active)
+            try:
+                if self.barrier is not None:
+                    self.barrier.wait(timeout=5)
+                time.sleep(self.delay)
+                if path in self.fail:
+                    raise RuntimeError("boom")
+                if if_generation_match == 0 and path in self.existing:
+                    raise PreconditionFailed("exists")
+                data = file.read()
+                with self._lock:
+                    self.uploaded.append(path)
+                    self.contents[path] = data
+            finally:
+                with self._lock:
+                    self.active -= 1
+
+        def exists():
+            self.exists_calls += 1
+            return path in self.existing
+
+        def delete():
+            with self._lock:
+                self.deleted.append(path)
+
+        blob.upload_from_file.side_effect = upload_from_file
+        blob.exists.side_effect = exists
+        blob.delete.side_effect = delete
+        return blob
+
+
+class ParallelUploadTestCase(TestCase):
+    """Uploads run concurrently, report progress and roll back as a unit."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+
+    def test_01_uploads_run_concurrently_and_record_manifest(self):
+        files = [_image(f"photo{i}.jpg") for i in range(4)]
+        bucket = _FakeBucket(barrier=threading.Barrier(4))
+        progress = []
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            paths = helpers.upload_multiple_images_to_storage(
+                files, FOLDER, "upload_user", "post_image",
+                progress=lambda done, total, path: progress.append((done, total)),
+            )
+
+        self.assertEqual(len(bucket.threads), 4)
+        self.assertEqual(len(paths), 4)
+        self.assertEqual(progress, [(1, 4), (2, 4), (3, 4), (4, 4)])
+        self.assertEqual(
+            set(MediaObject.objects.values_list("path", flat=True)),
+            {f"{FOLDER}/{path}" for path in paths},
+        )
+
+    def test_02_failure_rolls_back_every_upload(self):
+        files = [_image("a.jpg"), _image("b.jpg"), _image("c.jpg")]
+        bucket = _FakeBucket(fail={f"{FOLDER}/b.jpg"})
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            with self.assertRaisesMessage(ValueError, "Failed to upload b.jpg"):
+                helpers.upload_multiple_images_to_storage(
+                    files, FOLDER, "upload_user", flatten_structure=False
+                )
+
+        self.assertEqual(sorted(bucket.deleted), sorted(bucket.uploaded))
+        self.assertFalse(MediaObject.objects.exists())
+
+    def test_03_invalid_file_rejected_before_upload(self):
+        files = [_image("a.jpg"), _image("notes.txt", content_type="text/plain")]
+        bucket = _FakeBucket()
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            with self.assertRaisesMessage(ValueError, "Failed to upload notes.txt"):
+                helpers.upload_multiple_images_to_storage(files, FOLDER, "upload_user")
+
+        self.assertEqual(bucket.uploaded, [])
+
+    def test_04_original_names_kept_without_existence_probes(self):
+        files = [_image("wall.jpg"), _image("wall.jpg"), _image("topo.jpg")]
+        bucket = _FakeBucket(existing={f"{FOLDER}/topo.jpg"})
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            paths = helpers.upload_multiple_images_to_storage(
+                files, FOLDER, "upload_user", flatten_structure=False
+            )
+
+        self.assertEqual(bucket.exists_calls, 0)
+        self.assertEqual(paths[:2], ["wall.jpg", "wall_1.jpg"])
+        self.assertRegex(paths[2], r"^topo_[0-9a-f]{8}\.jpg$")
+
+
+MODEL_FOLDER = "crags/CRAG-000001/models/MODEL-000001"
+
+
+def _zip(members):
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        for name, data in members.items():
+            archive.writestr(name, data)
+    return SimpleUploadedFile("model.zip", buffer.getvalue(), content_type="application/zip")
+
+
+class ZippedModelUploadTestCase(TestCase):
+    """Zip members are streamed into the bucket concurrently within a memory budget."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+
+    def test_01_members_streamed_renamed_and_recorded(self):
+        archive = _zip(
+            {
+                "scan/mesh.glb": b"g" * 1000,
+                "scan/textures/albedo.png": b"p" * 500,
+                "scan/extra.glb": b"e" * 10,
+                ".hidden": b"x",
+            }
+        )
+        bucket = _FakeBucket()
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            paths = helpers.upload_zipped_model_to_storage(archive, MODEL_FOLDER, "model_user")
+
+        self.assertEqual(paths, ["scan/model.glb", "scan/textures/albedo.png", "scan/model_2.glb"])
+        self.assertEqual(bucket.contents[f"{MODEL_FOLDER}/scan/model.glb"], b"g" * 1000)
+        row = MediaObject.objects.get(path=f"{MODEL_FOLDER}/scan/textures/albedo.png")
+        self.assertEqual((row.size, row.content_type), (500, "image/png"))
+
+    def test_02_memory_budget_bounds_concurrency(self):
+        archive = _zip({f"tex{i}.png": b"t" * 1000 for i in range(6)})
+        bucket = _FakeBucket(delay=0.05)
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket), \
+                patch("MyApp.Firebase.helpers.ZIP_UPLOAD_MEMORY_BUDGET", 2000):
+            paths = helpers.upload_zipped_model_to_storage(archive, MODEL_FOLDER, "model_user")
+
+        self.assertEqual(len(paths), 6)
+        self.assertEqual(bucket.max_active, 2)
+
+    def test_03_failed_member_rolls_back_archive(self):
+        archive = _zip({"a.png": b"a", "b.png": b"b", "c.png": b"c"})
+        bucket = _FakeBucket(fail={f"{MODEL_FOLDER}/b.png"})
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            with self.assertRaisesMessage(ValueError, "Failed to upload b.png"):
+                helpers.upload_zipped_model_to_storage(archive, MODEL_FOLDER, "model_user")
+
+        self.assertEqual(sorted(bucket.deleted), sorted(bucket.uploaded))
+        self.assertFalse(MediaObject.objects.exists())
@@ -0,0 +1,123 @@
+"""
+Django TestCase for the denormalized like/comment counters on Post and the
+batched liked_by_me flag.
+
+Run with: python manage.py test MyApp._TestCode.test_post_counters
+"""
+
+import time
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+
+from MyApp.Entity.user import User
+from MyApp.Entity.post import Post
+from MyApp.Entity.postlikes import PostLike
+from MyApp.Entity.postcomment import PostComment
+from MyApp.Controller import post_likes_controller, post_comment_controller
+from MyApp.Firebase import helpers
+from MyApp.Serializer.serializers import PostSerializer
+
+
+class PostCountersTestCase(TestCase):
+    """Counters follow likes and comments; feeds embed them without extra queries."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+        self.author = User.objects.create(
+            user_id="counter_author", username="counterauthor", email="author@example.com"
+        )
+        self.viewer = User.objects.create(
+            user_id="counter_viewer", username="counterviewer", email="viewer@example.com"
+        )
+        self.posts = [
+            Post.objects.create(user=self.author, title=f"Post {i}", content="content")
+            for i in range(5)
+        ]
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+
+    def _post(self, index=0):
+        return Post.objects.get(pk=self.posts[index].pk)
+
+    def test_01_like_and_unlike_adjust_like_count(self):
+        post_id = self.posts[0].formatted_id
+
+        post_likes_controller.like_post(post_id, self.viewer.user_id)
+        post_likes_controller.like_post(post_id, self.author.user_id)
+        self.assertEqual(self._post().like_count, 2)
+        self.assertEqual(post_likes_controller.get_post_likes_count(post_id), 2)
+
+        post_likes_controller.unlike_post(post_id, self.viewer.user_id)
+        post_likes_controller.unlike_post(post_id, self.viewer.user_id)
+        self.assertEqual(self._post().like_count, 1)
+
+    def test_02_comments_adjust_comment_count(self):
+        comment = post_comment_controller.create_post_comment(
+            {
+                "post_id": self.posts[0].formatted_id,
+                "user_id": self.viewer.user_id,
+                "content": "Nice send!",
+            }
+        )
+        self.assertEqual(self._post().comment_count, 1)
+
+        post_comment_controller.delete_post_comment(comment.formatted_id)
+        self.assertEqual(self._post().comment_count, 0)
+
+    def test_03_user_delete_cascades_into_counters(self):
+        PostLike.objects.create(post=self.posts[0], user=self.viewer)
+        PostComment.objects.create(post=self.posts[0], user=self.viewer, content="hi")
+
+        self.viewer.delete()
+
+        post = self._post()
+        self.assertEqual((post.like_count, post.comment_count), (0, 0))
+
+    def test_04_reconcile_repairs_drift(self):
+        PostLike.objects.create(post=self.posts[1], user=self.viewer)
+        Post.objects.filter(pk=self.posts[1].pk).update(like_count=7, comment_count=3)
+        Post.objects.filter(pk=self.posts[2].pk).update(like_count=4)
+
+        call_command("reconcile_post_counters", stdout=StringIO())
+
+        self.assertEqual((self._post(1).like_count, self._post(1).comment_count), (1, 0))
+        self.assertEqual(self._post(2).like_count, 0)
+
+    def test_05_feed_liked_by_me_is_batched(self):
+        PostLike.objects.create(post=self.posts[1], user=self.viewer)
+        PostLike.objects.create(post=self.posts[3], user=self.viewer)
+        PostLike.objects.create(post=self.posts[3], user=self.author)
+        posts = Post.objects.filter(pk__in=[p.pk for p in self.posts]).order_by("post_id")
+
+        # page query + manifest query + one liked_by_me lookup, whatever the page size
+        with self.assertNumQueries(3):
+            data = PostSerializer(posts, many=True, context={"viewer_id": self.viewer.user_id}).data
+
+        self.assertEqual([p["liked_by_me"] for p in data], [False, True, False, True, False])
+        self.assertEqual([p["like_count"] for p in data], [0, 1, 0, 2, 0])
+
+        anonymous = PostSerializer(self.posts, many=True).data
+        self.assertFalse(any(p["liked_by_me"] for p in anonymous))
+
+    @patch("firebase_admin.auth.verify_id_token")
+    @patch("MyApp.Boundary.post_boundary.authenticate_app_check_token")
+    def test_06_get_post_view_reports_own_like(self, mock_auth, mock_verify):
+        mock_auth.return_value = {"success": True}
+        mock_verify.return_value = {"uid": self.viewer.user_id, "exp": int(time.time()) + 3600}
+        PostLike.objects.create(post=self.posts[0], user=self.viewer)
+        params = {"post_id": self.posts[0].formatted_id}
+
+        response = self.client.get(reverse("get_post"), params, headers={"Authorization": "Bearer id-token"})
+        # Naming another user's ID no longer reveals their likes
+        spoofed = self.client.get(reverse("get_post"), {**params, "viewer_id": self.viewer.user_id})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertTrue(data["liked_by_me"])
+        self.assertEqual(data["like_count"], 1)
+        self.assertFalse(spoofed.json()["data"]["liked_by_me"])
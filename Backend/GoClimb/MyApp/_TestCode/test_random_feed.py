@@ -0,0 +1,81 @@
+"""
+Django TestCase for the random-key feed sampler behind get_random_posts/ and get_random_crags/.
+
+Run with: python manage.py test MyApp._TestCode.test_random_feed
+"""
+
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+
+from MyApp.Entity.user import User
+from MyApp.Entity.post import Post
+from MyApp.Controller import post_controller
+from MyApp.Utils.random_feed import InvalidCursorError
+
+
+class RandomFeedTestCase(TestCase):
+    """A feed session serves every row exactly once, in pages, without ORDER BY RANDOM()."""
+
+    def setUp(self):
+        self.user = User.objects.create(user_id="feed_user", username="feed", email="feed@example.com")
+        self.other = User.objects.create(user_id="feed_other", username="other", email="o@example.com")
+        self.posts = [
+            Post.objects.create(user=self.user, title=f"Post {i}", content="c") for i in range(23)
+        ]
+        Post.objects.create(user=self.other, title="Other", content="c")
+
+    def _walk(self, fetch):
+        seen, cursor, pages = [], None, 0
+        while True:
+            page, cursor = fetch(cursor)
+            seen.extend(post.post_id for post in page)
+            pages += 1
+            if cursor is None:
+                return seen, pages
+
+    def test_01_session_covers_every_row_once(self):
+        seen, pages = self._walk(lambda cursor: post_controller.get_random_post(5, None, cursor))
+
+        self.assertEqual(len(seen), 24)
+        self.assertEqual(len(set(seen)), 24)
+        self.assertLessEqual(pages, 6)
+
+    def test_02_user_feed_is_scoped(self):
+        seen, _ = self._walk(
+            lambda cursor: post_controller.get_post_by_user_id(self.user.user_id, 10, None, cursor)
+        )
+        self.assertEqual(sorted(seen), sorted(p.post_id for p in self.posts))
+
+        _, cursor = post_controller.get_post_by_user_id(self.user.user_id, 1)
+        with self.assertRaises(InvalidCursorError):
+            post_controller.get_random_post(1, None, cursor)
+        with self.assertRaises(InvalidCursorError):
+            post_controller.get_random_post(1, None, "tampered")
+
+    def test_03_no_random_sort_and_blacklist_still_honoured(self):
+        blacklist = [p.formatted_id for p in self.posts[:20]]
+        with self.assertNumQueries(2) as queries:
+            page, cursor = post_controller.get_random_post(10, blacklist)
+        self.assertTrue(all("RANDOM()" not in q["sql"].upper() for q in queries.captured_queries))
+        self.assertEqual(
+            sorted(p.post_id for p in page),
+            sorted([p.post_id for p in self.posts[20:]] + [Post.objects.get(title="Other").post_id]),
+        )
+        self.assertIsNone(cursor)
+
+    @patch("MyApp.Boundary.post_boundary.authenticate_app_check_token")
+    def test_04_endpoint_returns_next_cursor(self, mock_auth):
+        mock_auth.return_value = {"success": True}
+        url = reverse("get_random_post")
+
+        first = self.client.post(url, {"count": 20}, content_type="application/json").json()
+        second = self.client.post(
+            url, {"count": 20, "cursor": first["next_cursor"]}, content_type="application/json"
+        ).json()
+
+        ids = [p["post_id"] for p in first["data"] + second["data"]]
+        self.assertEqual(len(ids), 24)
+        self.assertEqual(len(set(ids)), 24)
+        self.assertIsNone(second["next_cursor"])
@@ -0,0 +1,129 @@
+"""
+Django TestCase for bearer-token authentication (GoClimbUserMiddleware and
+FirebaseAuthentication) and controllers accepting the resolved user.
+
+Run with: python manage.py test MyApp._TestCode.test_request_auth
+"""
+
+import time
+from unittest.mock import patch
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.exceptions import AuthenticationFailed
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from MyApp.Boundary.post_boundary import create_post_view
+from MyApp.Controller import post_controller
+from MyApp.Entity.post import Post
+from MyApp.Entity.user import User
+from MyApp.Firebase import helpers
+from MyApp.Firebase.authentication import FirebaseAuthentication, resolve_request_user
+from MyApp.Utils import token_cache
+
+
+def _claims(uid):
+    return {"uid": uid, "exp": int(time.time()) + 3600}
+
+
+@patch("MyApp.Boundary.post_boundary.authenticate_app_check_token", return_value={"success": True})
+class RequestAuthTestCase(TestCase):
+    """The bearer token is verified once and its user reused down to the controller."""
+
+    def setUp(self):
+        token_cache.clear_token_cache()
+        helpers.clear_signed_url_cache()
+        self.user = User.objects.create(
+            user_id="auth_user", username="authuser", email="auth@example.com"
+        )
+        User.objects.create(user_id="other_user", username="otheruser", email="other@example.com")
+
+    def tearDown(self):
+        token_cache.clear_token_cache()
+        helpers.clear_signed_url_cache()
+
+    def _create_post(self, data, token="id-token"):
+        headers = {"Authorization": f"Bearer {token}"} if token else {}
+        return self.client.post(
+            reverse("create_post"), data, content_type="application/json", headers=headers
+        )
+
+    @patch("firebase_admin.auth.verify_id_token")
+    def test_01_token_verified_once_and_user_defaults(self, mock_verify, mock_app_check):
+        mock_verify.return_value = _claims("auth_user")
+
+        response = self._create_post({"title": "Morning", "content": "Sent it"})
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(Post.objects.get().user_id, "auth_user")
+        mock_verify.assert_called_once_with("id-token")
+
+    @patch("firebase_admin.auth.verify_id_token")
+    def test_02_mismatched_user_id_forbidden(self, mock_verify, mock_app_check):
+        mock_verify.return_value = _claims("auth_user")
+
+        response = self._create_post({"user_id": "other_user", "content": "Not mine"})
+
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(Post.objects.exists())
+
+    @patch("firebase_admin.auth.verify_id_token")
+    def test_03_drf_authentication_reuses_resolution(self, mock_verify, mock_app_check):
+        mock_verify.side_effect = lambda token: _claims(token.split("-")[0])
+        factory = APIRequestFactory()
+        backend = FirebaseAuthentication()
+
+        request = factory.get("/", HTTP_AUTHORIZATION="Bearer auth_user-token")
+        self.assertEqual(resolve_request_user(request), self.user)
+        user, claims = backend.authenticate(Request(request))
+        self.assertEqual((user, claims["uid"]), (self.user, "auth_user"))
+        mock_verify.assert_called_once()
+
+        unknown = factory.get("/", HTTP_AUTHORIZATION="Bearer ghost-token")
+        with self.assertRaises(AuthenticationFailed):
+            backend.authenticate(Request(unknown))
+        self.assertIsNone(backend.authenticate(Request(factory.get("/"))))
+
+    @patch("firebase_admin.auth.verify_id_token", side_effect=ValueError("expired"))
+    def test_04_requests_without_valid_token_unchanged(self, mock_verify, mock_app_check):
+        self.assertEqual(
+            self._create_post({"user_id": "other_user", "title": "T", "content": "Hi"}, token=None).status_code,
+            201,
+        )
+        self.assertEqual(
+            self._create_post({"user_id": "other_user", "title": "T", "content": "Hi"}, token="bad").status_code,
+            201,
+        )
+        self.assertEqual(Post.objects.filter(user_id="other_user").count(), 2)
+
+    def test_05_resolved_user_skips_user_queries(self, mock_app_check):
+        with CaptureQueriesContext(connection) as queries:
+            post_controller.create_post(
+                self.user.pk, {"title": "T", "content": "C"}, user=self.user
+            )
+
+        user_reads = [
+            q["sql"] for q in queries.captured_queries
+            if q["sql"].startswith("SELECT") and 'FROM "user"' in q["sql"]
+        ]
+        self.assertEqual(user_reads, [])
+
+    @patch("firebase_admin.auth.verify_id_token")
+    def test_06_views_work_without_middleware(self, mock_verify, mock_app_check):
+        mock_verify.return_value = _claims("auth_user")
+        factory = APIRequestFactory()
+
+        anonymous = create_post_view(
+            factory.post("/", {"user_id": "other_user", "title": "T", "content": "No token"}, format="json")
+        )
+        with_token = create_post_view(
+            factory.post("/", {"title": "T", "content": "Direct"}, format="json", HTTP_AUTHORIZATION="Bearer id-token")
+        )
+
+        self.assertEqual((anonymous.status_code, with_token.status_code), (201, 201))
+        self.assertEqual(
+            sorted(Post.objects.values_list("user_id", flat=True)), ["auth_user", "other_user"]
+        )
@@ -0,0 +1,124 @@
+"""
+Django TestCase for the per-request instrumentation middleware and the
+/metrics endpoint.
+
+Run with: python manage.py test MyApp._TestCode.test_request_metrics
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import requests
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from MyApp.Entity.post import Post
+from MyApp.Entity.user import User
+from MyApp.Firebase import helpers
+from MyApp.Serializer.serializers import PostSerializer
+from MyApp.Utils import metrics
+
+
+def _fake_send(adapter, request, **kwargs):
+    response = requests.Response()
+    response.status_code = 200
+    response.url = request.url
+    return response
+
+
+@override_settings(REQUEST_METRICS_ENABLED=True, METRICS_TOKEN="scrape-secret")
+class RequestMetricsTestCase(TestCase):
+    """Requests report their query/call counts in headers and on /metrics."""
+
+    def setUp(self):
+        metrics.install_instrumentation()
+        metrics.reset_metrics()
+        helpers.clear_signed_url_cache()
+        user = User.objects.create(user_id="metrics_user", username="metrics", email="m@example.com")
+        self.post = Post.objects.create(user=user, title="Send", content="Crux")
+
+    def tearDown(self):
+        metrics.reset_metrics()
+        helpers.clear_signed_url_cache()
+
+    @patch("MyApp.Boundary.post_boundary.authenticate_app_check_token", return_value={"success": True})
+    def test_01_server_timing_and_prometheus_per_view(self, mock_auth):
+        response = self.client.get(reverse("get_post"), {"post_id": self.post.formatted_id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], r'db;dur=[\d.]+;desc="\d+ queries"')
+        self.assertIn("serialize;dur=", response["Server-Timing"])
+        self.assertIn("total;dur=", response["Server-Timing"])
+
+        scrape = self.client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        body = scrape.content.decode()
+        self.assertTrue(scrape["Content-Type"].startswith("text/plain; version=0.0.4"))
+        self.assertIn('goclimb_requests_total{view="get_post"} 1', body)
+        self.assertRegex(body, r'goclimb_db_queries_max\{view="get_post"\} [1-9]')
+        # Scrapes don't report on themselves
+        self.assertNotIn('view="metrics"', body)
+
+    @patch("requests.adapters.HTTPAdapter.send", _fake_send)
+    def test_02_outbound_calls_classified_by_host(self):
+        token = metrics.start_request()
+        try:
+            session = requests.Session()
+            session.get("https://storage.googleapis.com/upload/b/bucket/o")
+            session.get("https://maps.googleapis.com/maps/api/geocode/json")
+            requests.get("https://api.stripe.com/v1/charges")
+        finally:
+            request_metrics = metrics.finish_request(token)
+
+        self.assertEqual(request_metrics.counts["storage"], 1)
+        self.assertEqual(request_metrics.counts["http"], 2)
+
+    def test_03_nested_serializers_timed_once(self):
+        token = metrics.start_request()
+        try:
+            PostSerializer([self.post], many=True).data
+        finally:
+            request_metrics = metrics.finish_request(token)
+
+        self.assertEqual(request_metrics.counts["serializer"], 1)
+
+    def test_04_worker_threads_report_to_request(self):
+        token = metrics.start_request()
+        try:
+            with ThreadPoolExecutor(max_workers=2) as executor:
+                futures = [
+                    helpers._submit_in_context(executor, metrics.current_metrics().add, "storage", 0.01)
+                    for _ in range(3)
+                ]
+                for future in futures:
+                    future.result()
+        finally:
+            request_metrics = metrics.finish_request(token)
+
+        self.assertEqual(request_metrics.counts["storage"], 3)
+
+    def test_05_metrics_token_required_when_configured(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 401)
+        response = self.client.get("/metrics", headers={"Authorization": "Bearer scrape-secret"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_06_metrics_closed_without_token(self):
+        with self.settings(METRICS_TOKEN=""):
+            self.assertEqual(self.client.get("/metrics").status_code, 404)
+            with self.settings(DEBUG=True):
+                self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+    def test_07_instrumentation_installs_once(self):
+        request = requests.Session.request
+        data = PostSerializer.data.fget
+
+        metrics.install_instrumentation()
+
+        self.assertIs(requests.Session.request, request)
+        self.assertIs(PostSerializer.data.fget, data)
+        self.assertFalse(metrics._instrumented(request.__wrapped__))
+
+    @override_settings(REQUEST_METRICS_ENABLED=False)
+    def test_08_disabled_metrics_skip_middleware(self):
+        response = self.client.get(reverse("get_post"), {"post_id": self.post.formatted_id})
+
+        self.assertNotIn("Server-Timing", response)
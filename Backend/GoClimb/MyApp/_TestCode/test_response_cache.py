@@ -0,0 +1,129 @@
+"""
+Django TestCase for the response cache on read-mostly GET endpoints
+(MyApp.Utils.response_cache): hits, tag invalidation and ETag revalidation.
+
+Run with: python manage.py test MyApp._TestCode.test_response_cache
+"""
+
+import tempfile
+from datetime import date
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.route import Route
+from MyApp.Entity.user import User
+from MyApp.Firebase import helpers
+from MyApp.Utils.response_cache import CACHE_STATUS_HEADER, clear_response_cache
+from MyApp._Benchmark.fakes import offline_services
+
+
+class ResponseCacheTestCase(TestCase):
+    """Cached GETs are served without queries until a tagged entity changes."""
+
+    def setUp(self):
+        clear_response_cache()
+        helpers.clear_signed_url_cache()
+        self.user = User.objects.create(user_id="cache_user", username="cacheuser", email="c@example.com")
+        self.crag = Crag.objects.create(name="Cache Crag", location_lat=1.3, location_lon=103.8)
+        self.route = Route.objects.create(route_name="Cache Route", route_grade=6, crag=self.crag)
+        self.crag_id = f"CRAG-{self.crag.crag_id:06d}"
+
+    def tearDown(self):
+        clear_response_cache()
+        helpers.clear_signed_url_cache()
+
+    def test_01_second_request_is_a_hit_without_queries(self):
+        url = reverse("get_crag_info")
+        first = self.client.get(url, {"crag_id": self.crag_id})
+
+        with CaptureQueriesContext(connection) as queries:
+            second = self.client.get(url, {"crag_id": f" {self.crag_id} "})
+
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual((first[CACHE_STATUS_HEADER], second[CACHE_STATUS_HEADER]), ("miss", "hit"))
+        self.assertEqual(second.json(), first.json())
+        self.assertEqual(second["ETag"], first["ETag"])
+        self.assertEqual(len(queries), 0)
+
+    def test_02_if_none_match_returns_304(self):
+        url = reverse("get_all_crag_ids")
+        etag = self.client.get(url)["ETag"]
+
+        for _ in range(2):  # once from the view, once from the cache
+            response = self.client.get(url, headers={"If-None-Match": etag})
+            self.assertEqual(response.status_code, 304)
+            self.assertEqual(response.content, b"")
+            self.assertEqual(response["ETag"], etag)
+            clear_response_cache()
+
+        stale = self.client.get(url, headers={"If-None-Match": 'W/"stale"'})
+        self.assertEqual(stale.status_code, 200)
+
+    def test_03_saving_a_tagged_entity_invalidates(self):
+        url = reverse("get_all_crag_ids")
+        self.client.get(url)
+
+        Crag.objects.create(name="Second Crag", location_lat=1.4, location_lon=103.9)
+        response = self.client.get(url)
+
+        self.assertEqual(response[CACHE_STATUS_HEADER], "miss")
+        self.assertEqual(len(response.json()["data"]), 2)
+
+    def test_04_climb_logs_invalidate_rankings_only(self):
+        ranking_url = reverse("get_weekly_user_ranking")
+        ids_url = reverse("get_all_crag_ids")
+        self.client.get(ranking_url, {"count": 10})
+        self.client.get(ids_url)
+
+        ClimbLog.objects.create(
+            user=self.user, route=self.route, date_climbed=date.today(), status=True, attempt=1
+        )
+        ranking = self.client.get(ranking_url, {"count": 10})
+
+        self.assertEqual(ranking[CACHE_STATUS_HEADER], "miss")
+        self.assertEqual(ranking.json()["data"][0]["user"]["user_id"], "cache_user")
+        self.assertEqual(self.client.get(ids_url)[CACHE_STATUS_HEADER], "hit")
+
+    def test_05_media_changes_invalidate_their_owner(self):
+        url = reverse("get_crag_info")
+        with offline_services():
+            self.client.get(url, {"crag_id": self.crag_id})
+            image = SimpleUploadedFile("a.png", b"\x89PNG\r\n", content_type="image/png")
+            helpers.upload_image_to_storage(image, f"{self.crag.images_bucket_path}/a.png", "cache_user")
+            response = self.client.get(url, {"crag_id": self.crag_id})
+
+        self.assertEqual(response[CACHE_STATUS_HEADER], "miss")
+        self.assertEqual(len(response.json()["data"]["images_urls"]), 1)
+
+    def test_06_errors_are_not_cached(self):
+        url = reverse("get_crag_info")
+        self.client.get(url, {"crag_id": "CRAG-999999"})
+        response = self.client.get(url, {"crag_id": "CRAG-999999"})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertNotIn(CACHE_STATUS_HEADER, response)
+
+    def test_07_file_backend(self):
+        with tempfile.TemporaryDirectory() as directory:
+            caches = {
+                "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+                "responses": {
+                    "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                    "LOCATION": directory,
+                },
+            }
+            with override_settings(CACHES=caches):
+                url = reverse("get_route_by_crag_id")
+                self.client.get(url, {"crag_id": self.crag_id})
+                hit = self.client.get(url, {"crag_id": self.crag_id})
+                Route.objects.create(route_name="Second Route", route_grade=7, crag=self.crag)
+                miss = self.client.get(url, {"crag_id": self.crag_id})
+
+        self.assertEqual((hit[CACHE_STATUS_HEADER], miss[CACHE_STATUS_HEADER]), ("hit", "miss"))
+        self.assertEqual(len(miss.json()["data"]), 2)
@@ -0,0 +1,168 @@
+"""
+Django TestCase for packed route coordinates (MyApp.Utils.route_codec) and
+the format=binary mode of modelroutedata/get_by_model_id/.
+
+Run with: python manage.py test MyApp._TestCode.test_route_data_binary
+"""
+
+import json
+import math
+from unittest.mock import patch
+
+from django.test import TestCase
+from django.urls import reverse
+
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.cragmodel import CragModel
+from MyApp.Entity.modelroutedata import ModelRouteData
+from MyApp.Entity.route import Route
+from MyApp.Entity.user import User
+from MyApp.Firebase import helpers
+from MyApp.Utils import route_codec
+
+
+def _trace(count):
+    """A wavy line up a wall, in metres."""
+    return [
+        {"x": round(math.sin(i / 7), 4), "y": round(0.12 * i, 4), "z": round(0.3 * math.cos(i / 5), 4)}
+        for i in range(count)
+    ]
+
+
+def _app_route(count):
+    """What the app uploads (UnityViewerDirect): points out of order, 1-based."""
+    points = [{"order": i + 1, "pos": pos} for i, pos in enumerate(_trace(count))]
+    return {"route_name": "Pinch Line", "points": points[1::2] + points[::2]}
+
+
+@patch("MyApp.Firebase.helpers.storage.bucket")
+@patch("MyApp.Boundary.modelroutedata_boundary.authenticate_app_check_token")
+class RouteDataBinaryTestCase(TestCase):
+    """Coordinates are packed on save and served as one binary page on request."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+        self.url = reverse("get_model_route_data_by_model_id")
+        self.user = User.objects.create(user_id="trace_user", username="tracer", email="t@example.com")
+        with self.settings(GOOGLE_MAPS_API_KEY=None):
+            crag = Crag.objects.create(name="Trace Crag", location_lat=1.0, location_lon=2.0, user=self.user)
+        route = Route.objects.create(route_name="Arete", route_grade=5, crag=crag, user=self.user)
+        self.crag_model = CragModel.objects.create(name="Scan", crag=crag, user=self.user)
+
+        self.keyed = ModelRouteData.objects.create(
+            model=self.crag_model, user=self.user, route=route,
+            route_data={"coordinates": _trace(300), "difficulty": "6b"},
+        )
+        self.listed = ModelRouteData.objects.create(
+            model=self.crag_model, user=self.user, route=route,
+            route_data={"coordinates": [[0, 0], [1.5, 2.25], [3, 4.5]]},
+        )
+        self.traced = ModelRouteData.objects.create(
+            model=self.crag_model, user=self.user, route=route, route_data=_app_route(200),
+        )
+        self.unpacked = ModelRouteData.objects.create(
+            model=self.crag_model, user=self.user, route=route,
+            route_data={"coordinates": [{"x": 1, "y": 2, "hold": "jug"}], "holds": 1},
+        )
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+
+    def test_01_points_are_packed_on_save(self, mock_auth, mock_bucket):
+        self.assertIsNone(self.unpacked.route_points)
+        points, flags = route_codec.unpack_points(self.keyed.route_points)
+        self.assertEqual(flags, 1)
+        self.assertEqual(points.shape, (300, 3))
+        self.assertEqual(len(self.keyed.route_points), 12 + 16 * 3 + 300 * 3 * 2)
+
+        # Error is at most half a quantization step of the axis range (y spans ~36 m)
+        decoded = route_codec.with_points({}, points, flags)["coordinates"]
+        for original, point in zip(_trace(300), decoded):
+            for axis in "xyz":
+                self.assertAlmostEqual(original[axis], point[axis], delta=36 / 65535 / 2)
+        listed, flags = route_codec.unpack_points(bytes(self.listed.route_points))
+        self.assertEqual(route_codec.with_points({}, listed, flags)["coordinates"][2], [3.0, 4.5])
+
+        self.keyed.route_data = {"coordinates": [[5, 5, 5]]}
+        self.keyed.save(update_fields=["route_data"])
+        self.keyed.refresh_from_db()
+        self.assertEqual(route_codec.unpack_points(self.keyed.route_points)[0].tolist(), [[5.0, 5.0, 5.0]])
+
+        for shape in (None, [], [[1]], [[1, 2], [1, 2, 3]], [{"y": 1, "x": 2}], [[1, True]], [["a", 2]]):
+            self.assertIsNone(route_codec.pack_route_data({"coordinates": shape}), shape)
+        for points in (
+            [{"order": 1, "pos": {"x": 1, "y": 2}}],
+            [{"order": "1", "pos": {"x": 1, "y": 2, "z": 3}}],
+            [{"order": 1, "pos": {"x": 1, "y": 2, "z": 3}, "hold": "jug"}],
+        ):
+            self.assertIsNone(route_codec.pack_route_data({"points": points}), points)
+
+    def test_02_app_points_are_packed_in_order(self, mock_auth, mock_bucket):
+        points, flags = route_codec.unpack_points(self.traced.route_points)
+        self.assertEqual(flags, 2)
+        self.assertEqual(points.shape, (200, 3))
+
+        restored = route_codec.with_points({"route_name": "Pinch Line"}, points, flags, list(range(1, 201)))
+        self.assertEqual(restored["route_name"], "Pinch Line")
+        self.assertEqual([p["order"] for p in restored["points"]], list(range(1, 201)))
+        for original, point in zip(_trace(200), restored["points"]):
+            for axis in "xyz":
+                self.assertAlmostEqual(original[axis], point["pos"][axis], delta=24 / 65535 / 2)
+
+    def test_03_binary_page_matches_json(self, mock_auth, mock_bucket):
+        mock_auth.return_value = {"success": True}
+        model_id = self.crag_model.formatted_id
+
+        as_json = self.client.get(self.url, {"model_id": model_id})
+        as_binary = self.client.get(self.url, {"model_id": model_id, "format": "binary"})
+
+        self.assertEqual(as_binary.status_code, 200)
+        self.assertEqual(as_binary["Content-Type"], route_codec.ROUTE_PAGE_CONTENT_TYPE)
+        self.assertLess(len(as_binary.content), len(as_json.content) / 4)
+
+        page = route_codec.decode_route_page(as_binary.content)
+        rows = as_json.json()["data"]
+        self.assertEqual(
+            [r["model_route_data_id"] for r in page["routes"]],
+            [r["model_route_data_id"] for r in rows],
+        )
+        self.assertEqual(page["routes"][0]["route_id"], rows[0]["route"]["route_id"])
+        self.assertEqual(page["routes"][0]["user_id"], "trace_user")
+
+        unpacked, traced, listed, keyed = page["routes"]
+        self.assertIsNone(unpacked["points"])
+        self.assertEqual(traced["route_data"]["route_name"], "Pinch Line")
+        self.assertEqual([p["order"] for p in traced["route_data"]["points"]], list(range(1, 201)))
+        for axis, value in _trace(200)[42].items():
+            self.assertAlmostEqual(traced["route_data"]["points"][42]["pos"][axis], value, places=3)
+        self.assertEqual(unpacked["route_data"], self.unpacked.route_data)
+        for decoded, original in zip(listed["route_data"]["coordinates"], [[0, 0], [1.5, 2.25], [3, 4.5]]):
+            self.assertEqual(len(decoded), 2)
+            for value, expected in zip(decoded, original):
+                self.assertAlmostEqual(value, expected, places=4)
+        self.assertEqual(keyed["route_data"]["difficulty"], "6b")
+        self.assertEqual(len(keyed["route_data"]["coordinates"]), 300)
+
+        # The header never carries coordinates that are in the blob section
+        header_length = int.from_bytes(as_binary.content[8:12], "little")
+        header = json.loads(as_binary.content[12 : 12 + header_length])
+        self.assertNotIn("coordinates", header["routes"][3]["route_data"])
+        self.assertEqual(header["routes"][1]["route_data"], {"route_name": "Pinch Line"})
+        self.assertEqual(header["routes"][1]["orders"], list(range(1, 201)))
+
+    def test_04_binary_pages_and_json_errors(self, mock_auth, mock_bucket):
+        mock_auth.return_value = {"success": True}
+        params = {"model_id": self.crag_model.formatted_id, "format": "binary", "page_size": 2}
+
+        first = route_codec.decode_route_page(self.client.get(self.url, params).content)
+        second = route_codec.decode_route_page(
+            self.client.get(self.url, {**params, "cursor": first["next_cursor"]}).content
+        )
+        missing = self.client.get(self.url, {"model_id": "MODEL-999999", "format": "binary"})
+
+        self.assertEqual(len(first["routes"]), 2)
+        self.assertEqual(len(second["routes"]), 2)
+        self.assertIsNone(second["next_cursor"])
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(missing["Content-Type"], "application/json")
+        self.assertEqual(missing.json()["errors"], {"model_id": "Invalid ID."})
@@ -0,0 +1,145 @@
+"""
+Django TestCase for server-side route normalization (MyApp.Utils.normalization)
+and model_route_data/get_normalized/.
+
+Run with: python manage.py test MyApp._TestCode.test_route_normalization
+"""
+
+from unittest.mock import patch
+
+import numpy as np
+from django.test import TestCase
+from django.urls import reverse
+
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.cragmodel import CragModel
+from MyApp.Entity.modelroutedata import ModelRouteData
+from MyApp.Entity.route import Route
+from MyApp.Entity.user import User
+from MyApp.Firebase import helpers
+from MyApp.Utils import normalization
+from MyApp.Utils.response_cache import clear_response_cache
+
+ALIGNMENT = {"scale": 2, "pos_offset": {"x": 1, "y": 2, "z": 3}, "rot_offset": {"x": 90, "y": 0, "z": 0}}
+
+
+@patch("MyApp.Firebase.helpers.storage.bucket")
+@patch("MyApp.Boundary.modelroutedata_boundary.authenticate_app_check_token")
+class RouteNormalizationTestCase(TestCase):
+    """Route points come back aligned to the mesh, cached per normalization version."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+        clear_response_cache()
+        self.url = reverse("get_normalized_model_route_data")
+        self.user = User.objects.create(user_id="norm_user", username="normer", email="n@example.com")
+        with self.settings(GOOGLE_MAPS_API_KEY=None):
+            crag = Crag.objects.create(name="Norm Crag", location_lat=1.0, location_lon=2.0, user=self.user)
+        self.route = Route.objects.create(route_name="Slab", route_grade=4, crag=crag, user=self.user)
+        self.crag_model = CragModel.objects.create(
+            name="Scan", crag=crag, user=self.user, normalization_data=ALIGNMENT
+        )
+        self.keyed = ModelRouteData.objects.create(
+            model=self.crag_model, user=self.user, route=self.route,
+            route_data={"coordinates": [{"x": 0, "y": 1, "z": 0}, {"x": 1, "y": 0, "z": 0}]},
+        )
+        self.flat = ModelRouteData.objects.create(
+            model=self.crag_model, user=self.user, route=self.route,
+            route_data={"coordinates": [[0, 1]]},
+        )
+        self.traced = ModelRouteData.objects.create(
+            model=self.crag_model, user=self.user, route=self.route,
+            route_data={
+                "route_name": "Slab Line",
+                "points": [
+                    {"order": 2, "pos": {"x": 1, "y": 0, "z": 0}},
+                    {"order": 1, "pos": {"x": 0, "y": 1, "z": 0}},
+                ],
+            },
+        )
+        self.freeform = ModelRouteData.objects.create(
+            model=self.crag_model, user=self.user, route=self.route, route_data={"holds": ["jug"]},
+        )
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+        clear_response_cache()
+
+    def _get(self):
+        return self.client.get(self.url, {"model_id": self.crag_model.formatted_id})
+
+    def test_01_batch_matches_per_point_unity_transform(self, mock_auth, mock_bucket):
+        parsed = normalization.parse_normalization(
+            {"scale": "0.5", "pos_offset": {"x": 3}, "rot_offset": {"x": 30, "y": 45, "z": 60}}
+        )
+        self.assertEqual(parsed["pos_offset"], {"x": 3.0, "y": 0.0, "z": 0.0})
+        self.assertEqual(normalization.parse_normalization(None)["rot_offset"]["x"], 90.0)
+
+        rng = np.random.default_rng(7)
+        point_sets = [rng.normal(size=(n, 3)) for n in (5, 1, 40)]
+        batched = normalization.normalize_point_sets(point_sets, normalization.normalization_matrix(parsed))
+
+        def rotate(axis, degrees, v):
+            c, s = np.cos(np.radians(degrees)), np.sin(np.radians(degrees))
+            i, j = {"x": (1, 2), "y": (2, 0), "z": (0, 1)}[axis]
+            out = v.copy()
+            out[i], out[j] = c * v[i] - s * v[j], s * v[i] + c * v[j]
+            return out
+
+        # Unity's Quaternion.Euler: z first, then x, then y
+        for points, result in zip(point_sets, batched):
+            for point, transformed in zip(points, result):
+                expected = 0.5 * point
+                for axis in ("z", "x", "y"):
+                    expected = rotate(axis, parsed["rot_offset"][axis], expected)
+                np.testing.assert_allclose(transformed, expected + [3, 0, 0], atol=1e-12)
+
+    def test_02_endpoint_returns_aligned_points(self, mock_auth, mock_bucket):
+        mock_auth.return_value = {"success": True}
+
+        response = self._get()
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()["data"]
+        self.assertEqual(data["model_id"], self.crag_model.formatted_id)
+        routes = {r["model_route_data_id"]: r for r in data["routes"]}
+        # (0, 1, 0) -> scaled to (0, 2, 0) -> x +90 deg -> (0, 0, 2) -> offset
+        traced = routes[self.traced.formatted_id]["route_data"]
+        self.assertEqual(traced["route_name"], "Slab Line")
+        self.assertEqual([p["order"] for p in traced["points"]], [1, 2])
+        np.testing.assert_allclose(
+            [[p["pos"][axis] for axis in "xyz"] for p in traced["points"]], [[1, 2, 5], [3, 2, 3]], atol=1e-6
+        )
+        keyed = routes[self.keyed.formatted_id]["route_data"]["coordinates"]
+        self.assertEqual(keyed[0], {"x": 1.0, "y": 2.0, "z": 5.0})
+        np.testing.assert_allclose(routes[self.flat.formatted_id]["route_data"]["coordinates"], [[1, 2, 5]], atol=1e-6)
+        self.assertFalse(routes[self.freeform.formatted_id]["normalized"])
+        self.assertEqual(routes[self.freeform.formatted_id]["route_data"], {"holds": ["jug"]})
+
+    def test_03_cached_per_normalization_version(self, mock_auth, mock_bucket):
+        mock_auth.return_value = {"success": True}
+        first = self._get().json()["data"]
+
+        with self.assertNumQueries(1):  # only the model's normalization_data
+            self.assertEqual(self._get().json()["data"], first)
+
+        self.crag_model.normalization_data = {**ALIGNMENT, "scale": 4}
+        self.crag_model.save()
+        rescaled = self._get().json()["data"]
+        self.assertNotEqual(rescaled["normalization_version"], first["normalization_version"])
+        self.assertEqual(rescaled["routes"][2]["route_data"]["coordinates"], [[1.0, 2.0, 7.0]])  # newest first
+
+        ModelRouteData.objects.create(
+            model=self.crag_model, user=self.user, route=self.route, route_data={"coordinates": [[0, 0, 0]]}
+        )
+        self.assertEqual(len(self._get().json()["data"]["routes"]), 5)
+
+    def test_04_invalid_input(self, mock_auth, mock_bucket):
+        mock_auth.return_value = {"success": True}
+        missing = self.client.get(self.url, {"model_id": "MODEL-999999"})
+        CragModel.objects.filter(pk=self.crag_model.pk).update(normalization_data={"scale": "huge"})
+        broken = self._get()
+
+        self.assertEqual(missing.status_code, 404)
+        self.assertEqual(broken.status_code, 400)
+        self.assertEqual(broken.json()["errors"], {"normalization_data": "scale must be a number."})
@@ -0,0 +1,105 @@
+"""
+Django TestCase for ranked post, crag and user search in MyApp.Utils.search.
+
+Run with: python manage.py test MyApp._TestCode.test_search
+"""
+
+from unittest.mock import patch
+
+from django.test import TestCase
+
+from MyApp.Entity.user import User
+from MyApp.Entity.post import Post
+from MyApp.Entity.crag import Crag
+from MyApp.Controller import post_controller, crag_controller, user_controller
+from MyApp.Utils import search
+
+
+class SearchTestCase(TestCase):
+    """Search is served by the tsvector/tag indexes and returns the best match first."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(
+            user_id="search_user", username="boulderbob", email="bob@example.com", status=True
+        )
+        User.objects.create(
+            user_id="search_user_2", username="sportsally", email="sally@example.com", status=True
+        )
+        User.objects.create(
+            user_id="search_user_3", username="boulderhidden", email="hidden@example.com", status=False
+        )
+        cls.title_hit = Post.objects.create(
+            user=cls.user, title="Bouldering at Dairy Farm", content="Great day out.",
+            tags=["Outdoor", " Bouldering "],
+        )
+        cls.content_hit = Post.objects.create(
+            user=cls.user, title="Weekend recap", content="Some bouldering, mostly sport.",
+            tags=["sport"],
+        )
+        Post.objects.create(
+            user=cls.user, title="Bouldering suspended", content="Hidden", status="suspended"
+        )
+        cls.crag_name_hit = Crag.objects.create(
+            name="Dairy Farm Quarry", location_lat=1.36, location_lon=103.77,
+            description="Granite slabs.",
+        )
+        cls.crag_description_hit = Crag.objects.create(
+            name="Pulau Ubin", location_lat=1.40, location_lon=103.96,
+            description="Quiet island crag near an old quarry.",
+        )
+
+    def test_01_posts_ranked_title_before_content(self):
+        posts = list(post_controller.search_posts("bouldering"))
+
+        self.assertEqual(posts, [self.title_hit, self.content_hit])
+
+    def test_02_posts_match_word_prefixes(self):
+        posts = list(post_controller.search_posts("boul"))
+
+        self.assertEqual(set(posts), {self.title_hit, self.content_hit})
+
+    def test_03_search_vector_follows_writes(self):
+        self.content_hit.title = "Crimpfest report"
+        self.content_hit.save()
+
+        posts = list(post_controller.search_posts("crimpfest"))
+
+        self.assertEqual(posts, [self.content_hit])
+
+    def test_04_tags_stored_normalized_and_matched_exactly(self):
+        self.title_hit.refresh_from_db()
+        self.assertEqual(self.title_hit.tags, ["outdoor", "bouldering"])
+
+        posts = list(post_controller.search_posts_by_tags(["OUTDOOR", "", "nothing"]))
+        self.assertEqual(posts, [self.title_hit])
+
+        # exact containment, not substring
+        self.assertEqual(list(post_controller.search_posts_by_tags(["door"])), [])
+
+    def test_05_crags_ranked_name_before_description(self):
+        crags = list(crag_controller.search_crags("quarry"))
+
+        self.assertEqual(crags, [self.crag_name_hit, self.crag_description_hit])
+
+    def test_06_users_match_substring_and_skip_inactive(self):
+        with patch("MyApp.Utils.search.trigram_available", return_value=False):
+            users = list(user_controller.search_users("boulder"))
+
+        self.assertEqual([u.username for u in users], ["boulderbob"])
+
+    def test_07_users_fuzzy_match(self):
+        if not search.trigram_available():
+            self.skipTest("pg_trgm is not installed")
+
+        users = list(user_controller.search_users("bouldrbob"))
+
+        self.assertEqual([u.username for u in users], ["boulderbob"])
+
+    def test_08_non_postgres_fallback(self):
+        with patch("MyApp.Utils.search.is_postgres", return_value=False):
+            posts = list(post_controller.search_posts("ouldering"))
+            crags = list(crag_controller.search_crags("quarry"))
+
+        self.assertEqual(posts, [self.content_hit, self.title_hit])
+        self.assertEqual(crags, [self.crag_name_hit, self.crag_description_hit])
@@ -0,0 +1,155 @@
+"""
+Django TestCase for the signed-URL cache and media manifest in MyApp.Firebase.helpers.
+
+Run with: python manage.py test MyApp._TestCode.test_signed_url_cache
+"""
+
+import time
+from unittest.mock import patch, MagicMock
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+
+from MyApp._Benchmark.fakes import InMemoryBlob, offline_services
+from MyApp.Controller import user_controller
+from MyApp.Entity.user import User
+from MyApp.Entity.post import Post
+from MyApp.Entity.mediaobject import MediaObject
+from MyApp.Firebase import helpers
+from MyApp.Serializer.serializers import PostSerializer
+
+
+def _make_bucket():
+    bucket = MagicMock()
+
+    def blob(path):
+        blob = MagicMock()
+        blob.name = path
+        blob.generate_signed_url.return_value = f"https://signed/{path}"
+        return blob
+
+    bucket.blob.side_effect = blob
+    return bucket
+
+
+class SignedUrlCacheTestCase(TestCase):
+    """Warm reads of a post feed should not touch the bucket."""
+
+    def setUp(self):
+        helpers.clear_signed_url_cache()
+        self.user = User.objects.create(
+            user_id="cache_user", username="cacheuser", email="cache@example.com"
+        )
+        self.posts = [
+            Post.objects.create(user=self.user, title=f"Post {i}", content="content")
+            for i in range(50)
+        ]
+        helpers.record_media_objects(
+            [{"path": f"{post.images_bucket_path}/photo.jpg"} for post in self.posts]
+        )
+
+    def tearDown(self):
+        helpers.clear_signed_url_cache()
+
+    def test_01_warm_feed_has_no_bucket_round_trips(self):
+        bucket = _make_bucket()
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            with self.assertNumQueries(1):
+                first = PostSerializer(self.posts, many=True).data
+            self.assertEqual(bucket.blob.call_count, 50)
+
+            bucket.reset_mock()
+            second = PostSerializer(self.posts, many=True).data
+
+        bucket.list_blobs.assert_not_called()
+        bucket.blob.assert_not_called()
+        self.assertEqual(
+            [p["images_urls"] for p in first], [p["images_urls"] for p in second]
+        )
+        self.assertEqual(len(second[0]["images_urls"]), 1)
+
+    def test_02_delete_folder_invalidates(self):
+        bucket = _make_bucket()
+        bucket.list_blobs.return_value = []
+        post = self.posts[0]
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            self.assertEqual(len(helpers.get_download_urls_in_folder(post.images_bucket_path)), 1)
+            helpers.delete_bucket_folder(post.bucket_path)
+
+            urls = helpers.get_download_urls_in_folder(post.images_bucket_path)
+
+        self.assertEqual(urls, [])
+        self.assertFalse(MediaObject.objects.filter(path__startswith=post.bucket_path).exists())
+
+    def test_03_upload_records_manifest_and_invalidates_folder(self):
+        bucket = _make_bucket()
+        post = self.posts[0]
+        image = MagicMock()
+        image.content_type = "image/png"
+        image.size = 1024
+        image.name = "new.png"
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            before = helpers.get_download_urls_json_in_folder(post.images_bucket_path)
+            helpers.upload_image_to_storage(
+                image, f"{post.images_bucket_path}/new.png", self.user.user_id
+            )
+
+            after = helpers.get_download_urls_json_in_folder(post.images_bucket_path)
+
+        bucket.list_blobs.assert_not_called()
+        self.assertEqual(len(before["files"]), 1)
+        self.assertEqual(len(after["files"]), 2)
+        row = MediaObject.objects.get(path=f"{post.images_bucket_path}/new.png")
+        self.assertEqual((row.owner_type, row.owner_id), ("post", str(post.post_id)))
+        self.assertEqual(row.size, 1024)
+
+    def test_04_cache_is_bounded_and_invalidates_by_prefix(self):
+        cache = helpers._SignedUrlCache(maxsize=3)
+        cache.set(("file", "crags/CRAG-000001/a.jpg", 900), "a", 60)
+        cache.set(("folder", "crags/CRAG-000001", 15, False), ["a"], 60)
+        cache.set(("file", "crags/CRAG-000002/b.jpg", 900), "b", 60)
+        cache.get(("file", "crags/CRAG-000001/a.jpg", 900))
+        cache.set(("file", "crags/CRAG-000003/c.jpg", 900), "c", 60)
+
+        # The least recently used entry made room
+        self.assertEqual(len(cache), 3)
+        self.assertIsNone(cache.get(("folder", "crags/CRAG-000001", 15, False)))
+
+        with patch("MyApp.Firebase.helpers.time.monotonic", return_value=time.monotonic() + 120):
+            cache.set(("file", "users/u/d.jpg", 900), "d", 60)
+        self.assertEqual(len(cache), 1)
+
+        cache.set(("folder", "crags/CRAG-000001", 15, False), ["a"], 60)
+        cache.set(("file", "crags/CRAG-000001/a.jpg", 900), "a", 60)
+        cache.invalidate("crags/CRAG-000001/new.jpg")
+        self.assertIsNone(cache.get(("folder", "crags/CRAG-000001", 15, False)))
+        self.assertEqual(cache.get(("file", "crags/CRAG-000001/a.jpg", 900)), "a")
+        cache.invalidate("crags/CRAG-000001")
+        self.assertEqual(len(cache), 1)
+
+    def test_05_profile_picture_replaced_without_exists_check(self):
+        self.user.profile_picture = "old.jpg"
+        self.user.save()
+        old_path = self.user.profile_picture_path
+        helpers.record_media_objects([{"path": old_path}])
+
+        with offline_services() as services:
+            services.bucket.objects[old_path] = (b"old", "image/jpeg", {})
+            with patch.object(InMemoryBlob, "exists", side_effect=AssertionError("exists() called")):
+                user_controller.update_user(
+                    self.user.pk, {}, SimpleUploadedFile("new.png", b"png", content_type="image/png")
+                )
+                # The old picture may already be gone from storage
+                user_controller.update_user(
+                    self.user.pk, {}, SimpleUploadedFile("newer.png", b"png", content_type="image/png")
+                )
+                services.bucket.objects.clear()
+                user_controller.update_user(
+                    self.user.pk, {}, SimpleUploadedFile("newest.png", b"png", content_type="image/png")
+                )
+
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture, "newest.png")
+        self.assertEqual(helpers.get_existing_media_paths([old_path]), set())
+        folder = f"{self.user.images_bucket_path}/"
+        self.assertEqual(helpers.get_media_paths_in_folders([folder])[folder], [self.user.profile_picture_path])
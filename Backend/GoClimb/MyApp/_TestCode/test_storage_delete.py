@@ -0,0 +1,121 @@
+"""
+Django TestCase for batched storage deletes in MyApp.Firebase.helpers.
+
+Run with: python manage.py test MyApp._TestCode.test_storage_delete
+"""
+
+import threading
+from unittest.mock import patch, MagicMock
+
+from django.test import TestCase
+from google.api_core.exceptions import NotFound, ServiceUnavailable
+
+from MyApp.Entity.mediaobject import MediaObject
+from MyApp.Exceptions.exceptions import StorageDeleteError
+from MyApp.Firebase import helpers
+
+FOLDER = "crags/CRAG-000001"
+
+
+_ERRORS = {404: NotFound, 503: ServiceUnavailable}
+
+
+class _FakeBatch:
+    """Like storage's Batch: thread-local, raises only the last bad status."""
+
+    def __init__(self, bucket):
+        self.bucket = bucket
+        self.statuses = []
+
+    def __enter__(self):
+        self.bucket.local.batch = self
+        return self
+
+    def __exit__(self, exc_type, *exc):
+        self.bucket.local.batch = None
+        self.bucket.batch_sizes.append(len(self.statuses))
+        bad = [status for status in self.statuses if status >= 300]
+        if exc_type is None and bad:
+            raise _ERRORS[bad[-1]]("batch")
+
+
+class _FakeBucket:
+    """Bucket stand-in whose deletes only count when issued inside a batch."""
+
+    name = "test-bucket"
+
+    def __init__(self, blob_names, statuses=None):
+        self.blob_names = blob_names
+        self.statuses = statuses or {}
+        self.deleted = []
+        self.batch_sizes = []
+        self.single_deletes = []
+        self.threads = set()
+        self.local = threading.local()
+        self._lock = threading.Lock()
+        self.client = MagicMock()
+        self.client.batch.side_effect = lambda: _FakeBatch(self)
+
+    def list_blobs(self, prefix=None):
+        for name in self.blob_names:
+            blob = MagicMock()
+            blob.name = name
+            yield blob
+
+    def delete_blob(self, name):
+        with self._lock:
+            status = 404 if name in self.deleted else self.statuses.get(name, 204)
+            self.threads.add(threading.get_ident())
+            if status < 300:
+                self.deleted.append(name)
+        batch = getattr(self.local, "batch", None)
+        if batch is not None:
+            batch.statuses.append(status)
+        else:
+            self.single_deletes.append(name)
+            if status >= 300:
+                raise _ERRORS[status](name)
+
+
+class StorageDeleteTestCase(TestCase):
+    """Folder deletes go out 100 blobs per request, several requests at a time."""
+
+    def test_01_folder_deleted_in_concurrent_batches(self):
+        names = [f"{FOLDER}/images/{i}.jpg" for i in range(250)]
+        bucket = _FakeBucket(names)
+        helpers.record_media_objects([{"path": name} for name in names[:3]])
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            report = helpers.delete_bucket_folder(FOLDER)
+
+        self.assertEqual(report, {"deleted": 250, "failed": []})
+        self.assertEqual(sorted(bucket.batch_sizes), [50, 100, 100])
+        self.assertEqual(bucket.single_deletes, [])
+        self.assertEqual(sorted(bucket.deleted), sorted(names))
+        self.assertFalse(MediaObject.objects.exists())
+
+    def test_02_partial_failure_is_reported(self):
+        names = [f"{FOLDER}/images/{i}.jpg" for i in range(5)]
+        bucket = _FakeBucket(
+            names, statuses={names[1]: 503, names[3]: 404}
+        )
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            with self.assertRaises(StorageDeleteError) as raised:
+                helpers.delete_bucket_folder(FOLDER)
+
+        self.assertEqual(raised.exception.failed, [names[1]])
+        self.assertEqual(raised.exception.deleted, 4)
+        self.assertEqual(bucket.batch_sizes, [5])
+        # The batch error names no blob, so each is settled on its own
+        self.assertEqual(bucket.single_deletes, names)
+        self.assertEqual(sorted(bucket.deleted), sorted([names[0], names[2], names[4]]))
+
+    def test_03_single_batch_stays_on_calling_thread(self):
+        bucket = _FakeBucket([f"{FOLDER}/a.jpg", f"{FOLDER}/b.jpg"])
+
+        with patch("MyApp.Firebase.helpers.storage.bucket", return_value=bucket):
+            report = helpers.delete_blobs(name for name in bucket.blob_names)
+
+        self.assertEqual(bucket.threads, {threading.get_ident()})
+        self.assertEqual(report["deleted"], 2)
@@ -0,0 +1,102 @@
+"""
+Django TestCase for the verified-token cache in MyApp.Utils.token_cache.
+
+Run with: python manage.py test MyApp._TestCode.test_token_cache
+"""
+
+import time
+from unittest.mock import patch, MagicMock
+
+from django.core.cache import caches
+from django.test import TestCase, override_settings
+
+from MyApp.Firebase import helpers
+from MyApp.Utils import token_cache
+
+LOCMEM_CACHES = {
+    "default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"},
+    "tokens": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache", "LOCATION": "tokens"},
+}
+
+
+def _claims(uid="cached_user", ttl=3600):
+    return {"uid": uid, "exp": int(time.time()) + ttl}
+
+
+class TokenCacheTestCase(TestCase):
+    """Verified tokens are reused until shortly before they expire."""
+
+    def setUp(self):
+        token_cache.clear_token_cache()
+
+    def tearDown(self):
+        token_cache.clear_token_cache()
+
+    @patch("firebase_admin.auth.verify_id_token")
+    def test_01_repeated_token_verified_once(self, mock_verify):
+        mock_verify.return_value = _claims()
+
+        first = helpers.verify_id_token("id-token")
+        second = helpers.verify_id_token("id-token")
+
+        self.assertTrue(first["success"])
+        self.assertEqual(second["data"]["user_id"], "cached_user")
+        mock_verify.assert_called_once_with("id-token")
+
+    @patch("firebase_admin.app_check.verify_token")
+    def test_02_app_check_tokens_cached_separately(self, mock_verify):
+        mock_verify.return_value = _claims(uid=None)
+
+        for _ in range(3):
+            self.assertTrue(helpers.verify_app_check_token("shared-token")["success"])
+        mock_verify.assert_called_once_with("shared-token")
+
+        # The same string presented as an ID token is verified on its own
+        with patch("firebase_admin.auth.verify_id_token", return_value=_claims()) as mock_id:
+            helpers.verify_id_token("shared-token")
+        mock_id.assert_called_once_with("shared-token")
+
+    def test_03_failures_and_unbounded_claims_not_cached(self):
+        verify = MagicMock(side_effect=[ValueError("bad"), {"uid": "no_exp"}, {"uid": "no_exp"}])
+
+        with self.assertRaises(ValueError):
+            token_cache.verify_with_cache("id", "token", verify)
+        token_cache.verify_with_cache("id", "token", verify)
+        token_cache.verify_with_cache("id", "token", verify)
+
+        self.assertEqual(verify.call_count, 3)
+
+    def test_04_tokens_near_expiry_are_reverified(self):
+        margin = token_cache.TOKEN_CACHE_EXPIRY_MARGIN_SECONDS
+        verify = MagicMock(return_value=_claims(ttl=margin - 1))
+
+        token_cache.verify_with_cache("id", "token", verify)
+        token_cache.verify_with_cache("id", "token", verify)
+
+        self.assertEqual(verify.call_count, 2)
+
+    def test_05_least_recently_used_token_evicted(self):
+        verify = MagicMock(side_effect=lambda token: _claims(uid=token))
+
+        with patch.object(token_cache, "_verified_tokens", token_cache._VerifiedTokenLRU(2)):
+            token_cache.verify_with_cache("id", "a", verify)
+            token_cache.verify_with_cache("id", "b", verify)
+            token_cache.verify_with_cache("id", "a", verify)
+            token_cache.verify_with_cache("id", "c", verify)
+            token_cache.verify_with_cache("id", "a", verify)
+            token_cache.verify_with_cache("id", "b", verify)
+
+        self.assertEqual([c.args[0] for c in verify.call_args_list], ["a", "b", "c", "b"])
+
+    @override_settings(CACHES=LOCMEM_CACHES, TOKEN_CACHE_ALIAS="tokens")
+    def test_06_shared_cache_spares_other_workers(self):
+        caches["tokens"].clear()
+        verify = MagicMock(return_value=_claims())
+
+        token_cache.verify_with_cache("id", "token", verify)
+        # Simulate another worker process with a cold in-process cache
+        token_cache.clear_token_cache()
+        claims = token_cache.verify_with_cache("id", "token", verify)
+
+        self.assertEqual(claims["uid"], "cached_user")
+        verify.assert_called_once()
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 class UsersConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "MyApp"
+
+    def ready(self):
+        from MyApp import signals  # noqa: F401
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+
+from MyApp.Utils.climb_stats import rebuild_climb_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the leaderboard tables (user_climb_stats, user_daily_climb_stats) "
+        "from climb_log. Run once after deploying them, or to repair drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            action="append",
+            dest="user_ids",
+            help="Only rebuild this user (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_climb_stats(options["user_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt climb stats for {total} user(s)."))
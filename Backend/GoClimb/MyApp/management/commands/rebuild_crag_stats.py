@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from MyApp.Utils.crag_stats import rebuild_crag_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the per-crag daily climb rollups (crag_daily_climb_stats) from "
+        "climb_log. Run once after deploying the table, or to repair drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--crag",
+            action="append",
+            dest="crag_ids",
+            type=int,
+            help="Only rebuild this raw crag id (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        total = rebuild_crag_stats(options["crag_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} crag daily bucket(s)."))
@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+
+from MyApp.Utils.post_counters import reconcile_post_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute post.like_count and post.comment_count from post_like and "
+        "post_comment. Schedule periodically to repair drift."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--post",
+            action="append",
+            dest="post_ids",
+            type=int,
+            help="Only reconcile this post (raw id, repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        corrected = reconcile_post_counters(options["post_ids"])
+        self.stdout.write(self.style.SUCCESS(f"Corrected counters on {corrected} post(s)."))
@@ -0,0 +1,137 @@
+import json
+import os
+import subprocess
+from datetime import datetime, timezone
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from MyApp._Benchmark.fakes import offline_services
+from MyApp._Benchmark.scenarios import SCENARIOS, compare_results, run_scenarios
+from MyApp._Benchmark.seed import dataset_counts, scaled_sizes, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset into a throwaway test database and measure "
+        "p50/p95/p99 latency and queries per request for the ranking, feed, "
+        "search, nearby-crag and crag-detail endpoints, with all external "
+        "services faked. Writes the results as JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale",
+            type=float,
+            default=1.0,
+            help="Multiply the default dataset (100k users, 1M climb logs, 50k posts).",
+        )
+        parser.add_argument("--users", type=int, help="Override the number of users.")
+        parser.add_argument("--climb-logs", type=int, help="Override the number of climb logs.")
+        parser.add_argument("--posts", type=int, help="Override the number of posts.")
+        parser.add_argument("--crags", type=int, help="Override the number of crags.")
+        parser.add_argument(
+            "--scenario",
+            action="append",
+            dest="scenarios",
+            choices=sorted(SCENARIOS),
+            help="Only run this scenario (repeatable).",
+        )
+        parser.add_argument("--iterations", type=int, default=200, help="Timed requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=20, help="Untimed requests per scenario.")
+        parser.add_argument("--seed", type=int, default=1, help="RNG seed for data and requests.")
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the benchmark database (and its data) for the next run.",
+        )
+        parser.add_argument(
+            "--output",
+            default="benchmark-results.json",
+            help="Where to write the JSON results (default benchmark-results.json).",
+        )
+        parser.add_argument(
+            "--compare",
+            metavar="BASELINE",
+            help="A previous results file to print deltas against.",
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options["compare"]:
+            try:
+                with open(options["compare"]) as f:
+                    baseline = json.load(f)
+            except (OSError, ValueError) as e:
+                raise CommandError(f"Could not read baseline {options['compare']}: {e}")
+
+        sizes = scaled_sizes(
+            options["scale"],
+            users=options["users"],
+            climb_logs=options["climb_logs"],
+            posts=options["posts"],
+            crags=options["crags"],
+        )
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        # Same database the test runner would use; never the configured one
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=options["keepdb"]
+        )
+        try:
+            with offline_services():
+                counts = dataset_counts()
+                if counts["users"] == 0:
+                    self.stdout.write(f"Seeding {sizes}")
+                    counts = seed_dataset(sizes, seed=options["seed"], log=self.stdout.write)
+                else:
+                    self.stdout.write(f"Reusing seeded database: {counts}")
+
+                results = run_scenarios(
+                    options["scenarios"],
+                    iterations=options["iterations"],
+                    warmup=options["warmup"],
+                    seed=options["seed"],
+                    log=self.stdout.write,
+                )
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=options["keepdb"])
+            teardown_test_environment()
+
+        report = {
+            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "database": connection.vendor,
+            "dataset": counts,
+            "iterations": options["iterations"],
+            "warmup": options["warmup"],
+            "seed": options["seed"],
+            "scenarios": results,
+        }
+        with open(options["output"], "w") as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+        for name, result in results.items():
+            latency = result["latency_ms"]
+            self.stdout.write(
+                f"{name}: p50 {latency['p50']:.1f} ms, p99 {latency['p99']:.1f} ms, "
+                f"{result['queries_per_request']['mean']:g} queries/request"
+            )
+        if baseline is not None:
+            self.stdout.write("Compared with " + options["compare"])
+            for line in compare_results(baseline, report):
+                self.stdout.write("  " + line)
+
+        self.stdout.write(self.style.SUCCESS(f"Wrote {os.path.abspath(options['output'])}"))
+
+
+def _git_commit():
+
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -0,0 +1,50 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from MyApp.Utils.jobs import run_pending_jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Run queued background jobs (storage cleanup and other deferred side "
+        "effects). Runs until interrupted unless --once is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Drain the jobs that are due now, then exit.",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=10,
+            help="Jobs claimed per round trip (default 10).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=2.0,
+            help="Seconds to wait when no job is due (default 2).",
+        )
+        parser.add_argument(
+            "--kind",
+            action="append",
+            dest="kinds",
+            help="Only run jobs of this kind (repeatable).",
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        while True:
+            claimed = run_pending_jobs(options["batch_size"], options["kinds"])
+            total += claimed
+            if claimed:
+                continue
+            if options["once"]:
+                break
+            time.sleep(options["sleep"])
+
+        self.stdout.write(self.style.SUCCESS(f"Ran {total} job(s)."))
@@ -0,0 +1,63 @@
+from firebase_admin import storage
+from django.core.management.base import BaseCommand
+
+from MyApp.Entity.mediaobject import MediaObject
+from MyApp.Firebase.helpers import record_media_objects
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the media_object manifest from the storage bucket. Run once after "
+        "deploying the manifest table, or any time files were changed outside the API."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--prefix",
+            action="append",
+            dest="prefixes",
+            help="Bucket prefix to scan (repeatable). Defaults to crags/ and users/.",
+        )
+        parser.add_argument(
+            "--prune",
+            action="store_true",
+            help="Delete manifest rows whose blobs no longer exist under the scanned prefixes.",
+        )
+
+    def handle(self, *args, **options):
+        prefixes = options["prefixes"] or ["crags/", "users/"]
+        bucket = storage.bucket()
+
+        for prefix in prefixes:
+            seen = set()
+            batch = []
+
+            for blob in bucket.list_blobs(prefix=prefix):
+                if blob.name.endswith("/"):
+                    continue
+                seen.add(blob.name)
+                batch.append(
+                    {"path": blob.name, "size": blob.size, "content_type": blob.content_type}
+                )
+                if len(batch) >= BATCH_SIZE:
+                    record_media_objects(batch)
+                    batch = []
+
+            record_media_objects(batch)
+            self.stdout.write(f"{prefix}: recorded {len(seen)} file(s)")
+
+            if options["prune"]:
+                stale = [
+                    path
+                    for path in MediaObject.objects.filter(path__startswith=prefix)
+                    .values_list("path", flat=True)
+                    .iterator()
+                    if path not in seen
+                ]
+                for start in range(0, len(stale), BATCH_SIZE):
+                    MediaObject.objects.filter(path__in=stale[start:start + BATCH_SIZE]).delete()
+                self.stdout.write(f"{prefix}: pruned {len(stale)} stale row(s)")
+
+        self.stdout.write(self.style.SUCCESS("Media manifest synchronised."))
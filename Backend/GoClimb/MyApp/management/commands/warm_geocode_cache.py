@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand
+
+from MyApp.Entity.crag import Crag
+from MyApp.Utils.geocoding import refresh_location_details
+
+
+class Command(BaseCommand):
+    help = "Fill the geocode cache for every crag (run once after deploying the cache table)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--force",
+            action="store_true",
+            help="Re-fetch coordinates that are already cached.",
+        )
+
+    def handle(self, *args, **options):
+        force = options["force"]
+        coordinates = (
+            Crag.objects.exclude(location_lat__isnull=True)
+            .exclude(location_lon__isnull=True)
+            .values_list("location_lat", "location_lon")
+            .distinct()
+        )
+
+        total = 0
+        for lat, lon in coordinates:
+            details = refresh_location_details(lat, lon, force=force)
+            total += 1
+            self.stdout.write(f"{lat}, {lon}: {details.get('city')}, {details.get('country')}")
+
+        self.stdout.write(self.style.SUCCESS(f"Processed {total} coordinate pair(s)."))
@@ -0,0 +1,81 @@
+"""
+Request middleware for MyApp. Listed in settings.MIDDLEWARE.
+"""
+
+import json
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.db import connections
+from django.utils.functional import SimpleLazyObject
+
+from MyApp.Firebase.authentication import resolve_request_user
+from MyApp.Utils import metrics
+
+metrics_logger = logging.getLogger("MyApp.metrics")
+
+
+class RequestMetricsMiddleware:
+    """
+    Count SQL queries, storage and outbound HTTP calls and serializer time for
+    each request. Adds a ``Server-Timing`` header, logs one JSON line per
+    request on the ``MyApp.metrics`` logger and aggregates the totals per view
+    for the ``/metrics`` endpoint.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.enabled = getattr(settings, "REQUEST_METRICS_ENABLED", False)
+        if self.enabled:
+            metrics.install_instrumentation()
+
+    def __call__(self, request):
+        if not self.enabled:
+            return self.get_response(request)
+
+        token = metrics.start_request()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(metrics.db_execute_wrapper))
+                response = self.get_response(request)
+        finally:
+            request_metrics = metrics.finish_request(token)
+
+        match = getattr(request, "resolver_match", None)
+        # Unrouted paths share one label so 404 scans can't grow the series
+        view_name = match.view_name if match else "unmatched"
+        if view_name != "metrics":
+            metrics.record_request(view_name, request_metrics)
+
+        response["Server-Timing"] = request_metrics.server_timing()
+        metrics_logger.info(
+            json.dumps(
+                {
+                    "view": view_name,
+                    "method": request.method,
+                    "status": response.status_code,
+                    **request_metrics.as_log_fields(),
+                }
+            )
+        )
+        return response
+
+
+class GoClimbUserMiddleware:
+    """
+    Attach ``request.goclimb_user``: the ``User`` matching the request's
+    Firebase bearer token, or ``AnonymousUser``. Resolved lazily, so requests
+    that never look at it never verify the token.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.goclimb_user = SimpleLazyObject(
+            lambda: resolve_request_user(request) or AnonymousUser()
+        )
+        return self.get_response(request)
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0015_userpayment'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GeocodeCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('lat_key', models.DecimalField(decimal_places=4, max_digits=8)),
+                ('lon_key', models.DecimalField(decimal_places=4, max_digits=8)),
+                ('location_details', models.JSONField()),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'geocode_cache',
+                'managed': True,
+                'constraints': [models.UniqueConstraint(fields=('lat_key', 'lon_key'), name='geocode_cache_lat_lon_key')],
+            },
+        ),
+    ]
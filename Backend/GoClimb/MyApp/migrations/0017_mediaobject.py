@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:49
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0016_geocodecache'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaObject',
+            fields=[
+                ('media_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('path', models.CharField(max_length=1024, unique=True)),
+                ('folder', models.CharField(db_index=True, max_length=1024)),
+                ('size', models.BigIntegerField(blank=True, null=True)),
+                ('content_type', models.CharField(blank=True, default='', max_length=100)),
+                ('owner_type', models.CharField(blank=True, choices=[('user', 'User'), ('crag', 'Crag'), ('route', 'Route'), ('post', 'Post'), ('crag_model', 'Crag Model')], default='', max_length=20)),
+                ('owner_id', models.CharField(blank=True, default='', max_length=128)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'db_table': 'media_object',
+                'managed': True,
+                'indexes': [models.Index(fields=['owner_type', 'owner_id'], name='media_objec_owner_t_614bba_idx')],
+            },
+        ),
+    ]
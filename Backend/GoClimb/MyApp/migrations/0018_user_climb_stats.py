@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:54
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0017_mediaobject'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserClimbStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='climb_stats', serialize=False, to='MyApp.user')),
+                ('topped_count', models.IntegerField(db_index=True, default=0)),
+                ('grade_sum', models.BigIntegerField(default=0)),
+                ('average_grade', models.FloatField(db_index=True, default=0)),
+                ('score', models.FloatField(db_index=True, default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'db_table': 'user_climb_stats',
+                'managed': True,
+            },
+        ),
+        migrations.CreateModel(
+            name='UserDailyClimbStats',
+            fields=[
+                ('stats_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('topped_count', models.IntegerField(default=0)),
+                ('grade_sum', models.BigIntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_climb_stats', to='MyApp.user')),
+            ],
+            options={
+                'db_table': 'user_daily_climb_stats',
+                'managed': True,
+                'indexes': [models.Index(fields=['day', 'user'], name='user_daily__day_2165b0_idx')],
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='user_daily_climb_stats_user_day')],
+            },
+        ),
+    ]
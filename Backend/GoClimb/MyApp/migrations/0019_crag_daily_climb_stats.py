@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0018_user_climb_stats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CragDailyClimbStats',
+            fields=[
+                ('stats_id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('day', models.DateField()),
+                ('climb_count', models.IntegerField(default=0)),
+                ('crag', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_climb_stats', to='MyApp.crag')),
+            ],
+            options={
+                'db_table': 'crag_daily_climb_stats',
+                'managed': True,
+                'indexes': [models.Index(fields=['day', 'crag'], name='crag_daily__day_fad021_idx')],
+                'constraints': [models.UniqueConstraint(fields=('crag', 'day'), name='crag_daily_climb_stats_crag_day')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 22:58
+
+import MyApp.Utils.random_feed
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0019_crag_daily_climb_stats'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crag',
+            name='random_key',
+            field=models.FloatField(default=MyApp.Utils.random_feed.new_random_key),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='random_key',
+            field=models.FloatField(default=MyApp.Utils.random_feed.new_random_key),
+        ),
+        # AddField evaluates the default once; give existing rows their own keys
+        migrations.RunSQL(
+            sql=[
+                'UPDATE "crag" SET "random_key" = random();',
+                'UPDATE "post" SET "random_key" = random();',
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddIndex(
+            model_name='crag',
+            index=models.Index(fields=['random_key', 'crag_id'], name='crag_random__7af181_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['random_key', 'post_id'], name='post_random__efce63_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['user', 'random_key', 'post_id'], name='post_user_id_da4143_idx'),
+        ),
+    ]
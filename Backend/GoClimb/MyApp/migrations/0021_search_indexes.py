@@ -0,0 +1,73 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:03
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.db import migrations, models
+
+TRIGRAM_INDEXES = {
+    'user_username_trgm': 'CREATE INDEX IF NOT EXISTS "user_username_trgm" ON "user" USING gin ("username" gin_trgm_ops);',
+    'user_username_upper_trgm': 'CREATE INDEX IF NOT EXISTS "user_username_upper_trgm" ON "user" USING gin (UPPER("username"::text) gin_trgm_ops);',
+    'user_email_upper_trgm': 'CREATE INDEX IF NOT EXISTS "user_email_upper_trgm" ON "user" USING gin (UPPER("email"::text) gin_trgm_ops);',
+    'crag_name_trgm': 'CREATE INDEX IF NOT EXISTS "crag_name_trgm" ON "crag" USING gin ("name" gin_trgm_ops);',
+    'crag_name_upper_trgm': 'CREATE INDEX IF NOT EXISTS "crag_name_upper_trgm" ON "crag" USING gin (UPPER("name"::text) gin_trgm_ops);',
+}
+
+
+def create_trigram_indexes(apps, schema_editor):
+    # pg_trgm is a contrib extension; skip the fuzzy-match indexes on servers
+    # that do not ship it (search then falls back to icontains).
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        cursor.execute("SELECT 1 FROM pg_available_extensions WHERE name = 'pg_trgm'")
+        if cursor.fetchone() is None:
+            return
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm;')
+        for statement in TRIGRAM_INDEXES.values():
+            cursor.execute(statement)
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    with schema_editor.connection.cursor() as cursor:
+        for name in TRIGRAM_INDEXES:
+            cursor.execute(f'DROP INDEX IF EXISTS "{name}";')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0020_random_key'),
+    ]
+
+    operations = [
+        # Post.save now stores tags lowercased; bring existing rows in line
+        migrations.RunSQL(
+            sql='UPDATE "post" SET "tags" = ARRAY(SELECT lower(btrim(t)) FROM unnest("tags") WITH ORDINALITY AS u(t, i) WHERE btrim(t) <> \'\' ORDER BY i) WHERE "tags" IS NOT NULL;',
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+        migrations.AddField(
+            model_name='crag',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('name', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('description', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='search_vector',
+            field=models.GeneratedField(db_persist=True, expression=django.contrib.postgres.search.CombinedSearchVector(django.contrib.postgres.search.SearchVector('title', config='english', weight='A'), '||', django.contrib.postgres.search.SearchVector('content', config='english', weight='B'), django.contrib.postgres.search.SearchConfig('english')), output_field=django.contrib.postgres.search.SearchVectorField()),
+        ),
+        migrations.AddIndex(
+            model_name='crag',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='crag_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['search_vector'], name='post_search_vector_gin'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=django.contrib.postgres.indexes.GinIndex(fields=['tags'], name='post_tags_gin'),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
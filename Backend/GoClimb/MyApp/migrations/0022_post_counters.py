@@ -0,0 +1,30 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:07
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0021_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comment_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='like_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            sql=[
+                'UPDATE "post" SET "like_count" = (SELECT COUNT(*) FROM "post_like" WHERE "post_like"."post_id" = "post"."post_id");',
+                'UPDATE "post" SET "comment_count" = (SELECT COUNT(*) FROM "post_comment" WHERE "post_comment"."post_id" = "post"."post_id");',
+            ],
+            reverse_sql=migrations.RunSQL.noop,
+        ),
+    ]
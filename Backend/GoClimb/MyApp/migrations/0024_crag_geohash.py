@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:36
+
+from django.db import migrations, models
+
+from MyApp.Utils.geo import encode_geohash
+
+
+def backfill_geohash(apps, schema_editor):
+    Crag = apps.get_model("MyApp", "Crag")
+    crags = list(Crag.objects.only("crag_id", "location_lat", "location_lon"))
+    for crag in crags:
+        crag.geohash = encode_geohash(crag.location_lat, crag.location_lon)
+    Crag.objects.bulk_update(crags, ["geohash"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0023_background_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='crag',
+            name='geohash',
+            field=models.CharField(blank=True, default='', editable=False, max_length=12),
+        ),
+        migrations.RunPython(backfill_geohash, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='crag',
+            index=models.Index(fields=['geohash'], name='crag_geohash_prefix', opclasses=['varchar_pattern_ops']),
+        ),
+    ]
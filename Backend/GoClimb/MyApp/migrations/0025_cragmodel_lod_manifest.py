@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0024_crag_geohash'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='cragmodel',
+            name='lod_manifest',
+            field=models.JSONField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.18 on 2026-10-17 23:45
+
+from django.db import migrations, models
+
+from MyApp.Utils.route_codec import pack_route_data
+
+
+def backfill_route_points(apps, schema_editor):
+    ModelRouteData = apps.get_model("MyApp", "ModelRouteData")
+    rows = list(ModelRouteData.objects.only("model_route_data_id", "route_data"))
+    for row in rows:
+        row.route_points = pack_route_data(row.route_data)
+    ModelRouteData.objects.bulk_update(rows, ["route_points"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0025_cragmodel_lod_manifest'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='modelroutedata',
+            name='route_points',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill_route_points, migrations.RunPython.noop),
+    ]
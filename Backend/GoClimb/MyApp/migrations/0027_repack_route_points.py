@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 10:20
+
+from django.db import migrations
+
+from MyApp.Utils.route_codec import pack_route_data
+
+
+def repack_posed_route_points(apps, schema_editor):
+    # 0026 only packed "coordinates"; the app's routes are "points" of {order, pos}
+    ModelRouteData = apps.get_model("MyApp", "ModelRouteData")
+    rows = list(
+        ModelRouteData.objects.filter(route_data__has_key="points").only("model_route_data_id", "route_data")
+    )
+    for row in rows:
+        row.route_points = pack_route_data(row.route_data)
+    ModelRouteData.objects.bulk_update(rows, ["route_points"], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('MyApp', '0026_modelroutedata_route_points'),
+    ]
+
+    operations = [
+        migrations.RunPython(repack_posed_route_points, migrations.RunPython.noop),
+    ]
@@ -4,3 +4,9 @@ from MyApp.Entity.postlikes import PostLike
 from MyApp.Entity.post import Post
 from MyApp.Entity.crag import Crag
 from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.geocodecache import GeocodeCache
+from MyApp.Entity.mediaobject import MediaObject
+from MyApp.Entity.userclimbstats import UserClimbStats
+from MyApp.Entity.userdailyclimbstats import UserDailyClimbStats
+from MyApp.Entity.cragdailyclimbstats import CragDailyClimbStats
+from MyApp.Entity.backgroundjob import BackgroundJob
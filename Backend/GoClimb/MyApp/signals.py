@@ -0,0 +1,142 @@
+"""
+Signal handlers keeping derived tables in sync with their source rows.
+Connected in UsersConfig.ready().
+"""
+
+from django.db.models import QuerySet
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from MyApp.Entity.climblog import ClimbLog
+from MyApp.Entity.crag import Crag
+from MyApp.Entity.cragmodel import CragModel
+from MyApp.Entity.modelroutedata import ModelRouteData
+from MyApp.Entity.post import Post
+from MyApp.Entity.postcomment import PostComment
+from MyApp.Entity.postlikes import PostLike
+from MyApp.Entity.route import Route
+from MyApp.Entity.user import User
+from MyApp.Utils import climb_stats, crag_stats, post_counters, response_cache
+
+
+@receiver(pre_save, sender=ClimbLog)
+def remember_climb_log_contribution(sender, instance, raw=False, **kwargs):
+
+    if raw or instance.pk is None:
+        instance._previous_contribution = None
+        instance._previous_crag_bucket = None
+        return
+    instance._previous_contribution = climb_stats.stored_climb_log_contribution(instance.pk)
+    instance._previous_crag_bucket = crag_stats.stored_climb_log_crag_bucket(instance.pk)
+
+
+@receiver(post_save, sender=ClimbLog)
+def update_climb_stats_on_save(sender, instance, created, raw=False, **kwargs):
+
+    if raw:
+        return
+
+    previous = None if created else getattr(instance, "_previous_contribution", None)
+    current = climb_stats.climb_log_contribution(instance)
+    if previous != current:
+        climb_stats.apply_contribution(previous, -1)
+        climb_stats.apply_contribution(current, 1)
+
+    previous_bucket = None if created else getattr(instance, "_previous_crag_bucket", None)
+    current_bucket = crag_stats.climb_log_crag_bucket(instance)
+    if previous_bucket != current_bucket:
+        crag_stats.apply_crag_bucket(previous_bucket, -1)
+        crag_stats.apply_crag_bucket(current_bucket, 1)
+
+
+@receiver(post_delete, sender=ClimbLog)
+def update_climb_stats_on_delete(sender, instance, **kwargs):
+
+    try:
+        contribution = climb_stats.climb_log_contribution(instance)
+        bucket = crag_stats.climb_log_crag_bucket(instance)
+    except Route.DoesNotExist:
+        return
+    climb_stats.apply_contribution(contribution, -1)
+    crag_stats.apply_crag_bucket(bucket, -1)
+
+
+@receiver(pre_save, sender=Route)
+def remember_route_grade_and_crag(sender, instance, raw=False, **kwargs):
+
+    instance._previous_grade_and_crag = None
+    if not raw and instance.pk is not None:
+        instance._previous_grade_and_crag = (
+            Route.objects.filter(pk=instance.pk).values_list("route_grade", "crag_id").first()
+        )
+
+
+@receiver(post_save, sender=Route)
+def rebuild_stats_on_route_change(sender, instance, created, raw=False, **kwargs):
+
+    previous = getattr(instance, "_previous_grade_and_crag", None)
+    if raw or created or previous is None:
+        return
+    previous_grade, previous_crag_id = previous
+
+    if previous_grade != instance.route_grade:
+        user_ids = set(
+            ClimbLog.objects.filter(route_id=instance.pk, status=True).values_list("user_id", flat=True)
+        )
+        if user_ids:
+            climb_stats.rebuild_climb_stats(user_ids)
+
+    if previous_crag_id != instance.crag_id:
+        crag_stats.rebuild_crag_stats([previous_crag_id, instance.crag_id])
+
+
+def _deleting_post(origin) -> bool:
+
+    # Likes and comments removed because their post is being deleted do not
+    # need the counter kept in step.
+    if isinstance(origin, Post):
+        return True
+    return isinstance(origin, QuerySet) and origin.model is Post
+
+
+@receiver(post_save, sender=PostLike)
+def increment_like_count(sender, instance, created, raw=False, **kwargs):
+
+    if created and not raw:
+        post_counters.adjust_post_counter(instance.post_id, "like_count", 1)
+
+
+@receiver(post_delete, sender=PostLike)
+def decrement_like_count(sender, instance, origin=None, **kwargs):
+
+    if not _deleting_post(origin):
+        post_counters.adjust_post_counter(instance.post_id, "like_count", -1)
+
+
+@receiver(post_save, sender=PostComment)
+def increment_comment_count(sender, instance, created, raw=False, **kwargs):
+
+    if created and not raw:
+        post_counters.adjust_post_counter(instance.post_id, "comment_count", 1)
+
+
+@receiver(post_delete, sender=PostComment)
+def decrement_comment_count(sender, instance, origin=None, **kwargs):
+
+    if not _deleting_post(origin):
+        post_counters.adjust_post_counter(instance.post_id, "comment_count", -1)
+
+
+def invalidate_cached_responses(sender, raw=False, **kwargs):
+
+    if not raw:
+        response_cache.invalidate_tags([response_cache.MODEL_TAGS[sender._meta.label]])
+
+
+for _model in (Crag, Route, ClimbLog, CragModel, ModelRouteData, Post, User):
+    post_save.connect(
+        invalidate_cached_responses, sender=_model, dispatch_uid=f"response-cache-save-{_model.__name__}"
+    )
+    post_delete.connect(
+        invalidate_cached_responses, sender=_model, dispatch_uid=f"response-cache-delete-{_model.__name__}"
+    )
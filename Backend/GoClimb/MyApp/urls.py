@@ -3,12 +3,14 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from . import views
+from MyApp.Views.metrics_views import metrics_view
 
 urlpatterns = [
 
     path("admin/", admin.site.urls),
 
     path("", views.home, name="home"),
+    path("metrics", metrics_view, name="metrics"),
 
     path("auth/", include("MyApp.Url.auth_url")),
     path("user/", include("MyApp.Url.user_url")),